@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for actor message scheduling.
+
+Sends messages round-robin to 1, 100 and 10,000 actors on the default
+dispatcher and reports delivered messages/sec and the p50/p99 latency
+from ``tell`` to ``receive``. Each message carries its send timestamp.
+
+Usage:
+    python benchmark_actors.py [--messages 100000] [--actors 1 100 10000]
+                               [--throughput 5] [--threads 8]
+                               [--dispatcher default|fork-join]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abhikarta.actor import Actor, ActorSystem, Props  # noqa: E402
+from abhikarta.actor.dispatcher import DispatcherConfig  # noqa: E402
+from abhikarta.actor.system import ActorSystemConfig  # noqa: E402
+
+
+class Recorder:
+    """Collects receive latencies and signals when all messages arrived."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.latencies = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def record(self, sent_at: float):
+        latency = time.perf_counter() - sent_at
+        with self.lock:
+            self.latencies.append(latency)
+            if len(self.latencies) >= self.expected:
+                self.done.set()
+
+
+class LatencyActor(Actor):
+    def __init__(self, recorder: Recorder):
+        super().__init__()
+        self._recorder = recorder
+
+    def receive(self, message):
+        self._recorder.record(message)
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(actor_count: int, messages: int, throughput: int, threads: int,
+        dispatcher: str = "default"):
+    config = ActorSystemConfig(
+        name=f"bench-{actor_count}",
+        default_dispatcher=DispatcherConfig(dispatcher_type=dispatcher,
+                                            thread_pool_size=threads, throughput=throughput),
+        log_dead_letters=False
+    )
+    system = ActorSystem(config)
+    try:
+        recorder = Recorder(messages)
+        refs = [system.actor_of(Props(LatencyActor, args=(recorder,)), f"a{i}")
+                for i in range(actor_count)]
+
+        start = time.perf_counter()
+        for i in range(messages):
+            refs[i % actor_count].tell(time.perf_counter())
+        completed = recorder.done.wait(timeout=120)
+        elapsed = time.perf_counter() - start
+
+        received = len(recorder.latencies)
+        print(f"{actor_count:>6} actors: {received / elapsed:>10,.0f} msg/s   "
+              f"p50 {percentile(recorder.latencies, 0.50) * 1000:8.3f} ms   "
+              f"p99 {percentile(recorder.latencies, 0.99) * 1000:8.3f} ms"
+              + ("" if completed else f"   (timed out: {received}/{messages})"))
+        if dispatcher == "fork-join":
+            stats = system.get_stats()['dispatchers']['default']
+            print(f"{'':>14}steals {stats['steals']:,}   parks {stats['parks']:,}")
+    finally:
+        system.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--actors', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--throughput', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--dispatcher', choices=['default', 'fork-join'], default='default')
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, throughput={args.throughput}, "
+          f"{args.threads} {args.dispatcher} dispatcher threads")
+    for actor_count in args.actors:
+        run(actor_count, args.messages, args.throughput, args.threads, args.dispatcher)
+
+
+if __name__ == '__main__':
+    main()
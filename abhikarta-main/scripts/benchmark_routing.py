@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for actor routing logics.
+
+Measures selections/sec at 10, 100 and 1,000 routees for consistent
+hashing (against the previous MD5 linear-scan ring), smallest-mailbox,
+power-of-two-choices and round-robin. Also reports the share of keys
+that move when one routee joins the ring. Routees are stand-ins with
+random mailbox depths, so the load-aware logics do real comparisons.
+
+Usage:
+    python benchmark_routing.py [--routees 10 100 1000] [--messages 100000]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abhikarta.actor.router import (  # noqa: E402
+    ConsistentHashingLogic,
+    PowerOfTwoChoicesLogic,
+    RoundRobinLogic,
+    SmallestMailboxLogic,
+)
+
+
+class Mailbox:
+    def __init__(self, depth: int):
+        self.depth = depth
+
+    def size(self) -> int:
+        return self.depth
+
+
+class Routee:
+    """Stands in for an ActorRef: a path and a mailbox reference."""
+
+    def __init__(self, path: str, depth: int):
+        self.path = path
+        self._mailbox = Mailbox(depth)
+
+    def _mailbox_ref(self):
+        return self._mailbox
+
+
+class LegacyConsistentHashing:
+    """The previous ring: MD5 per message and a linear scan."""
+
+    def __init__(self, virtual_nodes: int = 100):
+        self._virtual_nodes = virtual_nodes
+        self._ring = []
+
+    def _hash(self, key) -> int:
+        return int(hashlib.md5(str(key).encode()).hexdigest(), 16)
+
+    def select(self, message, routees):
+        if len(self._ring) != len(routees) * self._virtual_nodes:
+            self._ring = sorted(((self._hash(f"{r.path}-{i}"), r) for r in routees
+                                 for i in range(self._virtual_nodes)), key=lambda x: x[0])
+        hash_val = self._hash(message)
+        for ring_hash, routee in self._ring:
+            if ring_hash >= hash_val:
+                return [routee]
+        return [self._ring[0][1]]
+
+
+def rate(logic, routees, messages) -> float:
+    logic.select(messages[0], routees)  # Build rings outside the timing
+    start = time.perf_counter()
+    for message in messages:
+        logic.select(message, routees)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def moved_keys(routees, keys) -> float:
+    """Fraction of keys that change routee when one routee is added."""
+    logic = ConsistentHashingLogic()
+    before = [logic.select(key, routees)[0] for key in keys]
+    grown = routees + (Routee(f"/user/router/routee-{len(routees)}", 0),)
+    after = [logic.select(key, grown)[0] for key in keys]
+    return sum(a is not b for a, b in zip(before, after)) / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--routees', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--messages', type=int, default=100000)
+    args = parser.parse_args()
+
+    keys = [f"user-{i}" for i in range(args.messages)]
+    print(f"{args.messages} selections per logic (selections/sec)")
+    for count in args.routees:
+        routees = tuple(Routee(f"/user/router/routee-{i}", random.randint(0, 50))
+                        for i in range(count))
+        # The legacy scan is slow at scale; time fewer messages
+        legacy_keys = keys[:max(1000, args.messages // count)]
+        results = [
+            ('hash (legacy)', rate(LegacyConsistentHashing(), routees, legacy_keys)),
+            ('hash', rate(ConsistentHashingLogic(), routees, keys)),
+            ('smallest', rate(SmallestMailboxLogic(), routees, keys)),
+            ('two-choices', rate(PowerOfTwoChoicesLogic(), routees, keys)),
+            ('round-robin', rate(RoundRobinLogic(), routees, keys)),
+        ]
+        print(f"{count:>5} routees: " + "   ".join(
+            f"{name} {value:>10,.0f}" for name, value in results)
+              + f"   keys moved on join {moved_keys(routees, keys[:20000]):.1%}")
+
+
+if __name__ == '__main__':
+    main()
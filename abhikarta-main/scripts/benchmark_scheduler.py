@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the actor schedulers.
+
+Compares the heap scheduler with the hierarchical timing wheel at 1,000
+and 100,000 pending timers. For each it reports schedule and cancel
+rates, the time to expire every timer, and the p50/p99 lateness of
+delivery (how long after its deadline each message arrived).
+
+Usage:
+    python benchmark_scheduler.py [--timers 1000 100000] [--delay 3.0]
+                                  [--tick 0.01] [--wheel-size 512]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abhikarta.actor.scheduler import SchedulerFactory  # noqa: E402
+
+
+class Receiver:
+    """Stands in for an ActorRef; records how late each message arrived."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.lateness = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def tell(self, deadline: float, sender=None):
+        late = time.time() - deadline
+        with self.lock:
+            self.lateness.append(late)
+            if len(self.lateness) >= self.expected:
+                self.done.set()
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(scheduler_type: str, timers: int, delay: float, tick: float, wheel_size: int):
+    scheduler = SchedulerFactory.create(scheduler_type, tick_duration=tick, wheel_size=wheel_size)
+    scheduler.start()
+    try:
+        # Schedule and cancel half, as with asks that are answered in time
+        receiver = Receiver(timers - timers // 2)
+        start = time.perf_counter()
+        tasks = []
+        for i in range(timers):
+            # Spread deadlines over one delay so expiry is not a single burst
+            at = delay + delay * i / timers
+            tasks.append(scheduler.schedule_once(at, receiver, time.time() + at))
+        schedule_rate = timers / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for task in tasks[::2]:
+            task.cancel()
+        cancel_rate = (timers // 2 or 1) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        completed = receiver.done.wait(timeout=delay * 2 + 60)
+        expire_seconds = time.perf_counter() - start
+
+        print(f"{scheduler_type:>12} {timers:>7}: "
+              f"schedule {schedule_rate:>10,.0f}/s   cancel {cancel_rate:>10,.0f}/s   "
+              f"expired in {expire_seconds:6.2f} s   "
+              f"lateness p50 {percentile(receiver.lateness, 0.50) * 1000:7.2f} ms   "
+              f"p99 {percentile(receiver.lateness, 0.99) * 1000:7.2f} ms"
+              + ("" if completed else f"   (timed out: {len(receiver.lateness)})"))
+    finally:
+        scheduler.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--timers', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--delay', type=float, default=3.0)
+    parser.add_argument('--tick', type=float, default=0.01)
+    parser.add_argument('--wheel-size', type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"tick={args.tick * 1000:.0f} ms, wheel size={args.wheel_size}, "
+          f"deadlines spread over {args.delay}-{args.delay * 2} s, half cancelled")
+    for timers in args.timers:
+        for scheduler_type in ('heap', 'timing-wheel'):
+            run(scheduler_type, timers, args.delay, args.tick, args.wheel_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SQLite performance profile.
+
+Compares the legacy configuration (rollback journal, synchronous=FULL, one
+commit per statement) with the tuned profile (WAL, synchronous=NORMAL,
+batched transactions) on the workload WorkflowExecutor._save_execution
+produces: one executions row plus N execution_steps rows, while a reader
+thread polls the executions table like the dashboards do.
+
+Usage:
+    python benchmark_sqlite.py [--executions 200] [--steps 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from abhikarta.database.sqlite_handler import SQLiteHandler  # noqa: E402
+
+EXECUTION_SQL = """
+    INSERT INTO executions (
+        execution_id, agent_id, user_id, status,
+        input_data, output_data, started_at, completed_at, duration_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+STEP_SQL = """
+    INSERT INTO execution_steps (
+        execution_id, step_number, node_id, node_type, status,
+        input_data, output_data, started_at, completed_at, duration_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+NOW = '2025-01-01T00:00:00'
+
+
+def make_rows(index: int, steps: int):
+    execution_id = f"bench_{index}"
+    execution = (execution_id, 'wf_bench', 'bench', 'completed',
+                 '{"q": 1}', '{"a": 1}', NOW, NOW, 10)
+    step_rows = [(execution_id, n, f"node_{n}", 'python', 'completed',
+                  '{"x": 1}', '{"y": 2}', NOW, NOW, 1) for n in range(steps)]
+    return execution, step_rows
+
+
+def run(label: str, handler: SQLiteHandler, executions: int, steps: int, batched: bool):
+    handler.init_schema()
+    stop = threading.Event()
+    reads = [0]
+
+    def reader():
+        while not stop.is_set():
+            handler.fetch_all("SELECT execution_id, status FROM executions ORDER BY id DESC LIMIT 20")
+            reads[0] += 1
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    start = time.perf_counter()
+
+    for i in range(executions):
+        execution, step_rows = make_rows(i, steps)
+        if batched:
+            with handler.transaction():
+                handler.execute(EXECUTION_SQL, execution)
+                handler.execute_many(STEP_SQL, step_rows)
+        else:
+            handler.execute(EXECUTION_SQL, execution)
+            for row in step_rows:
+                handler.execute(STEP_SQL, row)
+
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    rows = executions * (steps + 1)
+    print(f"{label:<36} {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s  "
+          f"{executions / elapsed:8.1f} executions/s  {reads[0]:6d} reads")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--executions', type=int, default=200)
+    parser.add_argument('--steps', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = SQLiteHandler(os.path.join(tmp, 'legacy.db'), journal_mode='DELETE',
+                               synchronous='FULL', cache_size_kb=0, mmap_size_mb=0,
+                               temp_store='DEFAULT')
+        tuned = SQLiteHandler(os.path.join(tmp, 'tuned.db'))
+
+        print(f"{args.executions} executions x {args.steps} steps, one concurrent reader\n")
+        before = run("before: rollback journal, per-stmt", legacy,
+                     args.executions, args.steps, batched=False)
+        after = run("after: WAL profile, one commit", tuned,
+                    args.executions, args.steps, batched=True)
+        print(f"\nspeedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
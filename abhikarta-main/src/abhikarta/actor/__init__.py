@@ -73,6 +73,8 @@ from .actor import (
     Terminated,
     ReceiveTimeout,
     DeadLetter,
+    AskTimeout,
+    PromiseActorRef,
 )
 
 # Props and configuration
@@ -132,6 +134,13 @@ from .scheduler import (
     Scheduler,
     Cancellable,
     TimerScheduler,
+    TimingWheelScheduler,
+    SchedulerFactory,
+)
+
+# Routing
+from .router import (
+    ConsistentHashRing,
 )
 
 # Patterns
@@ -145,6 +154,7 @@ from .patterns import (
     ScatterGatherLogic,
     ConsistentHashingLogic,
     SmallestMailboxLogic,
+    PowerOfTwoChoicesLogic,
     GetRoutees,
     Routees,
     AddRoutee,
@@ -189,6 +199,8 @@ __all__ = [
     'Terminated',
     'ReceiveTimeout',
     'DeadLetter',
+    'AskTimeout',
+    'PromiseActorRef',
     
     # Props
     'Props',
@@ -236,6 +248,8 @@ __all__ = [
     'Scheduler',
     'Cancellable',
     'TimerScheduler',
+    'TimingWheelScheduler',
+    'SchedulerFactory',
     
     # Patterns - Routers
     'RouterActor',
@@ -246,6 +260,8 @@ __all__ = [
     'ScatterGatherLogic',
     'ConsistentHashingLogic',
     'SmallestMailboxLogic',
+    'PowerOfTwoChoicesLogic',
+    'ConsistentHashRing',
     'GetRoutees',
     'Routees',
     'AddRoutee',
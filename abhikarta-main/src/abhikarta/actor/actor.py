@@ -123,6 +123,12 @@ class DeadLetter:
     recipient: 'ActorRef'
 
 
+@dataclass(frozen=True)
+class AskTimeout:
+    """Sent by the scheduler to an ask's reply reference when it expires."""
+    timeout: float
+
+
 # ============================================
 # ACTOR LIFECYCLE
 # ============================================
@@ -192,7 +198,9 @@ class ActorRef:
             return
         
         envelope = Envelope(message=message, sender=sender)
-        mailbox.enqueue(envelope)
+        if mailbox.enqueue(envelope):
+            # Wake the actor if it is idle
+            mailbox.notify_enqueued()
     
     def __lshift__(self, message: Any) -> None:
         """Operator << for sending messages: actor_ref << message"""
@@ -244,6 +252,67 @@ class ActorRef:
         return self._path
 
 
+def _no_mailbox() -> None:
+    return None
+
+
+class PromiseActorRef(ActorRef):
+    """
+    Reply-only reference used by the ask pattern.
+    
+    The first message told to it completes its Future directly; there is
+    no mailbox, cell or dispatcher hop. An :class:`AskTimeout` fails the
+    Future instead. Replies arriving after completion become dead letters.
+    """
+    
+    __slots__ = ('_future', '_on_complete', 'timeout_task')
+    
+    def __init__(self, path: str, uid: str, system: 'ActorSystem', future: Future,
+                 on_complete: Optional[Callable[['PromiseActorRef'], None]] = None):
+        self._path = path
+        self._uid = uid
+        self._system_ref = weakref.ref(system)
+        self._mailbox_ref = _no_mailbox
+        self._future = future
+        self._on_complete = on_complete
+        self.timeout_task = None
+    
+    @property
+    def future(self) -> Future:
+        """The Future completed by the reply."""
+        return self._future
+    
+    def tell(self, message: Any, sender: Optional['ActorRef'] = None) -> None:
+        """Complete the Future with the reply (or fail it on AskTimeout)."""
+        if isinstance(message, AskTimeout):
+            completed = self._complete(exception=TimeoutError(
+                f"Ask timed out after {message.timeout}s"))
+        else:
+            completed = self._complete(result=message)
+        
+        if not completed and not isinstance(message, AskTimeout):
+            system = self._system_ref()
+            if system:
+                system._publish_dead_letter(DeadLetter(message, sender, self))
+    
+    def fail(self, exception: BaseException) -> bool:
+        """Fail the Future unless it is already complete."""
+        return self._complete(exception=exception)
+    
+    def _complete(self, result: Any = None, exception: BaseException = None) -> bool:
+        try:
+            if exception is not None:
+                self._future.set_exception(exception)
+            else:
+                self._future.set_result(result)
+        except Exception:
+            return False  # Already completed (InvalidStateError)
+        
+        if self._on_complete is not None:
+            self._on_complete(self)
+        return True
+
+
 # ============================================
 # ACTOR CONTEXT
 # ============================================
@@ -9,7 +9,7 @@ Dispatcher Types:
 - DefaultDispatcher: Shared thread pool for most actors
 - PinnedDispatcher: Dedicated thread per actor
 - CallingThreadDispatcher: Runs in calling thread (testing)
-- ForkJoinDispatcher: Work-stealing for CPU-bound tasks
+- ForkJoinDispatcher: Work-stealing with parked idle workers, for CPU-bound tasks
 
 Acknowledgement:
 This implementation is inspired by Apache Pekko (incubating).
@@ -23,15 +23,26 @@ Version: 1.3.0
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Set
 from dataclasses import dataclass, field
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, Future
+import itertools
 import threading
 import queue
-import time
+import random
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from abhikarta.monitoring import ACTOR_DISPATCHER_STEALS, ACTOR_DISPATCHER_PARKS
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+# Messages per actor dispatch when a dispatcher does not configure it
+DEFAULT_THROUGHPUT = 5
+
 
 class Dispatcher(ABC):
     """
@@ -68,6 +79,24 @@ class Dispatcher(ABC):
     def is_shutdown(self) -> bool:
         """Check if dispatcher is shutdown."""
         pass
+    
+    @property
+    def throughput(self) -> int:
+        """Max messages an actor processes per dispatch before yielding its thread."""
+        return getattr(self, '_throughput', DEFAULT_THROUGHPUT)
+    
+    @property
+    def throughput_deadline(self) -> float:
+        """Max seconds per dispatch (0 = unlimited)."""
+        return getattr(self, '_throughput_deadline', 0.0)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Dispatcher statistics for monitoring."""
+        return {
+            'type': type(self).__name__,
+            'throughput': self.throughput,
+            'shutdown': self.is_shutdown
+        }
 
 
 @dataclass
@@ -75,7 +104,7 @@ class DispatcherConfig:
     """Configuration for dispatcher creation."""
     dispatcher_type: str = "default"
     thread_pool_size: int = field(default_factory=lambda: os.cpu_count() or 4)
-    throughput: int = 5  # Messages per actor dispatch
+    throughput: int = DEFAULT_THROUGHPUT  # Messages per actor dispatch
     throughput_deadline: float = 0.0  # Max time per dispatch (0 = unlimited)
 
 
@@ -91,9 +120,11 @@ class DefaultDispatcher(Dispatcher):
         throughput: Max messages processed per dispatch
     """
     
-    def __init__(self, pool_size: Optional[int] = None, throughput: int = 5):
+    def __init__(self, pool_size: Optional[int] = None, throughput: int = DEFAULT_THROUGHPUT,
+                 throughput_deadline: float = 0.0):
         self._pool_size = pool_size or (os.cpu_count() or 4) * 2
-        self._throughput = throughput
+        self._throughput = max(1, throughput)
+        self._throughput_deadline = throughput_deadline
         self._executor = ThreadPoolExecutor(
             max_workers=self._pool_size,
             thread_name_prefix="actor-dispatcher"
@@ -280,26 +311,45 @@ class ForkJoinDispatcher(Dispatcher):
     """
     Work-stealing dispatcher for CPU-bound workloads.
     
-    Each thread has its own work queue. When idle, threads
-    steal work from other threads' queues. This provides
-    better cache locality and load balancing for compute-heavy
-    actors.
+    Each worker owns a deque. Tasks submitted from a worker thread go on
+    its own deque and are popped LIFO, which keeps an actor's follow-up
+    batches on the thread whose cache is warm. Idle workers steal FIFO
+    (oldest first) from a randomly chosen victim. Workers with nothing to
+    run or steal park on their own event; ``execute`` unparks the deque's
+    owner if it is parked, otherwise any one parked worker, so idle
+    workers use no CPU and wake without polling delay.
     """
     
-    def __init__(self, parallelism: Optional[int] = None):
+    # Parked workers also re-check for work this often, as a safety net
+    PARK_TIMEOUT = 1.0
+    
+    def __init__(self, parallelism: Optional[int] = None, throughput: int = DEFAULT_THROUGHPUT,
+                 throughput_deadline: float = 0.0, name: str = "fork-join"):
         self._parallelism = parallelism or os.cpu_count() or 4
-        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(self._parallelism)]
+        self._throughput = max(1, throughput)
+        self._throughput_deadline = throughput_deadline
+        self._name = name
+        self._deques: List[deque] = [deque() for _ in range(self._parallelism)]
+        self._wakeups: List[threading.Event] = [threading.Event() for _ in range(self._parallelism)]
+        self._parked: List[int] = []  # Parked worker IDs, most recent last
+        self._park_lock = threading.Lock()
+        self._local = threading.local()
+        self._next_queue = itertools.count()
         self._threads: List[threading.Thread] = []
         self._shutdown = False
-        self._lock = threading.Lock()
-        self._next_queue = 0
+        
+        # Per-worker counters; each slot is written only by its worker
+        self._executed = [0] * self._parallelism
+        self._steals = [0] * self._parallelism
+        self._parks = [0] * self._parallelism
+        self._wakeups_sent = 0
         
         # Start worker threads
         for i in range(self._parallelism):
             thread = threading.Thread(
                 target=self._worker,
                 args=(i,),
-                name=f"fork-join-{i}",
+                name=f"{name}-{i}",
                 daemon=True
             )
             thread.start()
@@ -308,56 +358,99 @@ class ForkJoinDispatcher(Dispatcher):
         logger.info(f"ForkJoinDispatcher initialized with {self._parallelism} threads")
     
     def _worker(self, worker_id: int) -> None:
-        """Worker thread that processes and steals tasks."""
-        my_queue = self._queues[worker_id]
+        """Worker thread: run local tasks, steal when empty, park when idle."""
+        self._local.worker_id = worker_id
+        own = self._deques[worker_id]
+        victims = random.Random(worker_id)
         
         while not self._shutdown:
-            # Try own queue first
             try:
-                task = my_queue.get(timeout=0.001)
-                if task is not None:
-                    try:
-                        task()
-                    except Exception as e:
-                        logger.error(f"Error in fork-join worker {worker_id}: {e}")
-                continue
-            except queue.Empty:
-                pass
-            
-            # Try stealing from other queues
-            stolen = False
-            for i in range(self._parallelism):
-                if i != worker_id:
-                    try:
-                        task = self._queues[i].get_nowait()
-                        if task is not None:
-                            try:
-                                task()
-                            except Exception as e:
-                                logger.error(f"Error in fork-join worker {worker_id}: {e}")
-                            stolen = True
-                            break
-                    except queue.Empty:
-                        pass
+                task = own.pop()
+            except IndexError:
+                task = self._steal(worker_id, victims)
+                if task is None:
+                    self._park(worker_id)
+                    continue
             
-            if not stolen:
-                time.sleep(0.001)  # Brief sleep if no work
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"Error in fork-join worker {worker_id}: {e}")
+            self._executed[worker_id] += 1
+    
+    def _steal(self, worker_id: int, victims: random.Random) -> Optional[Callable[[], None]]:
+        """Take the oldest task from another worker, starting at a random victim."""
+        count = self._parallelism
+        if count == 1:
+            return None
+        start = victims.randrange(count)
+        for offset in range(count):
+            victim = (start + offset) % count
+            if victim == worker_id:
+                continue
+            try:
+                task = self._deques[victim].popleft()
+            except IndexError:
+                continue
+            self._steals[worker_id] += 1
+            if _metrics_available:
+                ACTOR_DISPATCHER_STEALS.labels(dispatcher=self._name).inc()
+            return task
+        return None
+    
+    def _has_work(self) -> bool:
+        return any(self._deques)
+    
+    def _park(self, worker_id: int) -> None:
+        """Sleep until ``execute`` unparks this worker."""
+        wakeup = self._wakeups[worker_id]
+        with self._park_lock:
+            wakeup.clear()
+            self._parked.append(worker_id)
+        
+        # Re-check after registering: a task pushed before registration is
+        # visible here, and one pushed after will find this worker parked
+        if not self._has_work() and not self._shutdown:
+            self._parks[worker_id] += 1
+            if _metrics_available:
+                ACTOR_DISPATCHER_PARKS.labels(dispatcher=self._name).inc()
+            wakeup.wait(self.PARK_TIMEOUT)
+        
+        with self._park_lock:
+            if worker_id in self._parked:
+                self._parked.remove(worker_id)
+    
+    def _unpark(self, preferred: int) -> None:
+        """Wake the preferred worker if parked, otherwise the most recently parked one."""
+        with self._park_lock:
+            if not self._parked:
+                return
+            if preferred in self._parked:
+                self._parked.remove(preferred)
+                worker_id = preferred
+            else:
+                worker_id = self._parked.pop()
+            self._wakeups_sent += 1
+        self._wakeups[worker_id].set()
     
     def execute(self, task: Callable[[], None]) -> None:
-        """Submit task to least-loaded queue."""
+        """Push to the calling worker's deque, or round-robin from other threads."""
         if self._shutdown:
             return
         
-        # Round-robin distribution
-        with self._lock:
-            queue_idx = self._next_queue
-            self._next_queue = (self._next_queue + 1) % self._parallelism
+        worker_id = getattr(self._local, 'worker_id', None)
+        if worker_id is None:
+            worker_id = next(self._next_queue) % self._parallelism
+        self._deques[worker_id].append(task)
         
-        self._queues[queue_idx].put(task)
+        if self._parked:
+            self._unpark(worker_id)
     
     def shutdown(self, wait: bool = True) -> None:
         """Shutdown all workers."""
         self._shutdown = True
+        for wakeup in self._wakeups:
+            wakeup.set()
         
         if wait:
             for thread in self._threads:
@@ -369,6 +462,23 @@ class ForkJoinDispatcher(Dispatcher):
     def is_shutdown(self) -> bool:
         """Check shutdown state."""
         return self._shutdown
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Work-stealing counters, summed over workers."""
+        stats = super().get_stats()
+        with self._park_lock:
+            parked = len(self._parked)
+            wakeups = self._wakeups_sent
+        stats.update({
+            'parallelism': self._parallelism,
+            'queued': sum(len(d) for d in self._deques),
+            'executed': sum(self._executed),
+            'steals': sum(self._steals),
+            'parks': sum(self._parks),
+            'wakeups': wakeups,
+            'parked_workers': parked
+        })
+        return stats
 
 
 class BalancingDispatcher(Dispatcher):
@@ -450,9 +560,12 @@ class DispatcherFactory:
         
         if config.dispatcher_type == "default":
             return dispatcher_class(pool_size=config.thread_pool_size,
-                                   throughput=config.throughput)
+                                   throughput=config.throughput,
+                                   throughput_deadline=config.throughput_deadline)
         elif config.dispatcher_type == "fork-join":
-            return dispatcher_class(parallelism=config.thread_pool_size)
+            return dispatcher_class(parallelism=config.thread_pool_size,
+                                   throughput=config.throughput,
+                                   throughput_deadline=config.throughput_deadline)
         else:
             return dispatcher_class()
     
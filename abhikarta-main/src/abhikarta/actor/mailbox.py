@@ -17,7 +17,7 @@ Version: 1.3.0
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional, List
+from typing import Any, Callable, Optional, List
 from dataclasses import dataclass
 import threading
 import queue
@@ -37,8 +37,28 @@ class Mailbox(ABC):
     A mailbox is a message queue that holds messages until the actor
     processes them. Different implementations provide different
     ordering and capacity guarantees.
+    
+    The owning ActorCell registers an enqueue hook; ``ActorRef.tell``
+    calls :meth:`notify_enqueued` after a successful enqueue so an idle
+    actor is scheduled immediately.
     """
     
+    _enqueue_hook: Optional[Callable[[], None]] = None
+    
+    def set_enqueue_hook(self, hook: Optional[Callable[[], None]]) -> None:
+        """Register the callback run after each successful enqueue."""
+        self._enqueue_hook = hook
+    
+    def notify_enqueued(self) -> None:
+        """Run the enqueue hook, if any."""
+        hook = self._enqueue_hook
+        if hook is not None:
+            hook()
+    
+    def try_dequeue(self) -> Optional[Envelope]:
+        """Remove and return the next message without waiting (None if empty)."""
+        return self.dequeue(timeout=0)
+    
     @abstractmethod
     def enqueue(self, envelope: Envelope) -> bool:
         """
@@ -122,6 +142,16 @@ class UnboundedMailbox(Mailbox):
         except queue.Empty:
             return None
     
+    def try_dequeue(self) -> Optional[Envelope]:
+        """Get next message without waiting."""
+        try:
+            envelope = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        with self._lock:
+            self._size -= 1
+        return envelope
+    
     def is_empty(self) -> bool:
         """Check if empty."""
         return self._queue.empty()
@@ -186,6 +216,13 @@ class BoundedMailbox(Mailbox):
         except queue.Empty:
             return None
     
+    def try_dequeue(self) -> Optional[Envelope]:
+        """Get next message without waiting."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+    
     def is_empty(self) -> bool:
         """Check if empty."""
         return self._queue.empty()
@@ -259,6 +296,13 @@ class PriorityMailbox(Mailbox):
                 return envelope
             return None
     
+    def try_dequeue(self) -> Optional[Envelope]:
+        """Get highest priority message without waiting."""
+        with self._lock:
+            if self._heap:
+                return heapq.heappop(self._heap)[2]
+            return None
+    
     def is_empty(self) -> bool:
         """Check if empty."""
         with self._lock:
@@ -323,6 +367,13 @@ class ControlAwareMailbox(Mailbox):
         # Fall back to regular messages
         return self._message_queue.dequeue(timeout)
     
+    def try_dequeue(self) -> Optional[Envelope]:
+        """Get a control message, else a regular one, without waiting."""
+        try:
+            return self._control_queue.get_nowait()
+        except queue.Empty:
+            return self._message_queue.try_dequeue()
+    
     def is_empty(self) -> bool:
         """Check if both queues are empty."""
         return self._control_queue.empty() and self._message_queue.is_empty()
@@ -19,7 +19,7 @@ Version: 1.3.0
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Callable, Set, Type
+from typing import Any, Dict, List, Optional, Callable, Set, Tuple, Type
 from enum import Enum, auto
 import threading
 import random
@@ -28,6 +28,7 @@ import logging
 
 from .actor import Actor, ActorRef, TypedActor, ReceiveTimeout
 from .props import Props
+from .router import ConsistentHashRing, least_loaded_of_two, smallest_mailbox
 
 logger = logging.getLogger(__name__)
 
@@ -101,56 +102,36 @@ class SmallestMailboxLogic(RoutingLogic):
     def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
         if not routees:
             return []
-        # In a full implementation, would check mailbox sizes
-        return [random.choice(routees)]
+        return [smallest_mailbox(routees)]
+
+
+class PowerOfTwoChoicesLogic(RoutingLogic):
+    """Route to the less loaded of two random routees (O(1) per message)."""
+    
+    def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
+        if not routees:
+            return []
+        return [least_loaded_of_two(routees)]
 
 
 class ConsistentHashingLogic(RoutingLogic):
     """
     Consistent hashing - messages with same key go to same routee.
     
-    Message must have a 'hash_key' attribute or be hashable.
+    The key is the message's 'hash_key' attribute, or the message itself.
     """
     
     def __init__(self, virtual_nodes: int = 100):
         self._virtual_nodes = virtual_nodes
-        self._ring: Dict[int, int] = {}
-        self._sorted_keys: List[int] = []
-        self._lock = threading.Lock()
-    
-    def _build_ring(self, routees: List[ActorRef]) -> None:
-        """Build consistent hash ring."""
-        self._ring = {}
-        for i, routee in enumerate(routees):
-            for j in range(self._virtual_nodes):
-                key = hash(f"{routee.path}:{j}")
-                self._ring[key] = i
-        self._sorted_keys = sorted(self._ring.keys())
+        self._ring = ConsistentHashRing(virtual_nodes)
     
     def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
         if not routees:
             return []
         
-        with self._lock:
-            if len(self._ring) != len(routees) * self._virtual_nodes:
-                self._build_ring(routees)
-            
-            # Get hash key from message
-            if hasattr(message, 'hash_key'):
-                hash_key = hash(message.hash_key)
-            else:
-                hash_key = hash(message)
-            
-            # Find closest node in ring
-            for key in self._sorted_keys:
-                if hash_key <= key:
-                    return [routees[self._ring[key]]]
-            
-            # Wrap around
-            if self._sorted_keys:
-                return [routees[self._ring[self._sorted_keys[0]]]]
-        
-        return [routees[0]]
+        self._ring.update(routees)
+        key = message.hash_key if hasattr(message, 'hash_key') else message
+        return [self._ring.lookup(key) or routees[0]]
 
 
 class RouterActor(Actor):
@@ -178,13 +159,14 @@ class RouterActor(Actor):
         self._routee_props = routee_props
         self._num_routees = num_routees
         self._routing_logic = routing_logic or RoundRobinLogic()
-        self._routees: List[ActorRef] = []
+        # Replaced on change, never mutated, so logics can cache per snapshot
+        self._routees: Tuple[ActorRef, ...] = ()
     
     def pre_start(self) -> None:
         """Create routee pool."""
         for i in range(self._num_routees):
             routee = self.context.actor_of(self._routee_props, f"routee-{i}")
-            self._routees.append(routee)
+            self._routees += (routee,)
             self.context.watch(routee)
         logger.info(f"Router {self.self.path} started with {self._num_routees} routees")
     
@@ -208,13 +190,13 @@ class RouterActor(Actor):
         if name is None:
             name = f"routee-{len(self._routees)}"
         routee = self.context.actor_of(props, name)
-        self._routees.append(routee)
+        self._routees += (routee,)
         self.context.watch(routee)
     
     def _remove_routee(self, ref: ActorRef) -> None:
         """Remove a routee."""
         if ref in self._routees:
-            self._routees.remove(ref)
+            self._routees = tuple(r for r in self._routees if r is not ref)
             self.context.stop(ref)
 
 
@@ -11,11 +11,13 @@ Version: 1.3.0
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional, List, Dict, Type, Callable
+from typing import Any, Optional, List, Dict, Sequence, Tuple, Type, Callable
 from dataclasses import dataclass, field
+import bisect
 import threading
 import random
-import hashlib
+import sys
+import zlib
 import logging
 
 from .actor import Actor, ActorRef, Envelope, MessagePriority
@@ -55,6 +57,110 @@ class RemoveRoutee:
     routee: ActorRef
 
 
+def hash_key(key: Any) -> int:
+    """
+    Fast, process-stable 32-bit hash for ring placement.
+    
+    CRC32 runs in C; the murmur3 finalizer spreads its output so keys that
+    differ only in a suffix (``path-0``, ``path-1``) land far apart.
+    """
+    if isinstance(key, str):
+        data = key.encode()
+    elif isinstance(key, (bytes, bytearray)):
+        data = key
+    else:
+        data = str(key).encode()
+    h = zlib.crc32(data)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    h ^= h >> 16
+    return h
+
+
+def mailbox_size(routee: ActorRef) -> int:
+    """Pending messages for a local routee; 0 if unknown, maxsize if stopped."""
+    try:
+        mailbox = routee._mailbox_ref()
+    except AttributeError:
+        return 0
+    if mailbox is None:
+        return sys.maxsize
+    return mailbox.size()
+
+
+def least_loaded_of_two(routees: Sequence[ActorRef]) -> ActorRef:
+    """Power of two choices: the less loaded of two random routees."""
+    count = len(routees)
+    if count == 1:
+        return routees[0]
+    i = random.randrange(count)
+    j = random.randrange(count - 1)
+    first, second = routees[i], routees[j + 1 if j >= i else j]
+    return second if mailbox_size(second) < mailbox_size(first) else first
+
+
+def smallest_mailbox(routees: Sequence[ActorRef]) -> ActorRef:
+    """Single pass for the routee with the fewest pending messages."""
+    best, best_size = routees[0], mailbox_size(routees[0])
+    for routee in routees:
+        if best_size == 0:
+            break
+        size = mailbox_size(routee)
+        if size < best_size:
+            best, best_size = routee, size
+    return best
+
+
+class ConsistentHashRing:
+    """
+    Sorted ring of virtual nodes with binary-search lookup.
+    
+    Lookup is O(log n) via ``bisect``. The ring is rebuilt only when the
+    routee set changes, compared by identity; passing the same tuple again
+    skips even that comparison. Virtual nodes are placed by routee path, so
+    keys owned by unchanged routees keep their routee across rebuilds.
+    """
+    
+    def __init__(self, virtual_nodes: int = 100):
+        self._virtual_nodes = max(1, virtual_nodes)
+        self._hashes: List[int] = []
+        self._owners: List[ActorRef] = []
+        self._members: Tuple[ActorRef, ...] = ()
+        self._source: Optional[Sequence[ActorRef]] = None
+        self._lock = threading.Lock()
+    
+    def _build(self, members: Tuple[ActorRef, ...]) -> None:
+        points = sorted(
+            (hash_key(f"{routee.path}-{i}"), index)
+            for index, routee in enumerate(members)
+            for i in range(self._virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [members[index] for _, index in points]
+        self._members = members
+    
+    def update(self, routees: Sequence[ActorRef]) -> None:
+        """Rebuild the ring if the routee set differs from the last one."""
+        if routees is self._source and isinstance(routees, tuple):
+            return
+        with self._lock:
+            members = tuple(routees)
+            if len(members) != len(self._members) or any(
+                    a is not b for a, b in zip(members, self._members)):
+                self._build(members)
+            self._source = routees
+    
+    def lookup(self, key: Any) -> Optional[ActorRef]:
+        """Routee owning a key, or None for an empty ring."""
+        hashes, owners = self._hashes, self._owners
+        if not hashes:
+            return None
+        index = bisect.bisect_left(hashes, hash_key(key))
+        return owners[index if index < len(hashes) else 0]
+
+
 class RoutingLogic(ABC):
     """
     Abstract base for routing logic.
@@ -146,22 +252,22 @@ class SmallestMailboxLogic(RoutingLogic):
     def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
         if not routees:
             return []
-        
-        # Get mailbox sizes (if available)
-        sizes = []
-        for routee in routees:
-            try:
-                cell = routee._cell
-                if cell:
-                    sizes.append((cell.mailbox.size(), routee))
-                else:
-                    sizes.append((0, routee))
-            except:
-                sizes.append((0, routee))
-        
-        # Sort by size and return smallest
-        sizes.sort(key=lambda x: x[0])
-        return [sizes[0][1]]
+        return [smallest_mailbox(routees)]
+
+
+class PowerOfTwoChoicesLogic(RoutingLogic):
+    """
+    Power-of-two-choices routing logic.
+    
+    Samples two routees at random and routes to the one with the smaller
+    mailbox. Constant time per message, and the maximum load stays close
+    to SmallestMailboxLogic's without scanning every routee.
+    """
+    
+    def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
+        if not routees:
+            return []
+        return [least_loaded_of_two(routees)]
 
 
 class ConsistentHashingLogic(RoutingLogic):
@@ -183,8 +289,7 @@ class ConsistentHashingLogic(RoutingLogic):
     ):
         self._virtual_nodes = virtual_nodes
         self._hash_mapping = hash_mapping or self._default_hash_mapping
-        self._ring: List[tuple] = []
-        self._lock = threading.Lock()
+        self._ring = ConsistentHashRing(virtual_nodes)
     
     def _default_hash_mapping(self, message: Any) -> Any:
         """Extract hash key from message."""
@@ -192,45 +297,12 @@ class ConsistentHashingLogic(RoutingLogic):
             return message[0]  # Use first element as key
         return message
     
-    def _hash(self, key: Any) -> int:
-        """Compute hash for a key."""
-        key_str = str(key)
-        return int(hashlib.md5(key_str.encode()).hexdigest(), 16)
-    
-    def _build_ring(self, routees: List[ActorRef]) -> None:
-        """Build the consistent hash ring."""
-        ring = []
-        for routee in routees:
-            for i in range(self._virtual_nodes):
-                vnode_key = f"{routee.path}-{i}"
-                hash_val = self._hash(vnode_key)
-                ring.append((hash_val, routee))
-        ring.sort(key=lambda x: x[0])
-        self._ring = ring
-    
     def select(self, message: Any, routees: List[ActorRef]) -> List[ActorRef]:
         if not routees:
             return []
         
-        with self._lock:
-            # Rebuild ring if routees changed
-            if len(self._ring) != len(routees) * self._virtual_nodes:
-                self._build_ring(routees)
-            
-            if not self._ring:
-                return [routees[0]]
-            
-            # Find routee for message
-            key = self._hash_mapping(message)
-            hash_val = self._hash(key)
-            
-            # Binary search for nearest node
-            for ring_hash, routee in self._ring:
-                if ring_hash >= hash_val:
-                    return [routee]
-            
-            # Wrap around
-            return [self._ring[0][1]]
+        self._ring.update(routees)
+        return [self._ring.lookup(self._hash_mapping(message)) or routees[0]]
 
 
 class TailChoppingLogic(RoutingLogic):
@@ -264,7 +336,9 @@ class RouterActor(Actor):
     ):
         super().__init__()
         self._routing_logic = routing_logic
-        self._routees: List[ActorRef] = list(routees) if routees else []
+        # Replaced, never mutated, so routing reads it without copying and
+        # logics can cache per snapshot
+        self._routees: Tuple[ActorRef, ...] = tuple(routees) if routees else ()
         self._lock = threading.Lock()
     
     def receive(self, message: Any) -> None:
@@ -283,8 +357,7 @@ class RouterActor(Actor):
     
     def _route(self, message: Any) -> None:
         """Route message to selected routees."""
-        with self._lock:
-            routees = list(self._routees)
+        routees = self._routees
         
         if not routees:
             logger.warning(f"No routees available for routing: {message}")
@@ -300,24 +373,21 @@ class RouterActor(Actor):
     
     def _broadcast(self, message: Any) -> None:
         """Broadcast message to all routees."""
-        with self._lock:
-            routees = list(self._routees)
-        
-        for routee in routees:
+        for routee in self._routees:
             routee.tell(message, sender=self.sender)
     
     def _add_routee(self, routee: ActorRef) -> None:
         """Add a routee."""
         with self._lock:
             if routee not in self._routees:
-                self._routees.append(routee)
+                self._routees = self._routees + (routee,)
                 self.context.watch(routee)
     
     def _remove_routee(self, routee: ActorRef) -> None:
         """Remove a routee."""
         with self._lock:
             if routee in self._routees:
-                self._routees.remove(routee)
+                self._routees = tuple(r for r in self._routees if r is not routee)
                 self.context.unwatch(routee)
     
     def pre_start(self) -> None:
@@ -346,12 +416,11 @@ class PoolRouter(RouterActor):
     def pre_start(self) -> None:
         """Create routee pool."""
         for i in range(self._pool_size):
-            routee = self.context.spawn(
+            routee = self.context.actor_of(
                 self._routee_props,
                 name=f"routee-{i}"
             )
-            self._routees.append(routee)
-            self.context.watch(routee)
+            self._add_routee(routee)
 
 
 class GroupRouter(RouterActor):
@@ -374,8 +443,7 @@ class GroupRouter(RouterActor):
         for path in self._routee_paths:
             ref = self.context.system.actor_selection(path)
             if ref:
-                self._routees.append(ref)
-                self.context.watch(ref)
+                self._add_routee(ref)
 
 
 # Convenience router props
@@ -424,6 +492,14 @@ def smallest_mailbox_pool(props: Props, size: int = 5) -> Props:
     )
 
 
+def power_of_two_choices_pool(props: Props, size: int = 5) -> Props:
+    """Create power-of-two-choices pool router props."""
+    return Props(
+        PoolRouter,
+        args=(PowerOfTwoChoicesLogic(), props, size)
+    )
+
+
 def round_robin_group(paths: List[str]) -> Props:
     """Create round-robin group router props."""
     return Props(
@@ -6,6 +6,12 @@ This module provides scheduling capabilities for actors:
 - Periodic/recurring messages
 - Cancellable scheduled tasks
 
+Two implementations, selected with ``ActorSystemConfig.scheduler_type``:
+- ``heap``: a binary heap; precise, O(log n) schedule and expiry
+- ``timing-wheel``: a hierarchical hashed timing wheel; O(1) schedule and
+  cancel, and expiry in batches per tick. Suits many short-lived timers
+  such as ask and receive timeouts.
+
 Acknowledgement:
 This implementation is inspired by Apache Pekko (incubating).
 
@@ -16,8 +22,8 @@ Version: 1.3.0
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import threading
 import time
 import heapq
@@ -60,6 +66,25 @@ class ScheduledTask:
     sender: Optional[ActorRef]
     interval: Optional[float]  # For recurring tasks
     cancelled: bool = False
+    fixed_rate: bool = True  # Recurring: next run from the schedule, not from the send
+    # Timing wheel bookkeeping
+    deadline_tick: int = field(default=0, repr=False, compare=False)
+    bucket: Optional[Dict[str, 'ScheduledTask']] = field(default=None, repr=False, compare=False)
+    
+    def next_execution(self, now: float) -> float:
+        """
+        Next run time of a recurring task that just ran.
+        
+        Fixed-rate tasks stay on their original grid (no drift); runs more
+        than a full interval late are skipped rather than burst.
+        """
+        if not self.fixed_rate:
+            return now + self.interval
+        next_at = self.execute_at + self.interval
+        if next_at <= now - self.interval:
+            missed = int((now - next_at) // self.interval) + 1
+            next_at += missed * self.interval
+        return next_at
     
     def __lt__(self, other):
         """For heap ordering by execution time."""
@@ -78,6 +103,7 @@ class CancellableTask(Cancellable):
         if self._task.cancelled:
             return False
         self._task.cancelled = True
+        self._scheduler._on_cancel(self._task)
         return True
     
     def is_cancelled(self) -> bool:
@@ -100,14 +126,17 @@ class Scheduler:
     - High-precision timing
     """
     
-    def __init__(self, tick_duration: float = 0.01):
+    def __init__(self, tick_duration: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic):
         """
         Initialize the scheduler.
         
         Args:
             tick_duration: Time resolution in seconds (default 10ms)
+            clock: Monotonic time source for deadlines (injectable for tests)
         """
         self._tick_duration = tick_duration
+        self._clock = clock
         self._tasks: list = []  # Heap of ScheduledTask
         self._lock = threading.Lock()
         self._shutdown = threading.Event()
@@ -145,30 +174,29 @@ class Scheduler:
         """Background thread that dispatches scheduled tasks."""
         while not self._shutdown.is_set():
             next_wake: Optional[float] = None
+            due: List[ScheduledTask] = []
             
             with self._lock:
-                current_time = time.time()
+                current_time = self._clock()
                 
-                # Process all tasks that are ready
+                # Collect all tasks that are ready
                 while self._tasks and self._tasks[0].execute_at <= current_time:
                     task = heapq.heappop(self._tasks)
                     
                     if not task.cancelled:
-                        # Execute the task
-                        try:
-                            task.receiver.tell(task.message, task.sender)
-                        except Exception as e:
-                            logger.error(f"Error delivering scheduled message: {e}")
+                        due.append(task)
                         
                         # Re-schedule if recurring
-                        if task.interval is not None and not task.cancelled:
-                            task.execute_at = current_time + task.interval
+                        if task.interval is not None:
+                            task.execute_at = task.next_execution(current_time)
                             heapq.heappush(self._tasks, task)
                 
                 # Calculate next wake time
                 if self._tasks:
                     next_wake = self._tasks[0].execute_at - current_time
             
+            self._deliver(due)
+            
             # Wait for next task or new task
             if next_wake is not None:
                 self._new_task.wait(timeout=max(0.001, next_wake))
@@ -177,6 +205,28 @@ class Scheduler:
             
             self._new_task.clear()
     
+    @staticmethod
+    def _deliver(tasks: List[ScheduledTask]) -> None:
+        """Send due messages (outside the scheduler lock)."""
+        for task in tasks:
+            if task.cancelled:
+                continue
+            try:
+                task.receiver.tell(task.message, task.sender)
+            except Exception as e:
+                logger.error(f"Error delivering scheduled message: {e}")
+    
+    def _add(self, task: ScheduledTask) -> None:
+        """Insert a task and wake the scheduler thread."""
+        with self._lock:
+            heapq.heappush(self._tasks, task)
+        
+        self._new_task.set()  # Wake up scheduler thread
+    
+    def _on_cancel(self, task: ScheduledTask) -> None:
+        """Hook for cancellation; the heap drops cancelled tasks lazily."""
+        pass
+    
     def schedule_once(self, delay: float, receiver: ActorRef, message: Any,
                      sender: Optional[ActorRef] = None) -> Cancellable:
         """
@@ -193,26 +243,27 @@ class Scheduler:
         """
         task = ScheduledTask(
             task_id=str(uuid.uuid4()),
-            execute_at=time.time() + delay,
+            execute_at=self._clock() + delay,
             receiver=receiver,
             message=message,
             sender=sender,
             interval=None
         )
         
-        with self._lock:
-            heapq.heappush(self._tasks, task)
-        
-        self._new_task.set()  # Wake up scheduler thread
+        self._add(task)
         
         return CancellableTask(task, self)
     
     def schedule_repeatedly(self, initial_delay: float, interval: float,
                            receiver: ActorRef, message: Any,
-                           sender: Optional[ActorRef] = None) -> Cancellable:
+                           sender: Optional[ActorRef] = None,
+                           fixed_rate: bool = True) -> Cancellable:
         """
         Schedule a message to be sent repeatedly.
         
+        Fixed-rate schedules run at ``initial_delay + n * interval`` without
+        accumulating drift.
+        
         Args:
             initial_delay: Initial delay before first message
             interval: Interval between subsequent messages
@@ -225,17 +276,15 @@ class Scheduler:
         """
         task = ScheduledTask(
             task_id=str(uuid.uuid4()),
-            execute_at=time.time() + initial_delay,
+            execute_at=self._clock() + initial_delay,
             receiver=receiver,
             message=message,
             sender=sender,
-            interval=interval
+            interval=interval,
+            fixed_rate=fixed_rate
         )
         
-        with self._lock:
-            heapq.heappush(self._tasks, task)
-        
-        self._new_task.set()
+        self._add(task)
         
         return CancellableTask(task, self)
     
@@ -262,8 +311,8 @@ class Scheduler:
         """
         Schedule with fixed delay between message completion and next send.
         
-        Similar to schedule_repeatedly but measures delay from when
-        the previous message was sent, not from a fixed schedule.
+        Like schedule_repeatedly, but each delay is measured from when the
+        previous message was sent rather than from a fixed schedule.
         
         Args:
             initial_delay: Initial delay
@@ -275,8 +324,8 @@ class Scheduler:
         Returns:
             Cancellable handle
         """
-        # In this simplified implementation, same as schedule_repeatedly
-        return self.schedule_repeatedly(initial_delay, delay, receiver, message, sender)
+        return self.schedule_repeatedly(initial_delay, delay, receiver, message, sender,
+                                        fixed_rate=False)
     
     @property
     def pending_count(self) -> int:
@@ -300,6 +349,217 @@ class Scheduler:
         return count
 
 
+class TimingWheelScheduler(Scheduler):
+    """
+    Scheduler backed by a hierarchical hashed timing wheel.
+    
+    Level 0 has ``wheel_size`` buckets of one tick each. Each higher level's
+    buckets span a full rotation of the level below; when a lower level
+    wraps, the next bucket of the level above is re-distributed downward.
+    Schedule and cancel are O(1) dict operations. Each tick expires one
+    level-0 bucket as a batch and delivers it outside the lock. Timers fire
+    on the first tick at or after their deadline, so resolution is
+    ``tick_duration``. Deadlines and ticks share one monotonic clock, so
+    wall-clock adjustments do not move timers.
+    """
+    
+    def __init__(self, tick_duration: float = 0.01, wheel_size: int = 512, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the timing wheel.
+        
+        Args:
+            tick_duration: Time per level-0 bucket in seconds
+            wheel_size: Buckets per level
+            levels: Number of wheel levels (range is tick * wheel_size ** levels)
+            clock: Monotonic time source for deadlines and ticks
+        """
+        super().__init__(tick_duration, clock)
+        self._wheel_size = max(2, wheel_size)
+        self._levels = max(1, levels)
+        self._units = [self._wheel_size ** level for level in range(self._levels)]
+        self._wheels: List[List[Dict[str, ScheduledTask]]] = [
+            [{} for _ in range(self._wheel_size)] for _ in range(self._levels)
+        ]
+        self._overflow: Dict[str, ScheduledTask] = {}
+        self._origin = self._clock()
+        self._current_tick = 0  # Last processed tick
+        self._count = 0
+    
+    def _tick_for(self, execute_at: float) -> int:
+        """Deadline tick of a clock time (rounded up)."""
+        elapsed = execute_at - self._origin
+        tick = int(elapsed / self._tick_duration)
+        return tick if tick * self._tick_duration >= elapsed else tick + 1
+    
+    def _place(self, task: ScheduledTask, now_tick: int) -> None:
+        """Put a task in the lowest level whose window covers its deadline (lock held)."""
+        deadline = max(task.deadline_tick, now_tick)
+        for level, unit in enumerate(self._units):
+            if deadline // unit - now_tick // unit < self._wheel_size:
+                bucket = self._wheels[level][(deadline // unit) % self._wheel_size]
+                break
+        else:
+            bucket = self._overflow
+        bucket[task.task_id] = task
+        task.bucket = bucket
+    
+    def _add(self, task: ScheduledTask) -> None:
+        task.deadline_tick = self._tick_for(task.execute_at)
+        with self._lock:
+            self._place(task, self._current_tick + 1)
+            self._count += 1
+            idle = self._count == 1
+        if idle:
+            self._new_task.set()  # Wake the thread from its idle wait
+    
+    def _on_cancel(self, task: ScheduledTask) -> None:
+        with self._lock:
+            bucket = task.bucket
+            if bucket is not None and bucket.pop(task.task_id, None) is not None:
+                task.bucket = None
+                self._count -= 1
+    
+    def _advance(self, target_tick: int) -> List[ScheduledTask]:
+        """Process ticks up to ``target_tick`` and return due tasks (lock held)."""
+        due: List[ScheduledTask] = []
+        if self._count == 0:
+            self._current_tick = max(self._current_tick, target_tick)
+            return due
+        
+        while self._current_tick < target_tick and self._count:
+            tick = self._current_tick + 1
+            self._current_tick = tick
+            
+            # Cascade higher levels whose bucket boundary is this tick
+            for level in range(self._levels - 1, 0, -1):
+                unit = self._units[level]
+                if tick % unit:
+                    continue
+                if level == self._levels - 1 and self._overflow:
+                    pending, self._overflow = self._overflow, {}
+                    for task in pending.values():
+                        self._place(task, tick)
+                bucket_index = (tick // unit) % self._wheel_size
+                pending = self._wheels[level][bucket_index]
+                if pending:
+                    self._wheels[level][bucket_index] = {}
+                    for task in pending.values():
+                        self._place(task, tick)
+            
+            bucket_index = tick % self._wheel_size
+            expired = self._wheels[0][bucket_index]
+            if expired:
+                self._wheels[0][bucket_index] = {}
+                self._count -= len(expired)
+                for task in expired.values():
+                    task.bucket = None
+                    due.append(task)
+        
+        self._current_tick = max(self._current_tick, target_tick)
+        
+        now = self._clock()
+        for task in due:
+            if task.interval is not None and not task.cancelled:
+                task.execute_at = task.next_execution(now)
+                task.deadline_tick = max(self._tick_for(task.execute_at), self._current_tick + 1)
+                self._place(task, self._current_tick + 1)
+                self._count += 1
+        return due
+    
+    def _expire_due(self) -> Tuple[int, bool]:
+        """
+        Advance to the clock's current tick and deliver what expired.
+        
+        Returns:
+            (tick reached, whether the wheel is now empty)
+        """
+        target_tick = int((self._clock() - self._origin) / self._tick_duration)
+        with self._lock:
+            due = self._advance(target_tick)
+            idle = self._count == 0
+        self._deliver(due)
+        return target_tick, idle
+    
+    def _run(self) -> None:
+        """Background thread that advances the wheel one tick at a time."""
+        while not self._shutdown.is_set():
+            target_tick, idle = self._expire_due()
+            
+            if idle:
+                self._new_task.wait(timeout=1.0)
+            else:
+                next_tick_at = self._origin + (target_tick + 1) * self._tick_duration
+                self._new_task.wait(timeout=max(0.0005, next_tick_at - self._clock()))
+            self._new_task.clear()
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of pending scheduled tasks."""
+        with self._lock:
+            return self._count
+    
+    def cancel_all(self) -> int:
+        """
+        Cancel all pending tasks.
+        
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._lock:
+            count = 0
+            for buckets in self._wheels:
+                for bucket in buckets:
+                    for task in bucket.values():
+                        task.cancelled = True
+                        task.bucket = None
+                    count += len(bucket)
+                    bucket.clear()
+            for task in self._overflow.values():
+                task.cancelled = True
+                task.bucket = None
+            count += len(self._overflow)
+            self._overflow.clear()
+            self._count = 0
+            return count
+
+
+class SchedulerFactory:
+    """Factory for creating schedulers based on configuration."""
+    
+    _scheduler_types = {
+        "heap": Scheduler,
+        "timing-wheel": TimingWheelScheduler,
+    }
+    
+    @classmethod
+    def create(cls, scheduler_type: str = "heap", tick_duration: float = 0.01,
+               wheel_size: int = 512) -> Scheduler:
+        """
+        Create a scheduler.
+        
+        Args:
+            scheduler_type: "heap" or "timing-wheel"
+            tick_duration: Time resolution in seconds
+            wheel_size: Buckets per wheel level (timing wheel only)
+            
+        Returns:
+            New scheduler instance (not started)
+        """
+        scheduler_class = cls._scheduler_types.get(scheduler_type)
+        if scheduler_class is None:
+            raise ValueError(f"Unknown scheduler type: {scheduler_type}")
+        
+        if issubclass(scheduler_class, TimingWheelScheduler):
+            return scheduler_class(tick_duration=tick_duration, wheel_size=wheel_size)
+        return scheduler_class(tick_duration=tick_duration)
+    
+    @classmethod
+    def register(cls, name: str, scheduler_class: type) -> None:
+        """Register a custom scheduler type."""
+        cls._scheduler_types[name] = scheduler_class
+
+
 class TimerScheduler:
     """
     Actor-specific timer interface.
@@ -23,6 +23,7 @@ Version: 1.3.0
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Callable, Set
 from concurrent.futures import Future, ThreadPoolExecutor
+import itertools
 import threading
 import time
 import uuid
@@ -33,13 +34,13 @@ import weakref
 from .actor import (
     Actor, ActorRef, ActorContext, ActorLifecycle,
     Envelope, PoisonPill, Kill, Terminated, DeadLetter,
-    Identify, ActorIdentity, ReceiveTimeout
+    Identify, ActorIdentity, ReceiveTimeout, PromiseActorRef, AskTimeout
 )
 from .mailbox import Mailbox, MailboxFactory, MailboxConfig, DeadLetterMailbox
-from .dispatcher import Dispatcher, DispatcherFactory, DispatcherConfig
+from .dispatcher import Dispatcher, DispatcherFactory, DispatcherConfig, PinnedDispatcher
 from .supervision import SupervisorStrategy, OneForOneStrategy, Directive, ChildFailure
 from .props import Props
-from .scheduler import Scheduler
+from .scheduler import Scheduler, SchedulerFactory
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,9 @@ class ActorSystemConfig:
     shutdown_timeout: float = 30.0
     log_dead_letters: bool = True
     log_dead_letters_during_shutdown: bool = False
+    scheduler_type: str = "heap"  # "heap" or "timing-wheel"
+    scheduler_tick: float = 0.01
+    scheduler_wheel_size: int = 512
 
 
 class ActorCell:
@@ -63,6 +67,13 @@ class ActorCell:
     
     ActorCell manages the actor's mailbox processing, supervision,
     and lifecycle events.
+    
+    Scheduling: every successful ``tell`` runs the mailbox's enqueue hook,
+    which claims the cell's ``scheduled`` flag and submits one processing
+    batch to the dispatcher. The flag is a non-blocking lock acquire, an
+    atomic test-and-set, so exactly one batch runs at a time. A batch
+    drains up to the dispatcher's ``throughput`` messages without waiting,
+    releases the flag, then re-claims it if messages arrived meanwhile.
     """
     
     def __init__(self, 
@@ -81,10 +92,22 @@ class ActorCell:
         self.dispatcher = dispatcher
         self.system = system
         self.lifecycle = ActorLifecycle.CREATED
-        self.processing = threading.Event()
+        self._scheduled = threading.Lock()
         self._lock = threading.Lock()
         self._current_message: Optional[Any] = None
         self._watchers: Set[ActorRef] = set()
+        
+        # Pinned dispatchers run each actor on its own thread
+        self._pinned_thread: Optional[int] = None
+        if isinstance(dispatcher, PinnedDispatcher):
+            self._pinned_thread = dispatcher.get_thread_id()
+        
+        mailbox.set_enqueue_hook(self._schedule_mailbox_processing)
+    
+    @property
+    def is_scheduled(self) -> bool:
+        """Whether a processing batch is queued or running."""
+        return self._scheduled.locked()
     
     def start(self) -> None:
         """Start the actor."""
@@ -132,6 +155,10 @@ class ActorCell:
             watcher.tell(Terminated(self.ref))
         
         self.mailbox.close()
+        self.mailbox.set_enqueue_hook(None)
+        if self._pinned_thread is not None:
+            self.dispatcher.release_thread(self._pinned_thread)
+            self._pinned_thread = None
         logger.debug(f"Actor stopped: {self.ref.path}")
     
     def restart(self, reason: Exception) -> None:
@@ -165,30 +192,38 @@ class ActorCell:
         logger.debug(f"Actor restarted: {self.ref.path}")
     
     def _schedule_mailbox_processing(self) -> None:
-        """Schedule mailbox processing on dispatcher."""
-        if self.lifecycle not in (ActorLifecycle.RUNNING, ActorLifecycle.STARTING):
+        """Claim the scheduled flag and submit a processing batch (enqueue hook)."""
+        if self.lifecycle != ActorLifecycle.RUNNING:
             return
         
-        if self.mailbox.is_empty():
+        if self.mailbox.is_empty() or self.dispatcher.is_shutdown:
             return
         
-        if self.processing.is_set():
-            return
+        if not self._scheduled.acquire(blocking=False):
+            return  # Already scheduled or running; the batch will see the message
         
-        self.processing.set()
-        self.dispatcher.execute(self._process_mailbox)
+        try:
+            if self._pinned_thread is not None:
+                self.dispatcher.execute(self._process_mailbox, thread_id=self._pinned_thread)
+            else:
+                self.dispatcher.execute(self._process_mailbox)
+        except Exception:
+            self._scheduled.release()
+            raise
     
     def _process_mailbox(self) -> None:
-        """Process messages from mailbox."""
+        """Process up to ``throughput`` messages from the mailbox."""
+        throughput = self.dispatcher.throughput
+        deadline = self.dispatcher.throughput_deadline
+        started = time.monotonic() if deadline > 0 else 0.0
         try:
             messages_processed = 0
-            max_messages = 5  # Throughput limit per dispatch
             
-            while messages_processed < max_messages:
+            while messages_processed < throughput:
                 if self.lifecycle != ActorLifecycle.RUNNING:
                     break
                 
-                envelope = self.mailbox.dequeue(timeout=0.001)
+                envelope = self.mailbox.try_dequeue()
                 if envelope is None:
                     break
                 
@@ -218,11 +253,14 @@ class ActorCell:
                     self._current_message = None
                 
                 messages_processed += 1
+                if deadline > 0 and time.monotonic() - started >= deadline:
+                    break
         
         finally:
-            self.processing.clear()
+            self._scheduled.release()
             
-            # Reschedule if more messages
+            # Messages enqueued after the last dequeue found the flag held;
+            # re-claim so they are not stranded
             if not self.mailbox.is_empty() and self.lifecycle == ActorLifecycle.RUNNING:
                 self._schedule_mailbox_processing()
     
@@ -324,13 +362,17 @@ class ActorSystem:
         self._dead_letter_listeners: List[Callable[[DeadLetter], None]] = []
         
         # Scheduler
-        self._scheduler = Scheduler()
+        self._scheduler = SchedulerFactory.create(
+            self._config.scheduler_type,
+            tick_duration=self._config.scheduler_tick,
+            wheel_size=self._config.scheduler_wheel_size
+        )
         self._scheduler.start()
         
-        # Ask pattern support
-        self._ask_counter = 0
+        # Ask pattern support: reply refs correlated by ask ID
+        self._ask_ids = itertools.count(1)
         self._ask_lock = threading.Lock()
-        self._pending_asks: Dict[str, Future] = {}
+        self._pending_asks: Dict[str, PromiseActorRef] = {}
         
         # Register shutdown hook
         atexit.register(self._shutdown_hook)
@@ -409,9 +451,15 @@ class ActorSystem:
         if config is None:
             return self._default_dispatcher
         
-        # For simplicity, create new dispatcher
-        # In production, would cache based on config
-        return DispatcherFactory.create(config)
+        # Actors with the same dispatcher config share one pool
+        key = (f"{config.dispatcher_type}:{config.thread_pool_size}:"
+               f"{config.throughput}:{config.throughput_deadline}")
+        with self._actors_lock:
+            dispatcher = self._dispatchers.get(key)
+            if dispatcher is None:
+                dispatcher = DispatcherFactory.create(config)
+                self._dispatchers[key] = dispatcher
+            return dispatcher
     
     def _stop_actor(self, ref: ActorRef) -> None:
         """Internal: Stop an actor."""
@@ -460,48 +508,42 @@ class ActorSystem:
         self._dead_letter_listeners.append(listener)
     
     def _ask(self, target: ActorRef, message: Any, timeout: float) -> Future:
-        """Internal: Implement ask pattern."""
+        """
+        Internal: Implement ask pattern.
+        
+        The message is sent with a PromiseActorRef as sender. The reply
+        completes the Future from ``tell``. A scheduled AskTimeout fails it
+        instead. An ask costs a map insert and a timer, not an actor.
+        """
         future: Future = Future()
+        ask_id = f"ask-{next(self._ask_ids)}"
+        promise = PromiseActorRef(f"/{self._name}/temp/{ask_id}", ask_id, self,
+                                  future, self._complete_ask)
         
         with self._ask_lock:
-            self._ask_counter += 1
-            ask_id = f"ask-{self._ask_counter}"
-            self._pending_asks[ask_id] = future
-        
-        # Create temporary actor for response
-        class AskActor(Actor):
-            def __init__(self, ask_id: str, future: Future, system: ActorSystem):
-                super().__init__()
-                self._ask_id = ask_id
-                self._future = future
-                self._system = system
-            
-            def receive(self, message):
-                if not self._future.done():
-                    self._future.set_result(message)
-                self.context.stop(self.self)
-                with self._system._ask_lock:
-                    self._system._pending_asks.pop(self._ask_id, None)
-        
-        ask_actor_ref = self.actor_of(
-            Props(AskActor, args=(ask_id, future, self)),
-            f"ask-{ask_id}"
-        )
+            self._pending_asks[ask_id] = promise
         
-        # Send message with ask actor as sender
-        target.tell(message, ask_actor_ref)
+        promise.timeout_task = self._scheduler.schedule_once(
+            timeout, promise, AskTimeout(timeout))
         
-        # Schedule timeout
-        def timeout_handler():
-            if not future.done():
-                future.set_exception(TimeoutError(f"Ask timed out after {timeout}s"))
-                with self._ask_lock:
-                    self._pending_asks.pop(ask_id, None)
-        
-        self._scheduler.schedule_once(timeout, ask_actor_ref, PoisonPill())
+        target.tell(message, promise)
         
         return future
     
+    def _complete_ask(self, promise: PromiseActorRef) -> None:
+        """Forget a completed ask and cancel its timeout."""
+        with self._ask_lock:
+            self._pending_asks.pop(promise.uid, None)
+        timeout_task = promise.timeout_task
+        if timeout_task is not None:
+            timeout_task.cancel()
+    
+    @property
+    def pending_ask_count(self) -> int:
+        """Number of asks awaiting a reply."""
+        with self._ask_lock:
+            return len(self._pending_asks)
+    
     def actor_selection(self, path: str) -> Optional[ActorRef]:
         """
         Look up an actor by path.
@@ -537,6 +579,12 @@ class ActorSystem:
                     logger.error(f"Error stopping actor: {e}")
             self._actors.clear()
         
+        # Fail outstanding asks
+        with self._ask_lock:
+            pending = list(self._pending_asks.values())
+        for promise in pending:
+            promise.fail(RuntimeError("Actor system is terminated"))
+        
         # Stop scheduler
         self._scheduler.stop()
         
@@ -566,6 +614,21 @@ class ActorSystem:
         """Get number of dead letters."""
         return self._dead_letters.size()
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get actor system statistics, including per-dispatcher counters."""
+        with self._actors_lock:
+            actor_count = len(self._actors)
+            dispatchers = dict(self._dispatchers)
+        return {
+            'name': self._name,
+            'actors': actor_count,
+            'dead_letters': self._dead_letters.size(),
+            'pending_asks': self.pending_ask_count,
+            'scheduled_timers': self._scheduler.pending_count,
+            'dispatchers': {name: dispatcher.get_stats()
+                            for name, dispatcher in dispatchers.items()}
+        }
+    
     @classmethod
     def get(cls, name: str) -> Optional['ActorSystem']:
         """Get an existing ActorSystem by name."""
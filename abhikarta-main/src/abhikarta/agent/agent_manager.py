@@ -244,6 +244,7 @@ class AgentManager:
         # Persist changes
         if self.db_facade:
             self._save_to_db(agent)
+        self._invalidate_built_agent(agent_id)
         
         logger.info(f"Updated agent: {agent_id}")
         return agent
@@ -273,6 +274,7 @@ class AgentManager:
         """
         if agent_id in self._agents:
             del self._agents[agent_id]
+        self._invalidate_built_agent(agent_id)
         
         if self.db_facade:
             try:
@@ -446,6 +448,14 @@ class AgentManager:
             'draft': status_counts.get('draft', 0)
         }
     
+    def _invalidate_built_agent(self, agent_id: str):
+        """Drop the cached LangChain runnable of an edited or deleted agent."""
+        try:
+            from abhikarta.langchain.agents import invalidate_agent_executor
+            invalidate_agent_executor(agent_id)
+        except ImportError:
+            pass
+    
     def _save_to_db(self, agent: Agent):
         """Save agent to database."""
         if not self.db_facade:
@@ -10,8 +10,10 @@ Copyright © 2025-2030, All Rights Reserved
 
 import logging
 import json
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 
 from .models import (
     AIOrg, AINode, AITask, AIResponse, AIHITLAction,
@@ -32,6 +34,13 @@ def _timestamp_now() -> str:
     return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
 
 
+def _chunks(ids: Iterable[str], size: int = 500) -> Iterable[List[str]]:
+    """Split IDs into batches small enough for an ``IN (...)`` clause."""
+    ids = list(dict.fromkeys(i for i in ids if i))
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
 class AIORGDBOps:
     """
     Database operations for AI Org module.
@@ -42,16 +51,27 @@ class AIORGDBOps:
     Transaction handling:
     - SQLite: Auto-commits per execute(), explicit commit/rollback available
     - PostgreSQL: Requires explicit commit/rollback for transaction control
+    
+    Tree reads are batched: task subtrees load with one recursive query,
+    responses and nodes load per batch of IDs, and org node maps are cached
+    for ``node_map_ttl`` seconds (invalidated by node writes).
     """
     
-    def __init__(self, db_facade):
+    # Bound on delegation depth when walking task trees (guards against cycles)
+    MAX_TREE_DEPTH = 64
+    
+    def __init__(self, db_facade, node_map_ttl: float = 5.0):
         """
         Initialize with database facade.
         
         Args:
             db_facade: Database facade instance (SQLite or Postgres)
+            node_map_ttl: Seconds an org's node map is served from cache
         """
         self.db = db_facade
+        self.node_map_ttl = node_map_ttl
+        self._node_maps: Dict[str, Tuple[float, Dict[str, AINode]]] = {}
+        self._node_maps_lock = threading.Lock()
         self._ensure_tables()
     
     def _ensure_tables(self):
@@ -258,6 +278,40 @@ class AIORGDBOps:
                 self.db.rollback()
             raise
     
+    # =========================================================================
+    # ROW CONVERSION
+    # =========================================================================
+    
+    @staticmethod
+    def _node_from_row(row) -> AINode:
+        data = dict(row)
+        data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
+        data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
+        data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
+        return AINode.from_dict(data)
+    
+    @staticmethod
+    def _task_from_row(row) -> AITask:
+        data = dict(row)
+        data['input_data'] = json.loads(data['input_data']) if data['input_data'] else {}
+        data['output_data'] = json.loads(data['output_data']) if data['output_data'] else None
+        data['context'] = json.loads(data['context']) if data['context'] else {}
+        data['attachments'] = json.loads(data['attachments']) if data['attachments'] else []
+        return AITask.from_dict(data)
+    
+    @staticmethod
+    def _response_from_row(row) -> AIResponse:
+        data = dict(row)
+        data['content'] = json.loads(data['content']) if data['content'] else {}
+        data['original_ai_content'] = json.loads(data['original_ai_content']) if data['original_ai_content'] else None
+        return AIResponse.from_dict(data)
+    
+    @staticmethod
+    def _org_from_row(row) -> AIOrg:
+        data = row if isinstance(row, dict) else dict(row)
+        data['config'] = json.loads(data['config']) if data.get('config') else {}
+        return AIOrg.from_dict(data)
+    
     # =========================================================================
     # AI ORG OPERATIONS
     # =========================================================================
@@ -383,6 +437,24 @@ class AIORGDBOps:
             logger.error(f"Error listing orgs: {e}")
             return []
     
+    def get_orgs(self, org_ids: List[str]) -> Dict[str, AIOrg]:
+        """Get several organizations keyed by org_id."""
+        orgs: Dict[str, AIOrg] = {}
+        try:
+            for batch in _chunks(org_ids):
+                results = self.db.fetch_all(
+                    f"SELECT * FROM ai_orgs WHERE org_id IN ({', '.join('?' for _ in batch)})",
+                    tuple(batch)
+                )
+                for row in results or []:
+                    org = self._org_from_row(row)
+                    orgs[org.org_id] = org
+            
+            return orgs
+        except Exception as e:
+            logger.error(f"Error getting orgs: {e}")
+            return orgs
+    
     def delete_org(self, org_id: str) -> bool:
         """
         Delete an AI Organization and all related data.
@@ -401,6 +473,7 @@ class AIORGDBOps:
             self.db.execute("DELETE FROM ai_nodes WHERE org_id = ?", (org_id,))
             self.db.execute("DELETE FROM ai_event_logs WHERE org_id = ?", (org_id,))
             self.db.execute("DELETE FROM ai_orgs WHERE org_id = ?", (org_id,))
+            self.invalidate_node_map(org_id)
             
             return True
         except Exception as e:
@@ -475,6 +548,7 @@ class AIORGDBOps:
                     data['created_at'], data['updated_at']
                 ))
             
+            self.invalidate_node_map(node.org_id)
             return True
         except Exception as e:
             logger.error(f"Error saving node {node.node_id}: {e}")
@@ -489,11 +563,7 @@ class AIORGDBOps:
             )
             
             if result:
-                data = dict(result)
-                data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
-                data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
-                data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
-                return AINode.from_dict(data)
+                return self._node_from_row(result)
             return None
         except Exception as e:
             logger.error(f"Error getting node {node_id}: {e}")
@@ -507,15 +577,7 @@ class AIORGDBOps:
                 (org_id,)
             )
             
-            nodes = []
-            for row in results:
-                data = dict(row)
-                data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
-                data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
-                data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
-                nodes.append(AINode.from_dict(data))
-            
-            return nodes
+            return [self._node_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting nodes for org {org_id}: {e}")
             return []
@@ -528,15 +590,7 @@ class AIORGDBOps:
                 (parent_node_id,)
             )
             
-            nodes = []
-            for row in results:
-                data = dict(row)
-                data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
-                data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
-                data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
-                nodes.append(AINode.from_dict(data))
-            
-            return nodes
+            return [self._node_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting children of {parent_node_id}: {e}")
             return []
@@ -550,11 +604,7 @@ class AIORGDBOps:
             )
             
             if result:
-                data = dict(result)
-                data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
-                data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
-                data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
-                return AINode.from_dict(data)
+                return self._node_from_row(result)
             return None
         except Exception as e:
             logger.error(f"Error getting root node for org {org_id}: {e}")
@@ -564,6 +614,7 @@ class AIORGDBOps:
         """Delete an AI Node."""
         try:
             self.db.execute("DELETE FROM ai_nodes WHERE node_id = ?", (node_id,))
+            self.invalidate_node_map()
             return True
         except Exception as e:
             logger.error(f"Error deleting node {node_id}: {e}")
@@ -577,19 +628,37 @@ class AIORGDBOps:
                 (email,)
             )
             
-            nodes = []
-            for row in results:
-                data = dict(row)
-                data['agent_config'] = json.loads(data['agent_config']) if data['agent_config'] else {}
-                data['notification_channels'] = json.loads(data['notification_channels']) if data['notification_channels'] else []
-                data['notification_triggers'] = json.loads(data['notification_triggers']) if data['notification_triggers'] else []
-                nodes.append(AINode.from_dict(data))
-            
-            return nodes
+            return [self._node_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting nodes for email {email}: {e}")
             return []
     
+    def get_org_node_map(self, org_id: str) -> Dict[str, AINode]:
+        """
+        Get an organization's nodes keyed by node_id.
+        
+        Served from a short-lived cache; the returned dict is a copy but the
+        nodes are shared, so treat them as read-only.
+        """
+        now = time.monotonic()
+        with self._node_maps_lock:
+            cached = self._node_maps.get(org_id)
+            if cached and now - cached[0] < self.node_map_ttl:
+                return dict(cached[1])
+        
+        node_map = {node.node_id: node for node in self.get_org_nodes(org_id)}
+        with self._node_maps_lock:
+            self._node_maps[org_id] = (now, node_map)
+        return dict(node_map)
+    
+    def invalidate_node_map(self, org_id: str = None):
+        """Drop cached node maps for one organization, or all of them."""
+        with self._node_maps_lock:
+            if org_id is None:
+                self._node_maps.clear()
+            else:
+                self._node_maps.pop(org_id, None)
+    
     # =========================================================================
     # AI TASK OPERATIONS
     # =========================================================================
@@ -653,12 +722,7 @@ class AIORGDBOps:
             )
             
             if result:
-                data = dict(result)
-                data['input_data'] = json.loads(data['input_data']) if data['input_data'] else {}
-                data['output_data'] = json.loads(data['output_data']) if data['output_data'] else None
-                data['context'] = json.loads(data['context']) if data['context'] else {}
-                data['attachments'] = json.loads(data['attachments']) if data['attachments'] else []
-                return AITask.from_dict(data)
+                return self._task_from_row(result)
             return None
         except Exception as e:
             logger.error(f"Error getting task {task_id}: {e}")
@@ -684,16 +748,7 @@ class AIORGDBOps:
             
             results = self.db.fetch_all(query, tuple(params))
             
-            tasks = []
-            for row in results:
-                data = dict(row)
-                data['input_data'] = json.loads(data['input_data']) if data['input_data'] else {}
-                data['output_data'] = json.loads(data['output_data']) if data['output_data'] else None
-                data['context'] = json.loads(data['context']) if data['context'] else {}
-                data['attachments'] = json.loads(data['attachments']) if data['attachments'] else []
-                tasks.append(AITask.from_dict(data))
-            
-            return tasks
+            return [self._task_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting tasks for org {org_id}: {e}")
             return []
@@ -706,16 +761,7 @@ class AIORGDBOps:
                 (parent_task_id,)
             )
             
-            tasks = []
-            for row in results:
-                data = dict(row)
-                data['input_data'] = json.loads(data['input_data']) if data['input_data'] else {}
-                data['output_data'] = json.loads(data['output_data']) if data['output_data'] else None
-                data['context'] = json.loads(data['context']) if data['context'] else {}
-                data['attachments'] = json.loads(data['attachments']) if data['attachments'] else []
-                tasks.append(AITask.from_dict(data))
-            
-            return tasks
+            return [self._task_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting subtasks of {parent_task_id}: {e}")
             return []
@@ -734,20 +780,96 @@ class AIORGDBOps:
             
             results = self.db.fetch_all(query, tuple(params))
             
+            return [self._task_from_row(row) for row in results]
+        except Exception as e:
+            logger.error(f"Error getting tasks for node {node_id}: {e}")
+            return []
+    
+    def get_task_subtree(self, root_task_id: str) -> List[AITask]:
+        """
+        Get a task and all of its delegated descendants in one query.
+        
+        Returns:
+            Tasks ordered by depth, then creation time (the root first)
+        """
+        try:
+            results = self.db.fetch_all("""
+                WITH RECURSIVE subtree(task_id, depth) AS (
+                    SELECT task_id, 0 FROM ai_tasks WHERE task_id = ?
+                    UNION ALL
+                    SELECT t.task_id, s.depth + 1
+                    FROM ai_tasks t JOIN subtree s ON t.parent_task_id = s.task_id
+                    WHERE s.depth < ?
+                )
+                SELECT t.* FROM ai_tasks t JOIN subtree s ON t.task_id = s.task_id
+                ORDER BY s.depth, t.created_at
+            """, (root_task_id, self.MAX_TREE_DEPTH))
+            
+            return [self._task_from_row(row) for row in results or []]
+        except Exception as e:
+            logger.error(f"Error getting task subtree of {root_task_id}: {e}")
+            return []
+    
+    def get_org_tasks_by_status(
+        self,
+        org_id: str,
+        statuses: List[TaskStatus],
+        limit_per_status: int = 100
+    ) -> List[AITask]:
+        """Get the newest tasks of an organization in each of the given statuses."""
+        if not statuses:
+            return []
+        try:
+            placeholders = ', '.join('?' for _ in statuses)
+            results = self.db.fetch_all(
+                f"""SELECT * FROM (
+                        SELECT t.*, ROW_NUMBER() OVER (
+                            PARTITION BY status ORDER BY created_at DESC) AS row_rank
+                        FROM ai_tasks t
+                        WHERE org_id = ? AND status IN ({placeholders})
+                    ) ranked
+                    WHERE row_rank <= ?
+                    ORDER BY created_at DESC""",
+                (org_id, *[status.value for status in statuses], limit_per_status)
+            )
+            
             tasks = []
-            for row in results:
+            for row in results or []:
                 data = dict(row)
-                data['input_data'] = json.loads(data['input_data']) if data['input_data'] else {}
-                data['output_data'] = json.loads(data['output_data']) if data['output_data'] else None
-                data['context'] = json.loads(data['context']) if data['context'] else {}
-                data['attachments'] = json.loads(data['attachments']) if data['attachments'] else []
-                tasks.append(AITask.from_dict(data))
-            
+                data.pop('row_rank', None)
+                tasks.append(self._task_from_row(data))
             return tasks
         except Exception as e:
-            logger.error(f"Error getting tasks for node {node_id}: {e}")
+            logger.error(f"Error getting tasks for org {org_id}: {e}")
             return []
     
+    def get_tasks_for_nodes(
+        self,
+        node_ids: List[str],
+        statuses: Optional[List[TaskStatus]] = None
+    ) -> Dict[str, List[AITask]]:
+        """Get tasks assigned to several nodes, grouped by node_id (newest first)."""
+        tasks: Dict[str, List[AITask]] = {}
+        try:
+            status_values = [status.value for status in statuses or []]
+            for batch in _chunks(node_ids):
+                query = (f"SELECT * FROM ai_tasks WHERE assigned_node_id IN "
+                         f"({', '.join('?' for _ in batch)})")
+                params = list(batch)
+                if status_values:
+                    query += f" AND status IN ({', '.join('?' for _ in status_values)})"
+                    params.extend(status_values)
+                query += " ORDER BY created_at DESC"
+                
+                for row in self.db.fetch_all(query, tuple(params)) or []:
+                    task = self._task_from_row(row)
+                    tasks.setdefault(task.assigned_node_id, []).append(task)
+            
+            return tasks
+        except Exception as e:
+            logger.error(f"Error getting tasks for nodes: {e}")
+            return tasks
+    
     # =========================================================================
     # AI RESPONSE OPERATIONS
     # =========================================================================
@@ -789,10 +911,7 @@ class AIORGDBOps:
             )
             
             if result:
-                data = dict(result)
-                data['content'] = json.loads(data['content']) if data['content'] else {}
-                data['original_ai_content'] = json.loads(data['original_ai_content']) if data['original_ai_content'] else None
-                return AIResponse.from_dict(data)
+                return self._response_from_row(result)
             return None
         except Exception as e:
             logger.error(f"Error getting response {response_id}: {e}")
@@ -806,18 +925,31 @@ class AIORGDBOps:
                 (task_id,)
             )
             
-            responses = []
-            for row in results:
-                data = dict(row)
-                data['content'] = json.loads(data['content']) if data['content'] else {}
-                data['original_ai_content'] = json.loads(data['original_ai_content']) if data['original_ai_content'] else None
-                responses.append(AIResponse.from_dict(data))
-            
-            return responses
+            return [self._response_from_row(row) for row in results]
         except Exception as e:
             logger.error(f"Error getting responses for task {task_id}: {e}")
             return []
     
+    def get_responses_for_tasks(self, task_ids: List[str]) -> Dict[str, List[AIResponse]]:
+        """Get responses for several tasks, grouped by task_id in creation order."""
+        responses: Dict[str, List[AIResponse]] = {}
+        try:
+            for batch in _chunks(task_ids):
+                results = self.db.fetch_all(
+                    f"""SELECT * FROM ai_responses
+                        WHERE task_id IN ({', '.join('?' for _ in batch)})
+                        ORDER BY created_at""",
+                    tuple(batch)
+                )
+                for row in results or []:
+                    response = self._response_from_row(row)
+                    responses.setdefault(response.task_id, []).append(response)
+            
+            return responses
+        except Exception as e:
+            logger.error(f"Error getting responses for tasks: {e}")
+            return responses
+    
     # =========================================================================
     # HITL OPERATIONS
     # =========================================================================
@@ -889,6 +1021,39 @@ class AIORGDBOps:
             logger.error(f"Error getting HITL actions: {e}")
             return []
     
+    def get_hitl_actions_for_nodes(
+        self,
+        node_ids: List[str],
+        limit_per_node: int = 10
+    ) -> Dict[str, List[AIHITLAction]]:
+        """Get the most recent HITL actions of several nodes, grouped by node_id."""
+        actions: Dict[str, List[AIHITLAction]] = {}
+        try:
+            for batch in _chunks(node_ids):
+                results = self.db.fetch_all(
+                    f"""SELECT * FROM (
+                            SELECT a.*, ROW_NUMBER() OVER (
+                                PARTITION BY node_id ORDER BY created_at DESC) AS row_rank
+                            FROM ai_hitl_actions a
+                            WHERE node_id IN ({', '.join('?' for _ in batch)})
+                        ) ranked
+                        WHERE row_rank <= ?
+                        ORDER BY created_at DESC""",
+                    (*batch, limit_per_node)
+                )
+                for row in results or []:
+                    data = dict(row)
+                    data.pop('row_rank', None)
+                    data['original_content'] = json.loads(data['original_content']) if data['original_content'] else None
+                    data['modified_content'] = json.loads(data['modified_content']) if data['modified_content'] else None
+                    action = AIHITLAction.from_dict(data)
+                    actions.setdefault(action.node_id, []).append(action)
+            
+            return actions
+        except Exception as e:
+            logger.error(f"Error getting HITL actions for nodes: {e}")
+            return actions
+    
     # =========================================================================
     # EVENT LOG OPERATIONS
     # =========================================================================
@@ -456,10 +456,11 @@ class TaskEngine:
         """
         # Get all subtasks and their responses
         subtasks = self.db.get_subtasks(task.task_id)
+        responses_by_task = self.db.get_responses_for_tasks([st.task_id for st in subtasks])
         all_responses = []
         
         for subtask in subtasks:
-            responses = self.db.get_task_responses(subtask.task_id)
+            responses = responses_by_task.get(subtask.task_id, [])
             # Get the final response for each subtask
             if responses:
                 final_response = responses[-1]  # Most recent
@@ -683,16 +684,31 @@ This is an automated notification from Abhikarta AI Org.
         """
         Get complete task tree with subtasks and responses.
         
-        Returns hierarchical structure showing task delegation.
+        Returns hierarchical structure showing task delegation. The whole
+        tree loads with one subtree query and one batched responses query;
+        nodes come from the org's cached node map.
         """
-        task = self.db.get_task(task_id)
-        if not task:
+        tasks = self.db.get_task_subtree(task_id)
+        if not tasks:
             return {}
+        task = tasks[0]
+        
+        responses_by_task = self.db.get_responses_for_tasks([t.task_id for t in tasks])
+        node_map = self.db.get_org_node_map(task.org_id)
+        subtasks_by_parent: Dict[str, List[AITask]] = {}
+        for t in tasks[1:]:
+            subtasks_by_parent.setdefault(t.parent_task_id, []).append(t)
+        
+        def get_node(node_id: Optional[str]) -> Optional[AINode]:
+            if node_id and node_id not in node_map:
+                # Assigned after the cached map was built
+                node_map[node_id] = self.db.get_node(node_id)
+            return node_map.get(node_id)
         
         def build_tree(t: AITask) -> Dict[str, Any]:
-            responses = self.db.get_task_responses(t.task_id)
-            subtasks = self.db.get_subtasks(t.task_id)
-            node = self.db.get_node(t.assigned_node_id)
+            responses = responses_by_task.get(t.task_id, [])
+            subtasks = subtasks_by_parent.get(t.task_id, [])
+            node = get_node(t.assigned_node_id)
             
             return {
                 "task_id": t.task_id,
@@ -710,7 +726,5 @@ This is an automated notification from Abhikarta AI Org.
     
     def get_org_active_tasks(self, org_id: str) -> List[AITask]:
         """Get all active tasks for an organization."""
-        tasks = []
-        for status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.DELEGATED, TaskStatus.WAITING]:
-            tasks.extend(self.db.get_org_tasks(org_id, status))
-        return tasks
+        statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.DELEGATED, TaskStatus.WAITING]
+        return self.db.get_org_tasks_by_status(org_id, statuses, limit_per_status=100)
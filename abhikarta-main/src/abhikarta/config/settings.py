@@ -26,11 +26,23 @@ class DatabaseSettings:
     """Database configuration settings."""
     type: str = "sqlite"
     sqlite_path: str = "./data/abhikarta.db"
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 20000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_cached_statements: int = 256
     pg_host: str = "localhost"
     pg_port: int = 5432
     pg_database: str = "abhikarta"
     pg_user: str = "abhikarta_user"
     pg_password: str = ""
+    pg_pool_min_size: int = 1
+    pg_pool_max_size: int = 10
+    pg_pool_checkout_timeout: float = 30.0
+    pg_pool_max_lifetime_seconds: float = 1800.0
+    pg_pool_health_check_idle_seconds: float = 30.0
 
 
 @dataclass
@@ -157,11 +169,23 @@ class Settings:
         # Database settings
         settings.database.type = prop_conf.get('database.type', settings.database.type)
         settings.database.sqlite_path = prop_conf.get('database.sqlite.path', settings.database.sqlite_path)
+        settings.database.sqlite_journal_mode = prop_conf.get('database.sqlite.journal.mode', settings.database.sqlite_journal_mode)
+        settings.database.sqlite_synchronous = prop_conf.get('database.sqlite.synchronous', settings.database.sqlite_synchronous)
+        settings.database.sqlite_busy_timeout_ms = prop_conf.get_int('database.sqlite.busy.timeout.ms', settings.database.sqlite_busy_timeout_ms)
+        settings.database.sqlite_cache_size_kb = prop_conf.get_int('database.sqlite.cache.size.kb', settings.database.sqlite_cache_size_kb)
+        settings.database.sqlite_mmap_size_mb = prop_conf.get_int('database.sqlite.mmap.size.mb', settings.database.sqlite_mmap_size_mb)
+        settings.database.sqlite_temp_store = prop_conf.get('database.sqlite.temp.store', settings.database.sqlite_temp_store)
+        settings.database.sqlite_cached_statements = prop_conf.get_int('database.sqlite.cached.statements', settings.database.sqlite_cached_statements)
         settings.database.pg_host = prop_conf.get('database.postgresql.host', settings.database.pg_host)
         settings.database.pg_port = prop_conf.get_int('database.postgresql.port', settings.database.pg_port)
         settings.database.pg_database = prop_conf.get('database.postgresql.database', settings.database.pg_database)
         settings.database.pg_user = prop_conf.get('database.postgresql.user', settings.database.pg_user)
         settings.database.pg_password = prop_conf.get('database.postgresql.password', settings.database.pg_password)
+        settings.database.pg_pool_min_size = prop_conf.get_int('database.postgresql.pool.min.size', settings.database.pg_pool_min_size)
+        settings.database.pg_pool_max_size = prop_conf.get_int('database.postgresql.pool.max.size', settings.database.pg_pool_max_size)
+        settings.database.pg_pool_checkout_timeout = prop_conf.get_float('database.postgresql.pool.checkout.timeout.seconds', settings.database.pg_pool_checkout_timeout)
+        settings.database.pg_pool_max_lifetime_seconds = prop_conf.get_float('database.postgresql.pool.max.lifetime.seconds', settings.database.pg_pool_max_lifetime_seconds)
+        settings.database.pg_pool_health_check_idle_seconds = prop_conf.get_float('database.postgresql.pool.health.check.idle.seconds', settings.database.pg_pool_health_check_idle_seconds)
         
         # LLM settings
         settings.default_llm_provider = prop_conf.get('llm.default.provider', settings.default_llm_provider)
@@ -13,7 +13,8 @@ Version: 1.4.0
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,12 @@ class DatabaseHandler(ABC):
         """Execute a query and return last row ID."""
         pass
     
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """Execute a query for each parameter tuple in one transaction."""
+        for params in params_list:
+            self.execute(query, params)
+        return len(params_list)
+    
     @abstractmethod
     def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
         """Fetch single row as dictionary."""
@@ -61,6 +68,16 @@ class DatabaseHandler(ABC):
     def init_schema(self) -> None:
         """Initialize database schema."""
         pass
+    
+    @contextmanager
+    def transaction(self) -> Iterator['DatabaseHandler']:
+        """Group statements into one unit; commit on success, roll back on error."""
+        try:
+            yield self
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
 
 
 class DatabaseFacade:
@@ -99,7 +116,16 @@ class DatabaseFacade:
         
         if db_type == "sqlite":
             from .sqlite_handler import SQLiteHandler
-            self._handler = SQLiteHandler(self.settings.database.sqlite_path)
+            self._handler = SQLiteHandler(
+                self.settings.database.sqlite_path,
+                journal_mode=self.settings.database.sqlite_journal_mode,
+                synchronous=self.settings.database.sqlite_synchronous,
+                busy_timeout_ms=self.settings.database.sqlite_busy_timeout_ms,
+                cache_size_kb=self.settings.database.sqlite_cache_size_kb,
+                mmap_size_mb=self.settings.database.sqlite_mmap_size_mb,
+                temp_store=self.settings.database.sqlite_temp_store,
+                cached_statements=self.settings.database.sqlite_cached_statements
+            )
             logger.info(f"Initialized SQLite handler: {self.settings.database.sqlite_path}")
         
         elif db_type == "postgresql":
@@ -109,7 +135,12 @@ class DatabaseFacade:
                 port=self.settings.database.pg_port,
                 database=self.settings.database.pg_database,
                 user=self.settings.database.pg_user,
-                password=self.settings.database.pg_password
+                password=self.settings.database.pg_password,
+                pool_min_size=self.settings.database.pg_pool_min_size,
+                pool_max_size=self.settings.database.pg_pool_max_size,
+                pool_checkout_timeout=self.settings.database.pg_pool_checkout_timeout,
+                pool_max_lifetime_seconds=self.settings.database.pg_pool_max_lifetime_seconds,
+                pool_health_check_idle_seconds=self.settings.database.pg_pool_health_check_idle_seconds
             )
             logger.info(f"Initialized PostgreSQL handler: {self.settings.database.pg_host}")
         
@@ -218,6 +249,19 @@ class DatabaseFacade:
         """
         return self._handler.execute(query, params)
     
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """
+        Execute a query once per parameter tuple, committing once.
+        
+        Args:
+            query: SQL query string
+            params_list: List of parameter tuples
+            
+        Returns:
+            Number of parameter tuples executed
+        """
+        return self._handler.execute_many(query, params_list)
+    
     def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
         """
         Fetch single row.
@@ -267,13 +311,28 @@ class DatabaseFacade:
         """
         self._handler.rollback()
     
+    @contextmanager
+    def transaction(self) -> Iterator['DatabaseFacade']:
+        """
+        Run several statements as one transaction.
+        
+        Commits when the block exits normally and rolls back on an exception.
+        
+        Usage:
+            with db_facade.transaction():
+                db_facade.execute("INSERT ...", (...))
+                db_facade.execute("UPDATE ...", (...))
+        """
+        with self._handler.transaction():
+            yield self
+    
     @property
     def is_auto_commit(self) -> bool:
         """
         Check if database is in auto-commit mode.
         
-        SQLite handler uses auto-commit per execute().
-        PostgreSQL requires explicit commit/rollback.
+        Both handlers commit per execute() outside of transaction().
+        PostgreSQL callers may still use explicit commit/rollback.
         """
         return self.settings.database.type.lower() == "sqlite"
     
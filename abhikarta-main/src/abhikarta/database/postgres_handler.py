@@ -10,18 +10,244 @@ This software and associated documentation are proprietary and confidential.
 Unauthorized copying, distribution, modification, or use is strictly prohibited.
 """
 
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import logging
+import threading
+import time
 
 from .db_facade import DatabaseHandler
 
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# Prometheus Metrics
+# =============================================================================
+try:
+    from abhikarta.monitoring import (
+        DB_CONNECTIONS,
+        DB_POOL_SIZE,
+        DB_POOL_CHECKOUT_WAIT,
+        DB_POOL_TIMEOUTS,
+    )
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection becomes available in time."""
+    pass
+
+
+class PostgresConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections.
+    
+    Connections are checked out for one statement or one transaction and
+    returned afterwards, so concurrent request, actor and background threads
+    never share a connection. Connections older than ``max_lifetime_seconds``
+    are recycled, and connections idle longer than ``health_check_idle_seconds``
+    are pinged with ``SELECT 1`` before being handed out.
+    """
+    
+    DB_TYPE = 'postgresql'
+    
+    def __init__(self, connect_fn: Callable[[], Any], min_size: int = 1,
+                 max_size: int = 10, checkout_timeout: float = 30.0,
+                 max_lifetime_seconds: float = 1800.0,
+                 health_check_idle_seconds: float = 30.0):
+        self._connect_fn = connect_fn
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.health_check_idle_seconds = health_check_idle_seconds
+        
+        # Idle entries: (connection, created_at, returned_at)
+        self._idle: List[Tuple[Any, float, float]] = []
+        self._created_at: Dict[int, float] = {}
+        self._cond = threading.Condition()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        
+        self._checkouts = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_health_checks = 0
+        
+        for _ in range(self.min_size):
+            conn = self._open()
+            with self._cond:
+                self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+        self._update_gauges()
+    
+    def _open(self) -> Any:
+        """Open a new connection, counting it against max_size."""
+        conn = self._connect_fn()
+        with self._cond:
+            self._size += 1
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+    
+    def _discard(self, conn: Any) -> None:
+        """Close a connection and free its slot."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._created_at.pop(id(conn), None)
+            self._cond.notify()
+    
+    def _is_usable(self, conn: Any, created_at: float, returned_at: float) -> bool:
+        now = time.monotonic()
+        if getattr(conn, 'closed', 0):
+            return False
+        if self.max_lifetime_seconds > 0 and now - created_at > self.max_lifetime_seconds:
+            self._recycled += 1
+            return False
+        if self.health_check_idle_seconds >= 0 and now - returned_at > self.health_check_idle_seconds:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except Exception as e:
+                self._failed_health_checks += 1
+                logger.warning(f"Discarding unhealthy PostgreSQL connection: {e}")
+                return False
+        return True
+    
+    def checkout(self, timeout: float = None) -> Any:
+        """
+        Take a connection from the pool, opening one if below max_size.
+        
+        Raises:
+            PoolTimeoutError: If none is available within the timeout
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        
+        while True:
+            candidate = None
+            open_new = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # Reserve the slot before connecting
+                        open_new = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        if _metrics_available:
+                            DB_POOL_TIMEOUTS.labels(db_type=self.DB_TYPE).inc()
+                        raise PoolTimeoutError(
+                            f"No PostgreSQL connection available after {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            
+            if open_new:
+                try:
+                    conn = self._connect_fn()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_at[id(conn)] = time.monotonic()
+            else:
+                conn, created_at, returned_at = candidate
+                if not self._is_usable(conn, created_at, returned_at):
+                    self._discard(conn)
+                    continue
+            
+            with self._cond:
+                self._in_use += 1
+                self._checkouts += 1
+            if _metrics_available:
+                DB_POOL_CHECKOUT_WAIT.labels(db_type=self.DB_TYPE).observe(time.monotonic() - start)
+            self._update_gauges()
+            return conn
+    
+    def checkin(self, conn: Any) -> None:
+        """Return a connection, rolling back anything left uncommitted."""
+        healthy = not getattr(conn, 'closed', 0)
+        if healthy:
+            try:
+                conn.rollback()
+            except Exception:
+                healthy = False
+        
+        with self._cond:
+            self._in_use -= 1
+        if not healthy or self._closed:
+            self._discard(conn)
+        else:
+            with self._cond:
+                self._idle.append((conn, self._created_at.get(id(conn), time.monotonic()),
+                                   time.monotonic()))
+                self._cond.notify()
+        self._update_gauges()
+    
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check a connection out for the duration of a with-block."""
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+    
+    def close(self) -> None:
+        """Close idle connections; in-use ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._discard(conn)
+        self._update_gauges()
+    
+    def _update_gauges(self) -> None:
+        if _metrics_available:
+            DB_POOL_SIZE.labels(db_type=self.DB_TYPE).set(self._size)
+            DB_CONNECTIONS.labels(db_type=self.DB_TYPE).set(self._in_use)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'failed_health_checks': self._failed_health_checks
+            }
+
 
 class PostgresHandler(DatabaseHandler):
-    """PostgreSQL implementation of DatabaseHandler."""
+    """PostgreSQL implementation of DatabaseHandler backed by a connection pool."""
     
-    def __init__(self, host: str, port: int, database: str, user: str, password: str):
+    def __init__(self, host: str, port: int, database: str, user: str, password: str,
+                 pool_min_size: int = 1, pool_max_size: int = 10,
+                 pool_checkout_timeout: float = 30.0,
+                 pool_max_lifetime_seconds: float = 1800.0,
+                 pool_health_check_idle_seconds: float = 30.0):
         """
         Initialize PostgreSQL handler.
         
@@ -31,30 +257,58 @@ class PostgresHandler(DatabaseHandler):
             database: Database name
             user: Database user
             password: Database password
+            pool_min_size: Connections opened eagerly on connect()
+            pool_max_size: Upper bound on open connections
+            pool_checkout_timeout: Seconds to wait for a free connection
+            pool_max_lifetime_seconds: Recycle connections older than this (0 = never)
+            pool_health_check_idle_seconds: Ping connections idle longer than this
         """
         self.host = host
         self.port = port
         self.database = database
         self.user = user
         self.password = password
-        self.connection = None
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_checkout_timeout = pool_checkout_timeout
+        self.pool_max_lifetime_seconds = pool_max_lifetime_seconds
+        self.pool_health_check_idle_seconds = pool_health_check_idle_seconds
+        self._pool: Optional[PostgresConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()  # Connection of the thread's open transaction
         logger.info(f"PostgreSQL handler created for: {host}:{port}/{database}")
     
+    def _connect_one(self):
+        """Open a single psycopg2 connection."""
+        import psycopg2
+        
+        conn = psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.user,
+            password=self.password
+        )
+        conn.autocommit = False
+        return conn
+    
     def connect(self) -> None:
-        """Establish database connection."""
+        """Create the connection pool."""
         try:
-            import psycopg2
-            from psycopg2.extras import RealDictCursor
+            import psycopg2  # noqa: F401
             
-            self.connection = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            self.connection.autocommit = False
-            logger.info(f"PostgreSQL connected: {self.host}:{self.port}/{self.database}")
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = PostgresConnectionPool(
+                        self._connect_one,
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        checkout_timeout=self.pool_checkout_timeout,
+                        max_lifetime_seconds=self.pool_max_lifetime_seconds,
+                        health_check_idle_seconds=self.pool_health_check_idle_seconds
+                    )
+            logger.info(f"PostgreSQL connected: {self.host}:{self.port}/{self.database} "
+                        f"(pool {self.pool_min_size}-{self.pool_max_size})")
         except ImportError:
             logger.error("psycopg2 not installed. Install with: pip install psycopg2-binary")
             raise
@@ -63,12 +317,78 @@ class PostgresHandler(DatabaseHandler):
             raise
     
     def disconnect(self) -> None:
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Close the connection pool."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.close()
             logger.debug("PostgreSQL disconnected")
     
+    @property
+    def pool(self) -> PostgresConnectionPool:
+        """Get the connection pool, creating it on first use."""
+        if self._pool is None:
+            self.connect()
+        return self._pool
+    
+    @contextmanager
+    def _connection(self) -> Iterator[Tuple[Any, bool]]:
+        """
+        Yield (connection, owned) for one statement.
+        
+        Inside transaction() the thread's transaction connection is reused and
+        ``owned`` is False, so the statement must not commit or roll back.
+        """
+        tx_conn = getattr(self._local, 'connection', None)
+        if tx_conn is not None:
+            yield tx_conn, False
+            return
+        pool = self.pool
+        conn = pool.checkout()
+        try:
+            yield conn, True
+        finally:
+            pool.checkin(conn)
+    
+    @contextmanager
+    def transaction(self) -> Iterator['PostgresHandler']:
+        """
+        Run several statements on one connection as a single transaction.
+        
+        Commits when the block exits normally and rolls back on an exception.
+        Nested calls join the outer transaction.
+        
+        Usage:
+            with handler.transaction():
+                handler.execute("INSERT ...", (...))
+                handler.execute("UPDATE ...", (...))
+        """
+        if getattr(self._local, 'connection', None) is not None:
+            yield self
+            return
+        pool = self.pool
+        conn = pool.checkout()
+        self._local.connection = conn
+        try:
+            yield self
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.connection = None
+            pool.checkin(conn)
+    
+    @staticmethod
+    def _prepare_params(params):
+        """Convert lists to tuples and wrap single values."""
+        if params is not None:
+            if isinstance(params, list):
+                params = tuple(params)
+            elif not isinstance(params, tuple):
+                params = (params,)
+        return params
+    
     def execute(self, query: str, params: tuple = None) -> Any:
         """
         Execute a query.
@@ -80,34 +400,59 @@ class PostgresHandler(DatabaseHandler):
         Returns:
             Last row ID or None
         """
-        try:
-            # Ensure params is properly formatted
-            if params is not None:
-                # Convert to tuple if it's a list
-                if isinstance(params, list):
-                    params = tuple(params)
-                # Ensure single values are wrapped in tuple
-                elif not isinstance(params, tuple):
-                    params = (params,)
+        params = self._prepare_params(params)
+        with self._connection() as (conn, owned):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+                    
+                    # Try to get returning id
+                    result = None
+                    if cursor.description:
+                        try:
+                            row = cursor.fetchone()
+                            result = row[0] if row else None
+                        except Exception:
+                            result = None
+                if owned:
+                    conn.commit()
+                return result
+            except Exception as e:
+                logger.error(f"PostgreSQL execute error: {e}")
+                logger.error(f"Query: {query[:200]}...")
+                logger.error(f"Params: {params} (type: {type(params).__name__ if params else 'None'})")
+                if owned:
+                    conn.rollback()
+                raise
+    
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """
+        Execute a query for each parameter tuple in a single transaction.
+        
+        Args:
+            query: SQL query string
+            params_list: List of parameter tuples
             
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
-                self.connection.commit()
-                
-                # Try to get returning id
-                if cursor.description:
-                    try:
-                        result = cursor.fetchone()
-                        return result[0] if result else None
-                    except:
-                        return None
-                return None
-        except Exception as e:
-            logger.error(f"PostgreSQL execute error: {e}")
-            logger.error(f"Query: {query[:200]}...")
-            logger.error(f"Params: {params} (type: {type(params).__name__ if params else 'None'})")
-            self.connection.rollback()
-            raise
+        Returns:
+            Number of parameter tuples executed
+        """
+        if not params_list:
+            return 0
+        import psycopg2.extras
+        
+        with self._connection() as (conn, owned):
+            try:
+                with conn.cursor() as cursor:
+                    psycopg2.extras.execute_batch(cursor, query, [tuple(p) for p in params_list])
+                if owned:
+                    conn.commit()
+                return len(params_list)
+            except Exception as e:
+                logger.error(f"PostgreSQL execute_many error: {e}")
+                logger.error(f"Query: {query[:200]}...")
+                if owned:
+                    conn.rollback()
+                raise
     
     def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
         """
@@ -120,22 +465,15 @@ class PostgresHandler(DatabaseHandler):
         Returns:
             Row as dictionary or None
         """
+        import psycopg2.extras
+        
+        params = self._prepare_params(params)
         try:
-            import psycopg2.extras
-            
-            # Ensure params is properly formatted
-            if params is not None:
-                # Convert to tuple if it's a list
-                if isinstance(params, list):
-                    params = tuple(params)
-                # Ensure single values are wrapped in tuple
-                elif not isinstance(params, tuple):
-                    params = (params,)
-            
-            with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            with self._connection() as (conn, _):
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute(query, params)
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
         except Exception as e:
             logger.error(f"PostgreSQL fetch_one error: {e}")
             logger.error(f"Query: {query[:200]}...")
@@ -153,22 +491,15 @@ class PostgresHandler(DatabaseHandler):
         Returns:
             List of rows as dictionaries
         """
+        import psycopg2.extras
+        
+        params = self._prepare_params(params)
         try:
-            import psycopg2.extras
-            
-            # Ensure params is properly formatted
-            if params is not None:
-                # Convert to tuple if it's a list
-                if isinstance(params, list):
-                    params = tuple(params)
-                # Ensure single values are wrapped in tuple
-                elif not isinstance(params, tuple):
-                    params = (params,)
-            
-            with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            with self._connection() as (conn, _):
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                    return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"PostgreSQL fetch_all error: {e}")
             logger.error(f"Query: {query[:200]}...")
@@ -177,31 +508,38 @@ class PostgresHandler(DatabaseHandler):
     
     def commit(self) -> None:
         """
-        Commit current transaction.
+        Commit the current thread's transaction, if one is open.
         
-        PostgreSQL requires explicit commits when autocommit is False.
+        Statements outside transaction() commit on their own connection.
         """
-        if self.connection:
-            self.connection.commit()
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.commit()
             logger.debug("PostgreSQL commit")
     
     def rollback(self) -> None:
         """
-        Rollback current transaction.
+        Roll back the current thread's transaction, if one is open.
         
-        PostgreSQL requires explicit rollback to abort failed transactions.
+        Statements outside transaction() roll back on their own failure.
         """
-        if self.connection:
-            self.connection.rollback()
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.rollback()
             logger.debug("PostgreSQL rollback")
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        return self._pool.get_stats() if self._pool else {}
+    
     def init_schema(self) -> None:
         """Initialize PostgreSQL schema using the schema module."""
         from .schema import PostgresSchema
         
         schema = PostgresSchema()
         try:
-            schema.initialize_database(self.connection)
+            with self.pool.connection() as conn:
+                schema.initialize_database(conn)
             logger.info("PostgreSQL schema initialized via schema module")
         except Exception as e:
             logger.error(f"PostgreSQL schema init error: {e}")
@@ -210,15 +548,16 @@ class PostgresHandler(DatabaseHandler):
     def init_schema_legacy(self) -> None:
         """Initialize PostgreSQL schema (legacy method)."""
         schema = self._get_schema()
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(schema)
-                self.connection.commit()
-            logger.info("PostgreSQL schema initialized (legacy)")
-        except Exception as e:
-            logger.error(f"PostgreSQL schema init error: {e}")
-            self.connection.rollback()
-            raise
+        with self.pool.connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(schema)
+                conn.commit()
+                logger.info("PostgreSQL schema initialized (legacy)")
+            except Exception as e:
+                logger.error(f"PostgreSQL schema init error: {e}")
+                conn.rollback()
+                raise
     
     def _get_schema(self) -> str:
         """Get PostgreSQL schema SQL."""
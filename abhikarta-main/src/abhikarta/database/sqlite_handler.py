@@ -11,7 +11,8 @@ Unauthorized copying, distribution, modification, or use is strictly prohibited.
 """
 
 import sqlite3
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -22,19 +23,74 @@ from .db_facade import DatabaseHandler
 logger = logging.getLogger(__name__)
 
 
+def _convert_timestamp(val):
+    """Convert timestamp bytes to datetime, handling ISO format."""
+    if val is None:
+        return None
+    try:
+        # Decode bytes to string
+        if isinstance(val, bytes):
+            val = val.decode('utf-8')
+        # Handle ISO format with T separator
+        val = val.replace('T', ' ')
+        # Handle microseconds
+        if '.' in val:
+            return datetime.strptime(val, '%Y-%m-%d %H:%M:%S.%f')
+        else:
+            return datetime.strptime(val, '%Y-%m-%d %H:%M:%S')
+    except Exception:
+        # Return as string if parsing fails
+        return val
+
+
+# Register custom timestamp converter that handles ISO format (with T separator).
+# Converters are process-global, so this happens once rather than per connect.
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+sqlite3.register_converter("timestamp", _convert_timestamp)
+
+
 class SQLiteHandler(DatabaseHandler):
     """SQLite implementation of DatabaseHandler."""
     
-    def __init__(self, db_path: str):
+    JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+    SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+    TEMP_STORES = ('DEFAULT', 'FILE', 'MEMORY')
+    
+    def __init__(self, db_path: str, journal_mode: str = 'WAL',
+                 synchronous: str = 'NORMAL', busy_timeout_ms: int = 5000,
+                 cache_size_kb: int = 20000, mmap_size_mb: int = 256,
+                 temp_store: str = 'MEMORY', cached_statements: int = 256):
         """
         Initialize SQLite handler.
         
         Args:
             db_path: Path to SQLite database file
+            journal_mode: PRAGMA journal_mode (WAL lets readers run alongside a writer)
+            synchronous: PRAGMA synchronous (NORMAL is durable enough with WAL)
+            busy_timeout_ms: How long to wait on a locked database
+            cache_size_kb: Page cache per connection in KiB (0 = SQLite default)
+            mmap_size_mb: Memory-mapped I/O size in MiB (0 = disabled)
+            temp_store: PRAGMA temp_store
+            cached_statements: Prepared statements cached per connection
         """
         self.db_path = db_path
+        self.journal_mode = self._check_option('journal_mode', journal_mode, self.JOURNAL_MODES)
+        self.synchronous = self._check_option('synchronous', synchronous, self.SYNCHRONOUS_MODES)
+        self.busy_timeout_ms = max(0, int(busy_timeout_ms))
+        self.cache_size_kb = max(0, int(cache_size_kb))
+        self.mmap_size_mb = max(0, int(mmap_size_mb))
+        self.temp_store = self._check_option('temp_store', temp_store, self.TEMP_STORES)
+        self.cached_statements = max(0, int(cached_statements))
         self._local = threading.local()
-        logger.info(f"SQLite handler created for: {db_path}")
+        logger.info(f"SQLite handler created for: {db_path} "
+                    f"(journal_mode={self.journal_mode}, synchronous={self.synchronous})")
+    
+    @staticmethod
+    def _check_option(name: str, value: str, allowed: tuple) -> str:
+        value = (value or '').upper()
+        if value not in allowed:
+            raise ValueError(f"Invalid SQLite {name}: {value} (expected one of {', '.join(allowed)})")
+        return value
     
     @property
     def connection(self):
@@ -45,46 +101,83 @@ class SQLiteHandler(DatabaseHandler):
     
     def connect(self) -> None:
         """Establish database connection."""
-        # Ensure directory exists
-        db_file = Path(self.db_path)
-        db_file.parent.mkdir(parents=True, exist_ok=True)
+        in_memory = self.db_path == ':memory:'
         
-        # Register custom timestamp converter that handles ISO format (with T separator)
-        def convert_timestamp(val):
-            """Convert timestamp bytes to datetime, handling ISO format."""
-            if val is None:
-                return None
-            try:
-                # Decode bytes to string
-                if isinstance(val, bytes):
-                    val = val.decode('utf-8')
-                # Handle ISO format with T separator
-                val = val.replace('T', ' ')
-                # Handle microseconds
-                if '.' in val:
-                    return datetime.strptime(val, '%Y-%m-%d %H:%M:%S.%f')
-                else:
-                    return datetime.strptime(val, '%Y-%m-%d %H:%M:%S')
-            except Exception:
-                # Return as string if parsing fails
-                return val
-        
-        # Register the converter
-        sqlite3.register_converter("TIMESTAMP", convert_timestamp)
-        sqlite3.register_converter("timestamp", convert_timestamp)
+        # Ensure directory exists
+        if not in_memory:
+            db_file = Path(self.db_path)
+            db_file.parent.mkdir(parents=True, exist_ok=True)
         
-        self._local.connection = sqlite3.connect(
+        connection = sqlite3.connect(
             self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
             check_same_thread=False,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            cached_statements=self.cached_statements
         )
+        self._apply_pragmas(connection, in_memory)
+        self._local.connection = connection
+        self._local.tx_depth = 0
         logger.debug(f"SQLite connected: {self.db_path}")
     
+    def _apply_pragmas(self, connection: sqlite3.Connection, in_memory: bool) -> None:
+        """Apply the configured performance profile to a new connection."""
+        pragmas = [
+            f"PRAGMA busy_timeout = {self.busy_timeout_ms}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+        if not in_memory:
+            # journal_mode is persistent in the file; in-memory databases ignore WAL
+            pragmas.insert(0, f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.cache_size_kb:
+            pragmas.append(f"PRAGMA cache_size = -{self.cache_size_kb}")
+        if self.mmap_size_mb and not in_memory:
+            pragmas.append(f"PRAGMA mmap_size = {self.mmap_size_mb * 1024 * 1024}")
+        for pragma in pragmas:
+            try:
+                connection.execute(pragma)
+            except sqlite3.Error as e:
+                logger.warning(f"SQLite pragma failed ({pragma}): {e}")
+    
+    @property
+    def in_transaction(self) -> bool:
+        """True while the current thread is inside transaction()."""
+        return getattr(self._local, 'tx_depth', 0) > 0
+    
+    @contextmanager
+    def transaction(self) -> Iterator['SQLiteHandler']:
+        """
+        Run several statements as one transaction on this thread's connection.
+        
+        execute() and execute_many() skip their per-statement commit inside
+        the block; the outermost block commits on success and rolls back on an
+        exception. Nested calls join the outer transaction.
+        
+        Usage:
+            with handler.transaction():
+                handler.execute("INSERT ...", (...))
+                handler.execute_many("INSERT ...", rows)
+        """
+        connection = self.connection
+        self._local.tx_depth = getattr(self._local, 'tx_depth', 0) + 1
+        try:
+            yield self
+            if self._local.tx_depth == 1:
+                connection.commit()
+        except Exception:
+            if self._local.tx_depth == 1:
+                connection.rollback()
+            raise
+        finally:
+            self._local.tx_depth -= 1
+    
     def disconnect(self) -> None:
         """Close database connection."""
         if hasattr(self._local, 'connection') and self._local.connection:
             self._local.connection.close()
             self._local.connection = None
+            self._local.tx_depth = 0
             logger.debug("SQLite disconnected")
     
     def execute(self, query: str, params: tuple = None) -> Any:
@@ -111,13 +204,41 @@ class SQLiteHandler(DatabaseHandler):
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            self.connection.commit()
+            if not self.in_transaction:
+                self.connection.commit()
             return cursor.lastrowid
         except Exception as e:
             logger.error(f"SQLite execute error: {e}")
             logger.error(f"Query: {query[:100]}...")
             logger.error(f"Params: {params} (type: {type(params).__name__ if params else 'None'})")
-            self.connection.rollback()
+            if not self.in_transaction:
+                self.connection.rollback()
+            raise
+    
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """
+        Execute a query for each parameter tuple in a single transaction.
+        
+        Args:
+            query: SQL query string
+            params_list: List of parameter tuples
+            
+        Returns:
+            Number of parameter tuples executed
+        """
+        if not params_list:
+            return 0
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, [tuple(p) for p in params_list])
+            if not self.in_transaction:
+                self.connection.commit()
+            return len(params_list)
+        except Exception as e:
+            logger.error(f"SQLite execute_many error: {e}")
+            logger.error(f"Query: {query[:100]}...")
+            if not self.in_transaction:
+                self.connection.rollback()
             raise
     
     def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
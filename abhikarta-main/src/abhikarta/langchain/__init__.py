@@ -47,6 +47,10 @@ def __getattr__(name):
         return _get_llm_factory().LLMFactory
     elif name == 'get_langchain_llm':
         return _get_llm_factory().get_langchain_llm
+    elif name == 'LLMClientPool':
+        return _get_llm_factory().LLMClientPool
+    elif name == 'get_llm_client_pool':
+        return _get_llm_factory().get_llm_client_pool
     elif name == 'ToolFactory':
         return _get_tools().ToolFactory
     elif name == 'MCPToolAdapter':
@@ -59,21 +63,35 @@ def __getattr__(name):
         return _get_agents().create_react_agent
     elif name == 'create_tool_calling_agent':
         return _get_agents().create_tool_calling_agent
+    elif name == 'AgentExecutorCache':
+        return _get_agents().AgentExecutorCache
+    elif name == 'get_agent_executor_cache':
+        return _get_agents().get_agent_executor_cache
     elif name == 'WorkflowGraphExecutor':
         return _get_workflow_graph().WorkflowGraphExecutor
     elif name == 'create_workflow_graph':
         return _get_workflow_graph().create_workflow_graph
+    elif name == 'CompiledGraphCache':
+        return _get_workflow_graph().CompiledGraphCache
+    elif name == 'get_compiled_graph_cache':
+        return _get_workflow_graph().get_compiled_graph_cache
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'LLMFactory',
     'get_langchain_llm',
+    'LLMClientPool',
+    'get_llm_client_pool',
     'ToolFactory',
     'MCPToolAdapter',
     'create_langchain_tool',
     'AgentExecutor',
     'create_react_agent',
     'create_tool_calling_agent',
+    'AgentExecutorCache',
+    'get_agent_executor_cache',
     'WorkflowGraphExecutor',
-    'create_workflow_graph'
+    'create_workflow_graph',
+    'CompiledGraphCache',
+    'get_compiled_graph_cache'
 ]
@@ -12,10 +12,13 @@ Copyright © 2025-2030, All Rights Reserved
 Ashutosh Sinha
 """
 
+import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
@@ -32,6 +35,9 @@ try:
         AGENT_TOKENS_USED,
         AGENT_ERRORS,
         AGENT_TOOL_CALLS,
+        CACHE_REQUESTS,
+        CACHE_EVICTIONS,
+        CACHE_SIZE,
     )
     _metrics_available = True
 except ImportError:
@@ -172,6 +178,49 @@ class AgentExecutionResult:
         }
 
 
+try:
+    from langchain_core.callbacks import BaseCallbackHandler as _BaseCallbackHandler
+except ImportError:
+    _BaseCallbackHandler = object
+
+
+class AgentProgressCallbackHandler(_BaseCallbackHandler):
+    """
+    Forwards agent progress to an ``event_callback(event_type, data)``.
+    
+    Emits ``step`` (tool chosen), ``observation`` (tool output), ``token``
+    (streamed LLM tokens, when the model streams) and ``llm_end`` (token usage).
+    """
+    
+    def __init__(self, event_callback: Callable[[str, Dict], None]):
+        self.event_callback = event_callback
+        self.total_tokens = 0
+    
+    def _emit(self, event_type: str, data: Dict):
+        try:
+            self.event_callback(event_type, data)
+        except Exception as e:
+            logger.debug(f"Agent progress callback failed: {e}")
+    
+    def on_agent_action(self, action, **kwargs):
+        self._emit('step', {
+            'tool': str(getattr(action, 'tool', action)),
+            'tool_input': str(getattr(action, 'tool_input', ''))[:2000]
+        })
+    
+    def on_tool_end(self, output, **kwargs):
+        self._emit('observation', {'output': str(output)[:2000]})
+    
+    def on_llm_new_token(self, token: str, **kwargs):
+        self._emit('token', {'token': token})
+    
+    def on_llm_end(self, response, **kwargs):
+        from .llm_factory import _reported_tokens
+        tokens = _reported_tokens(response) or 0
+        self.total_tokens += tokens
+        self._emit('llm_end', {'tokens': tokens, 'total_tokens': self.total_tokens})
+
+
 def create_react_agent(llm, tools: List, system_prompt: str = None) -> Any:
     """
     Create a ReAct (Reasoning + Acting) agent.
@@ -478,11 +527,11 @@ def create_conversational_agent(llm, tools: List, system_prompt: str = None) ->
         def __init__(self, chain):
             self.chain = chain
             
-        def invoke(self, inputs):
+        def invoke(self, inputs, config=None):
             """Execute the conversational chain."""
             logger.info(f"[CONVERSATIONAL] Invoking with input: {str(inputs)[:200]}...")
             try:
-                result = self.chain.invoke(inputs)
+                result = self.chain.invoke(inputs, config=config)
                 logger.info(f"[CONVERSATIONAL] Got response: {str(result)[:200]}...")
                 return {
                     'output': result,
@@ -525,6 +574,148 @@ def create_plan_execute_agent(llm, tools: List, system_prompt: str = None) -> An
         return create_react_agent(llm, tools, system_prompt)
 
 
+# ============================================================================
+# Built Agent Cache
+# ============================================================================
+
+class AgentExecutorCache:
+    """
+    Process-wide LRU cache of fully built agent runnables.
+    
+    Building an agent parses its config, creates the LLM, enumerates MCP
+    servers and code fragments for tools, and constructs the LangChain or
+    LangGraph runnable. Entries hold the parsed config and the runnable,
+    keyed by agent_id plus the row's version/updated_at token, so an edited
+    agent is rebuilt. Explicit invalidation covers same-second edits and tool
+    changes that do not touch the agents row. Chat history and callbacks are
+    passed per invocation, so one runnable serves every request.
+    """
+    
+    CACHE_NAME = 'agent_executor'
+    
+    def __init__(self, max_size: int = 64, enabled: bool = True):
+        self.max_size = max(1, max_size)
+        self.enabled = enabled
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+    
+    @staticmethod
+    def make_key(agent_id: str, version: str, config_overrides: Dict = None,
+                 *owners) -> tuple:
+        """Build a cache key; owners (db facade, factories) are keyed by identity."""
+        overrides = ''
+        if config_overrides:
+            payload = json.dumps(config_overrides, sort_keys=True, default=str)
+            overrides = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return (agent_id, version, overrides) + tuple(id(o) for o in owners)
+    
+    def get(self, key: tuple) -> Optional[tuple]:
+        """Return ``(agent_config, runnable)`` for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        self._record('hit' if entry is not None else 'miss')
+        return entry
+    
+    def put(self, key: tuple, agent_config: Dict, runnable: Any):
+        """Store a built agent, dropping older versions of the same agent."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for stale in [k for k in self._entries if k[0] == key[0] and k[1] != key[1]]:
+                del self._entries[stale]
+            self._entries[key] = (agent_config, runnable)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+                if _metrics_available:
+                    CACHE_EVICTIONS.labels(cache=self.CACHE_NAME).inc()
+            size = len(self._entries)
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(size)
+    
+    def invalidate(self, agent_id: str = None) -> int:
+        """
+        Drop built agents for one agent, or all agents when no ID is given.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if agent_id is None:
+                keys = list(self._entries)
+            else:
+                keys = [k for k in self._entries if k[0] == agent_id]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += len(keys)
+            size = len(self._entries)
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(size)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} built agent(s) for {agent_id or 'all agents'}")
+        return len(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+    
+    def _record(self, result: str):
+        if _metrics_available:
+            CACHE_REQUESTS.labels(cache=self.CACHE_NAME, result=result).inc()
+
+
+_executor_cache: Optional[AgentExecutorCache] = None
+_executor_cache_lock = threading.Lock()
+
+
+def get_agent_executor_cache() -> AgentExecutorCache:
+    """Get the global built agent cache."""
+    global _executor_cache
+    if _executor_cache is None:
+        with _executor_cache_lock:
+            if _executor_cache is None:
+                _executor_cache = AgentExecutorCache()
+    return _executor_cache
+
+
+def init_agent_executor_cache(max_size: int = 64, enabled: bool = True) -> AgentExecutorCache:
+    """Initialize the global built agent cache."""
+    global _executor_cache
+    with _executor_cache_lock:
+        _executor_cache = AgentExecutorCache(max_size=max_size, enabled=enabled)
+    return _executor_cache
+
+
+def invalidate_agent_executor(agent_id: str = None) -> int:
+    """Invalidate built agents after an agent edit, or all of them after tool changes."""
+    if _executor_cache is None:
+        return 0
+    return _executor_cache.invalidate(agent_id)
+
+
 class AgentExecutor:
     """
     High-level agent executor that integrates with the Abhikarta database.
@@ -567,7 +758,8 @@ class AgentExecutor:
     
     def execute_agent(self, agent_id: str, input_data: Any, 
                      chat_history: List = None,
-                     config_overrides: Dict = None) -> AgentExecutionResult:
+                     config_overrides: Dict = None,
+                     event_callback: Callable[[str, Dict], None] = None) -> AgentExecutionResult:
         """
         Execute an agent with the given input.
         
@@ -576,14 +768,22 @@ class AgentExecutor:
             input_data: Input to the agent (string or dict)
             chat_history: Optional chat history for multi-turn conversations
             config_overrides: Optional configuration overrides
+            event_callback: Optional ``callback(event_type, data)`` receiving
+                step, observation, token and llm_end progress events
             
         Returns:
             AgentExecutionResult with execution details
         """
         from ..utils.helpers import generate_execution_id, EntityType as HelperEntityType
         
-        # Load agent config first to get name for execution ID
-        agent_config = self._load_agent_config(agent_id)
+        # Reuse the built agent for this config version; otherwise load the
+        # config first to get the name for the execution ID
+        cache_key = self._executor_cache_key(agent_id, config_overrides)
+        cached = get_agent_executor_cache().get(cache_key) if cache_key else None
+        if cached:
+            agent_config, agent_executor = cached
+        else:
+            agent_config, agent_executor = self._load_agent_config(agent_id), None
         agent_name = agent_config.get('name', '') if agent_config else ''
         
         execution_id = generate_execution_id(HelperEntityType.AGENT, agent_name)
@@ -606,42 +806,21 @@ class AgentExecutor:
             logger.info(f"[AGENT:{agent_id}] Loaded config for: {agent_config.get('name', agent_id)}")
             logger.info(f"[AGENT:{agent_id}] Agent type: {agent_config.get('agent_type', 'unknown')}")
             
-            # Apply overrides
-            if config_overrides:
+            # Apply overrides (cached entries already include them)
+            if config_overrides and agent_executor is None:
                 agent_config.update(config_overrides)
             
             result.status = 'running'
             result.metadata['agent_name'] = agent_config.get('name', agent_id)
             
-            # Create LLM instance
-            logger.info(f"[AGENT:{agent_id}] Creating LLM instance...")
-            llm = self._create_llm(agent_config)
-            logger.info(f"[AGENT:{agent_id}] LLM created successfully")
-            
-            # Create tools
-            logger.info(f"[AGENT:{agent_id}] Creating tools...")
-            tools = self._create_tools(agent_config)
-            logger.info(f"[AGENT:{agent_id}] Tools created: {[t.name if hasattr(t, 'name') else str(t) for t in tools]}")
-            
-            # Create agent executor
             agent_type = agent_config.get('agent_type', 'conversational')
-            system_prompt = agent_config.get('system_prompt', '')
-            
-            logger.info(f"[AGENT:{agent_id}] Creating {agent_type} agent executor...")
-            if system_prompt:
-                logger.info(f"[AGENT:{agent_id}] System prompt: {system_prompt[:200]}...")
-            
-            # Get the creator function with conversational as default fallback
-            creator_func = self.AGENT_TYPES.get(agent_type, create_conversational_agent)
             
-            try:
-                agent_executor = creator_func(llm, tools, system_prompt)
-            except ImportError as e:
-                # If the requested agent type fails due to missing imports, fall back to conversational
-                logger.warning(f"[AGENT:{agent_id}] Failed to create {agent_type} agent: {e}. Falling back to conversational.")
-                agent_executor = create_conversational_agent(llm, tools, system_prompt)
-            
-            logger.info(f"[AGENT:{agent_id}] Agent executor created")
+            if agent_executor is not None:
+                logger.info(f"[AGENT:{agent_id}] Reusing cached {agent_type} agent executor")
+            else:
+                agent_executor = self._build_agent(agent_id, agent_config)
+                if cache_key:
+                    get_agent_executor_cache().put(cache_key, agent_config, agent_executor)
             
             # Prepare input
             if isinstance(input_data, str):
@@ -655,7 +834,12 @@ class AgentExecutor:
             # Execute agent
             logger.info(f"[AGENT:{agent_id}] Invoking agent...")
             start_time = time.time()
-            response = agent_executor.invoke(agent_input)
+            if event_callback and _BaseCallbackHandler is not object:
+                progress = AgentProgressCallbackHandler(event_callback)
+                response = agent_executor.invoke(agent_input, config={'callbacks': [progress]})
+                result.token_usage['total_tokens'] = progress.total_tokens
+            else:
+                response = agent_executor.invoke(agent_input)
             result.duration_ms = int((time.time() - start_time) * 1000)
             
             logger.info(f"[AGENT:{agent_id}] Agent completed in {result.duration_ms}ms")
@@ -742,6 +926,63 @@ class AgentExecutor:
         
         return result
     
+    def _build_agent(self, agent_id: str, agent_config: Dict) -> Any:
+        """Create the LLM, tools and agent runnable for a loaded config."""
+        # Create LLM instance
+        logger.info(f"[AGENT:{agent_id}] Creating LLM instance...")
+        llm = self._create_llm(agent_config)
+        logger.info(f"[AGENT:{agent_id}] LLM created successfully")
+        
+        # Create tools
+        logger.info(f"[AGENT:{agent_id}] Creating tools...")
+        tools = self._create_tools(agent_config)
+        logger.info(f"[AGENT:{agent_id}] Tools created: {[t.name if hasattr(t, 'name') else str(t) for t in tools]}")
+        
+        # Create agent executor
+        agent_type = agent_config.get('agent_type', 'conversational')
+        system_prompt = agent_config.get('system_prompt', '')
+        
+        logger.info(f"[AGENT:{agent_id}] Creating {agent_type} agent executor...")
+        if system_prompt:
+            logger.info(f"[AGENT:{agent_id}] System prompt: {system_prompt[:200]}...")
+        
+        # Get the creator function with conversational as default fallback
+        creator_func = self.AGENT_TYPES.get(agent_type, create_conversational_agent)
+        
+        try:
+            agent_executor = creator_func(llm, tools, system_prompt)
+        except ImportError as e:
+            # If the requested agent type fails due to missing imports, fall back to conversational
+            logger.warning(f"[AGENT:{agent_id}] Failed to create {agent_type} agent: {e}. Falling back to conversational.")
+            agent_executor = create_conversational_agent(llm, tools, system_prompt)
+        
+        logger.info(f"[AGENT:{agent_id}] Agent executor created")
+        return agent_executor
+    
+    def _executor_cache_key(self, agent_id: str, config_overrides: Dict = None) -> Optional[tuple]:
+        """
+        Key for the built agent cache, or None when the agent cannot be cached.
+        
+        Only the row's ``version``/``updated_at`` columns are read, so a hit
+        skips the full config load and JSON parsing.
+        """
+        if not get_agent_executor_cache().enabled:
+            return None
+        try:
+            row = self.db_facade.fetch_one(
+                "SELECT version, updated_at FROM agents WHERE agent_id = ?",
+                (agent_id,)
+            )
+        except Exception as e:
+            logger.debug(f"[AGENT:{agent_id}] Config version lookup failed: {e}")
+            return None
+        if not row:
+            return None
+        version = f"{row.get('version')}@{row.get('updated_at')}"
+        return AgentExecutorCache.make_key(agent_id, version, config_overrides,
+                                           self.db_facade, self.llm_factory,
+                                           self.tool_factory)
+    
     def _load_agent_config(self, agent_id: str) -> Optional[Dict]:
         """Load agent configuration from database."""
         agent = self.db_facade.fetch_one(
@@ -846,9 +1087,20 @@ class AgentExecutor:
             if provider == 'ollama':
                 try:
                     from langchain_ollama import ChatOllama
-                    llm = ChatOllama(
+                    from .llm_factory import get_llm_client_pool, _with_rate_limit
+                    ollama_url = base_url or 'http://localhost:11434'
+                    llm = get_llm_client_pool().get_or_create(
+                        provider=provider,
                         model=model,
-                        base_url=base_url or 'http://localhost:11434',
+                        factory=lambda: _with_rate_limit(
+                            ChatOllama(
+                                model=model,
+                                base_url=ollama_url,
+                                temperature=temperature
+                            ),
+                            provider, self.db_facade
+                        ),
+                        base_url=ollama_url,
                         temperature=temperature
                     )
                     logger.info(f"[AGENT] Created ChatOllama: model={model}, base_url={base_url}")
@@ -8,12 +8,221 @@ Copyright © 2025-2030, All Rights Reserved
 Ashutosh Sinha
 """
 
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Union, Callable
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+try:
+    from abhikarta.monitoring import CACHE_REQUESTS, CACHE_EVICTIONS, CACHE_SIZE
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+except ImportError:
+    BaseCallbackHandler = object
+
+from abhikarta.llm_provider.rate_limiter import (
+    ProviderRateLimiter, get_rate_limiter_registry
+)
+
+
+class LLMClientPool:
+    """
+    Thread-safe registry of reusable LangChain chat-model clients.
+    
+    Chat models (and the keep-alive HTTP connection pools they own) are
+    shared across workflow nodes and agents that use the same provider,
+    model, endpoint, credentials and sampling parameters instead of being
+    constructed on every invocation. Entries are LRU-bounded, evicted after
+    an idle timeout, and can be invalidated when llm_providers rows change.
+    """
+    
+    CACHE_NAME = 'llm_client'
+    _SIMPLE_TYPES = (str, int, float, bool, type(None))
+    
+    def __init__(self, max_size: int = 64, idle_timeout_seconds: float = 600.0):
+        self.max_size = max(1, max_size)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._clients: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._last_sweep = time.monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    @staticmethod
+    def fingerprint(secret: Any) -> Optional[str]:
+        """Return a non-reversible fingerprint of a credential or config blob."""
+        if secret is None or secret == '':
+            return None
+        if not isinstance(secret, str):
+            secret = json.dumps(secret, sort_keys=True, default=str)
+        return hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]
+    
+    def get_or_create(self, provider: str, model: str, factory: Callable[[], Any],
+                      base_url: str = None, api_key: str = None,
+                      temperature: float = None, provider_id: str = None,
+                      **params) -> Any:
+        """
+        Return a pooled client, creating it with ``factory`` on a miss.
+        
+        Args:
+            provider: Provider type (e.g. 'openai', 'ollama')
+            model: Model name
+            factory: Zero-argument callable that builds the client
+            base_url: Endpoint URL
+            api_key: Credential (only its fingerprint is kept)
+            temperature: Sampling temperature
+            provider_id: Optional llm_providers.provider_id for invalidation
+            **params: Other construction parameters that affect the client
+            
+        Returns:
+            LangChain chat model instance
+        """
+        if any(not isinstance(v, self._SIMPLE_TYPES) for v in params.values()):
+            # Callbacks or other per-request objects cannot be shared
+            return factory()
+        
+        key = (
+            (provider or '').lower(), model, base_url, self.fingerprint(api_key),
+            temperature, provider_id, tuple(sorted(params.items()))
+        )
+        now = time.monotonic()
+        
+        with self._lock:
+            self._sweep_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry['last_used'] = now
+                self._clients.move_to_end(key)
+                self._hits += 1
+                self._record('hit')
+                return entry['client']
+            self._misses += 1
+        self._record('miss')
+        
+        client = factory()
+        
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                # Another thread built the same client concurrently
+                existing['last_used'] = now
+                return existing['client']
+            self._clients[key] = {
+                'client': client,
+                'tags': {t for t in ((provider or '').lower(), provider_id) if t},
+                'created_at': now,
+                'last_used': now
+            }
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self._count_eviction()
+            self._update_size()
+        logger.debug(f"Pooled new LLM client: provider={provider}, model={model}, base_url={base_url}")
+        return client
+    
+    def invalidate(self, provider: str = None) -> int:
+        """
+        Drop pooled clients for a provider (type or provider_id), or all clients.
+        
+        Returns:
+            Number of clients removed
+        """
+        with self._lock:
+            if provider is None:
+                keys = list(self._clients)
+            else:
+                tag = provider.lower() if provider else provider
+                keys = [k for k, e in self._clients.items()
+                        if provider in e['tags'] or tag in e['tags']]
+            for key in keys:
+                del self._clients[key]
+            self._update_size()
+        if keys:
+            logger.info(f"Invalidated {len(keys)} pooled LLM client(s) for {provider or 'all providers'}")
+        return len(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._clients),
+                'max_size': self.max_size,
+                'idle_timeout_seconds': self.idle_timeout_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions
+            }
+    
+    def _sweep_idle(self, now: float):
+        """Evict idle clients; called with the lock held."""
+        if not self.idle_timeout_seconds or now - self._last_sweep < min(60.0, self.idle_timeout_seconds):
+            return
+        self._last_sweep = now
+        expired = [k for k, e in self._clients.items()
+                   if now - e['last_used'] > self.idle_timeout_seconds]
+        for key in expired:
+            del self._clients[key]
+            self._count_eviction()
+        if expired:
+            self._update_size()
+    
+    def _count_eviction(self):
+        self._evictions += 1
+        if _metrics_available:
+            CACHE_EVICTIONS.labels(cache=self.CACHE_NAME).inc()
+    
+    def _update_size(self):
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(len(self._clients))
+    
+    def _record(self, result: str):
+        if _metrics_available:
+            CACHE_REQUESTS.labels(cache=self.CACHE_NAME, result=result).inc()
+
+
+_client_pool: Optional[LLMClientPool] = None
+_client_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Get the global LLM client pool."""
+    global _client_pool
+    if _client_pool is None:
+        with _client_pool_lock:
+            if _client_pool is None:
+                _client_pool = LLMClientPool()
+    return _client_pool
+
+
+def init_llm_client_pool(max_size: int = 64,
+                         idle_timeout_seconds: float = 600.0) -> LLMClientPool:
+    """Initialize the global LLM client pool."""
+    global _client_pool
+    with _client_pool_lock:
+        _client_pool = LLMClientPool(max_size=max_size,
+                                     idle_timeout_seconds=idle_timeout_seconds)
+    return _client_pool
+
+
+def invalidate_llm_clients(provider: str = None) -> int:
+    """Invalidate pooled clients after an llm_providers row changes."""
+    if _client_pool is None:
+        return 0
+    return _client_pool.invalidate(provider)
+
 
 class LLMFactory:
     """
@@ -440,7 +649,103 @@ def get_langchain_llm(db_facade, model_id: str = None, provider_id: str = None,
     if not provider:
         raise ValueError(f"Provider not found or inactive: {provider_id}")
     
-    return LLMFactory.create_llm(dict(provider), dict(model), **kwargs)
+    provider = dict(provider)
+    model = dict(model)
+    
+    # Reuse a pooled client; the row fingerprints make edited rows miss
+    return get_llm_client_pool().get_or_create(
+        provider=provider.get('provider_type'),
+        model=model.get('model_id'),
+        factory=lambda: _with_rate_limit(
+            LLMFactory.create_llm(provider, model, **kwargs),
+            provider.get('provider_type'), db_facade
+        ),
+        provider_id=provider_id,
+        provider_fingerprint=LLMClientPool.fingerprint(provider),
+        model_fingerprint=LLMClientPool.fingerprint(model),
+        **kwargs
+    )
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """
+    Holds LangChain chat-model calls until the provider budget allows them.
+    
+    Takes a lease when a run starts and settles it with the reported token
+    usage when the run ends. Sync callbacks run on the calling thread, and
+    LangChain runs them on an executor for async calls.
+    
+    The limiter is looked up on every call, so pooled clients pick up
+    limits configured or edited after they were created.
+    """
+    
+    # Let RateLimitTimeout propagate instead of being logged and ignored
+    raise_error = True
+    
+    def __init__(self, provider_type: str, db_facade=None, max_tokens: int = 0):
+        self.provider_type = provider_type
+        self.db_facade = db_facade
+        self.max_tokens = max_tokens or 0
+        self._leases: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def limiter(self) -> Optional[ProviderRateLimiter]:
+        return get_rate_limiter_registry().get_limiter(self.provider_type, self.db_facade)
+    
+    def _acquire(self, run_id, chars: int):
+        limiter = self.limiter
+        if limiter is None:
+            return
+        lease = limiter.acquire(chars // 4 + self.max_tokens)
+        with self._lock:
+            self._leases[run_id] = lease
+    
+    def on_chat_model_start(self, serialized: Dict, messages: list, *, run_id=None, **kwargs):
+        chars = sum(len(str(getattr(m, 'content', m))) for batch in messages for m in batch)
+        self._acquire(run_id, chars)
+    
+    def on_llm_start(self, serialized: Dict, prompts: list, *, run_id=None, **kwargs):
+        self._acquire(run_id, sum(len(p) for p in prompts))
+    
+    def on_llm_end(self, response, *, run_id=None, **kwargs):
+        with self._lock:
+            lease = self._leases.pop(run_id, None)
+        if lease:
+            lease.settle(_reported_tokens(response))
+    
+    def on_llm_error(self, error: BaseException, *, run_id=None, **kwargs):
+        with self._lock:
+            lease = self._leases.pop(run_id, None)
+        if lease:
+            lease.refund()
+
+
+def _reported_tokens(response) -> Optional[int]:
+    """Total tokens from an LLMResult, or None if the provider did not say."""
+    usage = (getattr(response, 'llm_output', None) or {}).get('token_usage') or {}
+    if usage.get('total_tokens'):
+        return usage['total_tokens']
+    total = 0
+    for generations in getattr(response, 'generations', None) or []:
+        for generation in generations:
+            metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+            total += metadata.get('total_tokens', 0)
+    return total or None
+
+
+def _with_rate_limit(llm, provider_type: str, db_facade=None):
+    """Attach the provider's rate limiter to a freshly created chat model."""
+    if not provider_type or BaseCallbackHandler is object:
+        return llm
+    handler = RateLimitCallbackHandler(provider_type, db_facade,
+                                       getattr(llm, 'max_tokens', 0) or 0)
+    callbacks = getattr(llm, 'callbacks', None)
+    if hasattr(callbacks, 'add_handler'):
+        callbacks.add_handler(handler, inherit=False)
+    else:
+        llm.callbacks = list(callbacks or []) + [handler]
+    return llm
 
 
 class LangChainCallbackHandler:
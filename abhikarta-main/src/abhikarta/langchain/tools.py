@@ -13,9 +13,8 @@ Ashutosh Sinha
 
 import json
 import logging
-import urllib.request
-import urllib.error
 from typing import Dict, Any, Optional, List, Callable, Type
+import requests
 from pydantic import BaseModel, Field, create_model
 
 logger = logging.getLogger(__name__)
@@ -63,9 +62,12 @@ class MCPToolAdapter:
     tools that can be used with agents.
     """
     
+    CALL_ENDPOINT = '/api/tools/call'
+    
     def __init__(self, db_facade=None):
         self.db_facade = db_facade
         self._cached_tools = {}
+        self._auth_header_cache: Dict[tuple, Dict[str, str]] = {}
     
     def get_tools_from_server(self, server_config: Dict[str, Any]) -> List[Any]:
         """
@@ -136,8 +138,12 @@ class MCPToolAdapter:
         def execute_mcp_tool(**kwargs) -> str:
             return self._call_mcp_tool(server_config, name, kwargs)
         
+        async def aexecute_mcp_tool(**kwargs) -> str:
+            return await self._acall_mcp_tool(server_config, name, kwargs)
+        
         return StructuredTool.from_function(
             func=execute_mcp_tool,
+            coroutine=aexecute_mcp_tool,
             name=name,
             description=description,
             args_schema=args_schema
@@ -178,6 +184,31 @@ class MCPToolAdapter:
         model_name = f"{name.replace('-', '_').replace('.', '_')}Input"
         return create_model(model_name, **field_definitions)
     
+    def _auth_headers(self, server_config: Dict) -> Dict[str, str]:
+        """Resolve auth headers for a server once and cache them."""
+        auth_type = server_config.get('auth_type', 'none')
+        raw_config = server_config.get('auth_config', '{}')
+        key = (server_config.get('server_id') or server_config.get('base_url', ''),
+               auth_type, raw_config if isinstance(raw_config, str) else json.dumps(raw_config, sort_keys=True))
+        headers = self._auth_header_cache.get(key)
+        if headers is None:
+            headers = {}
+            if auth_type and auth_type != 'none':
+                auth_config = json.loads(raw_config or '{}') if isinstance(raw_config, str) else raw_config
+                if auth_type == 'bearer' and 'token' in auth_config:
+                    headers['Authorization'] = f"Bearer {auth_config['token']}"
+                elif auth_type == 'api_key' and 'key' in auth_config and 'header' in auth_config:
+                    headers[auth_config['header']] = auth_config['key']
+            self._auth_header_cache[key] = headers
+        return headers
+    
+    def _get_http_pool(self, server_config: Dict):
+        """Get the MCPServerManager-owned connection pool for a server."""
+        from abhikarta.mcp import get_mcp_manager
+        return get_mcp_manager().get_http_pool(
+            server_config.get('base_url', ''), self._auth_headers(server_config)
+        )
+    
     def _call_mcp_tool(self, server_config: Dict, tool_name: str, 
                        arguments: Dict) -> str:
         """
@@ -191,62 +222,65 @@ class MCPToolAdapter:
         Returns:
             Tool execution result as string
         """
-        base_url = server_config.get('base_url', '').rstrip('/')
+        timeout = server_config.get('timeout_seconds', 30) or 30
+        request_data = {
+            'name': tool_name,
+            'arguments': arguments
+        }
         
-        # MCP standard tool call endpoint
-        call_endpoint = f"{base_url}/api/tools/call"
+        try:
+            # MCP standard tool call endpoint
+            response = self._get_http_pool(server_config).post_json(
+                self.CALL_ENDPOINT, request_data, timeout=timeout
+            )
+            return self._format_mcp_response(response)
+        except requests.ConnectionError as e:
+            return f"Connection Error: {e}"
+        except Exception as e:
+            return f"Error calling tool: {str(e)}"
+    
+    async def _acall_mcp_tool(self, server_config: Dict, tool_name: str,
+                              arguments: Dict) -> str:
+        """Async variant of :meth:`_call_mcp_tool`."""
         timeout = server_config.get('timeout_seconds', 30) or 30
+        request_data = {
+            'name': tool_name,
+            'arguments': arguments
+        }
         
         try:
-            # Build request
-            request_data = {
-                'name': tool_name,
-                'arguments': arguments
-            }
-            
-            req = urllib.request.Request(
-                call_endpoint,
-                data=json.dumps(request_data).encode('utf-8'),
-                method='POST'
+            response = await self._get_http_pool(server_config).apost_json(
+                self.CALL_ENDPOINT, request_data, timeout=timeout
             )
-            req.add_header('Content-Type', 'application/json')
-            req.add_header('Accept', 'application/json')
-            
-            # Add auth headers
-            auth_type = server_config.get('auth_type', 'none')
-            if auth_type and auth_type != 'none':
-                auth_config = json.loads(server_config.get('auth_config', '{}'))
-                if auth_type == 'bearer' and 'token' in auth_config:
-                    req.add_header('Authorization', f"Bearer {auth_config['token']}")
-                elif auth_type == 'api_key' and 'key' in auth_config and 'header' in auth_config:
-                    req.add_header(auth_config['header'], auth_config['key'])
-            
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                
-                # Extract result content
-                if isinstance(result, dict):
-                    if 'content' in result:
-                        content = result['content']
-                        if isinstance(content, list) and len(content) > 0:
-                            # Handle MCP content array format
-                            text_parts = [c.get('text', str(c)) for c in content if isinstance(c, dict)]
-                            return '\n'.join(text_parts) if text_parts else json.dumps(result)
-                        return str(content)
-                    elif 'result' in result:
-                        return json.dumps(result['result']) if isinstance(result['result'], (dict, list)) else str(result['result'])
-                    elif 'error' in result:
-                        return f"Error: {result['error']}"
-                
-                return json.dumps(result)
-                
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8') if e.fp else str(e)
-            return f"HTTP Error {e.code}: {error_body[:500]}"
-        except urllib.error.URLError as e:
-            return f"Connection Error: {e.reason}"
+            return self._format_mcp_response(response)
+        except requests.ConnectionError as e:
+            return f"Connection Error: {e}"
         except Exception as e:
             return f"Error calling tool: {str(e)}"
+    
+    @staticmethod
+    def _format_mcp_response(response) -> str:
+        """Convert an MCP tool call response into the tool's string output."""
+        if response.status_code >= 400:
+            return f"HTTP Error {response.status_code}: {response.text[:500]}"
+        
+        result = response.json()
+        
+        # Extract result content
+        if isinstance(result, dict):
+            if 'content' in result:
+                content = result['content']
+                if isinstance(content, list) and len(content) > 0:
+                    # Handle MCP content array format
+                    text_parts = [c.get('text', str(c)) for c in content if isinstance(c, dict)]
+                    return '\n'.join(text_parts) if text_parts else json.dumps(result)
+                return str(content)
+            elif 'result' in result:
+                return json.dumps(result['result']) if isinstance(result['result'], (dict, list)) else str(result['result'])
+            elif 'error' in result:
+                return f"Error: {result['error']}"
+        
+        return json.dumps(result)
 
 
 class CodeFragmentTool:
@@ -15,15 +15,21 @@ Ashutosh Sinha
 Version: 1.5.3
 """
 
+import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Callable, TypedDict, Annotated, Union
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from operator import add
 
+from abhikarta.utils.code_cache import compile_cached
+from abhikarta.llm_provider.response_cache import get_llm_response_cache, log_cache_hit
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -46,6 +52,9 @@ try:
         WORKFLOW_NODE_EXECUTIONS,
         WORKFLOW_NODE_DURATION,
         ACTIVE_WORKFLOWS,
+        CACHE_REQUESTS,
+        CACHE_EVICTIONS,
+        CACHE_SIZE,
     )
     _metrics_available = True
 except ImportError:
@@ -331,11 +340,46 @@ class LangGraphNodeFactory:
                 
                 logger.info(f"[NODE:{node_id}] LLM Input prompt ({len(prompt)} chars): {prompt[:500]}...")
                 
+                # Opt-in response cache: node config 'cache' (true/false/'always')
+                cache = get_llm_response_cache()
+                cache_key = None
+                cached = None
+                if cache.should_cache(temperature, node_config.get('cache')):
+                    bound = self._bound_llm_params(llm)
+                    cache_key = cache.make_key(
+                        provider or node_config.get('provider_id'),
+                        model or node_config.get('model_id'),
+                        messages, temperature, bound.get('tools'),
+                        max_tokens=max_tokens, bound=bound
+                    )
+                    cached = cache.get(cache_key)
+                
                 # Invoke LLM and measure time
                 start_time = time.time()
-                response = llm.invoke(messages)
-                duration_ms = (time.time() - start_time) * 1000
-                output = response.content if hasattr(response, 'content') else str(response)
+                if cached is not None:
+                    output = cached['content']
+                    duration_ms = (time.time() - start_time) * 1000
+                    logger.info(f"[NODE:{node_id}] LLM response served from cache")
+                    log_cache_hit(self.db_facade, provider, model, messages, cached,
+                                  execution_id=state.get('execution_id'),
+                                  temperature=temperature, max_tokens=max_tokens)
+                else:
+                    response = llm.invoke(messages)
+                    duration_ms = (time.time() - start_time) * 1000
+                    output = response.content if hasattr(response, 'content') else str(response)
+                    if cache_key:
+                        usage = getattr(response, 'usage_metadata', None) or {}
+                        cache.put(cache_key, {
+                            'content': output,
+                            'model': model or '',
+                            'provider': provider or '',
+                            'input_tokens': usage.get('input_tokens', 0),
+                            'output_tokens': usage.get('output_tokens', 0),
+                            'total_tokens': usage.get('total_tokens', 0),
+                            'latency_ms': int(duration_ms),
+                            'tool_calls': [],
+                            'finish_reason': 'stop'
+                        }, ttl_seconds=node_config.get('cache_ttl_seconds'))
                 
                 logger.info(f"[NODE:{node_id}] LLM Output ({len(output)} chars): {output[:500]}...")
                 
@@ -457,15 +501,51 @@ class LangGraphNodeFactory:
         
         return llm_node
     
+    @staticmethod
+    def _bound_llm_params(llm: Any) -> Dict[str, Any]:
+        """
+        Settings that shape an LLM's output, for response cache keys.
+        
+        Includes arguments bound with ``bind()``/``bind_tools()`` (tools,
+        stop, response_format, ...) and the model's own generation
+        parameters (top_p, seed, ...).
+        """
+        params = {}
+        bound = getattr(llm, 'kwargs', None)  # RunnableBinding
+        if isinstance(bound, dict):
+            params.update(bound)
+        identifying = getattr(getattr(llm, 'bound', llm), '_identifying_params', None)
+        if isinstance(identifying, dict):
+            params['model_params'] = identifying
+        return params
+    
     def _create_llm_from_config(self, provider: str, model: str, base_url: str = None,
                                 temperature: float = 0.7, api_key: str = None) -> Any:
         """
-        Create an LLM instance directly from config parameters.
+        Get an LLM instance directly from config parameters.
         
         This is used when the node has direct provider/model/base_url config
-        instead of database references.
+        instead of database references. Instances are shared through the
+        LLM client pool so repeated node invocations reuse connections.
         """
+        from .llm_factory import get_llm_client_pool, _with_rate_limit
+        
         provider = provider.lower()
+        return get_llm_client_pool().get_or_create(
+            provider=provider,
+            model=model,
+            factory=lambda: _with_rate_limit(
+                self._build_llm(provider, model, base_url, temperature, api_key),
+                provider, self.db_facade
+            ),
+            base_url=base_url,
+            api_key=api_key,
+            temperature=temperature
+        )
+    
+    def _build_llm(self, provider: str, model: str, base_url: str = None,
+                   temperature: float = 0.7, api_key: str = None) -> Any:
+        """Construct a new LangChain chat model for a provider."""
         logger.info(f"Creating LLM: provider={provider}, model={model}, base_url={base_url}")
         
         try:
@@ -730,8 +810,8 @@ class LangGraphNodeFactory:
                     'output': None  # Allow setting output directly
                 }
                 
-                # Execute code
-                exec(code, exec_globals)
+                # Execute code (compiled once per distinct source)
+                exec(compile_cached(code, origin=f"node:{node_id}"), exec_globals)
                 
                 # Get result - check both 'result' and 'output'
                 result = exec_globals.get('result') or exec_globals.get('output')
@@ -1585,6 +1665,164 @@ def create_workflow_graph(workflow_config: Dict, db_facade,
         raise
 
 
+# ============================================================================
+# Compiled Graph Cache
+# ============================================================================
+
+class CompiledGraphCache:
+    """
+    Process-wide LRU cache of compiled LangGraph workflow graphs.
+    
+    Entries are keyed by workflow_id plus a hash of the workflow definition,
+    so an edited definition never reuses a stale graph, and by the identity
+    of the facade and factories the graph was compiled against. Entries hold
+    those objects so their ids cannot be reused while cached. Explicit invalidation
+    (on update/delete) releases graphs that will no longer be requested.
+    Compiled graphs are stateless between invocations and safe to share.
+    """
+    
+    CACHE_NAME = 'workflow_graph'
+    
+    def __init__(self, max_size: int = 128, enabled: bool = True):
+        self.max_size = max(1, max_size)
+        self.enabled = enabled
+        self._graphs: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+    
+    @staticmethod
+    def definition_hash(workflow_config: Dict) -> str:
+        """Compute a stable hash of a workflow definition."""
+        payload = json.dumps(workflow_config, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get_or_create(self, workflow_id: str, workflow_config: Dict, db_facade,
+                      llm_factory=None, tool_factory=None) -> Any:
+        """
+        Return the compiled graph for a workflow, compiling it on a miss.
+        
+        Args:
+            workflow_id: Workflow ID
+            workflow_config: Workflow configuration with nodes and edges
+            db_facade: Database facade
+            llm_factory: Optional LLM factory
+            tool_factory: Optional tool factory
+            
+        Returns:
+            Compiled LangGraph StateGraph
+        """
+        if not self.enabled or not workflow_id:
+            return create_workflow_graph(workflow_config, db_facade, llm_factory, tool_factory)
+        
+        key = (workflow_id, self.definition_hash(workflow_config),
+               id(db_facade), id(llm_factory), id(tool_factory))
+        
+        with self._lock:
+            entry = self._graphs.get(key)
+            if entry is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                self._record('hit')
+                return entry[0]
+            self._misses += 1
+        self._record('miss')
+        
+        # Compile outside the lock; a concurrent miss at worst compiles twice
+        start = time.time()
+        graph = create_workflow_graph(workflow_config, db_facade, llm_factory, tool_factory)
+        logger.info(f"Compiled workflow graph {workflow_id} in {int((time.time() - start) * 1000)}ms")
+        
+        with self._lock:
+            # Drop older definitions of the same workflow; graphs compiled
+            # against other facades or factories stay
+            for stale in [k for k in self._graphs if k[0] == workflow_id and k[1] != key[1]]:
+                del self._graphs[stale]
+            self._graphs[key] = (graph, db_facade, llm_factory, tool_factory)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+                self._evictions += 1
+                if _metrics_available:
+                    CACHE_EVICTIONS.labels(cache=self.CACHE_NAME).inc()
+            size = len(self._graphs)
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(size)
+        return graph
+    
+    def invalidate(self, workflow_id: str = None) -> int:
+        """
+        Drop cached graphs for a workflow, or all graphs when no ID is given.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if workflow_id is None:
+                keys = list(self._graphs)
+            else:
+                keys = [k for k in self._graphs if k[0] == workflow_id]
+            for key in keys:
+                del self._graphs[key]
+            self._invalidations += len(keys)
+            size = len(self._graphs)
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(size)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} compiled graph(s) for {workflow_id or 'all workflows'}")
+        return len(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._graphs),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+    
+    def _record(self, result: str):
+        if _metrics_available:
+            CACHE_REQUESTS.labels(cache=self.CACHE_NAME, result=result).inc()
+
+
+_graph_cache: Optional[CompiledGraphCache] = None
+_graph_cache_lock = threading.Lock()
+
+
+def get_compiled_graph_cache() -> CompiledGraphCache:
+    """Get the global compiled graph cache."""
+    global _graph_cache
+    if _graph_cache is None:
+        with _graph_cache_lock:
+            if _graph_cache is None:
+                _graph_cache = CompiledGraphCache()
+    return _graph_cache
+
+
+def init_compiled_graph_cache(max_size: int = 128, enabled: bool = True) -> CompiledGraphCache:
+    """Initialize the global compiled graph cache."""
+    global _graph_cache
+    with _graph_cache_lock:
+        _graph_cache = CompiledGraphCache(max_size=max_size, enabled=enabled)
+    return _graph_cache
+
+
+def invalidate_workflow_graph(workflow_id: str = None) -> int:
+    """Invalidate cached compiled graphs after a workflow is edited or deleted."""
+    if _graph_cache is None:
+        return 0
+    return _graph_cache.invalidate(workflow_id)
+
+
 # ============================================================================
 # Workflow Executor
 # ============================================================================
@@ -1645,8 +1883,9 @@ class WorkflowGraphExecutor:
             result.status = 'running'
             result.metadata['workflow_name'] = workflow.get('name', workflow_id)
             
-            # Create and execute graph
-            graph = create_workflow_graph(
+            # Get compiled graph (cached per workflow definition)
+            graph = get_compiled_graph_cache().get_or_create(
+                workflow_id,
                 definition,
                 self.db_facade,
                 self.llm_factory,
@@ -21,11 +21,19 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor
 
+from abhikarta.llm_provider.rate_limiter import (
+    RateLimitTimeout, get_rate_limiter_registry, estimate_tokens
+)
+
 logger = logging.getLogger(__name__)
 
 # Thread pool for running sync LLM calls in async context
 _executor = ThreadPoolExecutor(max_workers=10)
 
+# Throttled callers block here while waiting for provider budget, so they
+# never hold the threads that run the LLM calls themselves
+_rate_limit_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='llm-rate-wait')
+
 
 @dataclass
 class LLMResponse:
@@ -68,6 +76,9 @@ class LLMConfig:
     # Provider-specific settings
     base_url: Optional[str] = None
     
+    # Rate-limit lane: interactive, normal, background (None = caller's context)
+    priority: Optional[str] = None
+    
     def __post_init__(self):
         """Load API key from environment if not provided."""
         if not self.api_key:
@@ -221,18 +232,15 @@ class LLMAdapter:
         # Use facade if available
         if self._facade:
             try:
-                # Run sync call in thread pool
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    _executor,
-                    lambda: self._facade.complete(
-                        messages=messages,
-                        model=self.config.model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        tools=tools,
-                        **kwargs
-                    )
+                # Shares the facade's pooled keep-alive transport
+                response = await self._facade.acomplete(
+                    messages=messages,
+                    model=self.config.model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    tools=tools,
+                    priority=self.config.priority,
+                    **kwargs
                 )
                 
                 return LLMResponse(
@@ -248,6 +256,8 @@ class LLMAdapter:
                     raw_response=response.raw_response
                 )
                 
+            except RateLimitTimeout:
+                raise
             except Exception as e:
                 logger.error(f"LLM generation error: {e}")
                 # Fall back to direct API call
@@ -288,17 +298,15 @@ class LLMAdapter:
         
         if self._facade:
             try:
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    _executor,
-                    lambda: self._facade.complete(
-                        messages=messages,
-                        model=self.config.model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        tools=tools,
-                        **kwargs
-                    )
+                # Shares the facade's pooled keep-alive transport
+                response = await self._facade.acomplete(
+                    messages=messages,
+                    model=self.config.model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    tools=tools,
+                    priority=self.config.priority,
+                    **kwargs
                 )
                 
                 return LLMResponse(
@@ -314,6 +322,8 @@ class LLMAdapter:
                     raw_response=response.raw_response
                 )
                 
+            except RateLimitTimeout:
+                raise
             except Exception as e:
                 logger.error(f"Chat error: {e}")
                 return await self._direct_call(
@@ -348,23 +358,33 @@ class LLMAdapter:
         
         start_time = time.time()
         
+        # The fallback hits the provider too, so it shares the provider budget
+        limiter = get_rate_limiter_registry().get_limiter(provider)
+        lease = None
+        if limiter:
+            loop = asyncio.get_running_loop()
+            lease = await loop.run_in_executor(
+                _rate_limit_executor, limiter.acquire,
+                estimate_tokens(messages, max_tokens), self.config.priority
+            )
+        
         try:
             if provider == 'openai':
                 base_url = self.config.base_url or 'https://api.openai.com/v1'
-                return await self._openai_call(
+                response = await self._openai_call(
                     base_url, api_key, model, messages, 
                     temperature, max_tokens, tools
                 )
             
             elif provider == 'anthropic':
-                return await self._anthropic_call(
+                response = await self._anthropic_call(
                     api_key, model, messages,
                     temperature, max_tokens, tools
                 )
             
             elif provider == 'ollama':
                 base_url = self.config.base_url or 'http://localhost:11434'
-                return await self._ollama_call(
+                response = await self._ollama_call(
                     base_url, model, messages,
                     temperature, max_tokens
                 )
@@ -372,13 +392,19 @@ class LLMAdapter:
             else:
                 # Generic OpenAI-compatible fallback
                 base_url = self.config.base_url or f'https://api.{provider}.com/v1'
-                return await self._openai_call(
+                response = await self._openai_call(
                     base_url, api_key, model, messages,
                     temperature, max_tokens, tools
                 )
+            
+            if lease:
+                lease.settle(response.total_tokens or None)
+            return response
                 
         except Exception as e:
             logger.error(f"Direct API call failed: {e}")
+            if lease:
+                lease.refund()
             return LLMResponse(
                 content=f"Error: {str(e)}",
                 model=model,
@@ -14,6 +14,47 @@ from .llm_facade import (
     AnthropicProvider,
     OllamaProvider
 )
+from .http_transport import (
+    HTTPTransport,
+    HTTPTransportError,
+    get_http_transport,
+    init_http_transport
+)
+from .llm_call_logger import (
+    LLMCallLogWriter,
+    get_llm_call_log_writer,
+    init_llm_call_log_writers,
+    flush_llm_call_log_writers,
+    shutdown_llm_call_log_writers
+)
+from .rate_limiter import (
+    ProviderRateLimiter,
+    RateLimiterRegistry,
+    RateLimitTimeout,
+    get_rate_limiter_registry,
+    init_llm_rate_limits,
+    llm_priority,
+    get_llm_priority,
+    set_llm_priority,
+    reset_llm_priority
+)
+from .response_cache import (
+    LLMResponseCache,
+    get_llm_response_cache,
+    init_llm_response_cache
+)
+from .tokenizer import (
+    Tokenizer,
+    HeuristicTokenizer,
+    TiktokenTokenizer,
+    ModelContextLimits,
+    register_tokenizer,
+    get_tokenizer,
+    count_tokens,
+    init_tokenizers,
+    get_model_context_limits,
+    init_model_context_limits
+)
 
 __all__ = [
     'LLMFacade',
@@ -21,5 +62,36 @@ __all__ = [
     'BaseLLMProvider',
     'OpenAIProvider',
     'AnthropicProvider',
-    'OllamaProvider'
+    'OllamaProvider',
+    'HTTPTransport',
+    'HTTPTransportError',
+    'get_http_transport',
+    'init_http_transport',
+    'LLMCallLogWriter',
+    'get_llm_call_log_writer',
+    'init_llm_call_log_writers',
+    'flush_llm_call_log_writers',
+    'shutdown_llm_call_log_writers',
+    'ProviderRateLimiter',
+    'RateLimiterRegistry',
+    'RateLimitTimeout',
+    'get_rate_limiter_registry',
+    'init_llm_rate_limits',
+    'llm_priority',
+    'get_llm_priority',
+    'set_llm_priority',
+    'reset_llm_priority',
+    'LLMResponseCache',
+    'get_llm_response_cache',
+    'init_llm_response_cache',
+    'Tokenizer',
+    'HeuristicTokenizer',
+    'TiktokenTokenizer',
+    'ModelContextLimits',
+    'register_tokenizer',
+    'get_tokenizer',
+    'count_tokens',
+    'init_tokenizers',
+    'get_model_context_limits',
+    'init_model_context_limits'
 ]
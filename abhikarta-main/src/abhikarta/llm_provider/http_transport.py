@@ -0,0 +1,377 @@
+"""
+HTTP Transport - Keep-alive connection pooling for LLM provider calls.
+
+Provider calls used to open a fresh connection (TCP + TLS handshake) for
+every request. The transport keeps a small pool of persistent
+``http.client`` connections per scheme/host/port, bounds the number of
+in-flight requests per host, and exposes an async entry point that runs on
+a bounded worker pool instead of spawning a thread per request.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import asyncio
+import contextvars
+import functools
+import http.client
+import json
+import logging
+import select
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+# Errors raised when a pooled keep-alive connection was closed by the peer
+# while idle. The request is retried once on a fresh connection if it was
+# never written, or at any point for idempotent methods.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Methods that are safe to send twice
+_IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+
+
+class HTTPTransportError(IOError):
+    """Raised when a provider endpoint returns a non-2xx status."""
+
+    def __init__(self, url: str, status: int, reason: str, body: str = ''):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.body = body
+        super().__init__(f"HTTP {status} {reason} from {url}: {body[:500]}")
+
+
+class HostConnectionPool:
+    """
+    Persistent connections to a single scheme/host/port.
+
+    At most ``max_connections`` requests are in flight at once; callers
+    beyond that block on a semaphore. Idle connections are reused LIFO and
+    dropped once they have been idle longer than ``idle_timeout_seconds``
+    or once the peer has closed them. A failed request on a reused
+    connection is retried once on a new one, unless it is not idempotent
+    (POST) and was already written: the server may have processed it.
+    """
+
+    def __init__(self, scheme: str, host: str, port: Optional[int],
+                 max_connections: int = 10, connect_timeout: float = 10.0,
+                 idle_timeout_seconds: float = 60.0,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_connections = max(1, max_connections)
+        self.connect_timeout = connect_timeout
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._ssl_context = ssl_context
+        self._idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._in_flight = 0
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self._created += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.connect_timeout,
+                context=self._ssl_context or ssl.create_default_context()
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) - an idle connection if one is fresh."""
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, idle_since = self._idle.pop()
+                if now - idle_since <= self.idle_timeout_seconds and not self._peer_closed(conn):
+                    self._reused += 1
+                    return conn, True
+                self._discarded += 1
+                conn.close()
+            return self._new_connection(), False
+
+    @staticmethod
+    def _peer_closed(conn: http.client.HTTPConnection) -> bool:
+        """True if an idle connection is readable, i.e. the peer closed it."""
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _checkin(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def request(self, method: str, path: str, body: Optional[bytes],
+                headers: Dict[str, str], timeout: float) -> Tuple[int, str, bytes]:
+        """
+        Send a request over a pooled connection.
+
+        Returns:
+            Tuple of (status, reason, body bytes)
+        """
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            for attempt in range(2):
+                conn, reused = self._checkout()
+                written = False
+                try:
+                    if conn.sock is None:
+                        conn.connect()
+                    conn.sock.settimeout(timeout)
+                    conn.request(method, path, body=body, headers=headers)
+                    written = True
+                    response = conn.getresponse()
+                    data = response.read()
+                except _STALE_CONNECTION_ERRORS:
+                    conn.close()
+                    retry_safe = not written or method.upper() in _IDEMPOTENT_METHODS
+                    if reused and attempt == 0 and retry_safe:
+                        # Peer closed the idle keep-alive socket; retry fresh
+                        with self._lock:
+                            self._discarded += 1
+                        continue
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+
+                if response.will_close:
+                    conn.close()
+                else:
+                    self._checkin(conn)
+                return response.status, response.reason, data
+            raise http.client.HTTPException(f"Could not send request to {self.host}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            for conn, _ in self._idle:
+                conn.close()
+            self._idle.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'host': f"{self.scheme}://{self.host}" + (f":{self.port}" if self.port else ''),
+                'max_connections': self.max_connections,
+                'in_flight': self._in_flight,
+                'idle': len(self._idle),
+                'created': self._created,
+                'reused': self._reused,
+                'discarded': self._discarded
+            }
+
+
+class HTTPTransport:
+    """
+    Shared keep-alive transport used by all LLMFacade providers.
+
+    Usage:
+        transport = get_http_transport()
+        result = transport.post_json(url, payload, headers={'Authorization': ...})
+        result = await transport.apost_json(url, payload)
+    """
+
+    def __init__(self, max_connections_per_host: int = 10,
+                 connect_timeout: float = 10.0,
+                 read_timeout: float = 120.0,
+                 idle_timeout_seconds: float = 60.0,
+                 async_workers: int = 32):
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.async_workers = max(1, async_workers)
+        self._pools: Dict[Tuple[str, str, Optional[int]], HostConnectionPool] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ssl_context = ssl.create_default_context()
+
+    def _get_pool(self, scheme: str, host: str, port: Optional[int]) -> HostConnectionPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = HostConnectionPool(
+                        scheme, host, port,
+                        max_connections=self.max_connections_per_host,
+                        connect_timeout=self.connect_timeout,
+                        idle_timeout_seconds=self.idle_timeout_seconds,
+                        ssl_context=self._ssl_context
+                    )
+                    self._pools[key] = pool
+        return pool
+
+    @staticmethod
+    def _uses_proxy(scheme: str, host: str) -> bool:
+        """True when environment proxy settings apply to this host."""
+        proxies = urllib.request.getproxies()
+        if scheme not in proxies:
+            return False
+        return not urllib.request.proxy_bypass(host)
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> bytes:
+        """
+        Perform an HTTP request and return the response body.
+
+        Raises:
+            HTTPTransportError: On non-2xx responses
+        """
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        timeout = timeout or self.read_timeout
+        headers = dict(headers or {})
+
+        if self._uses_proxy(scheme, parsed.hostname):
+            # Proxied requests keep using urllib, which handles CONNECT tunnels
+            req = urllib.request.Request(url, data=body, headers=headers, method=method)
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    return response.read()
+            except urllib.error.HTTPError as e:
+                raise HTTPTransportError(url, e.code, e.reason,
+                                         e.read().decode('utf-8', 'replace')) from e
+
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        headers.setdefault('Connection', 'keep-alive')
+
+        pool = self._get_pool(scheme, parsed.hostname, parsed.port)
+        status, reason, data = pool.request(method, path, body, headers, timeout)
+        if status >= 400:
+            raise HTTPTransportError(url, status, reason, data.decode('utf-8', 'replace'))
+        return data
+
+    def post_json(self, url: str, payload: Dict[str, Any],
+                  headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST a JSON payload and decode the JSON response."""
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/json')
+        data = self.request('POST', url, json.dumps(payload).encode('utf-8'),
+                            headers=headers, timeout=timeout)
+        return json.loads(data.decode('utf-8'))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.async_workers,
+                        thread_name_prefix='llm-http'
+                    )
+        return self._executor
+
+    async def run_async(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the transport's bounded worker pool.
+
+        Many coroutines can await LLM calls concurrently while the number of
+        OS threads stays fixed at ``async_workers``. The caller's context
+        variables (such as the rate-limit priority lane) are copied to the
+        worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(),
+                                          functools.partial(ctx.run, fn, *args, **kwargs))
+
+    async def apost_json(self, url: str, payload: Dict[str, Any],
+                         headers: Optional[Dict[str, str]] = None,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Async variant of :meth:`post_json`."""
+        return await self.run_async(self.post_json, url, payload, headers=headers, timeout=timeout)
+
+    def close(self):
+        """Close idle connections and stop the async worker pool."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            executor, self._executor = self._executor, None
+        for pool in pools:
+            pool.close()
+        if executor:
+            executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-host connection statistics."""
+        with self._lock:
+            pools = list(self._pools.values())
+        return {
+            'max_connections_per_host': self.max_connections_per_host,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout,
+            'async_workers': self.async_workers,
+            'hosts': [pool.get_stats() for pool in pools]
+        }
+
+
+# Global instance
+_http_transport: Optional[HTTPTransport] = None
+_http_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HTTPTransport:
+    """Get the global HTTP transport, creating it with defaults if needed."""
+    global _http_transport
+    if _http_transport is None:
+        with _http_transport_lock:
+            if _http_transport is None:
+                _http_transport = HTTPTransport()
+    return _http_transport
+
+
+def init_http_transport(max_connections_per_host: int = 10,
+                        connect_timeout: float = 10.0,
+                        read_timeout: float = 120.0,
+                        idle_timeout_seconds: float = 60.0,
+                        async_workers: int = 32) -> HTTPTransport:
+    """Initialize the global HTTP transport, replacing any existing one."""
+    global _http_transport
+    with _http_transport_lock:
+        if _http_transport is not None:
+            _http_transport.close()
+        _http_transport = HTTPTransport(
+            max_connections_per_host=max_connections_per_host,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            idle_timeout_seconds=idle_timeout_seconds,
+            async_workers=async_workers
+        )
+    return _http_transport
@@ -0,0 +1,300 @@
+"""
+LLM Call Logger - Asynchronous batched writer for the llm_calls table.
+
+LLMFacade used to INSERT one llm_calls row, and commit it, on the caller's
+thread after every completion. Rows are now put on a bounded in-memory
+queue and a background writer thread flushes them with ``execute_many`` in
+a single transaction every ``batch_size`` rows or ``flush_interval_ms``
+milliseconds, whichever comes first.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+INSERT_LLM_CALL_SQL = """
+    INSERT INTO llm_calls (
+        call_id, execution_id, agent_id, user_id,
+        provider, model, request_type,
+        system_prompt, user_prompt, messages,
+        response_content, tool_calls,
+        input_tokens, output_tokens, total_tokens,
+        cost_estimate, temperature, max_tokens,
+        latency_ms, status, error_message, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Column index of the messages payload, serialized on the writer thread
+_MESSAGES_COLUMN = 9
+
+
+class LLMCallLogWriter:
+    """
+    Background writer that batches llm_calls inserts.
+
+    Drop policies when the queue is full:
+        - drop_newest: discard the row being logged (default)
+        - drop_oldest: discard the oldest queued row to make room
+        - block: wait up to ``block_timeout_ms`` for space, then drop
+
+    Usage:
+        writer = LLMCallLogWriter(db_facade)
+        writer.submit(row)
+        writer.flush()
+    """
+
+    DROP_POLICIES = ('drop_newest', 'drop_oldest', 'block')
+
+    def __init__(self, db_facade, batch_size: int = 100,
+                 flush_interval_ms: int = 500, max_queue_size: int = 10000,
+                 drop_policy: str = 'drop_newest', block_timeout_ms: int = 100):
+        if drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.db_facade = db_facade
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self.max_queue_size = max(1, max_queue_size)
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout_ms / 1000.0
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=self.max_queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_requested = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+
+        self._thread = threading.Thread(target=self._run, name='llm-call-log-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, row: tuple) -> bool:
+        """
+        Queue a row for insertion.
+
+        Args:
+            row: Parameter tuple for INSERT_LLM_CALL_SQL; the messages column
+                may hold the raw list, which is JSON-encoded by the writer
+
+        Returns:
+            True if queued, False if dropped
+        """
+        if self._stop.is_set():
+            return self._drop()
+        with self._lock:
+            self._pending += 1
+        try:
+            if self.drop_policy == 'block':
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            if self.drop_policy != 'drop_oldest':
+                self._release(1)
+                return self._drop()
+            try:
+                self._queue.get_nowait()
+                self._release(1)
+                self._drop()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self._release(1)
+                return self._drop()
+        with self._lock:
+            self._submitted += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    def _drop(self) -> bool:
+        with self._lock:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 1000 == 0:
+                logger.warning(f"LLM call log queue full, dropped {self._dropped} rows")
+        return False
+
+    def _release(self, count: int):
+        with self._lock:
+            self._pending -= count
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        """Write everything currently queued, in batches."""
+        while True:
+            batch: List[tuple] = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            self._write(batch)
+            if len(batch) < self.batch_size:
+                return
+
+    def _write(self, batch: List[tuple]):
+        rows = []
+        for row in batch:
+            row = list(row)
+            if not isinstance(row[_MESSAGES_COLUMN], (str, type(None))):
+                row[_MESSAGES_COLUMN] = json.dumps(row[_MESSAGES_COLUMN], default=str)
+            rows.append(tuple(row))
+        try:
+            self.db_facade.execute_many(INSERT_LLM_CALL_SQL, rows)
+            with self._lock:
+                self._written += len(rows)
+                self._batches += 1
+            logger.debug(f"Logged {len(rows)} LLM calls")
+        except Exception as e:
+            with self._lock:
+                self._failed += len(rows)
+            logger.error(f"Failed to log {len(rows)} LLM calls: {e}")
+        finally:
+            self._release(len(batch))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until every queued row has been written (or failed).
+
+        Returns:
+            True if the queue drained before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        self._flush_requested.set()
+        with self._lock:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush queued rows and stop the writer thread."""
+        if self._stop.is_set():
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._flush_requested.set()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'max_queue_size': self.max_queue_size,
+                'batch_size': self.batch_size,
+                'flush_interval_ms': int(self.flush_interval * 1000),
+                'drop_policy': self.drop_policy,
+                'submitted': self._submitted,
+                'written': self._written,
+                'dropped': self._dropped,
+                'failed': self._failed,
+                'batches': self._batches
+            }
+
+
+# Writers are keyed by database facade; settings apply to writers created
+# after init_llm_call_log_writers().
+_writers: Dict[int, LLMCallLogWriter] = {}
+_writers_lock = threading.Lock()
+_writer_settings: Dict[str, Any] = {'enabled': True}
+
+
+def init_llm_call_log_writers(enabled: bool = True, batch_size: int = 100,
+                              flush_interval_ms: int = 500,
+                              max_queue_size: int = 10000,
+                              drop_policy: str = 'drop_newest',
+                              block_timeout_ms: int = 100):
+    """Configure the batched llm_calls writers."""
+    if drop_policy not in LLMCallLogWriter.DROP_POLICIES:
+        raise ValueError(f"Unknown drop policy: {drop_policy}")
+    shutdown_llm_call_log_writers()
+    with _writers_lock:
+        _writer_settings.clear()
+        _writer_settings.update(
+            enabled=enabled, batch_size=batch_size,
+            flush_interval_ms=flush_interval_ms, max_queue_size=max_queue_size,
+            drop_policy=drop_policy, block_timeout_ms=block_timeout_ms
+        )
+
+
+def get_llm_call_log_writer(db_facade) -> Optional[LLMCallLogWriter]:
+    """
+    Get the shared writer for a database facade.
+
+    Returns:
+        Writer, or None when batching is disabled or the facade does not
+        support execute_many (callers then insert synchronously)
+    """
+    if db_facade is None or not _writer_settings.get('enabled', True):
+        return None
+    if not hasattr(db_facade, 'execute_many'):
+        return None
+    key = id(db_facade)
+    writer = _writers.get(key)
+    if writer is None or writer.db_facade is not db_facade:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None or writer.db_facade is not db_facade:
+                settings = {k: v for k, v in _writer_settings.items() if k != 'enabled'}
+                writer = LLMCallLogWriter(db_facade, **settings)
+                _writers[key] = writer
+    return writer
+
+
+def flush_llm_call_log_writers(timeout: float = 5.0):
+    """Flush all writers without stopping them."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout)
+
+
+def shutdown_llm_call_log_writers(timeout: float = 5.0):
+    """Flush and stop all writers; called at process exit."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.shutdown(timeout)
+        except Exception as e:
+            logger.error(f"Error shutting down LLM call log writer: {e}")
+
+
+def get_llm_call_log_stats() -> List[Dict[str, Any]]:
+    """Get statistics for all active writers."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    return [writer.get_stats() for writer in writers]
+
+
+atexit.register(shutdown_llm_call_log_writers)
@@ -13,6 +13,11 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
+from .http_transport import get_http_transport
+from .llm_call_logger import INSERT_LLM_CALL_SQL, get_llm_call_log_writer
+from .rate_limiter import get_rate_limiter_registry, estimate_tokens
+from .response_cache import get_llm_response_cache, log_cache_hit
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -45,6 +50,7 @@ class LLMResponse:
     tool_calls: List[Dict] = field(default_factory=list)
     finish_reason: str = 'stop'
     raw_response: Dict = field(default_factory=dict)
+    cached: bool = False  # served from the response cache; no tokens were spent
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -56,7 +62,8 @@ class LLMResponse:
             'total_tokens': self.total_tokens,
             'latency_ms': self.latency_ms,
             'tool_calls': self.tool_calls,
-            'finish_reason': self.finish_reason
+            'finish_reason': self.finish_reason,
+            'cached': self.cached
         }
 
 
@@ -76,6 +83,20 @@ class BaseLLMProvider(ABC):
     def get_provider_name(self) -> str:
         """Get provider name."""
         pass
+    
+    async def acomplete(self, messages: List[Dict], **kwargs) -> LLMResponse:
+        """Async completion; runs on the shared transport's bounded worker pool."""
+        return await get_http_transport().run_async(self.complete, messages, **kwargs)
+    
+    def _post_json(self, url: str, payload: Dict, headers: Dict[str, str],
+                   timeout: float = None) -> Dict[str, Any]:
+        """POST JSON over the shared keep-alive transport.
+        
+        A ``timeout`` passed to the provider's constructor overrides the
+        per-provider default.
+        """
+        timeout = self.config.get('timeout') or timeout
+        return get_http_transport().post_json(url, payload, headers=headers, timeout=timeout)
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -90,9 +111,6 @@ class OpenAIProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using OpenAI API."""
-        import urllib.request
-        import urllib.error
-        
         model = kwargs.get('model', 'gpt-4o')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -111,18 +129,16 @@ class OpenAIProvider(BaseLLMProvider):
             if kwargs.get('tools'):
                 request_data['tools'] = kwargs['tools']
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -159,8 +175,6 @@ class AnthropicProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Anthropic API."""
-        import urllib.request
-        
         model = kwargs.get('model', 'claude-3-5-sonnet-20241022')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -190,19 +204,17 @@ class AnthropicProvider(BaseLLMProvider):
             if kwargs.get('tools'):
                 request_data['tools'] = kwargs['tools']
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/messages",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'x-api-key': self.api_key,
                     'anthropic-version': '2023-06-01'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             content_blocks = result.get('content', [])
@@ -251,8 +263,6 @@ class OllamaProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Ollama API."""
-        import urllib.request
-        
         model = kwargs.get('model', self.DEFAULT_MODEL)
         temperature = kwargs.get('temperature', 0.7)
         
@@ -268,15 +278,13 @@ class OllamaProvider(BaseLLMProvider):
                 }
             }
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/api/chat",
-                data=json.dumps(request_data).encode('utf-8'),
-                headers={'Content-Type': 'application/json'}
+                request_data,
+                headers={'Content-Type': 'application/json'},
+                timeout=300
             )
             
-            with urllib.request.urlopen(req, timeout=300) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             message = result.get('message', {})
@@ -310,8 +318,6 @@ class GoogleProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Google Gemini API."""
-        import urllib.request
-        
         model = kwargs.get('model', 'gemini-1.5-pro')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -346,15 +352,13 @@ class GoogleProvider(BaseLLMProvider):
                 request_data['systemInstruction'] = {'parts': [{'text': system_instruction}]}
             
             url = f"{self.base_url}/models/{model}:generateContent?key={self.api_key}"
-            req = urllib.request.Request(
+            result = self._post_json(
                 url,
-                data=json.dumps(request_data).encode('utf-8'),
-                headers={'Content-Type': 'application/json'}
+                request_data,
+                headers={'Content-Type': 'application/json'},
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             candidates = result.get('candidates', [{}])
@@ -394,8 +398,6 @@ class MistralProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Mistral API."""
-        import urllib.request
-        
         model = kwargs.get('model', 'mistral-large-latest')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -413,18 +415,16 @@ class MistralProvider(BaseLLMProvider):
             if kwargs.get('tools'):
                 request_data['tools'] = kwargs['tools']
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -461,8 +461,6 @@ class CohereProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Cohere API."""
-        import urllib.request
-        
         model = kwargs.get('model', 'command-r-plus')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -502,18 +500,16 @@ class CohereProvider(BaseLLMProvider):
             if preamble:
                 request_data['preamble'] = preamble
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             meta = result.get('meta', {})
@@ -548,8 +544,6 @@ class GroqProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Groq API (OpenAI-compatible)."""
-        import urllib.request
-        
         model = kwargs.get('model', 'llama-3.3-70b-versatile')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -564,18 +558,16 @@ class GroqProvider(BaseLLMProvider):
                 'max_tokens': max_tokens
             }
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=60
             )
             
-            with urllib.request.urlopen(req, timeout=60) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -611,8 +603,6 @@ class TogetherProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Together API (OpenAI-compatible)."""
-        import urllib.request
-        
         model = kwargs.get('model', 'meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -627,18 +617,16 @@ class TogetherProvider(BaseLLMProvider):
                 'max_tokens': max_tokens
             }
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -674,8 +662,6 @@ class DeepSeekProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using DeepSeek API (OpenAI-compatible)."""
-        import urllib.request
-        
         model = kwargs.get('model', 'deepseek-chat')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -690,18 +676,16 @@ class DeepSeekProvider(BaseLLMProvider):
                 'max_tokens': max_tokens
             }
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -737,8 +721,6 @@ class PerplexityProvider(BaseLLMProvider):
     
     def complete(self, messages: List[Dict], **kwargs) -> LLMResponse:
         """Generate completion using Perplexity API."""
-        import urllib.request
-        
         model = kwargs.get('model', 'llama-3.1-sonar-large-128k-online')
         temperature = kwargs.get('temperature', 0.7)
         max_tokens = kwargs.get('max_tokens', 2000)
@@ -753,18 +735,16 @@ class PerplexityProvider(BaseLLMProvider):
                 'max_tokens': max_tokens
             }
             
-            req = urllib.request.Request(
+            result = self._post_json(
                 f"{self.base_url}/chat/completions",
-                data=json.dumps(request_data).encode('utf-8'),
+                request_data,
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}'
-                }
+                },
+                timeout=120
             )
             
-            with urllib.request.urlopen(req, timeout=120) as response:
-                result = json.loads(response.read().decode('utf-8'))
-            
             latency_ms = int((time.time() - start_time) * 1000)
             
             choice = result.get('choices', [{}])[0]
@@ -868,18 +848,52 @@ class LLMFacade:
             model: Model name
             execution_id: Associated execution ID for logging
             agent_id: Associated agent ID for logging
-            **kwargs: Additional provider-specific parameters
+            **kwargs: Additional provider-specific parameters; ``priority``
+                (interactive, normal, background) selects the rate-limit lane
+                and ``cache`` (True, False, 'always') overrides the response
+                cache policy
             
         Returns:
             LLMResponse object
+            
+        Raises:
+            RateLimitTimeout: Provider budget did not free up in time
         """
         provider_name = provider or self.default_provider
+        priority = kwargs.pop('priority', None)
+        cache_mode = kwargs.pop('cache', None)
         
         if provider_name not in self.providers:
             raise ValueError(f"Provider not configured: {provider_name}")
         
         llm_provider = self.providers[provider_name]
         
+        # Serve repeated prompts from the response cache (hits cost nothing)
+        cache = get_llm_response_cache()
+        cache_key = None
+        if cache.should_cache(kwargs.get('temperature'), cache_mode):
+            # Every generation setting (stop, top_p, seed, response_format, ...) is keyed
+            params = {k: v for k, v in kwargs.items() if k not in ('temperature', 'tools')}
+            cache_key = cache.make_key(provider_name, model, messages,
+                                       kwargs.get('temperature'), kwargs.get('tools'), **params)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                log_cache_hit(self.db_facade, provider_name, model, messages, cached,
+                              execution_id=execution_id, agent_id=agent_id,
+                              user_id=self.user_id, temperature=kwargs.get('temperature'),
+                              max_tokens=kwargs.get('max_tokens'))
+                if _metrics_available:
+                    LLM_REQUESTS.labels(provider=provider_name, model=model or 'unknown',
+                                        status='cached').inc()
+                return LLMResponse(**{**cached, 'latency_ms': 0, 'input_tokens': 0,
+                                      'output_tokens': 0, 'total_tokens': 0, 'cached': True})
+        
+        # Wait for provider budget before the call so queueing is not counted as latency
+        limiter = get_rate_limiter_registry().get_limiter(provider_name, self.db_facade)
+        lease = None
+        if limiter:
+            lease = limiter.acquire(estimate_tokens(messages, kwargs.get('max_tokens')), priority)
+        
         # Extract prompts for logging
         system_prompt = None
         user_prompt = None
@@ -897,11 +911,17 @@ class LLMFacade:
         
         try:
             response = llm_provider.complete(messages, model=model, **kwargs)
+            if lease:
+                lease.settle(response.total_tokens or None)
+            if cache_key and response.finish_reason != 'error':
+                cache.put(cache_key, response.to_dict())
             
         except Exception as e:
             status = 'failed'
             error_message = str(e)
             logger.error(f"LLM call failed: {e}")
+            if lease:
+                lease.refund()
             
             # Track error metrics
             if _metrics_available:
@@ -961,6 +981,27 @@ class LLMFacade:
         
         return response
     
+    async def acomplete(
+        self,
+        messages: List[Dict],
+        provider: str = None,
+        model: str = None,
+        execution_id: str = None,
+        agent_id: str = None,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Async variant of :meth:`complete` with the same logging and metrics.
+        
+        Calls share the pooled keep-alive connections and run on a bounded
+        worker pool, so many coroutines can await completions concurrently
+        without a thread per request.
+        """
+        return await get_http_transport().run_async(
+            self.complete, messages, provider=provider, model=model,
+            execution_id=execution_id, agent_id=agent_id, **kwargs
+        )
+    
     def _log_call(
         self,
         call_id: str,
@@ -977,7 +1018,7 @@ class LLMFacade:
         error_message: str,
         kwargs: Dict
     ):
-        """Log LLM call to database."""
+        """Log LLM call to database (queued for the batched writer)."""
         if not self.db_facade:
             return
         
@@ -988,17 +1029,7 @@ class LLMFacade:
             total_tokens = response.total_tokens if response else 0
             cost = self._calculate_cost(provider, model, input_tokens, output_tokens)
             
-            self.db_facade.execute("""
-                INSERT INTO llm_calls (
-                    call_id, execution_id, agent_id, user_id,
-                    provider, model, request_type,
-                    system_prompt, user_prompt, messages,
-                    response_content, tool_calls,
-                    input_tokens, output_tokens, total_tokens,
-                    cost_estimate, temperature, max_tokens,
-                    latency_ms, status, error_message, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            row = (
                 call_id,
                 execution_id,
                 agent_id,
@@ -1008,7 +1039,7 @@ class LLMFacade:
                 'chat',
                 system_prompt,
                 user_prompt,
-                json.dumps(messages),
+                list(messages),
                 response.content if response else None,
                 json.dumps(response.tool_calls) if response and response.tool_calls else None,
                 input_tokens,
@@ -1021,7 +1052,16 @@ class LLMFacade:
                 status,
                 error_message,
                 json.dumps({'finish_reason': response.finish_reason if response else None})
-            ))
+            )
+            
+            # Hand off to the batched writer so callers never wait on a commit
+            writer = get_llm_call_log_writer(self.db_facade)
+            if writer:
+                writer.submit(row)
+                return
+            
+            row = row[:9] + (json.dumps(messages),) + row[10:]
+            self.db_facade.execute(INSERT_LLM_CALL_SQL, row)
             
             logger.debug(f"Logged LLM call: {call_id}")
             
@@ -0,0 +1,398 @@
+"""
+LLM Rate Limiter - Provider request and token budgets.
+
+``llm_providers`` stores ``rate_limit_rpm`` and ``rate_limit_tpm`` for every
+provider, but nothing consulted them, so bursts from swarms and workflows
+ran into provider 429s and retry storms. Every LLMFacade completion, the
+LLMAdapter direct-call fallback and pooled LangChain chat models now take a
+lease from the provider's limiter before the request is sent:
+
+- Requests are paced with a token bucket (GCRA form): at most ``rpm`` per
+  minute, with a burst of ``burst_seconds`` worth of requests. Requests are
+  spaced evenly across the minute, so throughput tracks the limit instead
+  of spending the whole allowance in a burst and then stalling.
+- Tokens are counted in a sliding 60 second window. A lease reserves an
+  estimate (prompt characters / 4 + ``max_tokens``), and the estimate is
+  replaced with the usage reported in the response.
+- Waiters are served by priority lane, then arrival order. ``interactive``
+  (web requests) goes before ``normal``, which goes before ``background``
+  (swarm agents).
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+try:
+    from abhikarta.monitoring import LLM_RATE_LIMIT_WAIT, LLM_THROTTLED_REQUESTS
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+# Lower value is served first
+PRIORITY_LANES = {'interactive': 0, 'normal': 1, 'background': 2}
+DEFAULT_PRIORITY = 'normal'
+
+_current_priority: ContextVar[str] = ContextVar('llm_priority', default=DEFAULT_PRIORITY)
+
+
+def get_llm_priority() -> str:
+    """Priority lane for LLM calls made from the current context."""
+    return _current_priority.get()
+
+
+def set_llm_priority(priority: str) -> Token:
+    """Set the lane for the current context; returns a token for reset."""
+    if priority not in PRIORITY_LANES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    return _current_priority.set(priority)
+
+
+def reset_llm_priority(token: Token):
+    """Restore the lane that was active before :func:`set_llm_priority`."""
+    _current_priority.reset(token)
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Run a block of LLM calls in a priority lane."""
+    token = set_llm_priority(priority)
+    try:
+        yield
+    finally:
+        reset_llm_priority(token)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]] = None, max_tokens: int = None) -> int:
+    """Rough pre-call token estimate: prompt characters / 4 plus max_tokens."""
+    chars = 0
+    for message in messages or []:
+        content = message.get('content') if isinstance(message, dict) else message
+        chars += len(content) if isinstance(content, str) else len(str(content or ''))
+    return chars // 4 + (max_tokens or 0)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call waited longer than ``max_wait_seconds`` for budget."""
+
+
+class RateLimitLease:
+    """Admission for one LLM request; settle with the actual token usage."""
+
+    __slots__ = ('limiter', 'priority', 'wait_seconds', '_entry')
+
+    def __init__(self, limiter: 'ProviderRateLimiter', priority: str,
+                 wait_seconds: float, entry: Optional[list]):
+        self.limiter = limiter
+        self.priority = priority
+        self.wait_seconds = wait_seconds
+        self._entry = entry
+
+    def settle(self, total_tokens: Optional[int]):
+        """Replace the reserved estimate with the tokens the provider reported."""
+        entry, self._entry = self._entry, None
+        if entry is not None and total_tokens is not None:
+            self.limiter._settle(entry, max(0, int(total_tokens)))
+
+    def refund(self):
+        """Release the reserved tokens after a failed call; the request still counts."""
+        self.settle(0)
+
+
+class ProviderRateLimiter:
+    """
+    Request and token budget for one provider, shared process-wide.
+
+    A limit of 0 disables that dimension.
+
+    Usage:
+        lease = limiter.acquire(tokens=estimate_tokens(messages, 1000))
+        response = provider.complete(messages)
+        lease.settle(response.total_tokens)
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0,
+                 burst_seconds: float = 1.0, max_wait_seconds: float = 300.0):
+        self.name = name
+        self.burst_seconds = max(0.0, burst_seconds)
+        self.max_wait_seconds = max_wait_seconds
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+        self._tat = 0.0                       # theoretical arrival time (GCRA)
+        self._token_log: deque = deque()     # [timestamp, tokens] entries
+        self._window_tokens = 0
+        self._admitted = 0
+        self._throttled = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self.configure(rpm, tpm)
+
+    def configure(self, rpm: int = 0, tpm: int = 0):
+        """Update limits in place (e.g. after the provider row is edited)."""
+        with self._cond:
+            self.rpm = max(0, int(rpm or 0))
+            self.tpm = max(0, int(tpm or 0))
+            self._interval = 60.0 / self.rpm if self.rpm else 0.0
+            self._burst = max(1.0, self.rpm * self.burst_seconds / 60.0)
+            self._cond.notify_all()
+
+    @property
+    def unlimited(self) -> bool:
+        return not self.rpm and not self.tpm
+
+    def acquire(self, tokens: int = 0, priority: str = None,
+                timeout: float = None) -> RateLimitLease:
+        """
+        Block until the request fits the provider budget.
+
+        Args:
+            tokens: Estimated tokens (prompt + completion) to reserve
+            priority: Lane (interactive, normal, background); defaults to
+                the current context's lane
+            timeout: Maximum wait; defaults to ``max_wait_seconds``
+
+        Raises:
+            RateLimitTimeout: Budget did not free up within the timeout
+        """
+        priority = priority if priority in PRIORITY_LANES else get_llm_priority()
+        timeout = self.max_wait_seconds if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            waiter = (PRIORITY_LANES[priority], next(self._seq))
+            heapq.heappush(self._waiters, waiter)
+            # A higher-priority arrival takes over the head of the queue
+            self._cond.notify_all()
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = None
+                    if self._waiters[0] is waiter:
+                        delay = self._admission_delay(now, tokens)
+                        if delay <= 0:
+                            heapq.heappop(self._waiters)
+                            entry = self._admit(now, tokens)
+                            self._cond.notify_all()
+                            break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise RateLimitTimeout(
+                            f"Rate limit for {self.name} not available within {timeout}s")
+                    self._cond.wait(remaining if delay is None else min(delay, remaining))
+            except BaseException:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+            waited = time.monotonic() - start
+            self._admitted += 1
+            self._wait_time += waited
+            if waited > 0.001:
+                self._throttled += 1
+
+        if _metrics_available:
+            LLM_RATE_LIMIT_WAIT.labels(provider=self.name, priority=priority).observe(waited)
+            if waited > 0.001:
+                LLM_THROTTLED_REQUESTS.labels(provider=self.name, priority=priority).inc()
+        return RateLimitLease(self, priority, waited, entry)
+
+    def _admission_delay(self, now: float, tokens: int) -> float:
+        """Seconds until a request reserving ``tokens`` may be sent."""
+        delay = 0.0
+        if self._interval:
+            allowed_at = self._tat - (self._burst - 1.0) * self._interval
+            delay = max(delay, allowed_at - now)
+        if self.tpm:
+            self._expire(now)
+            # A request larger than the whole budget goes alone in an empty window
+            needed = self._window_tokens + min(tokens, self.tpm) - self.tpm
+            if needed > 0 and self._token_log:
+                freed = 0
+                for ts, used in self._token_log:
+                    freed += used
+                    if freed >= needed:
+                        delay = max(delay, ts + self.WINDOW_SECONDS - now)
+                        break
+        return delay
+
+    def _admit(self, now: float, tokens: int) -> Optional[list]:
+        if self._interval:
+            self._tat = max(self._tat, now) + self._interval
+        if not self.tpm:
+            return None
+        entry = [now, tokens]
+        self._token_log.append(entry)
+        self._window_tokens += tokens
+        return entry
+
+    def _expire(self, now: float):
+        cutoff = now - self.WINDOW_SECONDS
+        while self._token_log and self._token_log[0][0] <= cutoff:
+            self._window_tokens -= self._token_log.popleft()[1]
+
+    def _settle(self, entry: list, tokens: int):
+        with self._cond:
+            now = time.monotonic()
+            self._expire(now)
+            # Entries still inside the window have not been expired yet
+            if entry[0] > now - self.WINDOW_SECONDS:
+                self._window_tokens += tokens - entry[1]
+            entry[1] = tokens
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        with self._cond:
+            self._expire(time.monotonic())
+            return {
+                'provider': self.name,
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'window_tokens': self._window_tokens,
+                'waiting': len(self._waiters),
+                'admitted': self._admitted,
+                'throttled': self._throttled,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': (self._wait_time / self._admitted * 1000
+                                if self._admitted else 0.0)
+            }
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide limiters keyed by provider type (openai, anthropic, ...).
+
+    Limits come from the active ``llm_providers`` rows. When several rows
+    share a provider type, the lowest non-zero limit wins.
+    """
+
+    def __init__(self, enabled: bool = True, burst_seconds: float = 1.0,
+                 max_wait_seconds: float = 300.0):
+        self.enabled = enabled
+        self.burst_seconds = burst_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._limiters: Dict[str, ProviderRateLimiter] = {}
+        self._loaded_from: set = set()
+        self._db_providers: set = set()  # Provider types whose limits came from llm_providers
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, rpm: int = 0, tpm: int = 0) -> ProviderRateLimiter:
+        """Set limits for a provider type."""
+        provider = (provider or '').lower()
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limiter = ProviderRateLimiter(provider, rpm, tpm,
+                                              burst_seconds=self.burst_seconds,
+                                              max_wait_seconds=self.max_wait_seconds)
+                self._limiters[provider] = limiter
+            else:
+                limiter.configure(rpm, tpm)
+        return limiter
+
+    def load_from_db(self, db_facade) -> int:
+        """
+        Load limits from llm_providers; returns the number of provider types.
+
+        Safe to call again after providers are created, edited or deleted:
+        limiters update in place, and provider types that no longer have an
+        active row lose the limits they got from the database.
+        """
+        rows = db_facade.fetch_all(
+            "SELECT provider_type, rate_limit_rpm, rate_limit_tpm FROM llm_providers WHERE is_active = 1"
+        ) or []
+        limits: Dict[str, List[int]] = {}
+        for row in rows:
+            provider = (row.get('provider_type') or '').lower()
+            if not provider:
+                continue
+            current = limits.setdefault(provider, [0, 0])
+            for i, key in enumerate(('rate_limit_rpm', 'rate_limit_tpm')):
+                value = int(row.get(key) or 0)
+                if value and (not current[i] or value < current[i]):
+                    current[i] = value
+        for provider, (rpm, tpm) in limits.items():
+            self.configure(provider, rpm, tpm)
+        with self._lock:
+            removed = self._db_providers - set(limits)
+            self._db_providers = set(limits)
+            self._loaded_from.add(id(db_facade))
+        for provider in removed:
+            self.configure(provider, 0, 0)
+        logger.debug(f"Loaded rate limits for {len(limits)} provider type(s)")
+        return len(limits)
+
+    def get_limiter(self, provider: str, db_facade=None) -> Optional[ProviderRateLimiter]:
+        """
+        Get the limiter for a provider type.
+
+        Returns:
+            Limiter, or None when limiting is disabled or the provider has no limits
+        """
+        if not self.enabled or not provider:
+            return None
+        provider = provider.lower()
+        limiter = self._limiters.get(provider)
+        if limiter is None and db_facade is not None and id(db_facade) not in self._loaded_from:
+            try:
+                self.load_from_db(db_facade)
+            except Exception as e:
+                logger.warning(f"Could not load LLM rate limits: {e}")
+                with self._lock:
+                    self._loaded_from.add(id(db_facade))
+            limiter = self._limiters.get(provider)
+        if limiter is None or limiter.unlimited:
+            return None
+        return limiter
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get statistics for all configured limiters."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.get_stats() for limiter in limiters]
+
+
+_registry: Optional[RateLimiterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """Get the global rate limiter registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RateLimiterRegistry()
+    return _registry
+
+
+def init_llm_rate_limits(db_facade=None, enabled: bool = True,
+                         burst_seconds: float = 1.0,
+                         max_wait_seconds: float = 300.0) -> RateLimiterRegistry:
+    """Initialize the global registry, optionally loading limits from the database."""
+    global _registry
+    registry = RateLimiterRegistry(enabled=enabled, burst_seconds=burst_seconds,
+                                   max_wait_seconds=max_wait_seconds)
+    if db_facade is not None and enabled:
+        registry.load_from_db(db_facade)
+    with _registry_lock:
+        _registry = registry
+    return registry
@@ -0,0 +1,383 @@
+"""
+LLM Response Cache - Reuse completions for repeated prompts.
+
+Workflows send the same system prompt and templated input through
+LLMFacade.complete and the LangGraph llm node over and over, and each
+call is a paid, multi-second round trip. Completions can now be cached
+under a key built from provider, model, normalized messages, temperature
+and tools:
+
+- An in-process LRU, bounded by ``max_size``, with a TTL.
+- An optional SQLite tier (``disk_path``) that survives restarts and is
+  shared by worker processes.
+- Caching is opt-in. ``llm.response.cache.enabled`` sets the default,
+  and a per-call or per-node ``cache`` setting overrides it.
+- Calls with temperature > 0 (or no temperature) skip the cache unless
+  ``cache_nonzero_temperature`` is set or the caller passes
+  ``cache='always'``.
+
+Hits are logged to llm_calls with zero tokens and zero cost, and carry
+``cache_hit`` in the row metadata, so usage dashboards only count real
+provider traffic.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Union
+
+from .llm_call_logger import INSERT_LLM_CALL_SQL, get_llm_call_log_writer
+
+logger = logging.getLogger(__name__)
+
+try:
+    from abhikarta.monitoring import CACHE_REQUESTS, CACHE_EVICTIONS, CACHE_SIZE
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+# LangChain-style roles map onto the provider roles
+_ROLE_ALIASES = {'human': 'user', 'ai': 'assistant'}
+
+
+def normalize_messages(messages: List[Any]) -> List[Dict[str, str]]:
+    """
+    Canonical form of a message list for cache keys.
+
+    Accepts provider dicts, LangChain ``(role, content)`` tuples and message
+    objects. Roles are lower-cased and aliased; content has line endings
+    unified and surrounding whitespace stripped.
+    """
+    normalized = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            role, content = message.get('role', ''), message.get('content', '')
+        elif isinstance(message, (tuple, list)) and len(message) == 2:
+            role, content = message
+        else:
+            role = getattr(message, 'type', '') or getattr(message, 'role', '')
+            content = getattr(message, 'content', message)
+        role = str(role).lower()
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        normalized.append({
+            'role': _ROLE_ALIASES.get(role, role),
+            'content': content.replace('\r\n', '\n').strip()
+        })
+    return normalized
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of LLM completions.
+
+    Payloads are plain dicts (content, tool_calls, token counts, ...).
+
+    Usage:
+        cache = get_llm_response_cache()
+        if cache.should_cache(temperature, override=node_config.get('cache')):
+            key = cache.make_key(provider, model, messages, temperature)
+            payload = cache.get(key)
+    """
+
+    CACHE_NAME = 'llm_response'
+    # Disk writes between trims of expired and surplus rows; the file may
+    # exceed disk_max_entries by up to this many rows in between
+    DISK_TRIM_INTERVAL = 100
+
+    def __init__(self, enabled: bool = False, max_size: int = 1000,
+                 ttl_seconds: int = 3600, cache_nonzero_temperature: bool = False,
+                 disk_path: str = None, disk_max_entries: int = 100000):
+        self.enabled = enabled
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, payload)
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._stores = 0
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._disk_puts = 0
+        self.disk_path = disk_path
+        if disk_path:
+            self._open_disk(disk_path)
+
+    # -------------------------------------------------------------------------
+    # Policy and keys
+    # -------------------------------------------------------------------------
+
+    def should_cache(self, temperature: Optional[float],
+                     override: Union[bool, str, None] = None) -> bool:
+        """
+        Decide whether a call may use the cache.
+
+        Args:
+            temperature: Sampling temperature of the call (None = provider default)
+            override: Per-call/per-node setting; True opts in, False opts out,
+                'always' opts in even for temperature > 0
+        """
+        if override is False or (override is None and not self.enabled):
+            return False
+        if override == 'always' or self.cache_nonzero_temperature:
+            return True
+        return temperature is not None and float(temperature) == 0.0
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: List[Any],
+                 temperature: Optional[float] = None, tools: Any = None,
+                 **params) -> str:
+        """Cache key for a completion request."""
+        material = {
+            'provider': (provider or '').lower(),
+            'model': model or '',
+            'messages': normalize_messages(messages),
+            'temperature': None if temperature is None else float(temperature),
+            'tools': tools or None,
+            'params': {k: v for k, v in params.items() if v is not None}
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    self._record('hit')
+                    return entry[1]
+                del self._entries[key]
+                self._update_size()
+
+        payload = self._disk_get(key, now)
+        if payload is not None:
+            with self._lock:
+                self._disk_hits += 1
+                self._store_memory(key, payload, now + self.ttl_seconds)
+            self._record('hit')
+            return payload
+
+        with self._lock:
+            self._misses += 1
+        self._record('miss')
+        return None
+
+    def put(self, key: str, payload: Dict[str, Any], ttl_seconds: int = None):
+        """Store a payload in both tiers."""
+        expires_at = time.time() + (ttl_seconds or self.ttl_seconds)
+        with self._lock:
+            self._store_memory(key, payload, expires_at)
+            self._stores += 1
+        self._disk_put(key, payload, expires_at)
+
+    def _store_memory(self, key: str, payload: Dict[str, Any], expires_at: float):
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+            if _metrics_available:
+                CACHE_EVICTIONS.labels(cache=self.CACHE_NAME).inc()
+        self._update_size()
+
+    def clear(self):
+        """Drop every cached completion."""
+        with self._lock:
+            self._entries.clear()
+            self._update_size()
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.execute("DELETE FROM llm_response_cache")
+                self._disk.commit()
+
+    # -------------------------------------------------------------------------
+    # SQLite tier
+    # -------------------------------------------------------------------------
+
+    def _open_disk(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._disk = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute("PRAGMA synchronous=NORMAL")
+        self._disk.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._disk.execute("CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires "
+                           "ON llm_response_cache(expires_at)")
+        self._trim_disk()
+        self._disk.commit()
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        if self._disk is None:
+            return None
+        try:
+            with self._disk_lock:
+                row = self._disk.execute(
+                    "SELECT payload, expires_at FROM llm_response_cache WHERE cache_key = ?",
+                    (key,)
+                ).fetchone()
+            if row and row[1] > now:
+                return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"LLM response cache disk read failed: {e}")
+        return None
+
+    def _disk_put(self, key: str, payload: Dict[str, Any], expires_at: float):
+        if self._disk is None:
+            return
+        try:
+            with self._disk_lock:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache (cache_key, payload, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(payload, default=str), expires_at)
+                )
+                self._disk_puts += 1
+                if self._disk_puts % self.DISK_TRIM_INTERVAL == 0:
+                    self._trim_disk()
+                self._disk.commit()
+        except Exception as e:
+            logger.warning(f"LLM response cache disk write failed: {e}")
+
+    def _trim_disk(self):
+        """Keep the file bounded (caller holds the disk lock or is opening it)."""
+        # Expired rows first, then the soonest to expire while over the limit
+        self._disk.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?",
+                           (time.time(),))
+        rows = self._disk.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+        if rows > self.disk_max_entries:
+            self._disk.execute(
+                "DELETE FROM llm_response_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM llm_response_cache ORDER BY expires_at "
+                "LIMIT ?)", (rows - self.disk_max_entries,)
+            )
+
+    def close(self):
+        """Close the SQLite tier."""
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.close()
+                self._disk = None
+
+    # -------------------------------------------------------------------------
+    # Stats
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            hits = self._hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'disk_path': self.disk_path,
+                'hits': hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'stores': self._stores,
+                'evictions': self._evictions
+            }
+
+    def _update_size(self):
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(len(self._entries))
+
+    def _record(self, result: str):
+        if _metrics_available:
+            CACHE_REQUESTS.labels(cache=self.CACHE_NAME, result=result).inc()
+
+
+def log_cache_hit(db_facade, provider: str, model: str, messages: List[Any],
+                  payload: Dict[str, Any], latency_ms: int = 0,
+                  execution_id: str = None, agent_id: str = None,
+                  user_id: str = 'system', temperature: float = None,
+                  max_tokens: int = None):
+    """Record a cache hit in llm_calls with zero tokens and zero cost."""
+    if not db_facade:
+        return
+    try:
+        normalized = normalize_messages(messages)
+        system_prompt = next((m['content'] for m in normalized if m['role'] == 'system'), None)
+        user_prompt = next((m['content'] for m in reversed(normalized) if m['role'] == 'user'), None)
+        row = (
+            str(uuid.uuid4()), execution_id, agent_id, user_id,
+            provider or 'unknown', model or 'unknown', 'chat',
+            system_prompt, user_prompt, normalized,
+            payload.get('content'),
+            json.dumps(payload['tool_calls']) if payload.get('tool_calls') else None,
+            0, 0, 0, 0.0,
+            temperature, max_tokens, latency_ms, 'success', None,
+            json.dumps({'finish_reason': payload.get('finish_reason'),
+                        'cache_hit': True,
+                        'cached_total_tokens': payload.get('total_tokens', 0)})
+        )
+        writer = get_llm_call_log_writer(db_facade)
+        if writer:
+            writer.submit(row)
+            return
+        row = row[:9] + (json.dumps(normalized),) + row[10:]
+        db_facade.execute(INSERT_LLM_CALL_SQL, row)
+    except Exception as e:
+        logger.error(f"Failed to log cached LLM call: {e}")
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the global LLM response cache (disabled by default)."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache()
+    return _response_cache
+
+
+def init_llm_response_cache(enabled: bool = False, max_size: int = 1000,
+                            ttl_seconds: int = 3600,
+                            cache_nonzero_temperature: bool = False,
+                            disk_path: str = None,
+                            disk_max_entries: int = 100000) -> LLMResponseCache:
+    """Initialize the global LLM response cache."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is not None:
+            _response_cache.close()
+        _response_cache = LLMResponseCache(
+            enabled=enabled, max_size=max_size, ttl_seconds=ttl_seconds,
+            cache_nonzero_temperature=cache_nonzero_temperature,
+            disk_path=disk_path or None, disk_max_entries=disk_max_entries
+        )
+    return _response_cache
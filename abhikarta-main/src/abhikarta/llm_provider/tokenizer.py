@@ -0,0 +1,284 @@
+"""
+Tokenizer - Token counting and per-model context limits.
+
+Context windows used to be budgeted as ``max_tokens * 4`` characters,
+which overruns models on code and non-English text and wastes context on
+plain prose. This module provides:
+
+- ``Tokenizer``, the counting interface. ``HeuristicTokenizer`` is a fast
+  pure-Python default that mimics BPE pre-tokenization (words, digit
+  groups, punctuation runs, whitespace) and prices each piece the way
+  byte-pair encoders typically do. ``TiktokenTokenizer`` is exact for
+  OpenAI models and is registered automatically when ``tiktoken`` is
+  installed.
+- A registry mapping model-name prefixes to tokenizers
+  (``register_tokenizer`` / ``get_tokenizer``).
+- ``ModelContextLimits``, which reads ``context_window`` and
+  ``max_output_tokens`` from ``llm_models`` and refreshes them on a TTL.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    _tiktoken_available = True
+except ImportError:
+    tiktoken = None
+    _tiktoken_available = False
+
+# Chat formats add a few tokens per message (role, separators) and prime the reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# Pre-tokenization close to GPT-style BPE: contractions, words with their
+# leading space, digit groups of up to three, punctuation runs, whitespace
+_PIECES = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+",
+    re.UNICODE
+)
+
+
+class Tokenizer(ABC):
+    """Counts tokens for a family of models."""
+
+    name = 'base'
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Number of tokens in a string."""
+        pass
+
+    def count_messages(self, messages: List[Any]) -> int:
+        """
+        Tokens for a chat prompt, including per-message overhead.
+
+        Accepts provider dicts, ``(role, content)`` tuples and objects with
+        a ``content`` attribute.
+        """
+        total = TOKENS_PER_REPLY
+        for message in messages or []:
+            if isinstance(message, dict):
+                content = message.get('content', '')
+            elif isinstance(message, (tuple, list)) and len(message) == 2:
+                content = message[1]
+            else:
+                content = getattr(message, 'content', message)
+            total += TOKENS_PER_MESSAGE + self.count(content if isinstance(content, str)
+                                                     else str(content or ''))
+        return total
+
+
+class HeuristicTokenizer(Tokenizer):
+    """
+    Dependency-free BPE-style estimator.
+
+    Typically within 10-15% of cl100k-style encoders on English prose and
+    code; errs high on accented and CJK text rather than overrunning.
+    """
+
+    name = 'heuristic'
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        tokens = 0
+        for piece in _PIECES.findall(text):
+            word = piece.lstrip(' ')
+            if not word:
+                tokens += 1
+            elif word[0].isalpha():
+                tokens += self._word_tokens(word)
+            elif word[0].isdigit() or word[0] == "'" or word.isspace():
+                tokens += 1
+            else:
+                tokens += math.ceil(len(word) / 2)
+        return tokens
+
+    @staticmethod
+    def _word_tokens(word: str) -> int:
+        if word.isascii():
+            # Common words up to ~6 letters are one merge; longer ones split
+            # into roughly four-letter pieces
+            return 1 if len(word) <= 6 else 1 + (len(word) - 3) // 4
+        weight = sum(1.0 if ord(c) >= 0x2E80 else 0.5 if ord(c) >= 0x80 else 0.25
+                     for c in word)
+        return max(1, math.ceil(weight))
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact counts for OpenAI models using ``tiktoken``."""
+
+    name = 'tiktoken'
+
+    def __init__(self, model: str = None, encoding: str = 'cl100k_base'):
+        if not _tiktoken_available:
+            raise ImportError("tiktoken is required for TiktokenTokenizer")
+        try:
+            self._encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(encoding)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+# Model-name prefix -> tokenizer; the longest matching prefix wins
+_tokenizers: Dict[str, Tokenizer] = {}
+_default_tokenizer: Tokenizer = HeuristicTokenizer()
+_tokenizers_lock = threading.Lock()
+
+
+def register_tokenizer(model_prefix: str, tokenizer: Tokenizer):
+    """Use a tokenizer for models whose name starts with ``model_prefix``."""
+    with _tokenizers_lock:
+        _tokenizers[model_prefix.lower()] = tokenizer
+
+
+def set_default_tokenizer(tokenizer: Tokenizer):
+    """Set the tokenizer used when no registered prefix matches."""
+    global _default_tokenizer
+    _default_tokenizer = tokenizer
+
+
+def get_tokenizer(model: str = None) -> Tokenizer:
+    """Get the tokenizer for a model (the default when none matches)."""
+    if model:
+        name = model.lower()
+        match = max((p for p in _tokenizers if name.startswith(p)), key=len, default=None)
+        if match is not None:
+            return _tokenizers[match]
+    return _default_tokenizer
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """Count tokens in a string with the model's tokenizer."""
+    return get_tokenizer(model).count(text)
+
+
+def init_tokenizers(default: str = 'heuristic') -> Tokenizer:
+    """
+    Configure tokenizers.
+
+    Registers exact ``tiktoken`` counting for OpenAI model prefixes when the
+    package is installed; ``default='tiktoken'`` also makes it the fallback.
+    """
+    if _tiktoken_available:
+        shared = TiktokenTokenizer()
+        for prefix in ('gpt-3.5', 'gpt-4', 'text-embedding'):
+            register_tokenizer(prefix, shared)
+        for prefix in ('gpt-4o', 'o1', 'o3', 'o4'):
+            try:
+                register_tokenizer(prefix, TiktokenTokenizer(encoding='o200k_base'))
+            except Exception:
+                register_tokenizer(prefix, shared)
+        if default == 'tiktoken':
+            set_default_tokenizer(shared)
+    elif default == 'tiktoken':
+        logger.warning("tiktoken not installed; using the heuristic tokenizer")
+    return _default_tokenizer
+
+
+class ModelContextLimits:
+    """
+    Per-model context and output limits from ``llm_models``.
+
+    Usage:
+        limits = get_model_context_limits(db_facade)
+        context_window, max_output = limits.get('gpt-4o')
+    """
+
+    def __init__(self, db_facade=None, refresh_seconds: float = 300,
+                 default_context: int = 4096, default_output: int = 1024):
+        self.db_facade = db_facade
+        self.refresh_seconds = refresh_seconds
+        self.default_context = default_context
+        self.default_output = default_output
+        self._limits: Dict[str, Tuple[int, int]] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, model: str = None) -> Tuple[int, int]:
+        """Return ``(context_window, max_output_tokens)`` for a model ID or name."""
+        return self.lookup(model) or (self.default_context, self.default_output)
+    
+    def lookup(self, model: str = None) -> Optional[Tuple[int, int]]:
+        """Like :meth:`get`, but None when ``llm_models`` does not know the model."""
+        if model and self.db_facade:
+            self._refresh_if_stale()
+            return self._limits.get(model.lower())
+        return None
+
+    def prompt_budget(self, model: str = None, reserve_tokens: int = 0) -> int:
+        """Tokens available for the prompt after the reply allowance and a reserve."""
+        context_window, max_output = self.get(model)
+        return max(0, context_window - min(max_output, context_window // 2) - reserve_tokens)
+
+    def invalidate(self):
+        """Reload limits on the next lookup."""
+        self._loaded_at = 0.0
+
+    def _refresh_if_stale(self):
+        if time.time() - self._loaded_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if time.time() - self._loaded_at < self.refresh_seconds:
+                return
+            try:
+                rows = self.db_facade.fetch_all(
+                    """SELECT model_id, name, context_window, max_output_tokens
+                       FROM llm_models WHERE is_active = 1"""
+                ) or []
+            except Exception as e:
+                logger.debug(f"Could not load model context limits: {e}")
+                rows = []
+            limits = {}
+            for row in rows:
+                value = (row.get('context_window') or self.default_context,
+                         row.get('max_output_tokens') or self.default_output)
+                for key in (row.get('model_id'), row.get('name')):
+                    if key:
+                        limits[str(key).lower()] = value
+            self._limits = limits
+            self._loaded_at = time.time()
+
+
+_model_limits: Optional[ModelContextLimits] = None
+_model_limits_lock = threading.Lock()
+
+
+def get_model_context_limits(db_facade=None) -> ModelContextLimits:
+    """Get the global model limits, binding a database on first use."""
+    global _model_limits
+    if _model_limits is None or (_model_limits.db_facade is None and db_facade is not None):
+        with _model_limits_lock:
+            if _model_limits is None:
+                _model_limits = ModelContextLimits(db_facade)
+            elif _model_limits.db_facade is None and db_facade is not None:
+                _model_limits.db_facade = db_facade
+                _model_limits.invalidate()
+    return _model_limits
+
+
+def init_model_context_limits(db_facade, refresh_seconds: float = 300,
+                              default_context: int = 4096,
+                              default_output: int = 1024) -> ModelContextLimits:
+    """Initialize the global model limits."""
+    global _model_limits
+    with _model_limits_lock:
+        _model_limits = ModelContextLimits(db_facade, refresh_seconds=refresh_seconds,
+                                           default_context=default_context,
+                                           default_output=default_output)
+    return _model_limits
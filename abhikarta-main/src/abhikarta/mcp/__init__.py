@@ -31,6 +31,12 @@ from .client import (
     create_mcp_client
 )
 
+# Pooled HTTP sessions
+from .http_pool import (
+    MCPHTTPPool,
+    create_pooled_session
+)
+
 # Manager
 from .manager import (
     MCPServerManager,
@@ -53,6 +59,10 @@ __all__ = [
     'WebSocketMCPClient',
     'create_mcp_client',
     
+    # HTTP pools
+    'MCPHTTPPool',
+    'create_pooled_session',
+    
     # Manager
     'MCPServerManager',
     'get_mcp_manager',
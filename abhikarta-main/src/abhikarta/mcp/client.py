@@ -7,13 +7,17 @@ Copyright © 2025-2030, All Rights Reserved
 Ashutosh Sinha
 """
 
+import itertools
 import logging
 import json
+import threading
 import time
 import requests
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 
+from .http_pool import create_pooled_session
 from .server import (
     MCPServerConfig, MCPServerState, MCPServerStatus,
     MCPTransportType, MCPAuthType, MCPToolDefinition
@@ -21,6 +25,14 @@ from .server import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    from abhikarta.monitoring import (
+        MCP_CONNECTIONS, MCP_REQUESTS, MCP_REQUEST_DURATION, MCP_INFLIGHT_REQUESTS
+    )
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
 
 class MCPClientBase(ABC):
     """Base class for MCP clients."""
@@ -197,8 +209,7 @@ class HTTPMCPClient(MCPClientBase):
     def _get_session(self) -> requests.Session:
         """Get or create HTTP session."""
         if not self._session:
-            self._session = requests.Session()
-            self._session.headers.update(self._build_headers())
+            self._session = create_pooled_session(headers=self._build_headers())
         return self._session
     
     def list_tools(self) -> List[MCPToolDefinition]:
@@ -281,65 +292,319 @@ class HTTPMCPClient(MCPClientBase):
             return False, 0
 
 
+class _PendingRequest:
+    """A JSON-RPC request awaiting its response."""
+    
+    __slots__ = ('method', 'payload', 'idempotent', 'future', 'sent_at', 'connection')
+    
+    def __init__(self, method: str, payload: str, idempotent: bool):
+        self.method = method
+        self.payload = payload
+        self.idempotent = idempotent
+        self.future: Future = Future()
+        self.sent_at = time.time()
+        self.connection = None  # socket the request was last written to
+
+
 class WebSocketMCPClient(MCPClientBase):
-    """WebSocket-based MCP client."""
+    """
+    WebSocket-based MCP client.
     
-    def __init__(self, config: MCPServerConfig):
+    Many JSON-RPC requests may be in flight on one connection. A background
+    reader thread routes each response to the caller waiting on its ``id``
+    and ignores notifications. Every connection, including reconnects, runs
+    the MCP ``initialize`` handshake before it is used. If the connection
+    drops, the reader reconnects with backoff and re-sends pending
+    idempotent requests (tools/list, or tool calls made with
+    ``idempotent=True``); other pending calls fail with a connection error.
+    """
+    
+    PROTOCOL_VERSION = "2024-11-05"
+    
+    def __init__(self, config: MCPServerConfig, reconnect_attempts: int = 3,
+                 reconnect_backoff_seconds: float = 0.5):
         super().__init__(config)
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_backoff_seconds = reconnect_backoff_seconds
         self._ws = None
-        self._message_id = 0
-        self._pending_responses: Dict[int, Any] = {}
+        self._reader: Optional[threading.Thread] = None
+        self.server_info: Dict[str, Any] = {}  # initialize result of the current connection
+        self._closing = False
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._lock = threading.RLock()       # connection + pending table
+        self._connect_lock = threading.Lock()  # one connect + handshake at a time
+        self._send_lock = threading.Lock()   # one frame on the wire at a time
+        self._stats = {
+            'requests': 0,
+            'timeouts': 0,
+            'errors': 0,
+            'notifications': 0,
+            'reconnects': 0,
+            'replayed': 0,
+            'max_in_flight': 0,
+        }
+    
+    def _create_connection(self):
+        """Open the underlying WebSocket."""
+        import websocket
+        
+        url = self.config.url.replace('http://', 'ws://').replace('https://', 'wss://')
+        headers = self._build_headers()
+        ws = websocket.create_connection(
+            url,
+            header=[f"{k}: {v}" for k, v in headers.items()],
+            timeout=self.config.timeout_seconds
+        )
+        # The reader blocks in recv(); per-call timeouts are enforced by callers
+        ws.settimeout(None)
+        return ws
     
     def connect(self) -> bool:
-        """Establish WebSocket connection."""
-        try:
-            import websocket
-            
-            url = self.config.url.replace('http://', 'ws://').replace('https://', 'wss://')
-            headers = self._build_headers()
-            
-            self._ws = websocket.create_connection(
-                url,
-                header=[f"{k}: {v}" for k, v in headers.items()],
-                timeout=self.config.timeout_seconds
+        """
+        Establish WebSocket connection, start the reader thread and initialize.
+        
+        The connection is only published for requests once the server has
+        answered ``initialize``.
+        """
+        with self._connect_lock:
+            if self.is_connected():
+                return True
+            self._closing = False
+            try:
+                ws = self._create_connection()
+            except Exception as e:
+                logger.error(f"WebSocket connection failed: {e}", exc_info=True)
+                return False
+            reader = threading.Thread(
+                target=self._reader_loop, args=(ws,),
+                name=f"mcp-ws-{self.config.server_id}", daemon=True
             )
-            
+            reader.start()
+            try:
+                self._initialize(ws)
+            except Exception as e:
+                logger.error(f"MCP initialize with {self.config.name} failed: {e}")
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+                return False
+            with self._lock:
+                self._ws = ws
+                self._reader = reader
+            if _metrics_available:
+                MCP_CONNECTIONS.labels(server_name=self.config.name).set(1)
             return True
-            
-        except Exception as e:
-            logger.error(f"WebSocket connection failed: {e}", exc_info=True)
-            return False
+    
+    def _initialize(self, ws):
+        """Run the MCP initialize handshake on a new, unpublished connection."""
+        msg_id = next(self._ids)
+        pending = _PendingRequest("initialize", json.dumps({
+            "jsonrpc": "2.0", "id": msg_id, "method": "initialize",
+            "params": {
+                "protocolVersion": self.PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "abhikarta", "version": "1.0"}
+            }
+        }), idempotent=False)
+        with self._lock:
+            self._pending[msg_id] = pending
+        try:
+            with self._send_lock:
+                pending.connection = ws
+                ws.send(pending.payload)
+            response = pending.future.result(self.config.timeout_seconds)
+        except FutureTimeoutError:
+            raise TimeoutError(f"initialize timed out after {self.config.timeout_seconds}s")
+        finally:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+        if 'error' in response:
+            raise ConnectionError(response['error'].get('message', 'initialize rejected'))
+        self.server_info = response.get('result', {})
+        with self._send_lock:
+            ws.send(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}))
     
     def disconnect(self):
-        """Close WebSocket connection."""
-        if self._ws:
+        """Close WebSocket connection and fail pending requests."""
+        with self._lock:
+            self._closing = True
+            ws, self._ws = self._ws, None
+            reader, self._reader = self._reader, None
+        if ws:
             try:
-                self._ws.close()
-            except:
+                ws.abort()
+                ws.close()
+            except Exception:
                 pass
-            self._ws = None
+        if reader and reader is not threading.current_thread():
+            reader.join(timeout=5)
+        self._fail_pending(ConnectionError("Connection closed"))
+        if _metrics_available:
+            MCP_CONNECTIONS.labels(server_name=self.config.name).set(0)
     
     def is_connected(self) -> bool:
         return self._ws is not None and self._ws.connected
     
+    # -------------------------------------------------------------------------
+    # Reader / demultiplexer
+    # -------------------------------------------------------------------------
+    
+    def _reader_loop(self, ws):
+        """Read frames and resolve the pending request each response belongs to."""
+        while True:
+            try:
+                frame = ws.recv()
+            except Exception as e:
+                if self._closing or ws is not self._ws:
+                    # Not (yet) published: only a handshake can be waiting on it
+                    self._fail_pending(ConnectionError(f"Connection lost: {e}"), connection=ws)
+                    return
+                self._on_connection_lost(ws, e)
+                return
+            if not frame:
+                continue
+            try:
+                message = json.loads(frame)
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring non-JSON frame from {self.config.name}")
+                continue
+            for item in (message if isinstance(message, list) else [message]):
+                self._dispatch(item)
+    
+    def _dispatch(self, message: Dict[str, Any]):
+        msg_id = message.get('id') if isinstance(message, dict) else None
+        with self._lock:
+            pending = self._pending.pop(msg_id, None) if msg_id is not None else None
+            if pending is None:
+                self._stats['notifications'] += 1
+            self._update_in_flight()
+        if pending is None:
+            # Server notification or a response nobody is waiting for any more
+            logger.debug(f"Unmatched frame from {self.config.name}: {str(message)[:200]}")
+            return
+        if not pending.future.done():
+            pending.future.set_result(message)
+    
+    def _on_connection_lost(self, ws, error: Exception):
+        """Reconnect and replay idempotent requests; fail the rest."""
+        logger.warning(f"WebSocket to {self.config.name} lost: {error}")
+        with self._lock:
+            if self._ws is ws:
+                self._ws = None
+            if _metrics_available:
+                MCP_CONNECTIONS.labels(server_name=self.config.name).set(0)
+        self._fail_pending(ConnectionError(f"Connection lost: {error}"), idempotent=False)
+        
+        for attempt in range(self.reconnect_attempts):
+            time.sleep(self.reconnect_backoff_seconds * (2 ** attempt))
+            if self._closing:
+                break
+            if self.connect():
+                with self._lock:
+                    self._stats['reconnects'] += 1
+                    replay = [p for p in self._pending.values()
+                              if p.idempotent and p.connection is not self._ws]
+                for pending in replay:
+                    try:
+                        self._send(pending)
+                        with self._lock:
+                            self._stats['replayed'] += 1
+                    except Exception as e:
+                        pending.future.set_exception(ConnectionError(str(e)))
+                logger.info(f"Reconnected to {self.config.name}, replayed {len(replay)} request(s)")
+                return
+        
+        self._fail_pending(ConnectionError(f"Reconnect to {self.config.name} failed"))
+    
+    def _fail_pending(self, error: Exception, idempotent: Optional[bool] = None,
+                      connection=None):
+        with self._lock:
+            failed = [(msg_id, p) for msg_id, p in self._pending.items()
+                      if (idempotent is None or p.idempotent == idempotent)
+                      and (connection is None or p.connection is connection)]
+            for msg_id, _ in failed:
+                del self._pending[msg_id]
+            self._update_in_flight()
+        for _, pending in failed:
+            if not pending.future.done():
+                pending.future.set_exception(error)
+    
+    def _update_in_flight(self):
+        """Refresh in-flight counters; called with the lock held."""
+        in_flight = len(self._pending)
+        if in_flight > self._stats['max_in_flight']:
+            self._stats['max_in_flight'] = in_flight
+        if _metrics_available:
+            MCP_INFLIGHT_REQUESTS.labels(server_name=self.config.name).set(in_flight)
+    
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+    
+    def _send(self, pending: _PendingRequest):
+        with self._send_lock:
+            ws = self._ws
+            if ws is None:
+                raise ConnectionError("Not connected")
+            pending.connection = ws
+            ws.send(pending.payload)
+    
+    def _request(self, method: str, params: Dict[str, Any] = None,
+                 timeout: float = None, idempotent: bool = False) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request and wait for its response.
+        
+        Raises:
+            TimeoutError: No response within the timeout
+            ConnectionError: Connection lost and the request was not replayed
+        """
+        if not self.is_connected() and not self.connect():
+            raise ConnectionError("Not connected")
+        
+        msg_id = next(self._ids)
+        request = {"jsonrpc": "2.0", "id": msg_id, "method": method}
+        if params is not None:
+            request["params"] = params
+        pending = _PendingRequest(method, json.dumps(request), idempotent)
+        timeout = timeout or self.config.timeout_seconds
+        
+        with self._lock:
+            self._pending[msg_id] = pending
+            self._stats['requests'] += 1
+            self._update_in_flight()
+        status = 'error'
+        try:
+            try:
+                self._send(pending)
+            except Exception:
+                # Idempotent requests wait for the reader to reconnect and replay
+                if not idempotent:
+                    raise
+            response = pending.future.result(timeout)
+            status = 'error' if 'error' in response else 'success'
+            return response
+        except FutureTimeoutError:
+            status = 'timeout'
+            raise TimeoutError(f"{method} timed out after {timeout}s")
+        finally:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+                self._update_in_flight()
+                if status == 'timeout':
+                    self._stats['timeouts'] += 1
+                elif status == 'error':
+                    self._stats['errors'] += 1
+            if _metrics_available:
+                MCP_REQUESTS.labels(server_name=self.config.name, method=method, status=status).inc()
+                MCP_REQUEST_DURATION.labels(server_name=self.config.name, method=method).observe(
+                    time.time() - pending.sent_at)
+    
     def list_tools(self) -> List[MCPToolDefinition]:
         """Request tool list via WebSocket."""
-        if not self.is_connected():
-            if not self.connect():
-                return []
-        
         try:
-            self._message_id += 1
-            msg_id = self._message_id
-            
-            request = {
-                "jsonrpc": "2.0",
-                "id": msg_id,
-                "method": "tools/list"
-            }
-            
-            self._ws.send(json.dumps(request))
-            response = json.loads(self._ws.recv())
+            response = self._request("tools/list", idempotent=True)
             
             if 'result' in response:
                 tools = response['result'].get('tools', [])
@@ -351,29 +616,25 @@ class WebSocketMCPClient(MCPClientBase):
             logger.error(f"Error listing tools via WebSocket: {e}", exc_info=True)
             return []
     
-    def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Call a tool via WebSocket."""
-        if not self.is_connected():
-            if not self.connect():
-                return {'success': False, 'error': 'Not connected'}
+    def call_tool(self, tool_name: str, parameters: Dict[str, Any],
+                  timeout: float = None, idempotent: bool = False) -> Dict[str, Any]:
+        """
+        Call a tool via WebSocket.
         
+        Safe to call from many threads at once; requests share the connection.
+        
+        Args:
+            tool_name: Tool name
+            parameters: Tool arguments
+            timeout: Per-call timeout (defaults to the server timeout)
+            idempotent: Replay the call if the connection drops mid-flight
+        """
+        start_time = time.time()
         try:
-            self._message_id += 1
-            msg_id = self._message_id
-            
-            request = {
-                "jsonrpc": "2.0",
-                "id": msg_id,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": parameters
-                }
-            }
-            
-            start_time = time.time()
-            self._ws.send(json.dumps(request))
-            response = json.loads(self._ws.recv())
+            response = self._request("tools/call", {
+                "name": tool_name,
+                "arguments": parameters
+            }, timeout=timeout, idempotent=idempotent)
             execution_time = (time.time() - start_time) * 1000
             
             if 'result' in response:
@@ -391,6 +652,8 @@ class WebSocketMCPClient(MCPClientBase):
             
             return {'success': False, 'error': 'Invalid response'}
             
+        except TimeoutError as e:
+            return {'success': False, 'error': str(e)}
         except Exception as e:
             logger.error(f"Error calling tool {tool_name}: {e}", exc_info=True)
             return {'success': False, 'error': str(e)}
@@ -405,6 +668,15 @@ class WebSocketMCPClient(MCPClientBase):
         latency = (time.time() - start_time) * 1000
         
         return connected, latency
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get multiplexing statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                'connected': self.is_connected(),
+                'in_flight': len(self._pending),
+            }
 
 
 def create_mcp_client(config: MCPServerConfig) -> MCPClientBase:
@@ -0,0 +1,158 @@
+"""
+MCP HTTP Pool - Persistent per-server HTTP sessions for MCP tool calls.
+
+MCPTool used to call module-level ``requests.post`` and the LangChain
+MCPToolAdapter built a one-shot ``urllib`` request per call, so every tool
+invocation paid for a new TCP/TLS connection and re-derived its auth
+headers. MCPServerManager now owns one pooled ``requests.Session`` per
+server (base URL + auth headers): keep-alive connections, a cap on
+connections per server, retry with exponential backoff for connection
+errors and idempotent requests, and an async entry point on a bounded
+worker pool.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Gateway errors that are worth retrying for idempotent requests
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+def create_pooled_session(max_connections: int = 10, max_retries: int = 2,
+                          backoff_seconds: float = 0.2,
+                          headers: Dict[str, str] = None) -> requests.Session:
+    """
+    Create a keep-alive session with bounded connections and retries.
+
+    Connection failures are retried for every method (the request never
+    reached the server); read errors and 502/503/504 responses only for
+    idempotent methods, so tool-call POSTs are never replayed.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_seconds,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_connections),
+                          pool_block=True, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class MCPHTTPPool:
+    """
+    Pooled HTTP session for a single MCP server.
+
+    Auth headers are resolved once when the pool is created and sent as
+    session defaults on every request.
+
+    Usage:
+        pool = get_mcp_manager().get_http_pool(base_url, auth_headers)
+        response = pool.post_json('/api/tools/call', payload, timeout=30)
+        response = await pool.apost_json('/api/tools/call', payload)
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str] = None,
+                 max_connections: int = 10, max_retries: int = 2,
+                 backoff_seconds: float = 0.2, executor: Executor = None):
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max(1, max_connections)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._executor = executor
+        self._session = create_pooled_session(
+            max_connections=self.max_connections,
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+            headers={'Content-Type': 'application/json',
+                     'Accept': 'application/json', **(headers or {})}
+        )
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._responses = 0
+        self._errors = 0
+        self._total_time_ms = 0.0
+
+    def url_for(self, path_or_url: str) -> str:
+        """Resolve an endpoint path against the server base URL."""
+        if path_or_url.startswith(('http://', 'https://')):
+            return path_or_url
+        return f"{self.base_url}{path_or_url}"
+
+    def request(self, method: str, path_or_url: str, timeout: float = 30,
+                **kwargs) -> requests.Response:
+        """Send a request over the pooled session."""
+        start = time.perf_counter()
+        try:
+            response = self._session.request(method, self.url_for(path_or_url),
+                                             timeout=timeout, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._requests += 1
+                self._errors += 1
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._requests += 1
+            self._responses += 1
+            self._total_time_ms += elapsed
+            if response.status_code >= 400:
+                self._errors += 1
+        return response
+
+    def post_json(self, path_or_url: str, payload: Dict[str, Any],
+                  timeout: float = 30) -> requests.Response:
+        """POST a JSON payload."""
+        return self.request('POST', path_or_url, timeout=timeout, json=payload)
+
+    async def arequest(self, method: str, path_or_url: str, timeout: float = 30,
+                       **kwargs) -> requests.Response:
+        """Async variant of :meth:`request`, run on the manager's worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: self.request(method, path_or_url, timeout=timeout, **kwargs)
+        )
+
+    async def apost_json(self, path_or_url: str, payload: Dict[str, Any],
+                         timeout: float = 30) -> requests.Response:
+        """Async variant of :meth:`post_json`."""
+        return await self.arequest('POST', path_or_url, timeout=timeout, json=payload)
+
+    def close(self):
+        """Close pooled connections."""
+        self._session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                'base_url': self.base_url,
+                'max_connections': self.max_connections,
+                'max_retries': self.max_retries,
+                'requests': self._requests,
+                'errors': self._errors,
+                'avg_latency_ms': (self._total_time_ms / self._responses
+                                   if self._responses else 0.0)
+            }
@@ -23,6 +23,7 @@ from .server import (
     MCPToolDefinition
 )
 from .client import MCPClientBase, create_mcp_client
+from .http_pool import MCPHTTPPool
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +82,16 @@ class MCPServerManager:
         self._monitor_running = False
         self._executor = ThreadPoolExecutor(max_workers=10)
         
+        # Pooled HTTP sessions for tool calls, keyed by (base_url, auth headers)
+        self._http_pools: Dict[tuple, MCPHTTPPool] = {}
+        self._http_pools_lock = threading.Lock()
+        self._http_pool_settings = {
+            'max_connections': 10,
+            'max_retries': 2,
+            'backoff_seconds': 0.2,
+        }
+        self._async_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='mcp-http')
+        
         self._initialized = True
         logger.info("MCPServerManager initialized")
     
@@ -97,6 +108,68 @@ class MCPServerManager:
         """Set tools registry for tool registration."""
         self._tools_registry = registry
     
+    # =========================================================================
+    # HTTP Connection Pools
+    # =========================================================================
+    
+    def configure_http_pools(self, max_connections: int = 10, max_retries: int = 2,
+                             backoff_seconds: float = 0.2, async_workers: int = 32):
+        """
+        Configure pooled HTTP sessions used for MCP tool calls.
+        
+        Existing pools are closed and recreated on next use.
+        """
+        with self._http_pools_lock:
+            self._http_pool_settings = {
+                'max_connections': max_connections,
+                'max_retries': max_retries,
+                'backoff_seconds': backoff_seconds,
+            }
+            pools = list(self._http_pools.values())
+            self._http_pools.clear()
+            old_executor = self._async_executor
+            self._async_executor = ThreadPoolExecutor(max_workers=max(1, async_workers),
+                                                      thread_name_prefix='mcp-http')
+        for pool in pools:
+            pool.close()
+        old_executor.shutdown(wait=False)
+    
+    def get_http_pool(self, base_url: str,
+                      auth_headers: Dict[str, str] = None) -> MCPHTTPPool:
+        """
+        Get the pooled HTTP session for a server.
+        
+        Args:
+            base_url: Server base URL
+            auth_headers: Resolved auth headers, sent on every request
+            
+        Returns:
+            MCPHTTPPool shared by all tools of that server
+        """
+        key = (base_url.rstrip('/'), tuple(sorted((auth_headers or {}).items())))
+        pool = self._http_pools.get(key)
+        if pool is None:
+            with self._http_pools_lock:
+                pool = self._http_pools.get(key)
+                if pool is None:
+                    pool = MCPHTTPPool(key[0], headers=auth_headers,
+                                       executor=self._async_executor,
+                                       **self._http_pool_settings)
+                    self._http_pools[key] = pool
+        return pool
+    
+    def close_http_pools(self, base_url: str = None) -> int:
+        """Close pooled sessions for a server URL, or all of them."""
+        with self._http_pools_lock:
+            if base_url is None:
+                keys = list(self._http_pools)
+            else:
+                keys = [k for k in self._http_pools if k[0] == base_url.rstrip('/')]
+            pools = [self._http_pools.pop(k) for k in keys]
+        for pool in pools:
+            pool.close()
+        return len(pools)
+    
     # =========================================================================
     # Server Management
     # =========================================================================
@@ -121,6 +194,7 @@ class MCPServerManager:
                 self._servers[config.server_id] = server
                 logger.info(f"Added MCP server: {config.name}")
         
+        self._invalidate_built_agents()
         if connect or config.auto_connect:
             self.connect_server(config.server_id)
         
@@ -145,10 +219,19 @@ class MCPServerManager:
             
             # Remove from registry
             del self._servers[server_id]
+            self._invalidate_built_agents()
             
             logger.info(f"Removed MCP server: {server_id}")
             return True
     
+    def _invalidate_built_agents(self):
+        """Drop cached agent runnables so their MCP tool lists are rebuilt."""
+        try:
+            from ..langchain.agents import invalidate_agent_executor
+            invalidate_agent_executor()
+        except ImportError:
+            pass
+    
     def get_server(self, server_id: str) -> Optional[MCPServer]:
         """Get a server by ID."""
         return self._servers.get(server_id)
@@ -250,6 +333,7 @@ class MCPServerManager:
             if server_id in self._clients:
                 self._clients[server_id].disconnect()
                 del self._clients[server_id]
+            self.close_http_pools(server.config.url)
             
             # Unregister tools from registry
             self._unregister_server_tools(server_id)
@@ -334,7 +418,8 @@ class MCPServerManager:
                     tool_def.to_dict(),
                     server.config.url,
                     server.config.name,
-                    server.config.auth_token
+                    server.config.auth_token,
+                    server.config.auth_header
                 )
                 self._tools_registry.register(mcp_tool, replace=True)
                 
@@ -605,14 +690,17 @@ class MCPServerManager:
                     'latency_ms': s.state.latency_ms
                 }
                 for sid, s in self._servers.items()
-            }
+            },
+            'http_pools': [pool.get_stats() for pool in list(self._http_pools.values())]
         }
     
     def shutdown(self):
         """Shutdown the manager."""
         self.stop_health_monitor()
         self.disconnect_all()
+        self.close_http_pools()
         self._executor.shutdown(wait=False)
+        self._async_executor.shutdown(wait=False)
         logger.info("MCPServerManager shutdown")
 
 
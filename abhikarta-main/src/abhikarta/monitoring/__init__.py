@@ -14,6 +14,7 @@ using Prometheus metrics. It tracks:
 - Tool executions
 - MCP server connections
 - Actor system metrics
+- In-process cache hit/miss rates
 - Script executions
 - Notifications
 
@@ -93,12 +94,16 @@ from .metrics import (
     LLM_TOKENS,
     LLM_ERRORS,
     LLM_COST,
+    LLM_RATE_LIMIT_WAIT,
+    LLM_THROTTLED_REQUESTS,
     
     # Database metrics
     DB_OPERATIONS,
     DB_OPERATION_DURATION,
     DB_CONNECTIONS,
     DB_POOL_SIZE,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_TIMEOUTS,
     
     # HTTP metrics
     HTTP_REQUESTS,
@@ -117,6 +122,7 @@ from .metrics import (
     MCP_CONNECTIONS,
     MCP_REQUESTS,
     MCP_REQUEST_DURATION,
+    MCP_INFLIGHT_REQUESTS,
     
     # Actor metrics
     ACTOR_MESSAGES,
@@ -124,6 +130,13 @@ from .metrics import (
     ACTIVE_ACTORS,
     ACTOR_MAILBOX_SIZE,
     DEAD_LETTERS,
+    ACTOR_DISPATCHER_STEALS,
+    ACTOR_DISPATCHER_PARKS,
+    
+    # Cache metrics
+    CACHE_REQUESTS,
+    CACHE_EVICTIONS,
+    CACHE_SIZE,
     
     # Script metrics
     SCRIPT_EXECUTIONS,
@@ -192,12 +205,16 @@ __all__ = [
     'LLM_TOKENS',
     'LLM_ERRORS',
     'LLM_COST',
+    'LLM_RATE_LIMIT_WAIT',
+    'LLM_THROTTLED_REQUESTS',
     
     # Database
     'DB_OPERATIONS',
     'DB_OPERATION_DURATION',
     'DB_CONNECTIONS',
     'DB_POOL_SIZE',
+    'DB_POOL_CHECKOUT_WAIT',
+    'DB_POOL_TIMEOUTS',
     
     # HTTP
     'HTTP_REQUESTS',
@@ -216,6 +233,7 @@ __all__ = [
     'MCP_CONNECTIONS',
     'MCP_REQUESTS',
     'MCP_REQUEST_DURATION',
+    'MCP_INFLIGHT_REQUESTS',
     
     # Actor
     'ACTOR_MESSAGES',
@@ -223,6 +241,13 @@ __all__ = [
     'ACTIVE_ACTORS',
     'ACTOR_MAILBOX_SIZE',
     'DEAD_LETTERS',
+    'ACTOR_DISPATCHER_STEALS',
+    'ACTOR_DISPATCHER_PARKS',
+    
+    # Cache
+    'CACHE_REQUESTS',
+    'CACHE_EVICTIONS',
+    'CACHE_SIZE',
     
     # Scripts
     'SCRIPT_EXECUTIONS',
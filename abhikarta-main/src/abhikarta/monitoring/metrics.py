@@ -267,6 +267,19 @@ LLM_COST = Counter(
     ['provider', 'model']
 )
 
+LLM_RATE_LIMIT_WAIT = Histogram(
+    'abhikarta_llm_rate_limit_wait_seconds',
+    'Time LLM calls waited for provider rate-limit budget',
+    ['provider', 'priority'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+LLM_THROTTLED_REQUESTS = Counter(
+    'abhikarta_llm_throttled_requests_total',
+    'LLM calls delayed by provider rate limits',
+    ['provider', 'priority']
+)
+
 # =============================================================================
 # DATABASE METRICS
 # =============================================================================
@@ -296,6 +309,19 @@ DB_POOL_SIZE = Gauge(
     ['db_type']
 )
 
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'abhikarta_db_pool_checkout_wait_seconds',
+    'Time spent waiting to check a connection out of the pool',
+    ['db_type'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    'abhikarta_db_pool_timeouts_total',
+    'Total number of pool checkouts that timed out',
+    ['db_type']
+)
+
 # =============================================================================
 # API/HTTP METRICS
 # =============================================================================
@@ -384,6 +410,12 @@ MCP_REQUEST_DURATION = Histogram(
     buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
 )
 
+MCP_INFLIGHT_REQUESTS = Gauge(
+    'abhikarta_mcp_inflight_requests',
+    'Number of MCP requests awaiting a response on a connection',
+    ['server_name']
+)
+
 # =============================================================================
 # ACTOR SYSTEM METRICS
 # =============================================================================
@@ -419,6 +451,40 @@ DEAD_LETTERS = Counter(
     ['reason']
 )
 
+ACTOR_DISPATCHER_STEALS = Counter(
+    'abhikarta_actor_dispatcher_steals_total',
+    'Tasks a work-stealing dispatcher worker took from another worker',
+    ['dispatcher']
+)
+
+ACTOR_DISPATCHER_PARKS = Counter(
+    'abhikarta_actor_dispatcher_parks_total',
+    'Times a dispatcher worker parked because no work was available',
+    ['dispatcher']
+)
+
+# =============================================================================
+# CACHE METRICS
+# =============================================================================
+
+CACHE_REQUESTS = Counter(
+    'abhikarta_cache_requests_total',
+    'Total number of in-process cache lookups',
+    ['cache', 'result']  # result: hit, miss
+)
+
+CACHE_EVICTIONS = Counter(
+    'abhikarta_cache_evictions_total',
+    'Total number of in-process cache evictions',
+    ['cache']
+)
+
+CACHE_SIZE = Gauge(
+    'abhikarta_cache_size',
+    'Number of entries held by an in-process cache',
+    ['cache']
+)
+
 # =============================================================================
 # SCRIPT EXECUTION METRICS
 # =============================================================================
@@ -28,6 +28,7 @@ from .execution_logger import (
     get_execution_logger,
     init_execution_logger,
     init_execution_logger_from_properties,
+    read_jsonl_log,
 )
 
 from .llm_config_resolver import (
@@ -39,6 +40,14 @@ from .llm_config_resolver import (
     SYSTEM_DEFAULTS,
 )
 
+from .agent_jobs import (
+    AgentJob,
+    AgentJobManager,
+    AgentJobQueueFull,
+    get_agent_job_manager,
+    init_agent_job_manager,
+)
+
 __all__ = [
     # Code Fragment Sync
     'CodeFragmentSyncService',
@@ -55,6 +64,7 @@ __all__ = [
     'ExecutionLogEntry',
     'EntityType',
     'LogFormat',
+    'read_jsonl_log',
     'get_execution_logger',
     'init_execution_logger',
     'init_execution_logger_from_properties',
@@ -65,4 +75,10 @@ __all__ = [
     'init_llm_config_resolver',
     'resolve_llm_config',
     'SYSTEM_DEFAULTS',
+    # Agent Jobs
+    'AgentJob',
+    'AgentJobManager',
+    'AgentJobQueueFull',
+    'get_agent_job_manager',
+    'init_agent_job_manager',
 ]
@@ -0,0 +1,290 @@
+"""
+Agent Jobs - Background agent executions with streamed progress.
+
+``POST /api/agents/<id>/execute`` used to run the whole multi-step agent
+inside the Flask request thread, and clients then polled the status
+endpoint. In job mode the request only enqueues the run and returns the
+execution_id:
+
+- Runs execute on a bounded worker pool sized by
+  ``agent.max.concurrent.executions``.
+- A further ``agent.job.queue.size`` jobs may wait; beyond that, submit
+  raises AgentJobQueueFull.
+- Each job keeps an ordered event log (status, step, observation,
+  token, llm_end, completed/failed). Server-Sent Events handlers read it
+  with :meth:`AgentJob.wait_events`; ``Last-Event-ID`` resumes after a
+  given sequence number.
+- Finished jobs stay in memory for ``retention_seconds``. The
+  ``executions`` row remains the durable record.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+
+logger = logging.getLogger(__name__)
+
+# Events that end a job's stream
+TERMINAL_EVENTS = ('completed', 'failed')
+
+
+class AgentJobQueueFull(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class AgentJob:
+    """
+    One queued or running agent execution and its event log.
+
+    Events are dicts: ``{'id': seq, 'event': type, 'data': {...}, 'timestamp': iso}``.
+    """
+
+    # Cap on buffered events per job; token streams can be long
+    MAX_EVENTS = 5000
+
+    def __init__(self, execution_id: str, agent_id: str, input_data: Any,
+                 user_id: str = None):
+        self.execution_id = execution_id
+        self.agent_id = agent_id
+        self.input_data = input_data
+        self.user_id = user_id
+        self.status = 'queued'
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._events: List[Dict[str, Any]] = []
+        self._next_seq = 1
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_EVENTS
+
+    def publish(self, event_type: str, data: Dict[str, Any] = None):
+        """Append an event and wake stream readers; terminal events finish the job."""
+        with self._cond:
+            if event_type in TERMINAL_EVENTS:
+                self.status = event_type
+                self.finished_at = time.time()
+            self._events.append({
+                'id': self._next_seq,
+                'event': event_type,
+                'data': data or {},
+                'timestamp': datetime.now().isoformat()
+            })
+            self._next_seq += 1
+            if len(self._events) > self.MAX_EVENTS:
+                # Drop buffered tokens first; step and status events are kept
+                for i, event in enumerate(self._events):
+                    if event['event'] == 'token':
+                        del self._events[i]
+                        break
+                else:
+                    self._events.pop(0)
+            self._cond.notify_all()
+
+    def wait_events(self, after: int = 0, timeout: float = 15.0) -> List[Dict[str, Any]]:
+        """
+        Return events with ``id > after``, waiting up to ``timeout`` for new ones.
+
+        Returns an empty list on timeout (callers send a keep-alive) or when
+        the job is finished and every event has been read.
+        """
+        with self._cond:
+            if self._next_seq - 1 <= after and not self.done:
+                self._cond.wait(timeout)
+            return [e for e in self._events if e['id'] > after]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            steps = sum(1 for e in self._events if e['event'] == 'step')
+            return {
+                'execution_id': self.execution_id,
+                'agent_id': self.agent_id,
+                'status': self.status,
+                'steps': steps,
+                'events': self._next_seq - 1,
+                'result': self.result
+            }
+
+
+class AgentJobManager:
+    """
+    Bounded worker pool for agent executions.
+
+    Usage:
+        manager = get_agent_job_manager(db_facade)
+        job = manager.submit(agent_id, input_data, execution_id, user_id)
+        for event in job.wait_events(after=0):
+            ...
+    """
+
+    def __init__(self, db_facade, max_concurrent: int = 10, max_queued: int = 100,
+                 retention_seconds: int = 3600,
+                 runner: Callable[['AgentJob'], Dict[str, Any]] = None):
+        self.db_facade = db_facade
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.retention_seconds = retention_seconds
+        self._runner = runner or self._run_langchain_agent
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix='agent-job')
+        self._jobs: Dict[str, AgentJob] = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, agent_id: str, input_data: Any, execution_id: str,
+               user_id: str = None) -> AgentJob:
+        """
+        Queue an agent run.
+
+        Raises:
+            AgentJobQueueFull: All workers are busy and the queue is full
+        """
+        with self._lock:
+            self._prune()
+            if self._active >= self.max_concurrent + self.max_queued:
+                self._rejected += 1
+                raise AgentJobQueueFull(
+                    f"Agent job queue is full ({self._active} running or queued)")
+            job = AgentJob(execution_id, agent_id, input_data, user_id)
+            self._jobs[execution_id] = job
+            self._active += 1
+            self._submitted += 1
+        job.publish('status', {'status': 'queued'})
+        self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, execution_id: str) -> Optional[AgentJob]:
+        """Get an in-memory job (None once evicted or if run elsewhere)."""
+        return self._jobs.get(execution_id)
+
+    def _execute(self, job: AgentJob):
+        job.status = 'running'
+        job.publish('status', {'status': 'running'})
+        try:
+            self._update_execution(job.execution_id, status='running')
+            result = self._runner(job)
+            status = result.get('status', 'completed')
+            if status not in TERMINAL_EVENTS:
+                status = 'completed'
+        except Exception as e:
+            logger.error(f"[JOB:{job.execution_id}] Agent job failed: {e}", exc_info=True)
+            result = {'status': 'failed', 'error_message': str(e)}
+            status = 'failed'
+
+        job.result = result
+        try:
+            self._update_execution(
+                job.execution_id, status=status,
+                output_data=result.get('output'),
+                error_message=result.get('error_message'),
+                completed_at=datetime.now().isoformat(),
+                duration_ms=result.get('duration_ms'),
+                metadata=json.dumps({
+                    'intermediate_steps': result.get('intermediate_steps', []),
+                    'tool_calls': result.get('tool_calls', []),
+                    'execution_mode': 'langchain_job'
+                }, default=str)
+            )
+        except Exception as e:
+            logger.error(f"[JOB:{job.execution_id}] Failed to record result: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+                if status == 'completed':
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            job.publish(status, result)
+
+    def _run_langchain_agent(self, job: AgentJob) -> Dict[str, Any]:
+        """Default runner: LangChain AgentExecutor with progress events."""
+        from abhikarta.langchain.agents import AgentExecutor as LangChainAgentExecutor
+
+        executor = LangChainAgentExecutor(self.db_facade)
+        result = executor.execute_agent(job.agent_id, job.input_data,
+                                        event_callback=job.publish)
+        return {
+            'status': result.status,
+            'output': result.output,
+            'error_message': result.error_message,
+            'duration_ms': result.duration_ms,
+            'intermediate_steps': result.intermediate_steps,
+            'tool_calls': result.tool_calls
+        }
+
+    def _update_execution(self, execution_id: str, **columns):
+        if not self.db_facade:
+            return
+        assignments = ', '.join(f"{name} = ?" for name in columns)
+        self.db_facade.execute(
+            f"UPDATE executions SET {assignments} WHERE execution_id = ?",
+            tuple(columns.values()) + (execution_id,)
+        )
+
+    def _prune(self):
+        """Forget finished jobs past retention; called with the lock held."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [eid for eid, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for execution_id in expired:
+            del self._jobs[execution_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job statistics."""
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+                'active': self._active,
+                'running': min(self._active, self.max_concurrent),
+                'queued': max(0, self._active - self.max_concurrent),
+                'tracked_jobs': len(self._jobs),
+                'submitted': self._submitted,
+                'rejected': self._rejected,
+                'completed': self._completed,
+                'failed': self._failed
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the worker pool."""
+        self._executor.shutdown(wait=wait)
+
+
+_job_manager: Optional[AgentJobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_agent_job_manager(db_facade=None) -> Optional[AgentJobManager]:
+    """Get the global job manager, creating a default one on first use."""
+    global _job_manager
+    if _job_manager is None and db_facade is not None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = AgentJobManager(db_facade)
+    return _job_manager
+
+
+def init_agent_job_manager(db_facade, max_concurrent: int = 10, max_queued: int = 100,
+                           retention_seconds: int = 3600) -> AgentJobManager:
+    """Initialize the global job manager."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is not None:
+            _job_manager.shutdown()
+        _job_manager = AgentJobManager(db_facade, max_concurrent=max_concurrent,
+                                       max_queued=max_queued,
+                                       retention_seconds=retention_seconds)
+    return _job_manager
@@ -35,6 +35,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from abhikarta.utils.code_cache import invalidate_compiled_code
+
 logger = logging.getLogger(__name__)
 
 
@@ -405,6 +407,11 @@ class CodeFragmentSyncService:
             # Reload module if already imported
             self._reload_module_if_loaded(module_name)
             
+            # Drop code objects compiled from the previous version, and
+            # built agents whose tools wrap this fragment
+            invalidate_compiled_code(f"fragment:{fragment_id}")
+            self._invalidate_built_agents()
+            
             # Notify callbacks
             self._notify_callbacks(module_name, SyncStatus.SYNCED)
             
@@ -483,8 +490,10 @@ class CodeFragmentSyncService:
                 logger.info(f"Removed fragment file: {file_path}")
             
             with self._lock:
-                if module_name in self._synced_fragments:
-                    del self._synced_fragments[module_name]
+                info = self._synced_fragments.pop(module_name, None)
+            if info is not None:
+                invalidate_compiled_code(f"fragment:{info.fragment_id}")
+                self._invalidate_built_agents()
             
             # Unload module if loaded
             full_module_name = f"code_fragments.{module_name}"
@@ -680,6 +689,14 @@ class CodeFragmentSyncService:
             except Exception as e:
                 logger.error(f"Error in sync callback: {e}")
     
+    def _invalidate_built_agents(self):
+        """Drop cached agent runnables; their tools may wrap a changed fragment."""
+        try:
+            from abhikarta.langchain.agents import invalidate_agent_executor
+            invalidate_agent_executor()
+        except ImportError:
+            pass
+    
     # ==========================================================================
     # STATUS & INFO
     # ==========================================================================
@@ -4,21 +4,46 @@ Conversation Memory Service
 Manages conversation history for conversational agents and workflows.
 Provides persistent storage and retrieval of chat messages.
 
+Messages are stored one row per message in ``conversation_messages``, so a
+turn is an append-only insert plus a header update instead of a rewrite of
+the whole ``messages_json`` blob. Hot conversations stay in an LRU cache;
+cold ones are loaded windowed (the last N messages), and older messages are
+paged in only when a caller needs them. Legacy blob rows are migrated on
+startup and on first load.
+
+Each message stores its token count. Context windows are budgeted in
+tokens against the model's limits from ``llm_models``. When a summarizer
+is configured, turns older than the recent ones are folded into a rolling
+summary in the background once they cross a token threshold; context
+windows then send the summary in place of those turns.
+
 Version: 1.5.3
 Copyright © 2025-2030, All Rights Reserved
 """
 
 import logging
 import json
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from pathlib import Path
 
+from abhikarta.llm_provider.tokenizer import (
+    Tokenizer, TOKENS_PER_MESSAGE, get_tokenizer, get_model_context_limits
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _is_integrity_error(error: Exception) -> bool:
+    """True for unique/primary-key violations from sqlite3 or psycopg2."""
+    return any(cls.__name__ == 'IntegrityError' for cls in type(error).__mro__)
+
+
 @dataclass
 class ChatMessage:
     """Represents a single message in a conversation."""
@@ -26,13 +51,28 @@ class ChatMessage:
     content: str
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    token_count: Optional[int] = None
+    
+    def tokens(self, tokenizer: Tokenizer, cache: bool = True) -> int:
+        """
+        Token count of the content, computed once and cached.
+        
+        With ``cache=False`` the content is counted afresh and the cached
+        count (which belongs to the store's tokenizer) is left alone.
+        """
+        if not cache:
+            return tokenizer.count(self.content or '')
+        if self.token_count is None:
+            self.token_count = tokenizer.count(self.content or '')
+        return self.token_count
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             'role': self.role,
             'content': self.content,
             'timestamp': self.timestamp,
-            'metadata': self.metadata
+            'metadata': self.metadata,
+            'token_count': self.token_count
         }
     
     @classmethod
@@ -41,7 +81,8 @@ class ChatMessage:
             role=data.get('role', 'human'),
             content=data.get('content', ''),
             timestamp=data.get('timestamp', datetime.now(timezone.utc).isoformat()),
-            metadata=data.get('metadata', {})
+            metadata=data.get('metadata', {}),
+            token_count=data.get('token_count')
         )
     
     def to_langchain_format(self) -> Tuple[str, str]:
@@ -61,6 +102,15 @@ class Conversation:
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Number of earlier messages that are stored but not loaded in ``messages``
+    history_offset: int = 0
+    # Tokens added since the last summary; internal, not part of to_dict()
+    unsummarized_tokens: int = 0
+    
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, including ones not loaded."""
+        return self.history_offset + len(self.messages)
     
     def add_message(self, role: str, content: str, metadata: Dict[str, Any] = None):
         """Add a message to the conversation."""
@@ -83,8 +133,29 @@ class Conversation:
             messages = messages[-max_messages:]
         return [msg.to_langchain_format() for msg in messages]
     
-    def get_context_window(self, max_tokens: int = 4000, avg_chars_per_token: int = 4) -> List[ChatMessage]:
-        """Get messages that fit within a context window."""
+    def get_context_window(self, max_tokens: int = 4000, avg_chars_per_token: int = 4,
+                           tokenizer: Tokenizer = None,
+                           cached_counts: bool = True) -> List[ChatMessage]:
+        """
+        Get messages that fit within a context window.
+        
+        With a tokenizer, messages are priced by their token counts plus
+        per-message overhead; otherwise by ``avg_chars_per_token``. Pass
+        ``cached_counts=False`` when the tokenizer is not the one the cached
+        counts were made with.
+        """
+        if tokenizer is not None:
+            selected = []
+            total_tokens = 0
+            for msg in reversed(self.messages):
+                cost = msg.tokens(tokenizer, cache=cached_counts) + TOKENS_PER_MESSAGE
+                if total_tokens + cost > max_tokens:
+                    break
+                selected.append(msg)
+                total_tokens += cost
+            selected.reverse()
+            return selected
+        
         max_chars = max_tokens * avg_chars_per_token
         selected = []
         total_chars = 0
@@ -107,6 +178,7 @@ class Conversation:
             'user_id': self.user_id,
             'title': self.title,
             'messages': [msg.to_dict() for msg in self.messages],
+            'message_count': self.message_count,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
             'metadata': self.metadata
@@ -131,23 +203,65 @@ class Conversation:
 class ConversationMemoryManager:
     """
     Manages conversation memory with both in-memory and persistent storage.
+    
+    Usage:
+        manager = get_conversation_memory_manager()
+        conversation = manager.get_or_create_conversation('agent', agent_id, user_id)
+        manager.add_message(conversation.conversation_id, 'human', text)
+        history = manager.get_chat_history(conversation.conversation_id, max_messages=20)
     """
     
-    def __init__(self, db_facade=None, storage_path: str = None):
+    # Header columns; the legacy blob is read only to migrate it
+    HEADER_COLUMNS = ("conversation_id, entity_type, entity_id, user_id, title, "
+                      "metadata_json, message_count, unsummarized_tokens, created_at, "
+                      "updated_at")
+    
+    # Tries per message when another writer takes the same seq
+    APPEND_ATTEMPTS = 3
+    
+    def __init__(self, db_facade=None, storage_path: str = None,
+                 max_cached: int = 256, window_size: int = 100,
+                 tokenizer: Tokenizer = None,
+                 summarizer: Callable[[Optional[str], List[ChatMessage]], str] = None,
+                 summary_threshold_tokens: int = 3000, summary_keep_recent: int = 10,
+                 default_context_tokens: int = 8000):
         """
         Initialize the conversation memory manager.
         
         Args:
             db_facade: Database facade for persistent storage
             storage_path: Optional file-based storage path
+            max_cached: Conversations kept in the in-memory LRU cache
+            window_size: Recent messages loaded for cold conversations
+            tokenizer: Token counter for stored messages and context budgets;
+                if None, stored counts use the default tokenizer and budgets
+                for a model use that model's tokenizer
+            summarizer: Optional ``summarizer(previous_summary, messages)``
+                that returns a new rolling summary; enables summarization
+            summary_threshold_tokens: Unsummarized tokens (outside the recent
+                turns) that trigger a background summary
+            summary_keep_recent: Most recent messages never summarized
+            default_context_tokens: Prompt budget when the model's limits are unknown
         """
         self.db_facade = db_facade
         self.storage_path = Path(storage_path) if storage_path else None
-        self._cache: Dict[str, Conversation] = {}
+        self.max_cached = max(1, max_cached)
+        self.window_size = max(1, window_size)
+        self.tokenizer = tokenizer or get_tokenizer()
+        self._per_model_tokenizers = tokenizer is None
+        self.summarizer = summarizer
+        self.summary_threshold_tokens = summary_threshold_tokens
+        self.summary_keep_recent = max(1, min(summary_keep_recent, self.window_size))
+        self.default_context_tokens = default_context_tokens
+        self._cache: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+        self._summarizing: set = set()
         
-        # Ensure database table exists
+        # Ensure database tables exist and migrate legacy message blobs
         if self.db_facade:
             self._ensure_table()
+            self._migrate_legacy_messages()
         
         # Ensure storage directory exists
         if self.storage_path:
@@ -156,7 +270,7 @@ class ConversationMemoryManager:
         logger.info("ConversationMemoryManager initialized")
     
     def _ensure_table(self):
-        """Create conversations table if it doesn't exist."""
+        """Create conversation tables if they don't exist."""
         try:
             self.db_facade.execute("""
                 CREATE TABLE IF NOT EXISTS conversations (
@@ -167,23 +281,101 @@ class ConversationMemoryManager:
                     title TEXT,
                     messages_json TEXT DEFAULT '[]',
                     metadata_json TEXT DEFAULT '{}',
+                    message_count INTEGER DEFAULT 0,
+                    unsummarized_tokens INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             self.db_facade.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversations_entity 
+                CREATE INDEX IF NOT EXISTS idx_conversations_entity
                 ON conversations(entity_type, entity_id)
             """)
             self.db_facade.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversations_user 
+                CREATE INDEX IF NOT EXISTS idx_conversations_user
                 ON conversations(user_id)
             """)
+            self.db_facade.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_messages (
+                    conversation_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT,
+                    metadata_json TEXT DEFAULT '{}',
+                    timestamp TEXT,
+                    token_count INTEGER,
+                    PRIMARY KEY (conversation_id, seq)
+                )
+            """)
             logger.info("Conversations table ensured")
         except Exception as e:
             logger.error(f"Failed to create conversations table: {e}")
+        
+        # Tables created by earlier versions lack the counter columns
+        self._ensure_column('conversations', 'message_count', 'INTEGER DEFAULT 0')
+        self._ensure_column('conversations', 'unsummarized_tokens', 'INTEGER DEFAULT 0')
+        self._ensure_column('conversation_messages', 'token_count', 'INTEGER')
+    
+    def _ensure_column(self, table: str, column: str, definition: str):
+        """Add a column to an existing table when it is missing."""
+        try:
+            self.db_facade.fetch_one(f"SELECT {column} FROM {table} LIMIT 1")
+        except Exception:
+            try:
+                self.db_facade.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                logger.info(f"Added {column} column to {table}")
+            except Exception as e:
+                logger.error(f"Failed to add {column} column to {table}: {e}")
+    
+    def _migrate_legacy_messages(self) -> int:
+        """Move messages stored in the legacy messages_json blob into rows."""
+        try:
+            rows = self.db_facade.fetch_all(
+                """SELECT conversation_id, messages_json FROM conversations
+                   WHERE messages_json IS NOT NULL AND messages_json NOT IN ('', '[]')"""
+            ) or []
+        except Exception as e:
+            logger.error(f"Failed to scan conversations for migration: {e}")
+            return 0
+        
+        migrated = 0
+        for row in rows:
+            if self._migrate_conversation(row['conversation_id'], row['messages_json']):
+                migrated += 1
+        if migrated:
+            logger.info(f"Migrated {migrated} conversation(s) to per-message storage")
+        return migrated
+    
+    def _migrate_conversation(self, conversation_id: str, messages_json: Any) -> bool:
+        """Rewrite one conversation's blob as message rows; idempotent."""
+        try:
+            messages_data = json.loads(messages_json) if isinstance(messages_json, str) else messages_json
+            messages = [ChatMessage.from_dict(m) for m in (messages_data or [])]
+            with self.db_facade.transaction():
+                self.db_facade.execute(
+                    "DELETE FROM conversation_messages WHERE conversation_id = ?",
+                    (conversation_id,)
+                )
+                if messages:
+                    self.db_facade.execute_many(
+                        """INSERT INTO conversation_messages
+                           (conversation_id, seq, role, content, metadata_json, timestamp,
+                            token_count)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        [self._message_params(conversation_id, seq, msg)
+                         for seq, msg in enumerate(messages)]
+                    )
+                self.db_facade.execute(
+                    """UPDATE conversations SET messages_json = '[]', message_count = ?
+                       WHERE conversation_id = ?""",
+                    (len(messages), conversation_id)
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to migrate conversation {conversation_id}: {e}")
+            return False
     
-    def create_conversation(self, entity_type: str, entity_id: str, 
+    def create_conversation(self, entity_type: str, entity_id: str,
                            user_id: str, metadata: Dict[str, Any] = None) -> Conversation:
         """
         Create a new conversation session.
@@ -193,7 +385,7 @@ class ConversationMemoryManager:
             entity_id: ID of the agent or workflow
             user_id: User initiating the conversation
             metadata: Optional metadata
-            
+        
         Returns:
             New Conversation instance
         """
@@ -208,40 +400,47 @@ class ConversationMemoryManager:
         )
         
         # Cache it
-        self._cache[conversation_id] = conversation
+        self._cache_put(conversation)
         
         # Persist to database
-        self._save_to_db(conversation)
+        self._insert_conversation(conversation)
         
         logger.info(f"Created conversation {conversation_id} for {entity_type}/{entity_id}")
         return conversation
     
-    def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
+    def get_conversation(self, conversation_id: str,
+                         max_messages: int = None) -> Optional[Conversation]:
         """
         Get a conversation by ID.
         
         Args:
             conversation_id: Conversation ID
-            
+            max_messages: Load at least this many recent messages instead of
+                the full history (older ones stay in the database)
+        
         Returns:
             Conversation or None if not found
         """
         # Check cache first
-        if conversation_id in self._cache:
-            return self._cache[conversation_id]
+        with self._lock:
+            conversation = self._cache.get(conversation_id)
+            if conversation is not None:
+                self._cache.move_to_end(conversation_id)
+                if conversation.history_offset and (
+                        not max_messages or len(conversation.messages) < max_messages):
+                    self._load_older_messages(conversation, max_messages)
+                return conversation
         
         # Try database
-        conversation = self._load_from_db(conversation_id)
+        conversation = self._load_from_db(conversation_id, max_messages)
         if conversation:
-            self._cache[conversation_id] = conversation
-            return conversation
+            return self._cache_put(conversation)
         
         # Try file storage
         if self.storage_path:
             conversation = self._load_from_file(conversation_id)
             if conversation:
-                self._cache[conversation_id] = conversation
-                return conversation
+                return self._cache_put(conversation)
         
         return None
     
@@ -250,17 +449,20 @@ class ConversationMemoryManager:
         """
         Get existing conversation or create new one.
         
+        Existing conversations are loaded windowed (``window_size`` recent
+        messages), which is all a chat turn needs.
+        
         Args:
             entity_type: 'agent' or 'workflow'
             entity_id: ID of the agent or workflow
             user_id: User ID
             conversation_id: Optional existing conversation ID
-            
+        
         Returns:
             Conversation instance
         """
         if conversation_id:
-            conversation = self.get_conversation(conversation_id)
+            conversation = self.get_conversation(conversation_id, max_messages=self.window_size)
             if conversation:
                 return conversation
         
@@ -276,49 +478,172 @@ class ConversationMemoryManager:
             role: 'human' or 'assistant'
             content: Message content
             metadata: Optional message metadata
-            
+        
         Returns:
-            True if successful
+            True if the message was stored, False if the conversation is
+            missing or the database write failed
         """
-        conversation = self.get_conversation(conversation_id)
-        if not conversation:
-            logger.warning(f"Conversation not found: {conversation_id}")
-            return False
-        
-        conversation.add_message(role, content, metadata)
-        self._save_to_db(conversation)
+        with self._lock:
+            conversation = self.get_conversation(conversation_id, max_messages=self.window_size)
+            if not conversation:
+                logger.warning(f"Conversation not found: {conversation_id}")
+                return False
+            
+            expected_seq = conversation.message_count
+            previous_title = conversation.title
+            previous_updated_at = conversation.updated_at
+            conversation.add_message(role, content, metadata)
+            message = conversation.messages[-1]
+            tokens = message.tokens(self.tokenizer)
+            conversation.unsummarized_tokens += tokens
+            
+            seq = self._append_to_db(conversation, message)
+            if seq is None:
+                # Keep memory consistent with what was stored
+                conversation.messages.pop()
+                conversation.title = previous_title
+                conversation.updated_at = previous_updated_at
+                conversation.unsummarized_tokens -= tokens
+                return False
+            if seq != expected_seq:
+                # Another writer appended meanwhile; reload the tail in order
+                self._reload_window(conversation)
+            
+            # Keep long hot conversations bounded in memory
+            if self.db_facade and len(conversation.messages) > 2 * self.window_size:
+                drop = len(conversation.messages) - self.window_size
+                conversation.messages = conversation.messages[drop:]
+                conversation.history_offset += drop
+            
+            needs_summary = self._needs_summary(conversation)
         
+        if needs_summary:
+            self._schedule_summary(conversation_id)
         return True
     
-    def get_chat_history(self, conversation_id: str, 
+    def get_chat_history(self, conversation_id: str,
                         max_messages: int = None) -> List[Tuple[str, str]]:
         """
         Get chat history for a conversation in LangChain format.
         
         Args:
             conversation_id: Conversation ID
-            max_messages: Optional limit on messages
-            
+            max_messages: Optional limit on messages; only these are loaded
+        
         Returns:
             List of (role, content) tuples
         """
-        conversation = self.get_conversation(conversation_id)
+        conversation = self.get_conversation(conversation_id, max_messages=max_messages)
         if not conversation:
             return []
         
         return conversation.get_chat_history(max_messages)
     
+    def tokenizer_for(self, model: str = None) -> Tokenizer:
+        """Tokenizer used to budget prompts for ``model``."""
+        if model and self._per_model_tokenizers:
+            return get_tokenizer(model)
+        return self.tokenizer
+    
+    def count_tokens(self, text: str, model: str = None) -> int:
+        """Count tokens in ``text`` the way prompts for ``model`` are budgeted."""
+        return self.tokenizer_for(model).count(text or '')
+    
+    def get_context_window(self, conversation_id: str, max_tokens: int = None,
+                           model: str = None, reserve_tokens: int = 0) -> List[ChatMessage]:
+        """
+        Get the most recent messages that fit within a token budget.
+        
+        When a rolling summary exists it comes first, as a system message
+        standing in for the turns it covers. Older messages are paged in only
+        while the loaded history still fits.
+        
+        Args:
+            conversation_id: Conversation ID
+            max_tokens: Token budget; defaults to the model's context window
+                minus its output allowance (``llm_models``), or the manager's
+                default budget when the model is not listed there
+            model: Model ID or name used to look up limits and the tokenizer
+            reserve_tokens: Tokens to keep free (system prompt, tools, input)
+        
+        Returns:
+            List of ChatMessage, oldest first
+        """
+        if max_tokens is None:
+            limits = get_model_context_limits(self.db_facade)
+            if limits.lookup(model):
+                max_tokens = limits.prompt_budget(model, reserve_tokens)
+            else:
+                # Unknown or unnamed model: fall back to the configured budget
+                max_tokens = max(0, self.default_context_tokens - reserve_tokens)
+        tokenizer = self.tokenizer_for(model)
+        cached_counts = tokenizer is self.tokenizer
+        
+        window = self.window_size
+        while True:
+            conversation = self.get_conversation(conversation_id, max_messages=window)
+            if not conversation:
+                return []
+            
+            summary_message = None
+            summarized_through = -1
+            budget = max_tokens
+            summary = conversation.metadata.get('summary')
+            if summary and summary.get('content'):
+                summary_message = ChatMessage(
+                    role='system',
+                    content=f"Summary of the earlier conversation:\n{summary['content']}",
+                    timestamp=summary.get('updated_at', ''),
+                    metadata={'summary': True}
+                )
+                summarized_through = summary.get('through_seq', -1)
+                budget -= summary_message.tokens(tokenizer) + TOKENS_PER_MESSAGE
+            
+            first_unsummarized = max(0, summarized_through + 1 - conversation.history_offset)
+            candidates = Conversation(
+                conversation_id=conversation_id, entity_type=conversation.entity_type,
+                entity_id=conversation.entity_id, user_id=conversation.user_id,
+                messages=conversation.messages[first_unsummarized:]
+            )
+            selected = candidates.get_context_window(max(0, budget), tokenizer=tokenizer,
+                                                     cached_counts=cached_counts)
+            
+            exhausted = (len(selected) < len(candidates.messages)
+                         or conversation.history_offset <= summarized_through + 1)
+            if exhausted:
+                return ([summary_message] if summary_message else []) + selected
+            window = len(conversation.messages) * 2
+    
+    def get_context_history(self, conversation_id: str, max_tokens: int = None,
+                            model: str = None, reserve_tokens: int = 0,
+                            max_messages: int = None) -> List[Tuple[str, str]]:
+        """
+        Token-budgeted chat history in LangChain format.
+        
+        Like :meth:`get_context_window`, optionally capped at ``max_messages``
+        conversation turns (the summary message does not count).
+        """
+        window = self.get_context_window(conversation_id, max_tokens=max_tokens,
+                                         model=model, reserve_tokens=reserve_tokens)
+        if max_messages:
+            summary = [m for m in window[:1] if m.metadata.get('summary')]
+            window = summary + window[len(summary):][-max_messages:]
+        return [msg.to_langchain_format() for msg in window]
+    
     def get_conversations_for_entity(self, entity_type: str, entity_id: str,
                                      user_id: str = None, limit: int = 50) -> List[Conversation]:
         """
         Get all conversations for an entity.
         
+        Only conversation headers are loaded; ``messages`` is empty and
+        ``message_count`` holds the stored total.
+        
         Args:
             entity_type: 'agent' or 'workflow'
             entity_id: Entity ID
             user_id: Optional user filter
             limit: Maximum conversations to return
-            
+        
         Returns:
             List of Conversations
         """
@@ -328,14 +653,14 @@ class ConversationMemoryManager:
         try:
             if user_id:
                 rows = self.db_facade.fetch_all(
-                    """SELECT * FROM conversations 
+                    f"""SELECT {self.HEADER_COLUMNS} FROM conversations
                        WHERE entity_type = ? AND entity_id = ? AND user_id = ?
                        ORDER BY updated_at DESC LIMIT ?""",
                     (entity_type, entity_id, user_id, limit)
                 )
             else:
                 rows = self.db_facade.fetch_all(
-                    """SELECT * FROM conversations 
+                    f"""SELECT {self.HEADER_COLUMNS} FROM conversations
                        WHERE entity_type = ? AND entity_id = ?
                        ORDER BY updated_at DESC LIMIT ?""",
                     (entity_type, entity_id, limit)
@@ -358,21 +683,26 @@ class ConversationMemoryManager:
         
         Args:
             conversation_id: Conversation ID
-            
+        
         Returns:
             True if deleted
         """
         # Remove from cache
-        if conversation_id in self._cache:
-            del self._cache[conversation_id]
+        with self._lock:
+            self._cache.pop(conversation_id, None)
         
         # Remove from database
         if self.db_facade:
             try:
-                self.db_facade.execute(
-                    "DELETE FROM conversations WHERE conversation_id = ?",
-                    (conversation_id,)
-                )
+                with self.db_facade.transaction():
+                    self.db_facade.execute(
+                        "DELETE FROM conversation_messages WHERE conversation_id = ?",
+                        (conversation_id,)
+                    )
+                    self.db_facade.execute(
+                        "DELETE FROM conversations WHERE conversation_id = ?",
+                        (conversation_id,)
+                    )
                 logger.info(f"Deleted conversation {conversation_id}")
                 return True
             except Exception as e:
@@ -386,40 +716,174 @@ class ConversationMemoryManager:
         
         Args:
             conversation_id: Conversation ID
-            
+        
         Returns:
             True if cleared
         """
-        conversation = self.get_conversation(conversation_id)
+        with self._lock:
+            conversation = self.get_conversation(conversation_id, max_messages=1)
+            if not conversation:
+                return False
+            
+            conversation.messages = []
+            conversation.history_offset = 0
+            conversation.metadata.pop('summary', None)
+            conversation.unsummarized_tokens = 0
+            conversation.updated_at = datetime.now(timezone.utc).isoformat()
+            if self.db_facade:
+                try:
+                    with self.db_facade.transaction():
+                        self.db_facade.execute(
+                            "DELETE FROM conversation_messages WHERE conversation_id = ?",
+                            (conversation_id,)
+                        )
+                        self._update_header(conversation)
+                except Exception as e:
+                    logger.error(f"Failed to clear conversation: {e}")
+        
+        logger.info(f"Cleared messages from conversation {conversation_id}")
+        return True
+    
+    def _needs_summary(self, conversation: Conversation) -> bool:
+        """Whether enough unsummarized history has built up to fold into the summary."""
+        if not self.summarizer or conversation.conversation_id in self._summarizing:
+            return False
+        if conversation.unsummarized_tokens < self.summary_threshold_tokens:
+            return False
+        through_seq = (conversation.metadata.get('summary') or {}).get('through_seq', -1)
+        return conversation.message_count - (through_seq + 1) > self.summary_keep_recent
+    
+    def _schedule_summary(self, conversation_id: str):
+        """Summarize a conversation on the background worker (one run per conversation)."""
+        with self._lock:
+            if conversation_id in self._summarizing:
+                return
+            self._summarizing.add(conversation_id)
+            if self._summary_executor is None:
+                self._summary_executor = ThreadPoolExecutor(max_workers=1,
+                                                            thread_name_prefix='conv-summary')
+        self._summary_executor.submit(self._summarize_in_background, conversation_id)
+    
+    def _summarize_in_background(self, conversation_id: str):
+        try:
+            self.summarize_conversation(conversation_id)
+        except Exception as e:
+            logger.error(f"Failed to summarize conversation {conversation_id}: {e}")
+        finally:
+            with self._lock:
+                self._summarizing.discard(conversation_id)
+    
+    def summarize_conversation(self, conversation_id: str) -> bool:
+        """
+        Fold messages older than the most recent ``summary_keep_recent``
+        into the conversation's rolling summary.
+        
+        The summarizer runs outside the lock; the result is discarded if
+        the conversation was cleared meanwhile.
+        
+        Returns:
+            True if the summary was updated
+        """
+        if not self.summarizer:
+            return False
+        
+        conversation = self.get_conversation(conversation_id, max_messages=self.window_size)
         if not conversation:
             return False
+        previous = conversation.metadata.get('summary') or {}
+        through_seq = previous.get('through_seq', -1)
+        new_through = conversation.message_count - self.summary_keep_recent - 1
+        if new_through <= through_seq:
+            return False
         
-        conversation.messages = []
-        conversation.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_to_db(conversation)
+        pending = [msg for seq, msg in self._pending_messages(conversation, through_seq, new_through)]
+        if not pending:
+            return False
+        content = self.summarizer(previous.get('content'), pending)
+        if not content:
+            return False
         
-        logger.info(f"Cleared messages from conversation {conversation_id}")
+        with self._lock:
+            conversation = self._cache.get(conversation_id) or self.get_conversation(conversation_id)
+            if not conversation or conversation.message_count <= new_through:
+                return False
+            if (conversation.metadata.get('summary') or {}).get('through_seq', -1) != through_seq:
+                return False
+            conversation.metadata['summary'] = {
+                'content': content,
+                'through_seq': new_through,
+                'token_count': self.tokenizer.count(content),
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            }
+            remaining = self._pending_messages(conversation, new_through, conversation.message_count - 1)
+            conversation.unsummarized_tokens = sum(
+                msg.tokens(self.tokenizer) for seq, msg in remaining)
+            if self.db_facade:
+                try:
+                    self._update_header(conversation)
+                except Exception as e:
+                    logger.error(f"Failed to save conversation summary: {e}")
+        
+        logger.debug(f"Summarized conversation {conversation_id} through message {new_through}")
         return True
     
-    def _save_to_db(self, conversation: Conversation):
-        """Save conversation to database."""
+    def _pending_messages(self, conversation: Conversation, after_seq: int,
+                          through_seq: int) -> List[Tuple[int, ChatMessage]]:
+        """``(seq, message)`` pairs in ``(after_seq, through_seq]``, from memory or the DB."""
+        offset = conversation.history_offset
+        if after_seq + 1 >= offset or not self.db_facade:
+            start = max(0, after_seq + 1 - offset)
+            return [(offset + i, msg)
+                    for i, msg in enumerate(conversation.messages[start:through_seq + 1 - offset],
+                                            start)]
+        return [(seq, msg) for seq, msg in
+                self._fetch_messages(conversation.conversation_id, after_seq=after_seq)
+                if seq <= through_seq]
+    
+    def shutdown(self):
+        """Stop the background summary worker."""
+        if self._summary_executor is not None:
+            self._summary_executor.shutdown(wait=False)
+    
+    def _cache_put(self, conversation: Conversation) -> Conversation:
+        """Cache a conversation, keeping the first copy if another thread won."""
+        with self._lock:
+            cached = self._cache.get(conversation.conversation_id)
+            if cached is not None:
+                self._cache.move_to_end(conversation.conversation_id)
+                return cached
+            self._cache[conversation.conversation_id] = conversation
+            # Evicted conversations are reloaded from the database on demand
+            while self.db_facade and len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return conversation
+    
+    def _message_params(self, conversation_id: str, seq: int, message: ChatMessage) -> tuple:
+        return (conversation_id, seq, message.role, message.content,
+                json.dumps(message.metadata), message.timestamp,
+                message.tokens(self.tokenizer))
+    
+    def _insert_conversation(self, conversation: Conversation):
+        """Insert a new conversation header."""
         if not self.db_facade:
             return
         
         try:
             self.db_facade.execute(
-                """INSERT OR REPLACE INTO conversations 
+                """INSERT INTO conversations
                    (conversation_id, entity_type, entity_id, user_id, title,
-                    messages_json, metadata_json, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    messages_json, metadata_json, message_count, unsummarized_tokens,
+                    created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, '[]', ?, ?, ?, ?, ?)""",
                 (
                     conversation.conversation_id,
                     conversation.entity_type,
                     conversation.entity_id,
                     conversation.user_id,
                     conversation.title,
-                    json.dumps([m.to_dict() for m in conversation.messages]),
                     json.dumps(conversation.metadata),
+                    conversation.message_count,
+                    conversation.unsummarized_tokens,
                     conversation.created_at,
                     conversation.updated_at
                 )
@@ -427,8 +891,121 @@ class ConversationMemoryManager:
         except Exception as e:
             logger.error(f"Failed to save conversation: {e}")
     
-    def _load_from_db(self, conversation_id: str) -> Optional[Conversation]:
-        """Load conversation from database."""
+    def _update_header(self, conversation: Conversation):
+        """Update title, counters and timestamps of a stored conversation."""
+        self.db_facade.execute(
+            """UPDATE conversations SET title = ?, metadata_json = ?, message_count = ?,
+                   unsummarized_tokens = ?, updated_at = ?
+               WHERE conversation_id = ?""",
+            (conversation.title, json.dumps(conversation.metadata),
+             conversation.message_count, conversation.unsummarized_tokens,
+             conversation.updated_at, conversation.conversation_id)
+        )
+    
+    def _append_to_db(self, conversation: Conversation, message: ChatMessage) -> Optional[int]:
+        """
+        Insert the conversation's newest message and update its header.
+        
+        The seq is allocated from the table in the same transaction, so an
+        earlier failed write or another worker process cannot make it
+        collide with a stored row. A concurrent insert of the same seq
+        fails the primary key and is retried with a fresh seq.
+        
+        Returns:
+            The stored seq, or None if the write failed
+        """
+        if not self.db_facade:
+            return conversation.message_count - 1
+        
+        offset = conversation.history_offset
+        for attempt in range(1, self.APPEND_ATTEMPTS + 1):
+            try:
+                with self.db_facade.transaction():
+                    row = self.db_facade.fetch_one(
+                        """SELECT COALESCE(MAX(seq), -1) + 1 AS next_seq
+                           FROM conversation_messages WHERE conversation_id = ?""",
+                        (conversation.conversation_id,)
+                    )
+                    seq = row['next_seq'] if row else 0
+                    self.db_facade.execute(
+                        """INSERT INTO conversation_messages
+                           (conversation_id, seq, role, content, metadata_json, timestamp,
+                            token_count)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        self._message_params(conversation.conversation_id, seq, message)
+                    )
+                    # Header count follows the stored rows
+                    conversation.history_offset = seq + 1 - len(conversation.messages)
+                    self._update_header(conversation)
+                return seq
+            except Exception as e:
+                conversation.history_offset = offset
+                if attempt < self.APPEND_ATTEMPTS and _is_integrity_error(e):
+                    continue
+                logger.error(f"Failed to save message to conversation "
+                             f"{conversation.conversation_id}: {e}")
+                return None
+        return None
+    
+    def _reload_window(self, conversation: Conversation):
+        """Replace the loaded messages with the stored tail of the conversation."""
+        try:
+            messages = self._fetch_messages(conversation.conversation_id, limit=self.window_size)
+        except Exception as e:
+            logger.error(f"Failed to reload conversation window: {e}")
+            return
+        conversation.messages = [m for _, m in messages]
+        conversation.history_offset = messages[0][0] if messages else 0
+    
+    def _fetch_messages(self, conversation_id: str, limit: int = None,
+                        before_seq: int = None,
+                        after_seq: int = None) -> List[Tuple[int, ChatMessage]]:
+        """Read ``(seq, message)`` pairs oldest first, limited to the newest ``limit``."""
+        query = ("SELECT seq, role, content, metadata_json, timestamp, token_count "
+                 "FROM conversation_messages WHERE conversation_id = ?")
+        params: List[Any] = [conversation_id]
+        if before_seq is not None:
+            query += " AND seq < ?"
+            params.append(before_seq)
+        if after_seq is not None:
+            query += " AND seq > ?"
+            params.append(after_seq)
+        query += " ORDER BY seq DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        rows = self.db_facade.fetch_all(query, tuple(params)) or []
+        messages = []
+        for row in reversed(rows):
+            metadata_json = row.get('metadata_json') or '{}'
+            messages.append((row['seq'], ChatMessage(
+                role=row.get('role') or 'human',
+                content=row.get('content') or '',
+                timestamp=row.get('timestamp') or '',
+                metadata=json.loads(metadata_json) if isinstance(metadata_json, str) else metadata_json,
+                token_count=row.get('token_count')
+            )))
+        return messages
+    
+    def _load_older_messages(self, conversation: Conversation, max_messages: int = None):
+        """Page in stored messages older than the loaded window."""
+        if not self.db_facade:
+            return
+        
+        need = max_messages - len(conversation.messages) if max_messages else None
+        try:
+            older = self._fetch_messages(conversation.conversation_id, limit=need,
+                                         before_seq=conversation.history_offset)
+        except Exception as e:
+            logger.error(f"Failed to load older messages: {e}")
+            return
+        conversation.messages = [m for _, m in older] + conversation.messages
+        conversation.history_offset = older[0][0] if older else 0
+    
+    def _load_from_db(self, conversation_id: str,
+                      max_messages: int = None) -> Optional[Conversation]:
+        """Load a conversation header and its most recent messages from database."""
         if not self.db_facade:
             return None
         
@@ -437,23 +1014,33 @@ class ConversationMemoryManager:
                 "SELECT * FROM conversations WHERE conversation_id = ?",
                 (conversation_id,)
             )
-            return self._row_to_conversation(row) if row else None
+            if not row:
+                return None
+            
+            # Rows written before per-message storage still hold a blob
+            legacy = row.get('messages_json')
+            if legacy and legacy not in ('', '[]'):
+                self._migrate_conversation(conversation_id, legacy)
+            
+            conversation = self._row_to_conversation(row)
+            if not conversation:
+                return None
+            messages = self._fetch_messages(conversation_id, limit=max_messages)
+            conversation.messages = [m for _, m in messages]
+            conversation.history_offset = messages[0][0] if messages else 0
+            return conversation
         except Exception as e:
             logger.error(f"Failed to load conversation: {e}")
             return None
     
     def _row_to_conversation(self, row) -> Optional[Conversation]:
-        """Convert database row to Conversation object."""
+        """Convert a conversation header row to a Conversation without messages."""
         if not row:
             return None
         
         try:
             row_dict = dict(row) if hasattr(row, 'keys') else row
             
-            messages_json = row_dict.get('messages_json', '[]')
-            messages_data = json.loads(messages_json) if isinstance(messages_json, str) else messages_json
-            messages = [ChatMessage.from_dict(m) for m in messages_data]
-            
             metadata_json = row_dict.get('metadata_json', '{}')
             metadata = json.loads(metadata_json) if isinstance(metadata_json, str) else metadata_json
             
@@ -463,10 +1050,12 @@ class ConversationMemoryManager:
                 entity_id=row_dict.get('entity_id', ''),
                 user_id=row_dict.get('user_id', ''),
                 title=row_dict.get('title', ''),
-                messages=messages,
+                messages=[],
                 created_at=row_dict.get('created_at', ''),
                 updated_at=row_dict.get('updated_at', ''),
-                metadata=metadata
+                metadata=metadata or {},
+                history_offset=row_dict.get('message_count') or 0,
+                unsummarized_tokens=row_dict.get('unsummarized_tokens') or 0
             )
         except Exception as e:
             logger.error(f"Error converting row to conversation: {e}")
@@ -499,8 +1088,58 @@ def get_conversation_memory_manager() -> Optional[ConversationMemoryManager]:
     return _memory_manager
 
 
-def init_conversation_memory_manager(db_facade=None, storage_path: str = None) -> ConversationMemoryManager:
+def create_llm_summarizer(db_facade, model_id: str = None,
+                          max_tokens: int = 512) -> Callable[[Optional[str], List[ChatMessage]], str]:
+    """
+    Build a summarizer that condenses turns with a configured LLM.
+    
+    Calls run in the ``background`` rate-limit lane so they never hold up
+    interactive traffic.
+    
+    Args:
+        db_facade: Database facade used to resolve the model
+        model_id: Model to use (the system default if None)
+        max_tokens: Output limit for each summary
+    """
+    def summarize(previous_summary: Optional[str], messages: List[ChatMessage]) -> str:
+        from abhikarta.langchain.llm_factory import get_langchain_llm
+        from abhikarta.llm_provider.rate_limiter import llm_priority
+        
+        transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+        prompt = (
+            "Update the running summary of a conversation with the new turns below. "
+            "Keep facts, decisions, names, numbers and open questions; drop pleasantries. "
+            "Reply with the updated summary only.\n\n"
+            f"Current summary:\n{previous_summary or '(none)'}\n\n"
+            f"New turns:\n{transcript}"
+        )
+        with llm_priority('background'):
+            llm = get_langchain_llm(db_facade, model_id=model_id, temperature=0,
+                                    max_tokens=max_tokens)
+            response = llm.invoke(prompt)
+        return (getattr(response, 'content', response) or '').strip()
+    
+    return summarize
+
+
+def init_conversation_memory_manager(db_facade=None, storage_path: str = None,
+                                     max_cached: int = 256,
+                                     window_size: int = 100,
+                                     tokenizer: Tokenizer = None,
+                                     summarizer: Callable[[Optional[str], List[ChatMessage]], str] = None,
+                                     summary_threshold_tokens: int = 3000,
+                                     summary_keep_recent: int = 10,
+                                     default_context_tokens: int = 8000) -> ConversationMemoryManager:
     """Initialize the singleton ConversationMemoryManager."""
     global _memory_manager
-    _memory_manager = ConversationMemoryManager(db_facade, storage_path)
+    if _memory_manager is not None:
+        _memory_manager.shutdown()
+    _memory_manager = ConversationMemoryManager(db_facade, storage_path,
+                                                max_cached=max_cached,
+                                                window_size=window_size,
+                                                tokenizer=tokenizer,
+                                                summarizer=summarizer,
+                                                summary_threshold_tokens=summary_threshold_tokens,
+                                                summary_keep_recent=summary_keep_recent,
+                                                default_context_tokens=default_context_tokens)
     return _memory_manager
@@ -9,6 +9,7 @@ Ashutosh Sinha
 Version: 1.5.3
 """
 
+import gzip
 import json
 import logging
 import os
@@ -34,9 +35,14 @@ class EntityType(Enum):
 class LogFormat(Enum):
     """Log file formats."""
     JSON = "json"
+    JSONL = "jsonl"  # Append-only, one record per event
     TEXT = "text"
 
 
+# Log file extensions of every format, read regardless of the configured one
+LOG_EXTENSIONS = (".jsonl", ".jsonl.gz", ".json", ".log")
+
+
 @dataclass
 class ExecutionLogConfig:
     """Configuration for execution logging."""
@@ -47,6 +53,7 @@ class ExecutionLogConfig:
     file_retention_days: int = 10  # File system log retention
     db_retention_days: int = 30    # Database log retention
     cleanup_interval_hours: int = 24  # How often to run cleanup
+    compress_completed: bool = False  # Gzip JSONL logs of finished runs
     
     # Backward compatibility
     @property
@@ -63,7 +70,14 @@ class ExecutionLogConfig:
             config.base_path = prop_conf.get('execution.log.path', 'executionlog')
             
             format_str = prop_conf.get('execution.log.format', 'json').lower()
-            config.log_format = LogFormat.JSON if format_str == 'json' else LogFormat.TEXT
+            config.log_format = {
+                'json': LogFormat.JSON,
+                'jsonl': LogFormat.JSONL,
+            }.get(format_str, LogFormat.TEXT)
+            
+            config.compress_completed = prop_conf.get(
+                'execution.log.compress.completed', 'false'
+            ).lower() == 'true'
             
             config.include_llm_responses = prop_conf.get(
                 'execution.log.include.llm.responses', 'true'
@@ -192,6 +206,13 @@ class ExecutionLog:
             'node_executions': self.node_executions
         }
     
+    def header_dict(self) -> Dict[str, Any]:
+        """Everything except entries and node executions (JSONL header record)."""
+        result = self.to_dict()
+        del result['entries']
+        del result['node_executions']
+        return result
+    
     def to_text(self) -> str:
         """Convert to human-readable text format."""
         lines = [
@@ -327,7 +348,10 @@ class ExecutionLogger:
             self.config.base_path = os.path.abspath(self.config.base_path)
         
         self._active_logs: Dict[str, ExecutionLog] = {}
-        self._file_lock = threading.Lock()
+        self._file_lock = threading.Lock()  # Guards the per-file lock table
+        self._file_locks: Dict[str, threading.Lock] = {}
+        # JSONL mode: (entries, node_executions) already appended per execution
+        self._appended: Dict[str, Tuple[int, int]] = {}
         
         # Initialize directories
         if self.config.enabled:
@@ -349,8 +373,37 @@ class ExecutionLogger:
     def _get_log_path(self, entity_type: EntityType, execution_id: str) -> Path:
         """Get the path for a log file."""
         base_path = Path(self.config.base_path)
-        extension = "json" if self.config.log_format == LogFormat.JSON else "log"
-        return base_path / entity_type.value / f"{execution_id}.{extension}"
+        return base_path / entity_type.value / f"{execution_id}{self._get_extension()}"
+    
+    def _get_extension(self) -> str:
+        """Get the log file extension for the configured format."""
+        return {
+            LogFormat.JSON: ".json",
+            LogFormat.JSONL: ".jsonl",
+        }.get(self.config.log_format, ".log")
+    
+    def _resolve_log_path(self, entity_type: EntityType, execution_id: str) -> Optional[Path]:
+        """
+        Get the existing log file, including a gzip-rotated one.
+        
+        The configured format is tried first, then the others, so logs
+        written before a format change stay readable.
+        """
+        base_path = Path(self.config.base_path) / entity_type.value
+        configured = self._get_extension()
+        for extension in sorted(LOG_EXTENSIONS, key=lambda ext: ext.replace('.gz', '') != configured):
+            log_path = base_path / f"{execution_id}{extension}"
+            if log_path.exists():
+                return log_path
+        return None
+    
+    def _get_file_lock(self, execution_id: str) -> threading.Lock:
+        """Get the lock serializing writes to one execution's log file."""
+        with self._file_lock:
+            lock = self._file_locks.get(execution_id)
+            if lock is None:
+                lock = self._file_locks[execution_id] = threading.Lock()
+            return lock
     
     def start_execution(self, 
                        execution_id: str,
@@ -511,8 +564,14 @@ class ExecutionLogger:
             # Write final log
             self._write_log(log)
             
+            if self.config.log_format == LogFormat.JSONL and self.config.compress_completed:
+                self._compress_log(log)
+            
             # Remove from active logs
             del self._active_logs[execution_id]
+            with self._file_lock:
+                self._file_locks.pop(execution_id, None)
+                self._appended.pop(execution_id, None)
             
             logger.info(f"Completed execution log: {execution_id} ({status})")
     
@@ -522,12 +581,16 @@ class ExecutionLogger:
             return
         
         try:
-            with self._file_lock:
+            with self._get_file_lock(log.execution_id):
                 log_path = self._get_log_path(log.entity_type, log.execution_id)
                 
                 # Ensure directory exists
                 log_path.parent.mkdir(parents=True, exist_ok=True)
                 
+                if self.config.log_format == LogFormat.JSONL:
+                    self._append_jsonl(log, log_path)
+                    return
+                
                 if self.config.log_format == LogFormat.JSON:
                     content = json.dumps(log.to_dict(), indent=2, default=str)
                 else:
@@ -539,6 +602,49 @@ class ExecutionLogger:
         except Exception as e:
             logger.error(f"Failed to write execution log {log.execution_id}: {e}")
     
+    def _append_jsonl(self, log: ExecutionLog, log_path: Path):
+        """
+        Append records added since the last write (caller holds the file lock).
+        
+        Records: one 'header' when the run starts, then 'entry' and 'node'
+        records as they occur, and a trailing 'summary' record repeating the
+        header fields with their final values (status, output, and anything
+        set after the header was written).
+        """
+        written = self._appended.get(log.execution_id)
+        records = []
+        if written is None:
+            written = (0, 0)
+            records.append({'record': 'header', **log.header_dict()})
+        entries_done, nodes_done = written
+        
+        for entry in log.entries[entries_done:]:
+            records.append({'record': 'entry', **entry.to_dict()})
+        for node in log.node_executions[nodes_done:]:
+            records.append({'record': 'node', **node})
+        if log.completed_at:
+            records.append({'record': 'summary', **log.header_dict()})
+        
+        if records:
+            lines = [json.dumps(r, default=str, separators=(',', ':')) for r in records]
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        
+        with self._file_lock:
+            self._appended[log.execution_id] = (len(log.entries), len(log.node_executions))
+    
+    def _compress_log(self, log: ExecutionLog):
+        """Gzip a finished JSONL log to <execution_id>.jsonl.gz."""
+        log_path = self._get_log_path(log.entity_type, log.execution_id)
+        gz_path = log_path.with_name(log_path.name + ".gz")
+        try:
+            with self._get_file_lock(log.execution_id):
+                with open(log_path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+                    dst.writelines(src)
+                log_path.unlink()
+        except Exception as e:
+            logger.error(f"Failed to compress execution log {log.execution_id}: {e}")
+    
     def get_log(self, execution_id: str) -> Optional[ExecutionLog]:
         """Get an active execution log."""
         return self._active_logs.get(execution_id)
@@ -590,28 +696,32 @@ class ExecutionLogger:
         # Try to detect from execution ID format
         detected_type = self.detect_entity_type_from_id(execution_id)
         if detected_type:
-            log_path = self._get_log_path(detected_type, execution_id)
-            if log_path.exists():
+            log_path = self._resolve_log_path(detected_type, execution_id)
+            if log_path:
                 return (detected_type, log_path)
         
         # Search all entity type directories
         for entity_type in EntityType:
-            log_path = self._get_log_path(entity_type, execution_id)
-            if log_path.exists():
+            log_path = self._resolve_log_path(entity_type, execution_id)
+            if log_path:
                 return (entity_type, log_path)
         
         return None
     
     def read_log_file(self, entity_type: EntityType, execution_id: str) -> Optional[Dict[str, Any]]:
         """Read a log file from disk."""
-        log_path = self._get_log_path(entity_type, execution_id)
+        log_path = self._resolve_log_path(entity_type, execution_id)
         
-        if not log_path.exists():
+        if log_path is None:
             return None
         
         try:
+            # Parse by the file's own format, not the configured one
+            if log_path.name.endswith(('.jsonl', '.jsonl.gz')):
+                return read_jsonl_log(log_path)
+            
             with open(log_path, 'r', encoding='utf-8') as f:
-                if self.config.log_format == LogFormat.JSON:
+                if log_path.suffix == '.json':
                     return json.load(f)
                 else:
                     return {'content': f.read()}
@@ -643,14 +753,14 @@ class ExecutionLogger:
             return []
         
         logs = []
-        extension = ".json" if self.config.log_format == LogFormat.JSON else ".log"
         
-        # Get files sorted by modification time (newest first)
-        files = sorted(base_path.glob(f"*{extension}"), 
-                      key=lambda x: x.stat().st_mtime, reverse=True)
+        # Get log files of every format sorted by modification time (newest first)
+        files = [f for f in base_path.iterdir() if f.name.endswith(LOG_EXTENSIONS)]
+        files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
         
         for log_file in files[:limit]:
-            execution_id = log_file.stem
+            extension = next(ext for ext in LOG_EXTENSIONS if log_file.name.endswith(ext))
+            execution_id = log_file.name[:-len(extension)]
             stat = log_file.stat()
             logs.append({
                 'execution_id': execution_id,
@@ -759,6 +869,38 @@ class ExecutionLogger:
         return removed_count
 
 
+def read_jsonl_log(log_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Rebuild the ExecutionLog.to_dict() view from a JSONL (optionally gzipped) log.
+    
+    The trailing 'summary' record is merged over the header. A truncated
+    final line from an interrupted write is ignored.
+    """
+    log_path = Path(log_path)
+    opener = gzip.open if log_path.suffix == '.gz' else open
+    result: Dict[str, Any] = {'entries': [], 'node_executions': []}
+    
+    with opener(log_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed record in {log_path}")
+                continue
+            kind = record.pop('record', None)
+            if kind == 'entry':
+                result['entries'].append(record)
+            elif kind == 'node':
+                result['node_executions'].append(record)
+            elif kind in ('header', 'summary'):
+                result.update(record)
+    
+    return result
+
+
 # Singleton accessor functions
 _default_logger: Optional[ExecutionLogger] = None
 
@@ -4,6 +4,8 @@ Swarm Event Bus - Internal messaging for swarm communication.
 Provides a dedicated event bus for intra-swarm communication with:
 - Topic-based pub/sub
 - Priority queuing
+- Topic trie for wildcard matching (* = one segment, # = zero or more)
+- Concurrent fan-out with per-subscriber bounded queues
 - Event history and replay
 - Metrics and monitoring
 
@@ -13,11 +15,13 @@ Ashutosh Sinha
 """
 
 import asyncio
-import fnmatch
+import contextvars
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional
 import uuid
 import json
@@ -162,11 +166,126 @@ class SwarmEvent:
         )
 
 
+@dataclass
+class _Subscription:
+    """A registered subscriber with its own delivery queue and workers."""
+    subscription_id: str
+    pattern: str
+    callback: Callable[[SwarmEvent], Any]
+    priority: int = 0
+    max_concurrency: int = 1
+    subscriber_id: Optional[str] = None     # Owning actor, for targeted events
+    queue: Optional[asyncio.Queue] = None
+    slots: Optional[asyncio.Semaphore] = None   # Free queue capacity ('block' policy)
+    workers: List[asyncio.Task] = field(default_factory=list)
+    delivered: int = 0
+    failed: int = 0
+    dropped: int = 0
+
+
+class _TopicTrieNode:
+    __slots__ = ('children', 'subscriptions')
+    
+    def __init__(self):
+        self.children: Dict[str, '_TopicTrieNode'] = {}
+        self.subscriptions: List[_Subscription] = []
+
+
+class TopicTrie:
+    """
+    Subscription patterns compiled into a trie over dot-separated segments.
+    
+    Segments match exactly, ``*`` matches exactly one segment and ``#``
+    matches zero or more segments, so a lookup costs O(depth of the event
+    type) rather than one pattern match per subscription.
+    """
+    
+    def __init__(self):
+        self._root = _TopicTrieNode()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, subscription: _Subscription) -> None:
+        node = self._root
+        for segment in subscription.pattern.split('.'):
+            node = node.children.setdefault(segment, _TopicTrieNode())
+        node.subscriptions.append(subscription)
+        self._size += 1
+    
+    def remove(self, subscription_id: str) -> Optional[_Subscription]:
+        """Remove a subscription by ID (pruning empty branches)."""
+        def _remove(node: _TopicTrieNode) -> Optional[_Subscription]:
+            for i, sub in enumerate(node.subscriptions):
+                if sub.subscription_id == subscription_id:
+                    return node.subscriptions.pop(i)
+            for segment, child in list(node.children.items()):
+                found = _remove(child)
+                if found:
+                    if not child.subscriptions and not child.children:
+                        del node.children[segment]
+                    return found
+            return None
+        
+        removed = _remove(self._root)
+        if removed:
+            self._size -= 1
+        return removed
+    
+    def match(self, event_type: str) -> List[_Subscription]:
+        """Return subscriptions matching an event type, highest priority first."""
+        segments = event_type.split('.')
+        found: Dict[str, _Subscription] = {}
+        
+        def _walk(node: _TopicTrieNode, index: int):
+            hash_child = node.children.get('#')
+            if hash_child is not None:
+                # '#' consumes zero or more of the remaining segments
+                for i in range(index, len(segments) + 1):
+                    _walk(hash_child, i)
+            if index == len(segments):
+                for sub in node.subscriptions:
+                    found[sub.subscription_id] = sub
+                return
+            child = node.children.get(segments[index])
+            if child is not None:
+                _walk(child, index + 1)
+            star_child = node.children.get('*')
+            if star_child is not None:
+                _walk(star_child, index + 1)
+        
+        _walk(self._root, 0)
+        return sorted(found.values(), key=lambda sub: -sub.priority)
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> TopicTrie:
+    """A single-pattern trie, cached for history filtering."""
+    trie = TopicTrie()
+    trie.add(_Subscription(subscription_id='', pattern=pattern, callback=None))
+    return trie
+
+
+# Subscription whose callback the current task is running
+_delivering: contextvars.ContextVar = contextvars.ContextVar('swarm_delivering', default=None)
+
+
 class SwarmEventBus:
     """
     Internal event bus for swarm communication.
     
     Provides topic-based pub/sub with priority queuing and event history.
+    A dispatcher takes events off the priority queue, looks up matching
+    subscriptions in a topic trie, and hands the event to each subscriber's
+    bounded queue; every subscriber has its own worker task(s), so one slow
+    agent no longer stalls delivery to the rest of the swarm.
+    
+    With the 'block' overflow policy, ``publish`` waits for room in every
+    matching subscriber's queue, so backpressure lands on the publisher and
+    the dispatcher never waits. Events published from inside a subscriber
+    callback are exempt and may overrun the queue bound. With 'drop',
+    events for a full queue are discarded.
     
     Usage:
         bus = SwarmEventBus("swarm-1")
@@ -180,16 +299,25 @@ class SwarmEventBus:
         await bus.publish(event)
     """
     
-    def __init__(self, swarm_id: str, max_history: int = 10000):
+    OVERFLOW_POLICIES = ('block', 'drop')
+    
+    def __init__(self, swarm_id: str, max_history: int = 10000,
+                 subscriber_queue_size: int = 1000, overflow_policy: str = 'block'):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
         self.swarm_id = swarm_id
         self._max_history = max_history
+        self._subscriber_queue_size = max(1, subscriber_queue_size)
+        self._overflow_policy = overflow_policy
         self._running = False
         
-        # Subscribers: pattern -> list of (callback, priority)
-        self._subscribers: Dict[str, List[tuple]] = {}
+        # Subscriptions compiled into a topic trie, plus an ID index
+        self._trie = TopicTrie()
+        self._subscriptions: Dict[str, _Subscription] = {}
         
         # Event queue with priority
         self._queue: asyncio.PriorityQueue = None
+        self._sequence = 0
         
         # Event history
         self._history: List[SwarmEvent] = []
@@ -201,6 +329,9 @@ class SwarmEventBus:
             'events_failed': 0,
             'events_dropped': 0,
         }
+        self._latency_count = 0
+        self._latency_total_ms = 0.0
+        self._latency_max_ms = 0.0
         
         # Processing task
         self._processor_task = None
@@ -210,6 +341,8 @@ class SwarmEventBus:
         """Start the event bus."""
         self._queue = asyncio.PriorityQueue()
         self._running = True
+        for subscription in self._subscriptions.values():
+            self._start_workers(subscription)
         self._processor_task = asyncio.create_task(self._process_events())
         logger.info(f"SwarmEventBus started for swarm {self.swarm_id}")
     
@@ -217,10 +350,15 @@ class SwarmEventBus:
         """Stop the event bus."""
         self._running = False
         
-        if self._processor_task:
-            self._processor_task.cancel()
+        tasks = [self._processor_task] if self._processor_task else []
+        for subscription in self._subscriptions.values():
+            tasks.extend(subscription.workers)
+            subscription.workers = []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             try:
-                await self._processor_task
+                await task
             except asyncio.CancelledError:
                 pass
         
@@ -240,9 +378,25 @@ class SwarmEventBus:
             logger.warning("Event bus not running")
             return False
         
-        # Add to queue with priority (negative for higher priority first)
+        # Add to queue with priority (negative for higher priority first);
+        # the sequence number keeps FIFO order within a priority
         priority = -event.priority.value
-        await self._queue.put((priority, event.timestamp.timestamp(), event))
+        # Publishes from subscriber callbacks never wait: subscribers that
+        # publish to each other could otherwise wait on each other forever
+        in_callback = _delivering.get() is not None
+        routes = []
+        for subscription in self._route(event):
+            reserved = False
+            if subscription.slots is not None and not in_callback:
+                # Backpressure: wait for room in the subscriber's queue
+                reserved = await self._reserve(subscription)
+                if not reserved:
+                    continue
+            routes.append((subscription, reserved))
+        if not self._running:
+            return False
+        self._sequence += 1
+        await self._queue.put((priority, self._sequence, time.monotonic(), event, routes))
         
         # Add to history
         self._history.append(event)
@@ -255,47 +409,75 @@ class SwarmEventBus:
         return True
     
     async def subscribe(self, pattern: str, callback: Callable[[SwarmEvent], Any],
-                       priority: int = 0) -> str:
+                       priority: int = 0, max_concurrency: int = 1,
+                       subscriber_id: str = None) -> str:
         """
         Subscribe to events matching a pattern.
         
         Args:
             pattern: Event type pattern (supports wildcards: *, #)
             callback: Async function to call with matching events
-            priority: Subscriber priority (higher = called first)
+            priority: Subscriber priority (higher = dispatched first)
+            max_concurrency: Events this subscriber may process at once
+            subscriber_id: Actor ID of the subscriber; targeted events for
+                other actors are not delivered. Without it the callback
+                receives targeted events and filters them itself.
             
         Returns:
             Subscription ID
         """
-        subscription_id = str(uuid.uuid4())
+        subscription = _Subscription(
+            subscription_id=str(uuid.uuid4()),
+            pattern=pattern,
+            callback=callback,
+            priority=priority,
+            max_concurrency=max(1, max_concurrency),
+            subscriber_id=subscriber_id
+        )
         
         async with self._lock:
-            if pattern not in self._subscribers:
-                self._subscribers[pattern] = []
-            
-            self._subscribers[pattern].append((subscription_id, callback, priority))
-            # Sort by priority (higher first)
-            self._subscribers[pattern].sort(key=lambda x: -x[2])
+            self._trie.add(subscription)
+            self._subscriptions[subscription.subscription_id] = subscription
+            if self._running:
+                self._start_workers(subscription)
         
         logger.debug(f"Subscribed to pattern: {pattern}")
-        return subscription_id
+        return subscription.subscription_id
     
     async def unsubscribe(self, subscription_id: str) -> bool:
         """Unsubscribe by subscription ID."""
         async with self._lock:
-            for pattern, subscribers in self._subscribers.items():
-                self._subscribers[pattern] = [
-                    s for s in subscribers if s[0] != subscription_id
-                ]
+            subscription = self._subscriptions.pop(subscription_id, None)
+            if subscription:
+                self._trie.remove(subscription_id)
+                for task in subscription.workers:
+                    task.cancel()
+                subscription.workers = []
         return True
     
+    def _start_workers(self, subscription: _Subscription) -> None:
+        """Create the subscriber's queue and delivery workers."""
+        if self._overflow_policy == 'block':
+            # The slots bound the queue; publishers take one per event and
+            # workers return it
+            if subscription.queue is None:
+                subscription.queue = asyncio.Queue()
+            subscription.slots = asyncio.Semaphore(
+                max(0, self._subscriber_queue_size - subscription.queue.qsize()))
+        elif subscription.queue is None:
+            subscription.queue = asyncio.Queue(maxsize=self._subscriber_queue_size)
+        subscription.workers = [
+            asyncio.create_task(self._deliver_loop(subscription))
+            for _ in range(subscription.max_concurrency)
+        ]
+    
     async def _process_events(self) -> None:
-        """Process events from the queue."""
+        """Dispatch events from the priority queue to subscriber queues."""
         while self._running:
             try:
                 # Get next event (with timeout to allow shutdown)
                 try:
-                    _, _, event = await asyncio.wait_for(
+                    _, _, published_at, event, routes = await asyncio.wait_for(
                         self._queue.get(), 
                         timeout=1.0
                     )
@@ -306,58 +488,95 @@ class SwarmEventBus:
                 if event.ttl:
                     age = (datetime.now(timezone.utc) - event.timestamp).total_seconds()
                     if age > event.ttl:
+                        for subscription, reserved in routes:
+                            if reserved:
+                                subscription.slots.release()
                         self._metrics['events_dropped'] += 1
                         logger.debug(f"Dropped expired event: {event.event_id}")
                         continue
                 
-                # Find matching subscribers
-                delivered = 0
-                for pattern, subscribers in self._subscribers.items():
-                    if self._matches_pattern(event.event_type, pattern):
-                        # Check target filter
-                        if event.target:
-                            # Direct message - only deliver to target
-                            for sub_id, callback, _ in subscribers:
-                                if event.target in sub_id:
-                                    try:
-                                        if asyncio.iscoroutinefunction(callback):
-                                            await callback(event)
-                                        else:
-                                            callback(event)
-                                        delivered += 1
-                                    except Exception as e:
-                                        logger.error(f"Subscriber error: {e}")
-                                        self._metrics['events_failed'] += 1
-                        else:
-                            # Broadcast - deliver to all matching
-                            for sub_id, callback, _ in subscribers:
-                                try:
-                                    if asyncio.iscoroutinefunction(callback):
-                                        await callback(event)
-                                    else:
-                                        callback(event)
-                                    delivered += 1
-                                except Exception as e:
-                                    logger.error(f"Subscriber error: {e}")
-                                    self._metrics['events_failed'] += 1
-                
-                self._metrics['events_delivered'] += delivered
+                for subscription, reserved in routes:
+                    self._enqueue(subscription, published_at, event, reserved)
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Event processing error: {e}")
     
+    def _route(self, event: SwarmEvent) -> List[_Subscription]:
+        """Subscriptions an event is delivered to."""
+        return [
+            subscription for subscription in self._trie.match(event.event_type)
+            # Direct message - only deliver to target
+            if not (event.target and subscription.subscriber_id
+                    and event.target != subscription.subscriber_id)
+        ]
+    
+    async def _reserve(self, subscription: _Subscription) -> bool:
+        """Wait for a free slot in a subscriber's queue."""
+        while self._running and subscription.subscription_id in self._subscriptions:
+            try:
+                # Timeout so publishers notice shutdown and unsubscribes
+                await asyncio.wait_for(subscription.slots.acquire(), timeout=1.0)
+                return True
+            except asyncio.TimeoutError:
+                continue
+        return False
+    
+    def _enqueue(self, subscription: _Subscription, published_at: float,
+                 event: SwarmEvent, reserved: bool = False) -> None:
+        """Hand an event to one subscriber without waiting."""
+        if subscription.queue is None or subscription.subscription_id not in self._subscriptions:
+            return
+        try:
+            # Never full under 'block': the publisher reserved a slot
+            subscription.queue.put_nowait((published_at, event, reserved))
+        except asyncio.QueueFull:
+            subscription.dropped += 1
+            self._metrics['events_dropped'] += 1
+            logger.warning(f"Subscriber queue full, dropped {event.event_type} "
+                           f"for pattern {subscription.pattern}")
+    
+    async def _deliver_loop(self, subscription: _Subscription) -> None:
+        """Worker: invoke the subscriber callback for each queued event."""
+        callback = subscription.callback
+        is_async = asyncio.iscoroutinefunction(callback)
+        _delivering.set(subscription)
+        while True:
+            try:
+                published_at, event, reserved = await subscription.queue.get()
+            except asyncio.CancelledError:
+                break
+            if reserved and subscription.slots is not None:
+                subscription.slots.release()
+            
+            latency_ms = (time.monotonic() - published_at) * 1000
+            self._latency_count += 1
+            self._latency_total_ms += latency_ms
+            if latency_ms > self._latency_max_ms:
+                self._latency_max_ms = latency_ms
+            
+            try:
+                if is_async:
+                    await callback(event)
+                else:
+                    callback(event)
+                subscription.delivered += 1
+                self._metrics['events_delivered'] += 1
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Subscriber error: {e}")
+                subscription.failed += 1
+                self._metrics['events_failed'] += 1
+            finally:
+                subscription.queue.task_done()
+    
     def _matches_pattern(self, event_type: str, pattern: str) -> bool:
         """Check if event type matches subscription pattern."""
         if pattern == event_type:
             return True
-        
-        # Convert to fnmatch style
-        fn_pattern = pattern.replace('.', '/').replace('*', '[^/]*').replace('#', '**')
-        fn_event = event_type.replace('.', '/')
-        
-        return fnmatch.fnmatch(fn_event, fn_pattern)
+        return bool(_compile_pattern(pattern).match(event_type))
     
     def get_history(self, event_type: str = None, 
                    limit: int = 100,
@@ -375,11 +594,21 @@ class SwarmEventBus:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get event bus metrics."""
+        queue_depths = {
+            sub.subscription_id: sub.queue.qsize() if sub.queue else 0
+            for sub in self._subscriptions.values()
+        }
         return {
             **self._metrics,
             'queue_size': self._queue.qsize() if self._queue else 0,
             'history_size': len(self._history),
-            'subscriber_count': sum(len(s) for s in self._subscribers.values()),
+            'subscriber_count': len(self._subscriptions),
+            'subscriber_queue_depth_total': sum(queue_depths.values()),
+            'subscriber_queue_depth_max': max(queue_depths.values(), default=0),
+            'subscriber_queue_depths': queue_depths,
+            'delivery_latency_ms_avg': (self._latency_total_ms / self._latency_count
+                                        if self._latency_count else 0.0),
+            'delivery_latency_ms_max': self._latency_max_ms,
         }
     
     def clear_history(self) -> None:
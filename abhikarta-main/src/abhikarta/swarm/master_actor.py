@@ -99,7 +99,7 @@ Available event types you can publish:
 - task.generate: Request content generation
 - task.transform: Request data transformation
 - task.validate: Request validation
-- task.custom.{name}: Custom task types
+- task.custom.{{name}}: Custom task types
 
 Respond with a JSON decision object containing:
 - decision_type: One of "broadcast", "direct", "aggregate", "complete", "retry", "escalate", "no_action"
@@ -129,6 +129,10 @@ What should we do next? Respond with a JSON decision."""
     # Limits
     max_iterations: int = 50                # Max decision iterations
     max_pending_tasks: int = 100            # Max pending tasks
+    
+    # Aggregation
+    result_quorum: int = 0                  # Complete after K agents respond (0 = master decides)
+    cancel_stragglers: bool = True          # Cancel outstanding agent work on quorum/timeout
 
 
 class MasterActor:
@@ -160,6 +164,7 @@ class MasterActor:
         
         # State
         self._pending_tasks: Dict[str, Dict] = {}  # correlation_id -> task state
+        self._completions: Dict[str, asyncio.Future] = {}  # correlation_id -> completion future
         self._decisions: List[MasterDecision] = []
         self._iteration_count = 0
         
@@ -172,6 +177,8 @@ class MasterActor:
             'decisions_made': 0,
             'tasks_completed': 0,
             'tasks_failed': 0,
+            'quorum_completions': 0,
+            'stragglers_cancelled': 0,
         }
     
     async def start(self) -> None:
@@ -179,20 +186,26 @@ class MasterActor:
         self._running = True
         
         # Subscribe to result events
-        await self.event_bus.subscribe("result.*", self._handle_result, priority=10)
-        await self.event_bus.subscribe("agent.*", self._handle_agent_event, priority=5)
-        await self.event_bus.subscribe("control.*", self._handle_control_event, priority=20)
+        await self.event_bus.subscribe("result.*", self._handle_result, priority=10,
+                                       subscriber_id=self._actor_id)
+        await self.event_bus.subscribe("agent.*", self._handle_agent_event, priority=5,
+                                       subscriber_id=self._actor_id)
+        await self.event_bus.subscribe("control.*", self._handle_control_event, priority=20,
+                                       subscriber_id=self._actor_id)
         
         logger.info(f"Master actor started for swarm {self.swarm_id}")
     
     async def stop(self) -> None:
         """Stop the master actor."""
         self._running = False
+        for correlation_id in list(self._completions):
+            self._finish(correlation_id, 'failed', error='Master actor stopped')
         logger.info(f"Master actor stopped for swarm {self.swarm_id}")
     
     async def handle_external_trigger(self, trigger_type: str, 
                                       trigger_data: Any,
-                                      correlation_id: str = None) -> Dict[str, Any]:
+                                      correlation_id: str = None,
+                                      quorum: int = None) -> Dict[str, Any]:
         """
         Handle an external trigger (Kafka message, HTTP request, schedule, etc.)
         
@@ -200,6 +213,8 @@ class MasterActor:
             trigger_type: Type of trigger (kafka, http, schedule, user_query)
             trigger_data: Trigger payload
             correlation_id: Optional correlation ID for tracking
+            quorum: Number of agent results that completes the task;
+                defaults to config.result_quorum
             
         Returns:
             Final result after swarm processing
@@ -215,7 +230,11 @@ class MasterActor:
             'results': [],
             'status': 'processing',
             'iterations': 0,
+            'quorum': self.config.result_quorum if quorum is None else quorum,
+            'dispatched': set(),     # agent IDs tasks were published to
+            'responders': set(),     # agent IDs that returned a result
         }
+        self._completions[correlation_id] = asyncio.get_running_loop().create_future()
         
         # Create initial event
         trigger_event = SwarmEvent(
@@ -299,10 +318,15 @@ class MasterActor:
             return
         
         if decision.decision_type == DecisionType.COMPLETE:
-            self._pending_tasks[correlation_id]['status'] = 'completed'
+            self._finish(correlation_id, 'completed')
             return
         
         if decision.decision_type in (DecisionType.BROADCAST, DecisionType.DIRECT):
+            task_state = self._pending_tasks.get(correlation_id)
+            if task_state is not None:
+                task_state['dispatched'].update(
+                    decision.target_agents or self.agent_registry.keys()
+                )
             event = SwarmEvent(
                 event_type=decision.event_type or "task.custom",
                 source=self._actor_id,
@@ -355,11 +379,67 @@ class MasterActor:
                 'timestamp': event.timestamp.isoformat()
             })
             task_state['iterations'] += 1
+            task_state['responders'].add(self._agent_id_from_source(event.source))
+            
+            if task_state['status'] != 'processing':
+                return
             
-            # Check if we should make another decision
-            if task_state['status'] == 'processing':
-                decision = await self._make_decision(event)
-                await self._execute_decision(decision, correlation_id)
+            # Partial-result quorum: enough agents answered, stop waiting
+            if self._quorum_reached(task_state):
+                self._metrics['quorum_completions'] += 1
+                self._finish(correlation_id, 'completed')
+                await self._cancel_stragglers(correlation_id, task_state, 'quorum reached')
+                return
+            
+            # Otherwise let the master decide the next step
+            decision = await self._make_decision(event)
+            await self._execute_decision(decision, correlation_id)
+    
+    @staticmethod
+    def _agent_id_from_source(source: str) -> str:
+        """Map a SwarmAgent actor ID (agent-<agent_id>-<instance>) to its agent ID."""
+        if source and source.startswith('agent-') and source.count('-') >= 2:
+            return source[len('agent-'):].rsplit('-', 1)[0]
+        return source
+    
+    @staticmethod
+    def _quorum_reached(task_state: Dict) -> bool:
+        """Check whether K of the N dispatched agents have responded."""
+        quorum = task_state['quorum']
+        if not quorum or quorum <= 0:
+            return False
+        dispatched = task_state['dispatched']
+        if dispatched:
+            quorum = min(quorum, len(dispatched))
+        return len(task_state['responders']) >= quorum
+    
+    def _finish(self, correlation_id: str, status: str, error: str = None) -> None:
+        """Mark a task finished and wake its waiter."""
+        task_state = self._pending_tasks.get(correlation_id)
+        if task_state is not None and task_state['status'] == 'processing':
+            task_state['status'] = status
+            if error:
+                task_state['error'] = error
+        future = self._completions.get(correlation_id)
+        if future is not None and not future.done():
+            future.set_result(status)
+    
+    async def _cancel_stragglers(self, correlation_id: str, task_state: Dict,
+                                 reason: str) -> None:
+        """Tell agents that have not responded yet to abandon the task."""
+        if not self.config.cancel_stragglers:
+            return
+        stragglers = sorted(task_state['dispatched'] - task_state['responders'])
+        if task_state['dispatched'] and not stragglers:
+            return
+        self._metrics['stragglers_cancelled'] += len(stragglers)
+        await self.event_bus.publish(SwarmEvent(
+            event_type=EventType.TASK_CANCELLED.value,
+            source=self._actor_id,
+            payload={'reason': reason, 'agents': stragglers},
+            correlation_id=correlation_id,
+            priority=EventPriority.HIGH
+        ))
     
     async def _handle_agent_event(self, event: SwarmEvent) -> None:
         """Handle agent lifecycle events."""
@@ -370,44 +450,47 @@ class MasterActor:
         logger.debug(f"Control event: {event.event_type}")
     
     async def _wait_for_completion(self, correlation_id: str) -> Dict[str, Any]:
-        """Wait for task completion or timeout."""
-        timeout = self.config.aggregation_timeout
-        start_time = datetime.now(timezone.utc)
+        """Wait for the task's completion future to resolve or time out."""
+        task_state = self._pending_tasks.get(correlation_id)
+        future = self._completions.get(correlation_id)
         
-        while True:
-            task_state = self._pending_tasks.get(correlation_id)
-            
-            if not task_state:
-                return {'status': 'error', 'error': 'Task not found'}
-            
-            if task_state['status'] == 'completed':
-                self._metrics['tasks_completed'] += 1
-                return {
-                    'status': 'success',
-                    'results': task_state['results'],
-                    'iterations': task_state['iterations'],
-                    'duration': (datetime.now(timezone.utc) - task_state['start_time']).total_seconds()
-                }
-            
-            if task_state['status'] == 'failed':
-                self._metrics['tasks_failed'] += 1
-                return {
-                    'status': 'failed',
-                    'error': task_state.get('error', 'Unknown error'),
-                    'results': task_state['results']
-                }
-            
-            # Check timeout
-            elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-            if elapsed > timeout:
-                self._metrics['tasks_failed'] += 1
-                return {
-                    'status': 'timeout',
-                    'results': task_state['results'],
-                    'iterations': task_state['iterations']
-                }
-            
-            await asyncio.sleep(0.1)
+        if not task_state or future is None:
+            return {'status': 'error', 'error': 'Task not found'}
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(future),
+                                   timeout=self.config.aggregation_timeout)
+        except asyncio.TimeoutError:
+            self._finish(correlation_id, 'timeout')
+            await self._cancel_stragglers(correlation_id, task_state, 'aggregation timeout')
+        finally:
+            self._completions.pop(correlation_id, None)
+            self._pending_tasks.pop(correlation_id, None)
+        
+        if task_state['status'] == 'completed':
+            self._metrics['tasks_completed'] += 1
+            return {
+                'status': 'success',
+                'results': task_state['results'],
+                'iterations': task_state['iterations'],
+                'responders': sorted(task_state['responders']),
+                'duration': (datetime.now(timezone.utc) - task_state['start_time']).total_seconds()
+            }
+        
+        if task_state['status'] == 'failed':
+            self._metrics['tasks_failed'] += 1
+            return {
+                'status': 'failed',
+                'error': task_state.get('error', 'Unknown error'),
+                'results': task_state['results']
+            }
+        
+        self._metrics['tasks_failed'] += 1
+        return {
+            'status': 'timeout',
+            'results': task_state['results'],
+            'iterations': task_state['iterations']
+        }
     
     async def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
         """Call the LLM for decision making."""
@@ -420,7 +503,8 @@ class MasterActor:
             if not self._llm_client:
                 self._llm_client = LLMAdapter(
                     provider=self.config.llm_provider,
-                    model=self.config.llm_model
+                    model=self.config.llm_model,
+                    priority='background'
                 )
             
             response = await self._llm_client.generate(
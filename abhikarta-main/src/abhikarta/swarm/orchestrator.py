@@ -191,6 +191,8 @@ class SwarmOrchestrator:
                     decision_timeout=definition.config.master_timeout,
                     aggregation_timeout=definition.config.swarm_timeout,
                     max_iterations=definition.config.max_iterations,
+                    result_quorum=definition.config.result_quorum,
+                    cancel_stragglers=definition.config.cancel_stragglers,
                 )
                 
                 # Build agent registry for master
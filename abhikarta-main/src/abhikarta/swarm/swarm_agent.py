@@ -114,6 +114,7 @@ class SwarmAgent:
             'tasks_received': 0,
             'tasks_completed': 0,
             'tasks_failed': 0,
+            'tasks_cancelled': 0,
             'total_processing_time': 0.0,
         }
         
@@ -140,10 +141,16 @@ class SwarmAgent:
                     await self.event_bus.subscribe(
                         subscription.event_pattern,
                         self._handle_event,
-                        priority=subscription.priority
+                        priority=subscription.priority,
+                        max_concurrency=self.config.max_concurrent
                     )
                     logger.debug(f"Agent {self._actor_id} subscribed to {subscription.event_pattern}")
         
+        # Cancellation of in-flight work (quorum reached, timeout)
+        await self.event_bus.subscribe(
+            EventType.TASK_CANCELLED.value, self._handle_cancel, priority=100
+        )
+        
         # Announce ready
         await self.event_bus.publish(SwarmEvent(
             event_type=EventType.AGENT_READY.value,
@@ -180,6 +187,10 @@ class SwarmAgent:
         if event.target and event.target != self._actor_id and event.target != self.config.agent_id:
             return
         
+        # Cancellations arrive on task.* patterns too; handled by _handle_cancel
+        if event.event_type == EventType.TASK_CANCELLED.value:
+            return
+        
         self._metrics['tasks_received'] += 1
         
         # Use semaphore for concurrency control
@@ -195,7 +206,8 @@ class SwarmAgent:
         self._active_tasks[task_id] = {
             'event': event,
             'start_time': start_time,
-            'status': 'processing'
+            'status': 'processing',
+            'execution': None
         }
         
         # Update state
@@ -207,8 +219,17 @@ class SwarmAgent:
         ))
         
         try:
-            # Execute the task
-            result = await self._execute_task(event)
+            # Execute the task as a separate future so it can be cancelled
+            execution = asyncio.ensure_future(self._execute_task(event))
+            self._active_tasks[task_id]['execution'] = execution
+            try:
+                result = await execution
+            except asyncio.CancelledError:
+                if self._active_tasks[task_id]['status'] != 'cancelled':
+                    raise
+                self._metrics['tasks_cancelled'] += 1
+                logger.debug(f"Agent {self._actor_id} cancelled task {task_id}")
+                return
             
             # Publish result
             await self.event_bus.publish(SwarmEvent(
@@ -259,6 +280,21 @@ class SwarmAgent:
                     source=self._actor_id
                 ))
     
+    async def _handle_cancel(self, event: SwarmEvent) -> None:
+        """Cancel in-flight tasks for a correlation the master no longer needs."""
+        payload = event.payload if isinstance(event.payload, dict) else {}
+        agents = payload.get('agents')
+        if agents and self.config.agent_id not in agents:
+            return
+        
+        for task in list(self._active_tasks.values()):
+            if task['event'].correlation_id != event.correlation_id:
+                continue
+            execution = task.get('execution')
+            if execution is not None and not execution.done():
+                task['status'] = 'cancelled'
+                execution.cancel()
+    
     async def _execute_task(self, event: SwarmEvent) -> Any:
         """
         Execute the actual task.
@@ -292,7 +328,8 @@ class SwarmAgent:
             if not self._llm_client:
                 self._llm_client = LLMAdapter(
                     provider=self.config.llm_provider,
-                    model=self.config.llm_model
+                    model=self.config.llm_model,
+                    priority='background'
                 )
             
             # Build prompt from event
@@ -233,6 +233,10 @@ class SwarmConfig:
     max_agents: int = 50              # Max concurrent agents
     max_events_per_second: int = 100  # Rate limiting
     
+    # Aggregation
+    result_quorum: int = 0            # Complete after K agent results (0 = master decides)
+    cancel_stragglers: bool = True    # Cancel outstanding agent work once done
+    
     # Retry
     retry_on_failure: bool = True
     max_retries: int = 3
@@ -258,6 +262,8 @@ class SwarmConfig:
             'max_iterations': self.max_iterations,
             'max_agents': self.max_agents,
             'max_events_per_second': self.max_events_per_second,
+            'result_quorum': self.result_quorum,
+            'cancel_stragglers': self.cancel_stragglers,
             'retry_on_failure': self.retry_on_failure,
             'max_retries': self.max_retries,
             'retry_delay': self.retry_delay,
@@ -12,6 +12,8 @@ import uuid
 import json
 from typing import Dict, Any, Optional, List
 
+from abhikarta.utils.code_cache import compile_cached
+
 from .base_tool import (
     BaseTool, ToolMetadata, ToolSchema, ToolParameter,
     ToolResult, ToolType, ToolCategory
@@ -31,7 +33,8 @@ class CodeFragmentTool(BaseTool):
     def __init__(self, metadata: ToolMetadata, schema: ToolSchema,
                  code: str, language: str = "python",
                  allowed_imports: List[str] = None,
-                 timeout_seconds: int = 30):
+                 timeout_seconds: int = 30,
+                 fragment_id: str = None):
         """
         Initialize CodeFragmentTool.
         
@@ -42,6 +45,8 @@ class CodeFragmentTool(BaseTool):
             language: Programming language (currently only Python)
             allowed_imports: List of allowed module imports
             timeout_seconds: Execution timeout
+            fragment_id: Source code_fragments ID, used to invalidate the
+                compiled code when the fragment changes
         """
         super().__init__(metadata)
         self._schema = schema
@@ -52,6 +57,7 @@ class CodeFragmentTool(BaseTool):
             'itertools', 'functools', 'operator', 'string'
         ]
         self._timeout_seconds = timeout_seconds
+        self._fragment_id = fragment_id
     
     @property
     def code(self) -> str:
@@ -79,8 +85,10 @@ class CodeFragmentTool(BaseTool):
             safe_globals['input_data'] = kwargs
             safe_globals['params'] = kwargs
             
-            # Execute code
-            exec(self._code, safe_globals)
+            # Execute code (compiled once per distinct source)
+            origin = (f"fragment:{self._fragment_id}" if self._fragment_id
+                      else f"tool:{self.tool_id}")
+            exec(compile_cached(self._code, origin=origin), safe_globals)
             
             # Get result
             result = safe_globals.get('result', safe_globals.get('output'))
@@ -179,7 +187,8 @@ class CodeFragmentTool(BaseTool):
             metadata=metadata,
             schema=schema,
             code=fragment.get('code', ''),
-            language=fragment.get('language', 'python')
+            language=fragment.get('language', 'python'),
+            fragment_id=fragment.get('fragment_id')
         )
     
     @classmethod
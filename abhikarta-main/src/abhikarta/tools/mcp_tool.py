@@ -25,8 +25,9 @@ class MCPTool(BaseTool):
     """
     Tool that wraps an MCP server tool.
     
-    Communicates with MCP servers via HTTP to execute tools.
-    Automatically handles authentication, retries, and error handling.
+    Communicates with MCP servers via HTTP to execute tools, using the
+    per-server connection pool owned by MCPServerManager. Automatically
+    handles authentication, retries, and error handling.
     """
     
     def __init__(self, metadata: ToolMetadata, schema: ToolSchema,
@@ -55,6 +56,11 @@ class MCPTool(BaseTool):
         self._auth_token = auth_token
         self._auth_header = auth_header or "Authorization"
         self._timeout = timeout
+        
+        # Resolved once; sent as session defaults by the pooled connection
+        self._auth_headers = {}
+        if auth_token:
+            self._auth_headers[self._auth_header] = f"Bearer {auth_token}"
     
     @property
     def server_url(self) -> str:
@@ -66,65 +72,80 @@ class MCPTool(BaseTool):
         """Tool name on the MCP server."""
         return self._tool_name
     
+    def _get_pool(self):
+        """Get the pooled HTTP session for this tool's server."""
+        from abhikarta.mcp.manager import get_mcp_manager
+        return get_mcp_manager().get_http_pool(self._server_url, self._auth_headers)
+    
+    def _build_payload(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "tool": self._tool_name,
+            "parameters": kwargs
+        }
+    
     def execute(self, **kwargs) -> ToolResult:
         """Execute the tool via MCP server."""
         import time
         start_time = time.time()
         
         try:
-            url = f"{self._server_url}{self._call_endpoint}"
-            
-            headers = {"Content-Type": "application/json"}
-            if self._auth_token:
-                headers[self._auth_header] = f"Bearer {self._auth_token}"
-            
-            payload = {
-                "tool": self._tool_name,
-                "parameters": kwargs
-            }
-            
-            response = requests.post(
-                url,
-                json=payload,
-                headers=headers,
+            response = self._get_pool().post_json(
+                self._call_endpoint,
+                self._build_payload(kwargs),
                 timeout=self._timeout
             )
+            return self._to_result(response, (time.time() - start_time) * 1000)
+        except Exception as e:
+            return self._error_result(e, (time.time() - start_time) * 1000)
+    
+    async def async_execute(self, **kwargs) -> ToolResult:
+        """Execute the tool via MCP server without blocking the event loop."""
+        import time
+        start_time = time.time()
+        
+        try:
+            response = await self._get_pool().apost_json(
+                self._call_endpoint,
+                self._build_payload(kwargs),
+                timeout=self._timeout
+            )
+            return self._to_result(response, (time.time() - start_time) * 1000)
+        except Exception as e:
+            return self._error_result(e, (time.time() - start_time) * 1000)
+    
+    def _to_result(self, response, execution_time: float) -> ToolResult:
+        """Convert an MCP server response into a ToolResult."""
+        if response.status_code == 200:
+            data = response.json()
             
-            execution_time = (time.time() - start_time) * 1000
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get('success', True):
-                    return ToolResult.success_result(
-                        data.get('result', data.get('output', data)),
-                        execution_time
-                    )
-                else:
-                    return ToolResult.error_result(
-                        data.get('error', 'Tool execution failed'),
-                        execution_time
-                    )
+            if data.get('success', True):
+                return ToolResult.success_result(
+                    data.get('result', data.get('output', data)),
+                    execution_time
+                )
             else:
                 return ToolResult.error_result(
-                    f"HTTP {response.status_code}: {response.text}",
+                    data.get('error', 'Tool execution failed'),
                     execution_time
                 )
-                
-        except requests.Timeout:
-            execution_time = (time.time() - start_time) * 1000
+        else:
+            return ToolResult.error_result(
+                f"HTTP {response.status_code}: {response.text}",
+                execution_time
+            )
+    
+    def _error_result(self, error: Exception, execution_time: float) -> ToolResult:
+        """Convert a request exception into a ToolResult."""
+        if isinstance(error, requests.Timeout):
             return ToolResult.error_result(
                 f"Request timed out after {self._timeout}s",
                 execution_time
             )
-        except requests.RequestException as e:
-            execution_time = (time.time() - start_time) * 1000
-            logger.error(f"MCPTool {self.name} request error: {e}")
-            return ToolResult.error_result(str(e), execution_time)
-        except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
-            logger.error(f"MCPTool {self.name} error: {e}")
-            return ToolResult.error_result(str(e), execution_time)
+        if isinstance(error, requests.RequestException):
+            logger.error(f"MCPTool {self.name} request error: {error}")
+        else:
+            logger.error(f"MCPTool {self.name} error: {error}")
+        return ToolResult.error_result(str(error), execution_time)
     
     def get_schema(self) -> ToolSchema:
         """Get the parameter schema."""
@@ -133,10 +154,7 @@ class MCPTool(BaseTool):
     def test_connection(self) -> bool:
         """Test connection to the MCP server."""
         try:
-            response = requests.get(
-                f"{self._server_url}/health",
-                timeout=5
-            )
+            response = self._get_pool().request('GET', '/health', timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -261,6 +279,10 @@ class MCPPluginTool(MCPTool):
             logger.error(f"MCPPluginTool {self.name} error: {e}")
             return ToolResult.error_result(str(e), execution_time)
     
+    async def async_execute(self, **kwargs) -> ToolResult:
+        """Plugins run locally; wrap the sync executor like BaseTool does."""
+        return await BaseTool.async_execute(self, **kwargs)
+    
     @classmethod
     def from_plugin_tool(cls, tool_def: Dict[str, Any], plugin_id: str,
                         plugin_name: str, executor: callable) -> 'MCPPluginTool':
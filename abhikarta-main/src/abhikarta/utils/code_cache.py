@@ -0,0 +1,209 @@
+"""
+Compiled Code Cache - Shared cache of compiled code objects.
+
+PythonNode, CodeFragmentNode, CodeFragmentTool and the workflow
+python_modules loader used to pass raw source strings to exec(), so every
+workflow run and tool call re-parsed and re-compiled the same fragment.
+Sources are now compiled once and the code object is reused, keyed by a
+content hash plus the filename shown in tracebacks.
+
+Each entry carries an origin such as ``fragment:<fragment_id>`` or
+``node:<node_id>``. The origin becomes the code object's filename
+(``<fragment:abc>``), and CodeFragmentSyncService invalidates entries by
+origin when a fragment changes.
+
+Copyright © 2025-2030, All Rights Reserved
+Ashutosh Sinha
+"""
+
+import hashlib
+import linecache
+import logging
+import threading
+import time
+from collections import OrderedDict
+from types import CodeType
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from abhikarta.monitoring import CACHE_REQUESTS, CACHE_EVICTIONS, CACHE_SIZE
+    _metrics_available = True
+except ImportError:
+    _metrics_available = False
+
+
+class CompiledCodeCache:
+    """
+    Thread-safe, LRU-bounded cache of ``compile(source, filename, 'exec')``.
+
+    Usage:
+        cache = get_compiled_code_cache()
+        code = cache.compile(source, origin=f"node:{node_id}")
+        exec(code, globals_dict, locals_dict)
+    """
+
+    CACHE_NAME = 'compiled_code'
+
+    def __init__(self, max_size: int = 1024, enabled: bool = True):
+        self.max_size = max(1, max_size)
+        self.enabled = enabled
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._compile_time_ms = 0.0
+
+    @staticmethod
+    def filename_for(origin: Optional[str]) -> str:
+        """Filename used for tracebacks, e.g. ``<fragment:abc>``."""
+        return f"<{origin}>" if origin else '<string>'
+
+    def compile(self, source: str, origin: str = None) -> CodeType:
+        """
+        Return the compiled code object for a source string.
+
+        Args:
+            source: Python source code
+            origin: Where the source came from (``fragment:<id>``,
+                ``node:<id>``, ``module:<name>``)
+
+        Returns:
+            Code object suitable for exec()
+
+        Raises:
+            SyntaxError: If the source does not compile (not cached)
+        """
+        filename = self.filename_for(origin)
+        if not self.enabled:
+            return self._compile(source, filename)
+
+        key = (hashlib.sha256(source.encode('utf-8')).hexdigest(), filename)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                entry['hits'] += 1
+                self._record('hit')
+                return entry['code']
+            self._misses += 1
+        self._record('miss')
+
+        code = self._compile(source, filename)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = {'code': code, 'origin': origin, 'hits': 0}
+                self._register_source(filename, source)
+                while len(self._entries) > self.max_size:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._forget_source(evicted)
+                    self._evictions += 1
+                    if _metrics_available:
+                        CACHE_EVICTIONS.labels(cache=self.CACHE_NAME).inc()
+            self._update_size()
+        return code
+
+    def _compile(self, source: str, filename: str) -> CodeType:
+        start = time.perf_counter()
+        try:
+            return compile(source, filename, 'exec')
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._compile_time_ms += elapsed
+
+    def invalidate(self, origin: str = None) -> int:
+        """
+        Drop cached code for an origin, or everything.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if origin is None:
+                keys = list(self._entries)
+            else:
+                keys = [k for k, e in self._entries.items() if e['origin'] == origin]
+            for key in keys:
+                self._forget_source(self._entries.pop(key))
+            self._invalidations += len(keys)
+            self._update_size()
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} compiled code object(s) for {origin or 'all origins'}")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'compile_time_ms': round(self._compile_time_ms, 3)
+            }
+
+    def _register_source(self, filename: str, source: str):
+        """Make the source visible to traceback/linecache for this filename."""
+        if filename == '<string>':
+            return
+        lines = source.splitlines(True)
+        linecache.cache[filename] = (len(source), None, lines, filename)
+
+    def _forget_source(self, entry: Dict[str, Any]):
+        """Drop linecache source once no cached entry uses the filename."""
+        filename = entry['code'].co_filename
+        if not any(e['code'].co_filename == filename for e in self._entries.values()):
+            linecache.cache.pop(filename, None)
+
+    def _update_size(self):
+        if _metrics_available:
+            CACHE_SIZE.labels(cache=self.CACHE_NAME).set(len(self._entries))
+
+    def _record(self, result: str):
+        if _metrics_available:
+            CACHE_REQUESTS.labels(cache=self.CACHE_NAME, result=result).inc()
+
+
+_code_cache: Optional[CompiledCodeCache] = None
+_code_cache_lock = threading.Lock()
+
+
+def get_compiled_code_cache() -> CompiledCodeCache:
+    """Get the global compiled code cache."""
+    global _code_cache
+    if _code_cache is None:
+        with _code_cache_lock:
+            if _code_cache is None:
+                _code_cache = CompiledCodeCache()
+    return _code_cache
+
+
+def init_compiled_code_cache(max_size: int = 1024, enabled: bool = True) -> CompiledCodeCache:
+    """Initialize the global compiled code cache."""
+    global _code_cache
+    with _code_cache_lock:
+        _code_cache = CompiledCodeCache(max_size=max_size, enabled=enabled)
+    return _code_cache
+
+
+def compile_cached(source: str, origin: str = None) -> CodeType:
+    """Compile through the global cache."""
+    return get_compiled_code_cache().compile(source, origin)
+
+
+def invalidate_compiled_code(origin: str = None) -> int:
+    """Invalidate cached code objects after a fragment changes."""
+    if _code_cache is None:
+        return 0
+    return _code_cache.invalidate(origin)
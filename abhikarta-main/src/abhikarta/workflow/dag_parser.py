@@ -81,7 +81,64 @@ class DAGWorkflow:
                 visit(node_id)
         
         return order
-    
+
+    def get_dependency_map(self) -> Dict[str, List[str]]:
+        """
+        Get the dependency map used for parallel (wavefront) scheduling.
+
+        Covers every node connected to the entry point, or every node when
+        no entry point is set. Dependencies that would close a cycle are
+        dropped so that every node in the map eventually becomes ready.
+
+        Returns:
+            Dict mapping node_id to the list of node_ids it waits for
+        """
+        successors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        for node_id, node in self.nodes.items():
+            for dep in node.dependencies:
+                if dep in successors:
+                    successors[dep].append(node_id)
+
+        # Collect the nodes connected to the entry point
+        if self.entry_point and self.entry_point in self.nodes:
+            connected = set()
+            stack = [self.entry_point]
+            while stack:
+                node_id = stack.pop()
+                if node_id in connected:
+                    continue
+                connected.add(node_id)
+                stack.extend(successors[node_id])
+                stack.extend(d for d in self.nodes[node_id].dependencies if d in self.nodes)
+        else:
+            connected = set(self.nodes)
+
+        # Depth-first topological order; back edges are ignored as in get_execution_order
+        visited = set()
+        order = []
+
+        def visit(node_id: str):
+            if node_id in visited:
+                return
+            visited.add(node_id)
+            for dep in self.nodes[node_id].dependencies:
+                if dep in connected:
+                    visit(dep)
+            order.append(node_id)
+
+        for node_id in self.nodes:
+            if node_id in connected:
+                visit(node_id)
+
+        position = {node_id: i for i, node_id in enumerate(order)}
+        return {
+            node_id: [
+                dep for dep in dict.fromkeys(self.nodes[node_id].dependencies)
+                if dep in position and position[dep] < position[node_id]
+            ]
+            for node_id in order
+        }
+
     def validate(self) -> List[str]:
         """Validate the workflow and return list of errors."""
         errors = []
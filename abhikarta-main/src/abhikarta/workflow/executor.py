@@ -19,7 +19,7 @@ import uuid
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 from .dag_parser import DAGParser, DAGWorkflow, DAGNode
 from .node_types import NodeFactory, NodeResult, BaseNode
@@ -104,8 +104,11 @@ class WorkflowExecutor:
     - LangGraph execution mode for complex workflows
     """
     
+    DEFAULT_MAX_PARALLELISM = 4
+    
     def __init__(self, db_facade=None, llm_facade=None, user_id: str = None,
-                 use_langgraph: bool = True):
+                 use_langgraph: bool = True, max_parallelism: int = None,
+                 fail_fast: bool = None, prop_conf=None):
         """
         Initialize workflow executor.
         
@@ -114,12 +117,33 @@ class WorkflowExecutor:
             llm_facade: LLM facade for LLM node execution (legacy)
             user_id: User ID for audit logging
             use_langgraph: Whether to use LangGraph for execution (default: True)
+            max_parallelism: Max nodes run concurrently in native mode
+                (default: workflow.native.max.parallelism or 4)
+            fail_fast: Stop scheduling on the first failed node in native mode;
+                when False, only the failed node's descendants are skipped
+                (default: workflow.native.fail.fast or True)
+            prop_conf: Optional PropertiesConfigurator instance (default: the
+                application's configurator, once it has been loaded)
         """
         self.db_facade = db_facade
         self.llm_facade = llm_facade
         self.user_id = user_id or 'system'
         self.parser = DAGParser()
-        self.max_workers = 4
+        if prop_conf is None:
+            # Routes construct executors without a configurator; use the
+            # singleton loaded at startup rather than creating an empty one
+            from ..core import SingletonMeta
+            from ..core.config import PropertiesConfigurator
+            prop_conf = SingletonMeta._instances.get(PropertiesConfigurator)
+        self.prop_conf = prop_conf
+        
+        if max_parallelism is None and prop_conf:
+            max_parallelism = prop_conf.get_int('workflow.native.max.parallelism',
+                                                self.DEFAULT_MAX_PARALLELISM)
+        if fail_fast is None and prop_conf:
+            fail_fast = prop_conf.get_bool('workflow.native.fail.fast', True)
+        self.max_workers = max(1, max_parallelism or self.DEFAULT_MAX_PARALLELISM)
+        self.fail_fast = True if fail_fast is None else fail_fast
         self.use_langgraph = use_langgraph
         self._execution_callbacks: List[Callable] = []
         
@@ -263,10 +287,11 @@ class WorkflowExecutor:
             # Convert workflow to LangGraph config format
             workflow_config = self._workflow_to_langgraph_config(workflow)
             
-            # Create and execute graph
-            from ..langchain.workflow_graph import create_workflow_graph
+            # Get compiled graph (cached per workflow definition)
+            from ..langchain.workflow_graph import get_compiled_graph_cache
             
-            graph = create_workflow_graph(
+            graph = get_compiled_graph_cache().get_or_create(
+                workflow.workflow_id,
                 workflow_config,
                 self.db_facade
             )
@@ -595,33 +620,12 @@ class WorkflowExecutor:
             if workflow.python_modules:
                 context['modules'] = self._load_python_modules(workflow.python_modules)
             
-            # Get execution order
-            execution_order = workflow.get_execution_order()
-            logger.info(f"Execution order: {execution_order}")
+            # Schedule nodes as soon as all of their dependencies have completed
+            dependencies = workflow.get_dependency_map()
+            logger.info(f"Scheduling {len(dependencies)} nodes "
+                        f"(max_parallelism={self.max_workers}, fail_fast={self.fail_fast})")
             
-            # Execute nodes in order
-            step_number = 0
-            for node_id in execution_order:
-                step_number += 1
-                dag_node = workflow.nodes[node_id]
-                
-                step = self._execute_node(dag_node, context, step_number)
-                execution.steps.append(step)
-                
-                if step.status == 'failed':
-                    execution.status = 'failed'
-                    execution.error_message = step.error_message
-                    break
-                
-                # Store node output for downstream nodes
-                context['node_outputs'][node_id] = step.output_data
-                context['accumulated_output'][node_id] = step.output_data
-                
-                # Update context input for next node
-                context['input'] = step.output_data
-                
-                # Notify callbacks
-                self._notify_callbacks('step_completed', step, execution)
+            self._execute_wavefront(workflow, dependencies, context, execution)
             
             # Set final status
             if execution.status != 'failed':
@@ -712,6 +716,135 @@ class WorkflowExecutor:
         
         return self.execute_workflow(workflow, input_data)
     
+    def _execute_wavefront(self, workflow: DAGWorkflow, dependencies: Dict[str, List[str]],
+                           context: Dict[str, Any], execution: WorkflowExecution):
+        """
+        Run nodes on a bounded thread pool in dependency order.
+        
+        Every node whose dependencies have completed is submitted immediately,
+        so end-to-end latency follows the critical path rather than the sum of
+        node latencies. Node outputs are recorded on the calling thread only.
+        
+        Args:
+            workflow: DAGWorkflow being executed
+            dependencies: Dependency map from DAGWorkflow.get_dependency_map()
+            context: Shared execution context (node_outputs is updated in place)
+            execution: WorkflowExecution receiving the steps and status
+        """
+        remaining = {node_id: set(deps) for node_id, deps in dependencies.items()}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in dependencies}
+        for node_id, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(node_id)
+        
+        steps: Dict[str, ExecutionStep] = {}
+        blocked: Dict[str, str] = {}
+        running = {}
+        step_number = 0
+        stop = False
+        
+        def launch(pool, node_id: str):
+            nonlocal step_number
+            step_number += 1
+            node_context = self._build_node_context(context, dependencies[node_id])
+            future = pool.submit(self._execute_node, workflow.nodes[node_id],
+                                 node_context, step_number)
+            running[future] = node_id
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=f"wf-{execution.execution_id[:8]}") as pool:
+            for node_id, deps in remaining.items():
+                if not deps:
+                    launch(pool, node_id)
+            
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    step = future.result()
+                    steps[node_id] = step
+                    
+                    if step.status == 'failed':
+                        if execution.status != 'failed':
+                            execution.status = 'failed'
+                            execution.error_message = step.error_message
+                        if self.fail_fast:
+                            stop = True
+                            for pending in running:
+                                pending.cancel()
+                        else:
+                            self._block_descendants(node_id, node_id, dependents, blocked)
+                        continue
+                    
+                    # Store node output for downstream nodes
+                    context['node_outputs'][node_id] = step.output_data
+                    context['accumulated_output'][node_id] = step.output_data
+                    
+                    # Notify callbacks
+                    self._notify_callbacks('step_completed', step, execution)
+                    
+                    if stop:
+                        continue
+                    for child in dependents[node_id]:
+                        remaining[child].discard(node_id)
+                        if not remaining[child] and child not in blocked:
+                            launch(pool, child)
+        
+        # Record nodes that never ran because an upstream node failed
+        for node_id, failed_node in blocked.items():
+            dag_node = workflow.nodes[node_id]
+            steps[node_id] = ExecutionStep(
+                step_number=0,
+                node_id=node_id,
+                node_type=dag_node.node_type,
+                status='skipped',
+                error_message=f"Skipped: upstream node '{failed_node}' failed"
+            )
+        
+        ordered = sorted(steps.values(), key=lambda s: (s.step_number == 0, s.step_number))
+        for step in ordered:
+            if step.step_number == 0:
+                step_number += 1
+                step.step_number = step_number
+            execution.steps.append(step)
+    
+    def _build_node_context(self, context: Dict[str, Any],
+                            parents: List[str]) -> Dict[str, Any]:
+        """
+        Build the context for a single node from the outputs of its parents.
+        
+        A node without parents receives the workflow input, a node with one
+        parent receives that parent's output, and a node with several parents
+        receives a dict keyed by parent id as 'input' plus the ordered parent
+        outputs as 'branch_outputs'/'inputs' (used by join and aggregate nodes).
+        """
+        node_outputs = dict(context['node_outputs'])
+        node_context = dict(context)
+        node_context['node_outputs'] = node_outputs
+        node_context['accumulated_output'] = dict(context['accumulated_output'])
+        
+        if len(parents) == 1:
+            node_context['input'] = node_outputs.get(parents[0])
+        elif parents:
+            branch_outputs = [node_outputs.get(p) for p in parents]
+            node_context['input'] = {p: node_outputs.get(p) for p in parents}
+            node_context['branch_outputs'] = branch_outputs
+            node_context['inputs'] = branch_outputs
+        return node_context
+    
+    def _block_descendants(self, node_id: str, failed_node: str,
+                           dependents: Dict[str, List[str]], blocked: Dict[str, str]):
+        """Mark every descendant of a failed node as blocked."""
+        stack = list(dependents[node_id])
+        while stack:
+            child = stack.pop()
+            if child in blocked:
+                continue
+            blocked[child] = failed_node
+            stack.extend(dependents[child])
+    
     def _execute_node(self, dag_node: DAGNode, context: Dict[str, Any], 
                      step_number: int) -> ExecutionStep:
         """Execute a single node."""
@@ -782,6 +915,7 @@ class WorkflowExecutor:
             Dict of loaded module namespaces
         """
         from abhikarta.utils.code_loader import CodeLoader
+        from abhikarta.utils.code_cache import compile_cached
         
         # Initialize code loader
         code_loader = CodeLoader(db_facade=self.db_facade)
@@ -797,8 +931,13 @@ class WorkflowExecutor:
                     continue
                 
                 # Execute the code to create module namespace
+                if isinstance(code_or_uri, str) and code_or_uri.startswith('db://'):
+                    origin = f"fragment:{code_or_uri[len('db://'):]}"
+                else:
+                    origin = f"module:{name}"
                 module_namespace = {}
-                exec(code, {'__builtins__': __builtins__}, module_namespace)
+                exec(compile_cached(code, origin=origin),
+                     {'__builtins__': __builtins__}, module_namespace)
                 loaded[name] = module_namespace
                 logger.debug(f"Loaded module: {name}")
                 
@@ -808,50 +947,55 @@ class WorkflowExecutor:
         return loaded
     
     def _save_execution(self, execution: WorkflowExecution):
-        """Save execution to database."""
+        """Save execution and all of its steps to the database in one commit."""
+        if not self.db_facade:
+            return
+        
         try:
-            # Save main execution record
-            self.db_facade.execute("""
-                INSERT INTO executions (
-                    execution_id, agent_id, user_id, status,
-                    input_data, output_data, error_message,
-                    started_at, completed_at, duration_ms, trace_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            step_rows = [(
                 execution.execution_id,
-                execution.workflow_id,
-                self.user_id,
-                execution.status,
-                json.dumps(execution.input_data),
-                json.dumps(execution.output_data),
-                execution.error_message,
-                execution.started_at.isoformat() if execution.started_at else None,
-                execution.completed_at.isoformat() if execution.completed_at else None,
-                execution.duration_ms,
-                json.dumps([s.__dict__ for s in execution.steps], default=str)
-            ))
+                step.step_number,
+                step.node_id,
+                step.node_type,
+                step.status,
+                json.dumps(step.input_data) if step.input_data else None,
+                json.dumps(step.output_data) if step.output_data else None,
+                step.error_message,
+                step.started_at.isoformat() if step.started_at else None,
+                step.completed_at.isoformat() if step.completed_at else None,
+                step.duration_ms
+            ) for step in execution.steps]
             
-            # Save individual steps
-            for step in execution.steps:
+            with self.db_facade.transaction():
+                # Save main execution record
                 self.db_facade.execute("""
+                    INSERT INTO executions (
+                        execution_id, agent_id, user_id, status,
+                        input_data, output_data, error_message,
+                        started_at, completed_at, duration_ms, trace_data
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    execution.execution_id,
+                    execution.workflow_id,
+                    self.user_id,
+                    execution.status,
+                    json.dumps(execution.input_data),
+                    json.dumps(execution.output_data),
+                    execution.error_message,
+                    execution.started_at.isoformat() if execution.started_at else None,
+                    execution.completed_at.isoformat() if execution.completed_at else None,
+                    execution.duration_ms,
+                    json.dumps([s.__dict__ for s in execution.steps], default=str)
+                ))
+                
+                # Save individual steps
+                self.db_facade.execute_many("""
                     INSERT INTO execution_steps (
                         execution_id, step_number, node_id, node_type,
                         status, input_data, output_data, error_message,
                         started_at, completed_at, duration_ms
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    execution.execution_id,
-                    step.step_number,
-                    step.node_id,
-                    step.node_type,
-                    step.status,
-                    json.dumps(step.input_data) if step.input_data else None,
-                    json.dumps(step.output_data) if step.output_data else None,
-                    step.error_message,
-                    step.started_at.isoformat() if step.started_at else None,
-                    step.completed_at.isoformat() if step.completed_at else None,
-                    step.duration_ms
-                ))
+                """, step_rows)
                 
         except Exception as e:
             logger.error(f"Failed to save execution: {e}", exc_info=True)
@@ -967,6 +1111,43 @@ class WorkflowManager:
             logger.error(f"Failed to create workflow: {e}", exc_info=True)
             return None
     
+    def update_workflow(self, workflow_id: str, name: str = None,
+                        description: str = None,
+                        dag_definition: Dict[str, Any] = None,
+                        python_modules: Dict[str, str] = None) -> bool:
+        """Update a workflow and invalidate its cached compiled graph."""
+        updates = []
+        params = []
+        if name is not None:
+            updates.append("name = ?")
+            params.append(name)
+        if description is not None:
+            updates.append("description = ?")
+            params.append(description)
+        if dag_definition is not None:
+            updates.append("dag_definition = ?")
+            params.append(json.dumps(dag_definition))
+        if python_modules is not None:
+            updates.append("python_modules = ?")
+            params.append(json.dumps(python_modules))
+        
+        if not updates:
+            return False
+        
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+        params.append(workflow_id)
+        
+        try:
+            self.db_facade.execute(
+                f"UPDATE workflows SET {', '.join(updates)} WHERE workflow_id = ?",
+                tuple(params)
+            )
+            self._invalidate_compiled_graph(workflow_id)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update workflow: {e}", exc_info=True)
+            return False
+    
     def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Get workflow by ID."""
         result = self.db_facade.fetch_one(
@@ -1053,7 +1234,16 @@ class WorkflowManager:
                 "DELETE FROM workflows WHERE workflow_id = ?",
                 (workflow_id,)
             )
+            self._invalidate_compiled_graph(workflow_id)
             return True
         except Exception as e:
             logger.error(f"Failed to delete workflow: {e}", exc_info=True)
             return False
+    
+    def _invalidate_compiled_graph(self, workflow_id: str):
+        """Drop any cached LangGraph compilation of a workflow."""
+        try:
+            from ..langchain.workflow_graph import invalidate_workflow_graph
+            invalidate_workflow_graph(workflow_id)
+        except ImportError:
+            pass
@@ -13,6 +13,8 @@ from typing import Dict, Any, Optional, List
 from enum import Enum
 from dataclasses import dataclass
 
+from abhikarta.utils.code_cache import compile_cached
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,8 +162,9 @@ class PythonNode(BaseNode):
             if 'modules' in context:
                 local_vars.update(context['modules'])
             
-            # Execute the code
-            exec(self.python_code, {'__builtins__': __builtins__}, local_vars)
+            # Execute the code (compiled once per distinct source)
+            code = compile_cached(self.python_code, origin=f"node:{self.node_id}")
+            exec(code, {'__builtins__': __builtins__}, local_vars)
             
             # Get output
             output = local_vars.get('output') or local_vars.get('result')
@@ -453,7 +456,8 @@ class CodeFragmentNode(BaseNode):
                 'result': None
             }
             
-            exec(code, {'__builtins__': __builtins__}, local_vars)
+            origin = f"fragment:{fragment_id}" if fragment_id else f"node:{self.node_id}"
+            exec(compile_cached(code, origin=origin), {'__builtins__': __builtins__}, local_vars)
             
             output = local_vars.get('output') or local_vars.get('result') or context.get('input')
             
@@ -17,7 +17,7 @@ Patent Pending: Certain architectural patterns and implementations described in
 document may be subject to patent applications.
 """
 
-from flask import Flask, render_template
+from flask import Flask, render_template, g
 import logging
 import os
 from typing import Optional
@@ -124,6 +124,7 @@ class AbhikartaLLMWeb:
         """Prepare and register all routes."""
         self._register_routes()
         self._register_error_handlers()
+        self._register_request_hooks()
         logger.info("Routes prepared successfully")
 
     def _register_context_processors(self):
@@ -259,6 +260,21 @@ class AbhikartaLLMWeb:
         
         logger.info("All routes registered successfully")
 
+    def _register_request_hooks(self):
+        """Register per-request hooks."""
+        from abhikarta.llm_provider.rate_limiter import set_llm_priority, reset_llm_priority
+        
+        # LLM calls made while serving a user request go ahead of background swarm work
+        @self.app.before_request
+        def use_interactive_llm_lane():
+            g.llm_priority_token = set_llm_priority('interactive')
+        
+        @self.app.teardown_request
+        def reset_llm_lane(exc=None):
+            token = g.pop('llm_priority_token', None)
+            if token is not None:
+                reset_llm_priority(token)
+
     def _register_error_handlers(self):
         """Register error handlers for the application."""
         
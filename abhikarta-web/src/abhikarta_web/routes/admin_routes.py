@@ -1115,6 +1115,7 @@ class AdminRoutes(AbstractRoutes):
                         created_by=session.get('user_id')
                     )
                     if result:
+                        self._reload_rate_limits()
                         self.log_audit('create_llm_provider', 'llm_provider', provider_id)
                         flash(f'LLM Provider "{name}" created successfully', 'success')
                         return redirect(url_for('admin_llm_providers'))
@@ -1161,6 +1162,8 @@ class AdminRoutes(AbstractRoutes):
                         (name, description, api_endpoint, api_key_name, rate_limit_rpm,
                          rate_limit_tpm, is_active, is_default, provider_id)
                     )
+                    self._invalidate_llm_clients(provider_id, provider)
+                    self._reload_rate_limits()
                     self.log_audit('update_llm_provider', 'llm_provider', provider_id)
                     flash('Provider updated successfully', 'success')
                     return redirect(url_for('admin_llm_providers'))
@@ -1186,7 +1189,11 @@ class AdminRoutes(AbstractRoutes):
                     flash('Cannot delete provider with existing models. Delete models first.', 'error')
                     return redirect(url_for('admin_llm_providers'))
                 
+                # Read the row first: its provider type tags the pooled clients
+                provider = self.db_facade.llm.get_provider(provider_id)
                 self.db_facade.llm.delete_provider(provider_id)
+                self._invalidate_llm_clients(provider_id, provider)
+                self._reload_rate_limits()
                 self.log_audit('delete_llm_provider', 'llm_provider', provider_id)
                 flash('Provider deleted successfully', 'success')
             except Exception as e:
@@ -1228,6 +1235,8 @@ class AdminRoutes(AbstractRoutes):
                         (new_status, provider_id)
                     )
                     status_text = 'activated' if new_status else 'deactivated'
+                    self._invalidate_llm_clients(provider_id, provider)
+                    self._reload_rate_limits()
                     self.log_audit(f'toggle_provider_{status_text}', 'llm_provider', provider_id)
                     flash(f'Provider "{provider_id}" {status_text}', 'success')
             except Exception as e:
@@ -1794,6 +1803,7 @@ class AdminRoutes(AbstractRoutes):
                     if result:
                         server_id = result
                         self.log_audit('create', 'mcp_tool_server', server_id)
+                        self._invalidate_built_agents()
                     
                     # Connect to MCP manager and load tools if active
                     if is_active:
@@ -1897,6 +1907,7 @@ class AdminRoutes(AbstractRoutes):
                          refresh_interval, timeout_seconds, server_id)
                     )
                     self.log_audit('update', 'mcp_tool_server', server_id)
+                    self._invalidate_built_agents()
                     flash('Server updated successfully', 'success')
                     return redirect(url_for('admin_mcp_tool_servers'))
                 except Exception as e:
@@ -1919,6 +1930,7 @@ class AdminRoutes(AbstractRoutes):
                     (server_id,)
                 )
                 self.log_audit('delete', 'mcp_tool_server', server_id)
+                self._invalidate_built_agents()
                 flash('Server deleted successfully', 'success')
             except Exception as e:
                 logger.error(f"Error deleting MCP tool server: {e}", exc_info=True)
@@ -2163,6 +2175,7 @@ class AdminRoutes(AbstractRoutes):
                 )
                 
                 self.log_audit('refresh', 'mcp_tool_server', server_id)
+                self._invalidate_built_agents()
                 flash(f'Successfully loaded {tool_count} tools from {server["name"]}', 'success')
                 
             except urllib.error.HTTPError as e:
@@ -2567,3 +2580,38 @@ class AdminRoutes(AbstractRoutes):
             return redirect(url_for('admin_hitl_tasks'))
         
         logger.info("Admin routes registered")
+    
+    def _invalidate_llm_clients(self, provider_id: str, provider: dict = None):
+        """
+        Drop pooled LangChain clients built from an edited or removed provider.
+        
+        Pass the provider row when it was read before the change; a deleted
+        row can no longer be looked up.
+        """
+        try:
+            from abhikarta.langchain.llm_factory import invalidate_llm_clients
+            invalidate_llm_clients(provider_id)
+            if provider is None:
+                provider = self.db_facade.llm.get_provider(provider_id)
+            if provider and provider.get('provider_type'):
+                invalidate_llm_clients(provider['provider_type'])
+        except Exception as e:
+            logger.debug(f"Could not invalidate LLM clients for {provider_id}: {e}")
+        # Built agents hold the clients that were just dropped
+        self._invalidate_built_agents()
+    
+    def _reload_rate_limits(self):
+        """Apply edited provider rate limits to the running process."""
+        try:
+            from abhikarta.llm_provider.rate_limiter import get_rate_limiter_registry
+            get_rate_limiter_registry().load_from_db(self.db_facade)
+        except Exception as e:
+            logger.warning(f"Could not reload LLM rate limits: {e}")
+    
+    def _invalidate_built_agents(self):
+        """Drop cached agent runnables after MCP server or LLM provider changes."""
+        try:
+            from abhikarta.langchain.agents import invalidate_agent_executor
+            invalidate_agent_executor()
+        except Exception as e:
+            logger.debug(f"Could not invalidate built agents: {e}")
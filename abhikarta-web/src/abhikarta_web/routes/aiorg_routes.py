@@ -744,36 +744,34 @@ class AIORGRoutes(AbstractRoutes):
             # Get nodes where user is human mirror
             user_nodes = db_ops.get_nodes_by_email(user_email)
             
-            # Get pending HITL items for user's nodes
+            # Get pending HITL items for user's nodes (batched across nodes)
+            from abhikarta.aiorg.models import TaskStatus
+            
+            node_ids = [n.node_id for n in user_nodes]
+            tasks_by_node = db_ops.get_tasks_for_nodes(
+                node_ids, statuses=[TaskStatus.DELEGATED, TaskStatus.WAITING])
+            actions_by_node = db_ops.get_hitl_actions_for_nodes(node_ids, limit_per_node=10)
             pending_items = []
             recent_actions = []
             
             for node in user_nodes:
                 # Get pending tasks for review
-                node_tasks = db_ops.get_node_tasks(node.node_id)
-                for task in node_tasks:
-                    if task.status.value in ['delegated', 'waiting']:
-                        pending_items.append({
-                            'node': node,
-                            'task': task,
-                            'type': 'task_review'
-                        })
+                for task in tasks_by_node.get(node.node_id, []):
+                    pending_items.append({
+                        'node': node,
+                        'task': task,
+                        'type': 'task_review'
+                    })
                 
                 # Get recent HITL actions
-                actions = db_ops.get_hitl_actions(node_id=node.node_id, limit=10)
-                for action in actions:
+                for action in actions_by_node.get(node.node_id, []):
                     recent_actions.append({
                         'node': node,
                         'action': action
                     })
             
             # Get orgs for user's nodes
-            org_ids = set(n.org_id for n in user_nodes)
-            orgs = {}
-            for org_id in org_ids:
-                org = db_ops.get_org(org_id)
-                if org:
-                    orgs[org_id] = org
+            orgs = db_ops.get_orgs([n.org_id for n in user_nodes])
             
             return render_template('aiorg/hitl_dashboard.html',
                                    fullname=session.get('fullname'),
@@ -17,7 +17,7 @@ Patent Pending: Certain architectural patterns and implementations described in
 document may be subject to patent applications.
 """
 
-from flask import request, jsonify, session, g, current_app
+from flask import request, jsonify, session, g, current_app, Response, stream_with_context
 import logging
 import json
 import hashlib
@@ -216,6 +216,54 @@ class APIRoutes(AbstractRoutes):
             'timestamp': datetime.now().isoformat()
         }), status_code
     
+    def _invalidate_built_agent(self, agent_id):
+        """Drop the cached LangChain runnable of an edited agent."""
+        try:
+            from abhikarta.langchain.agents import invalidate_agent_executor
+            invalidate_agent_executor(agent_id)
+        except Exception as e:
+            logger.debug(f"Could not invalidate built agent {agent_id}: {e}")
+    
+    def _default_agent_execution_mode(self):
+        """Default agent execution mode (sync or async) from configuration."""
+        try:
+            from abhikarta.core.config import PropertiesConfigurator
+            return PropertiesConfigurator().get('agent.execution.default.mode', 'sync')
+        except Exception:
+            return 'sync'
+    
+    def _submit_agent_job(self, agent_id, input_data, execution_id):
+        """Queue an agent execution on the background job pool."""
+        from abhikarta.services.agent_jobs import get_agent_job_manager, AgentJobQueueFull
+        
+        try:
+            get_agent_job_manager(self.db_facade).submit(
+                agent_id, input_data, execution_id, user_id=session.get('user_id')
+            )
+        except AgentJobQueueFull as e:
+            self.db_facade.execute(
+                "UPDATE executions SET status = 'failed', error_message = ? WHERE execution_id = ?",
+                (str(e), execution_id)
+            )
+            return self._error_response('EXEC_004', str(e), 503)
+        
+        logger.info(f"[API] Queued agent {agent_id} as job {execution_id}")
+        response = self._success_response({
+            'execution_id': execution_id,
+            'agent_id': agent_id,
+            'status': 'queued',
+            'events_url': f'/api/executions/{execution_id}/events',
+            'status_url': f'/api/executions/{execution_id}/status'
+        }, 'Execution queued')
+        response.status_code = 202
+        return response
+    
+    @staticmethod
+    def _sse(event_type, data, event_id=None):
+        """Format one Server-Sent Event."""
+        lines = f"id: {event_id}\n" if event_id is not None else ''
+        return f"{lines}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+    
     def register_routes(self):
         """Register all API routes."""
         
@@ -401,6 +449,7 @@ class APIRoutes(AbstractRoutes):
                      data.get('agent_type'), json.dumps(data.get('config', {})),
                      datetime.now().isoformat(), agent_id)
                 )
+                self._invalidate_built_agent(agent_id)
                 
                 agent = self.db_facade.fetch_one(
                     "SELECT * FROM agents WHERE agent_id = ?",
@@ -418,12 +467,22 @@ class APIRoutes(AbstractRoutes):
         @self.app.route('/api/agents/<agent_id>/execute', methods=['POST'])
         @api_login_required
         def api_execute_agent(agent_id):
-            """Execute an agent and return results."""
+            """
+            Execute an agent.
+            
+            ``mode`` (body or query string) selects how: ``sync`` runs in the
+            request and returns the result; ``async`` queues a background job
+            and returns 202 with the execution_id, whose progress streams from
+            ``/api/executions/<id>/events``. The default comes from
+            ``agent.execution.default.mode``.
+            """
             import uuid
             from datetime import datetime
             
             data = request.get_json() or {}
             input_data = data.get('input', data.get('input_data', ''))
+            mode = str(data.get('mode') or request.args.get('mode') or
+                       self._default_agent_execution_mode()).lower()
             
             # If input is a dict, convert to string
             if isinstance(input_data, dict):
@@ -442,15 +501,19 @@ class APIRoutes(AbstractRoutes):
                 execution_id = f"exec_{uuid.uuid4().hex[:16]}"
                 started_at = datetime.now()
                 
-                # Create execution record with 'running' status
+                # Create execution record ('queued' until a job worker picks it up)
                 self.db_facade.execute(
                     """INSERT INTO executions 
                        (execution_id, agent_id, user_id, status, input_data, started_at)
                        VALUES (?, ?, ?, ?, ?, ?)""",
-                    (execution_id, agent_id, session.get('user_id'), 'running',
+                    (execution_id, agent_id, session.get('user_id'),
+                     'queued' if mode == 'async' else 'running',
                      input_data, started_at.isoformat())
                 )
                 
+                if mode == 'async':
+                    return self._submit_agent_job(agent_id, input_data, execution_id)
+                
                 # Actually execute the agent using LangChain
                 try:
                     from abhikarta.langchain.agents import AgentExecutor as LangChainAgentExecutor
@@ -589,14 +652,16 @@ class APIRoutes(AbstractRoutes):
                 if not execution:
                     return jsonify({'status': 'not_found'})
                 
-                # Get step counts
-                steps = self.db_facade.fetch_all(
-                    "SELECT status FROM execution_steps WHERE execution_id = ?",
+                # Get step counts (aggregated in SQL; this endpoint is polled)
+                counts = self.db_facade.fetch_one(
+                    """SELECT COUNT(*) AS total_steps,
+                              SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed_steps
+                       FROM execution_steps WHERE execution_id = ?""",
                     (execution_id,)
-                ) or []
+                ) or {}
                 
-                total_steps = len(steps)
-                completed_steps = len([s for s in steps if s.get('status') == 'completed'])
+                total_steps = counts.get('total_steps') or 0
+                completed_steps = counts.get('completed_steps') or 0
                 progress = int((completed_steps / total_steps) * 100) if total_steps > 0 else 0
                 
                 return jsonify({
@@ -613,6 +678,62 @@ class APIRoutes(AbstractRoutes):
                 logger.error(f"Error getting execution status: {e}", exc_info=True)
                 return jsonify({'status': 'error', 'error': str(e)})
         
+        @self.app.route('/api/executions/<execution_id>/events', methods=['GET'])
+        @api_login_required
+        def api_stream_execution_events(execution_id):
+            """
+            Stream agent job progress as Server-Sent Events.
+            
+            Events: status, step, observation, token, llm_end, then completed
+            or failed. Reconnecting clients send ``Last-Event-ID`` (or
+            ``?after=<id>``) to resume.
+            """
+            from abhikarta.services.agent_jobs import get_agent_job_manager
+            
+            user_id = session.get('user_id')
+            is_admin = session.get('is_admin', False)
+            manager = get_agent_job_manager(self.db_facade)
+            job = manager.get(execution_id) if manager else None
+            
+            if job is None or (not is_admin and job.user_id != user_id):
+                # Not tracked in memory: report the stored status and close
+                if is_admin:
+                    execution = self.db_facade.fetch_one(
+                        "SELECT status, output_data, error_message, duration_ms FROM executions WHERE execution_id = ?",
+                        (execution_id,)
+                    )
+                else:
+                    execution = self.db_facade.fetch_one(
+                        "SELECT status, output_data, error_message, duration_ms FROM executions WHERE execution_id = ? AND user_id = ?",
+                        (execution_id, user_id)
+                    )
+                if not execution:
+                    return self._error_response('EXEC_003', 'Execution not found', 404)
+                status = execution.get('status')
+                event_type = status if status in ('completed', 'failed') else 'status'
+                return Response(self._sse(event_type, execution), mimetype='text/event-stream')
+            
+            try:
+                last_id = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+            except ValueError:
+                last_id = 0
+            
+            def generate():
+                after = last_id
+                while True:
+                    events = job.wait_events(after, timeout=15.0)
+                    if not events:
+                        if job.done:
+                            return
+                        yield ": keep-alive\n\n"
+                        continue
+                    for event in events:
+                        after = event['id']
+                        yield self._sse(event['event'], event['data'], event['id'])
+            
+            return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
         @self.app.route('/api/executions/<execution_id>/trace', methods=['GET'])
         @api_login_required
         def api_get_execution_trace(execution_id):
@@ -13,6 +13,8 @@ import time
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify, session, render_template
 
+from abhikarta.llm_provider.tokenizer import TOKENS_PER_MESSAGE
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +42,52 @@ class ConversationRoutes:
                 logger.error(f"Failed to get conversation memory manager: {e}")
         return self._memory_manager
     
+    @staticmethod
+    def _context_history(memory_manager, conversation, message: str,
+                         model: str = None, system_prompt: str = None):
+        """
+        Chat history for the next turn, budgeted in tokens for ``model``.
+        
+        Call before the input is added to the conversation. The system
+        prompt and the input are reserved out of the model's prompt budget.
+        """
+        reserve_tokens = 2 * TOKENS_PER_MESSAGE + memory_manager.count_tokens(message, model)
+        if system_prompt:
+            reserve_tokens += memory_manager.count_tokens(system_prompt, model)
+        return memory_manager.get_context_history(
+            conversation.conversation_id, model=model, reserve_tokens=reserve_tokens)
+    
+    def _agent_prompt_settings(self, agent_id: str):
+        """Model and system prompt of an agent, as its executor resolves them."""
+        row = self.db_facade.fetch_one(
+            "SELECT model_id, config FROM agents WHERE agent_id = ?", (agent_id,))
+        if not row:
+            return None, None
+        row = dict(row)
+        config = row.get('config') or {}
+        if isinstance(config, str):
+            try:
+                config = json.loads(config)
+            except json.JSONDecodeError:
+                config = {}
+        llm_config = config.get('llm_config') or {}
+        system_prompt = config.get('system_prompt')
+        if not system_prompt:
+            for node in (config.get('workflow') or {}).get('nodes', []):
+                if node.get('node_type') == 'llm' and node.get('config', {}).get('system_prompt'):
+                    system_prompt = node['config']['system_prompt']
+                    break
+        return llm_config.get('model') or row.get('model_id'), system_prompt
+    
+    @staticmethod
+    def _workflow_prompt_settings(dag_def: dict):
+        """Model and system prompt of a workflow's first LLM node."""
+        for node in dag_def.get('nodes', []):
+            if (node.get('type') or node.get('node_type')) == 'llm':
+                config = node.get('config') or {}
+                return config.get('model', 'gpt-4o'), config.get('system_prompt')
+        return None, None
+    
     def _register_routes(self):
         """Register all conversation routes."""
         
@@ -166,18 +214,17 @@ class ConversationRoutes:
                 conversation_id=conversation_id
             )
             
+            # Get token-budgeted chat history (rolling summary first, if any)
+            model, system_prompt = self._agent_prompt_settings(agent_id)
+            chat_history = self._context_history(memory_manager, conversation, message,
+                                                 model=model, system_prompt=system_prompt)
+            
             # Add user message
             memory_manager.add_message(conversation.conversation_id, 'human', message)
             
             start_time = time.time()
             
             try:
-                # Get chat history for context
-                chat_history = conversation.get_chat_history(max_messages=20)
-                # Remove the last message (the one we just added) as it will be the input
-                if chat_history:
-                    chat_history = chat_history[:-1]
-                
                 # Execute agent with conversation history
                 from abhikarta.langchain.agents import AgentExecutor as LangChainAgentExecutor
                 
@@ -206,7 +253,7 @@ class ConversationRoutes:
                     'execution_id': result.execution_id,
                     'status': result.status,
                     'duration_ms': duration_ms,
-                    'message_count': len(conversation.messages)
+                    'message_count': conversation.message_count
                 })
                 
             except Exception as e:
@@ -256,17 +303,10 @@ class ConversationRoutes:
                 conversation_id=conversation_id
             )
             
-            # Add user message
-            memory_manager.add_message(conversation.conversation_id, 'human', message)
-            
             start_time = time.time()
+            message_added = False
             
             try:
-                # Get chat history for context
-                chat_history = conversation.get_chat_history(max_messages=20)
-                if chat_history:
-                    chat_history = chat_history[:-1]
-                
                 # Load workflow
                 workflow_row = self.db_facade.fetch_one(
                     "SELECT * FROM workflows WHERE workflow_id = ?",
@@ -277,11 +317,21 @@ class ConversationRoutes:
                     return jsonify({'success': False, 'error': 'Workflow not found'}), 404
                 
                 workflow = dict(workflow_row)
+                dag_def = json.loads(workflow.get('dag_definition') or '{}')
+                
+                # Get token-budgeted chat history (rolling summary first, if
+                # any) before this message joins the conversation
+                model, system_prompt = self._workflow_prompt_settings(dag_def)
+                chat_history = self._context_history(memory_manager, conversation, message,
+                                                     model=model, system_prompt=system_prompt)
+                
+                # Add user message
+                memory_manager.add_message(conversation.conversation_id, 'human', message)
+                message_added = True
                 
                 # Execute workflow with chat history in input
                 from abhikarta.workflow import WorkflowExecutor, DAGParser
                 
-                dag_def = json.loads(workflow.get('dag_definition', '{}'))
                 dag_def['workflow_id'] = workflow_id
                 dag_def['name'] = workflow.get('name', '')
                 dag_def['python_modules'] = json.loads(workflow.get('python_modules', '{}'))
@@ -326,13 +376,15 @@ class ConversationRoutes:
                     'execution_id': execution.execution_id,
                     'status': execution.status,
                     'duration_ms': duration_ms,
-                    'message_count': len(conversation.messages)
+                    'message_count': conversation.message_count
                 })
                 
             except Exception as e:
                 logger.error(f"Workflow chat error: {e}", exc_info=True)
                 error_message = f"Error: {str(e)}"
                 
+                if not message_added:
+                    memory_manager.add_message(conversation.conversation_id, 'human', message)
                 memory_manager.add_message(
                     conversation.conversation_id,
                     'assistant',
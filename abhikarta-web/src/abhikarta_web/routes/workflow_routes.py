@@ -241,6 +241,7 @@ class WorkflowRoutes(AbstractRoutes):
                     "DELETE FROM workflows WHERE workflow_id = ?",
                     (workflow_id,)
                 )
+                self._invalidate_workflow_graph(workflow_id)
                 self.log_audit('delete_workflow', 'workflow', workflow_id)
                 return jsonify({'success': True})
             except Exception as e:
@@ -632,6 +633,7 @@ class WorkflowRoutes(AbstractRoutes):
                             name = ?, description = ?, dag_definition = ?, updated_at = CURRENT_TIMESTAMP
                         WHERE workflow_id = ?
                     """, (name, description, dag_definition, workflow_id))
+                    self._invalidate_workflow_graph(workflow_id)
                 else:
                     # Create new
                     workflow_id = str(uuid.uuid4())[:8]
@@ -935,6 +937,7 @@ class WorkflowRoutes(AbstractRoutes):
                         f"UPDATE workflows SET {', '.join(updates)} WHERE workflow_id = ?",
                         tuple(values)
                     )
+                    self._invalidate_workflow_graph(workflow_id)
                     
                     self.log_audit('update_workflow_json', 'workflow', workflow_id)
                 
@@ -953,6 +956,7 @@ class WorkflowRoutes(AbstractRoutes):
                     "DELETE FROM workflows WHERE workflow_id = ?",
                     (workflow_id,)
                 )
+                self._invalidate_workflow_graph(workflow_id)
                 self.log_audit('delete_workflow', 'workflow', workflow_id)
                 return jsonify({'success': True})
             except Exception as e:
@@ -960,3 +964,11 @@ class WorkflowRoutes(AbstractRoutes):
                 return jsonify({'error': str(e)}), 500
         
         logger.info("Workflow routes registered")
+    
+    def _invalidate_workflow_graph(self, workflow_id: str):
+        """Drop any cached compiled LangGraph for an edited or deleted workflow."""
+        try:
+            from abhikarta.langchain.workflow_graph import invalidate_workflow_graph
+            invalidate_workflow_graph(workflow_id)
+        except Exception as e:
+            logger.debug(f"Could not invalidate compiled graph for {workflow_id}: {e}")
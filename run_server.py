@@ -311,6 +311,12 @@ def prepare_mcp_manager(prop_conf, db_facade, tools_registry):
     manager = get_mcp_manager()
     manager.set_db_facade(db_facade)
     manager.set_tools_registry(tools_registry)
+    manager.configure_http_pools(
+        max_connections=prop_conf.get_int('mcp.http.max.connections.per.server', 10),
+        max_retries=prop_conf.get_int('mcp.http.max.retries', 2),
+        backoff_seconds=prop_conf.get_float('mcp.http.retry.backoff.seconds', 0.2),
+        async_workers=prop_conf.get_int('mcp.http.async.workers', 32)
+    )
     
     # Load servers from database
     server_count = manager.load_from_database()
@@ -598,11 +604,149 @@ def main():
         except Exception as e:
             logger.warning(f"LLM Config Resolver not initialized: {e}")
         
+        # 3.65 Initialize compiled workflow graph cache
+        try:
+            from abhikarta.langchain.workflow_graph import init_compiled_graph_cache
+            init_compiled_graph_cache(
+                max_size=prop_conf.get_int('workflow.graph.cache.size', 128),
+                enabled=prop_conf.get_bool('workflow.graph.cache.enabled', True)
+            )
+            logger.info("Compiled workflow graph cache initialized")
+        except Exception as e:
+            logger.warning(f"Compiled workflow graph cache not initialized: {e}")
+        
+        # 3.66 Initialize pooled LangChain chat-model clients
+        try:
+            from abhikarta.langchain.llm_factory import init_llm_client_pool
+            init_llm_client_pool(
+                max_size=prop_conf.get_int('llm.client.pool.max.size', 64),
+                idle_timeout_seconds=prop_conf.get_int('llm.client.pool.idle.timeout.seconds', 600)
+            )
+            logger.info("LLM client pool initialized")
+        except Exception as e:
+            logger.warning(f"LLM client pool not initialized: {e}")
+        
+        # 3.67 Initialize keep-alive HTTP transport for LLM providers
+        try:
+            from abhikarta.llm_provider.http_transport import init_http_transport
+            init_http_transport(
+                max_connections_per_host=prop_conf.get_int('llm.http.max.connections.per.host', 10),
+                connect_timeout=prop_conf.get_int('llm.http.connect.timeout.seconds', 10),
+                read_timeout=prop_conf.get_int('llm.http.read.timeout.seconds', 120),
+                idle_timeout_seconds=prop_conf.get_int('llm.http.idle.timeout.seconds', 60),
+                async_workers=prop_conf.get_int('llm.http.async.workers', 32)
+            )
+            logger.info("LLM HTTP transport initialized")
+        except Exception as e:
+            logger.warning(f"LLM HTTP transport not initialized: {e}")
+        
+        # 3.68 Initialize batched llm_calls writer
+        try:
+            from abhikarta.llm_provider.llm_call_logger import init_llm_call_log_writers
+            init_llm_call_log_writers(
+                enabled=prop_conf.get_bool('llm.call.log.async.enabled', True),
+                batch_size=prop_conf.get_int('llm.call.log.batch.size', 100),
+                flush_interval_ms=prop_conf.get_int('llm.call.log.flush.interval.ms', 500),
+                max_queue_size=prop_conf.get_int('llm.call.log.queue.size', 10000),
+                drop_policy=prop_conf.get('llm.call.log.drop.policy', 'drop_newest'),
+                block_timeout_ms=prop_conf.get_int('llm.call.log.block.timeout.ms', 100)
+            )
+            logger.info("LLM call log writer initialized")
+        except Exception as e:
+            logger.warning(f"LLM call log writer not initialized: {e}")
+        
+        # 3.69 Initialize compiled code cache for python nodes and code fragments
+        try:
+            from abhikarta.utils.code_cache import init_compiled_code_cache
+            init_compiled_code_cache(
+                max_size=prop_conf.get_int('code.cache.max.size', 1024),
+                enabled=prop_conf.get_bool('code.cache.enabled', True)
+            )
+            logger.info("Compiled code cache initialized")
+        except Exception as e:
+            logger.warning(f"Compiled code cache not initialized: {e}")
+        
+        # 3.695 Initialize provider rate limits (llm_providers.rate_limit_rpm/tpm)
+        try:
+            from abhikarta.llm_provider.rate_limiter import init_llm_rate_limits
+            registry = init_llm_rate_limits(
+                db_facade,
+                enabled=prop_conf.get_bool('llm.rate.limit.enabled', True),
+                burst_seconds=prop_conf.get_float('llm.rate.limit.burst.seconds', 1.0),
+                max_wait_seconds=prop_conf.get_float('llm.rate.limit.max.wait.seconds', 300.0)
+            )
+            logger.info(f"LLM rate limits initialized for {len(registry.get_stats())} provider type(s)")
+        except Exception as e:
+            logger.warning(f"LLM rate limits not initialized: {e}")
+        
+        # 3.696 Initialize LLM response cache (opt-in)
+        try:
+            from abhikarta.llm_provider.response_cache import init_llm_response_cache
+            response_cache = init_llm_response_cache(
+                enabled=prop_conf.get_bool('llm.response.cache.enabled', False),
+                max_size=prop_conf.get_int('llm.response.cache.max.size', 1000),
+                ttl_seconds=prop_conf.get_int('llm.response.cache.ttl.seconds', 3600),
+                cache_nonzero_temperature=prop_conf.get_bool('llm.response.cache.nonzero.temperature', False),
+                disk_path=prop_conf.get('llm.response.cache.disk.path', ''),
+                disk_max_entries=prop_conf.get_int('llm.response.cache.disk.max.entries', 100000)
+            )
+            logger.info(f"LLM response cache initialized (enabled={response_cache.enabled})")
+        except Exception as e:
+            logger.warning(f"LLM response cache not initialized: {e}")
+        
+        # 3.6965 Initialize built agent cache
+        try:
+            from abhikarta.langchain.agents import init_agent_executor_cache
+            init_agent_executor_cache(
+                max_size=prop_conf.get_int('agent.executor.cache.size', 64),
+                enabled=prop_conf.get_bool('agent.executor.cache.enabled', True)
+            )
+            logger.info("Built agent cache initialized")
+        except Exception as e:
+            logger.warning(f"Built agent cache not initialized: {e}")
+        
+        # 3.697 Initialize background agent job pool (async /api/agents/<id>/execute)
+        try:
+            from abhikarta.services.agent_jobs import init_agent_job_manager
+            job_manager = init_agent_job_manager(
+                db_facade,
+                max_concurrent=prop_conf.get_int('agent.max.concurrent.executions', 10),
+                max_queued=prop_conf.get_int('agent.job.queue.size', 100),
+                retention_seconds=prop_conf.get_int('agent.job.retention.seconds', 3600)
+            )
+            logger.info(f"Agent job pool initialized: {job_manager.max_concurrent} workers")
+        except Exception as e:
+            logger.warning(f"Agent job pool not initialized: {e}")
+        
+        # 3.698 Initialize tokenizers and per-model context limits
+        try:
+            from abhikarta.llm_provider.tokenizer import init_tokenizers, init_model_context_limits
+            tokenizer = init_tokenizers(prop_conf.get('llm.tokenizer.default', 'heuristic'))
+            init_model_context_limits(db_facade)
+            logger.info(f"Tokenizers initialized: default={tokenizer.name}")
+        except Exception as e:
+            logger.warning(f"Tokenizers not initialized: {e}")
+        
         # 3.7 Initialize Conversation Memory Manager (for chat history)
         try:
-            from abhikarta.services.conversation_memory import init_conversation_memory_manager
-            conv_memory = init_conversation_memory_manager(db_facade)
-            logger.info("Conversation memory manager initialized")
+            from abhikarta.services.conversation_memory import (
+                init_conversation_memory_manager, create_llm_summarizer
+            )
+            summarizer = None
+            if prop_conf.get_bool('conversation.summary.enabled', False):
+                summarizer = create_llm_summarizer(
+                    db_facade, model_id=prop_conf.get('conversation.summary.model', '') or None)
+            conv_memory = init_conversation_memory_manager(
+                db_facade,
+                max_cached=prop_conf.get_int('conversation.memory.cache.size', 256),
+                window_size=prop_conf.get_int('conversation.memory.window.size', 100),
+                summarizer=summarizer,
+                summary_threshold_tokens=prop_conf.get_int('conversation.summary.threshold.tokens', 3000),
+                summary_keep_recent=prop_conf.get_int('conversation.summary.keep.recent', 10),
+                default_context_tokens=prop_conf.get_int('conversation.context.max.tokens', 8000)
+            )
+            logger.info(f"Conversation memory manager initialized "
+                        f"(summaries {'on' if summarizer else 'off'})")
         except Exception as e:
             logger.warning(f"Conversation memory manager not initialized: {e}")
         
@@ -713,6 +857,11 @@ def main():
         # Close database connection
         if 'db_facade' in locals():
             print_shutdown_step(3, TOTAL_SHUTDOWN_STEPS, "Closing Database Connection", 'stopping')
+            try:
+                from abhikarta.llm_provider.llm_call_logger import shutdown_llm_call_log_writers
+                shutdown_llm_call_log_writers()
+            except Exception as e:
+                logger.warning(f"Error flushing LLM call logs: {e}")
             db_facade.disconnect()
             logger.info("Database connection closed")
             print_shutdown_step(3, TOTAL_SHUTDOWN_STEPS, "Database Connection Closed", 'done')
@@ -72,6 +72,1685 @@ class TestDatabaseFacade:
         assert len(result) > 0
         
         handler.disconnect()
+    
+    def test_sqlite_transaction_rolls_back(self, tmp_path):
+        """Test that a failed transaction() leaves no partial writes."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        handler = SQLiteHandler(str(tmp_path / 'tx.db'))
+        handler.init_schema()
+        assert handler.fetch_one("PRAGMA journal_mode")['journal_mode'] == 'wal'
+        sql = "INSERT INTO execution_steps (execution_id, step_number) VALUES (?, ?)"
+        with pytest.raises(RuntimeError):
+            with handler.transaction():
+                handler.execute_many(sql, [('e1', 1), ('e1', 2)])
+                raise RuntimeError("abort")
+        with handler.transaction():
+            handler.execute_many(sql, [('e2', 1), ('e2', 2)])
+        rows = handler.fetch_all("SELECT execution_id FROM execution_steps")
+        assert [r['execution_id'] for r in rows] == ['e2', 'e2']
+
+
+class TestPostgresConnectionPool:
+    """Test the PostgreSQL connection pool with fake connections."""
+
+    @staticmethod
+    def _pool(**kwargs):
+        from abhikarta.database.postgres_handler import PostgresConnectionPool
+
+        class FakeConnection:
+            def __init__(self):
+                self.closed = 0
+                self.rollbacks = 0
+
+            def rollback(self):
+                if self.closed:
+                    raise RuntimeError("connection already closed")
+                self.rollbacks += 1
+
+            def close(self):
+                self.closed = 1
+
+        opened = []
+
+        def connect():
+            opened.append(FakeConnection())
+            return opened[-1]
+
+        return PostgresConnectionPool(connect, **kwargs), opened
+
+    def test_checkout_and_return(self):
+        """Test that a returned connection is rolled back and reused."""
+        pool, opened = self._pool(min_size=1, max_size=2, health_check_idle_seconds=-1)
+        assert len(opened) == 1
+        with pool.connection() as conn:
+            assert conn is opened[0]
+            assert pool.get_stats()['in_use'] == 1
+        assert conn.rollbacks == 1
+        with pool.connection() as again:
+            assert again is conn
+        stats = pool.get_stats()
+        assert (stats['size'], stats['in_use'], stats['idle'], stats['checkouts']) == (1, 0, 1, 2)
+
+    def test_max_size_blocks_then_times_out(self):
+        """Test that checkout waits for a free slot and fails after the timeout."""
+        import threading
+        import time
+        from abhikarta.database.postgres_handler import PoolTimeoutError
+        pool, opened = self._pool(min_size=0, max_size=1, health_check_idle_seconds=-1)
+        conn = pool.checkout()
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout(timeout=0.05)
+        assert pool.get_stats()['timeouts'] == 1
+
+        threading.Timer(0.05, pool.checkin, args=(conn,)).start()
+        start = time.monotonic()
+        assert pool.checkout(timeout=2) is conn
+        assert time.monotonic() - start >= 0.04
+        assert len(opened) == 1
+
+    def test_broken_connections_discarded(self):
+        """Test that closed or failed connections are replaced, not reused."""
+        pool, opened = self._pool(min_size=0, max_size=2, health_check_idle_seconds=-1)
+        conn = pool.checkout()
+        conn.close()
+        pool.checkin(conn)
+        assert pool.get_stats()['size'] == 0
+        fresh = pool.checkout()
+        assert fresh is not conn and len(opened) == 2
+        pool.checkin(fresh)
+        fresh.closed = 1  # dropped by the server while idle
+        assert pool.checkout() is opened[2]
+        assert pool.get_stats()['size'] == 1
+
+    def test_close(self):
+        """Test that close() shuts idle connections and in-use ones on return."""
+        pool, opened = self._pool(min_size=2, max_size=3, health_check_idle_seconds=-1)
+        busy = pool.checkout()
+        pool.close()
+        idle = next(c for c in opened if c is not busy)
+        assert idle.closed and not busy.closed
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+        pool.checkin(busy)
+        assert all(c.closed for c in opened)
+        assert pool.get_stats()['size'] == 0
+
+
+class TestExecutionLogger:
+    """Test execution log files."""
+    
+    def test_jsonl_log_roundtrip(self, tmp_path, monkeypatch):
+        """Test that appended JSONL records rebuild the full log view."""
+        from abhikarta.services.execution_logger import (
+            ExecutionLogger, ExecutionLogConfig, EntityType, LogFormat
+        )
+        monkeypatch.setattr(ExecutionLogger, '_instance', None)
+        config = ExecutionLogConfig(base_path=str(tmp_path), log_format=LogFormat.JSONL,
+                                    compress_completed=True)
+        exec_logger = ExecutionLogger(config)
+        exec_logger.start_execution('agent_x_1', EntityType.AGENT, 'x', 'X',
+                                    user_input={'q': 'hi'})
+        for i in range(3):
+            exec_logger.log_node_execution('agent_x_1', f'step{i}', 'tool', output_data=i)
+        exec_logger.complete_execution('agent_x_1', output={'answer': 42})
+        
+        entity_type, log_path = exec_logger.find_log_file('agent_x_1')
+        assert log_path.name == 'agent_x_1.jsonl.gz'
+        data = exec_logger.read_log_file(entity_type, 'agent_x_1')
+        assert data['status'] == 'completed'
+        assert data['user_input'] == {'q': 'hi'}
+        assert data['output'] == {'answer': 42}
+        assert [n['output'] for n in data['node_executions']] == [0, 1, 2]
+        assert len(data['entries']) == 2
+
+    def test_logs_readable_across_formats(self, tmp_path, monkeypatch):
+        """Test that JSON logs stay visible under JSONL and late header fields survive."""
+        from abhikarta.services.execution_logger import (
+            ExecutionLogger, ExecutionLogConfig, EntityType, LogFormat
+        )
+        monkeypatch.setattr(ExecutionLogger, '_instance', None)
+        json_logger = ExecutionLogger(ExecutionLogConfig(base_path=str(tmp_path),
+                                                         log_format=LogFormat.JSON))
+        json_logger.start_execution('agent_x_1', EntityType.AGENT, 'x', 'X')
+        json_logger.complete_execution('agent_x_1', output='old')
+
+        monkeypatch.setattr(ExecutionLogger, '_instance', None)
+        exec_logger = ExecutionLogger(ExecutionLogConfig(base_path=str(tmp_path),
+                                                         log_format=LogFormat.JSONL))
+        exec_logger.start_execution('agent_x_2', EntityType.AGENT, 'x', 'X')
+        exec_logger.get_log('agent_x_2').llm_config = {'model': 'm1'}
+        exec_logger.complete_execution('agent_x_2', output='new')
+
+        entity_type, log_path = exec_logger.find_log_file('agent_x_1')
+        assert log_path.name == 'agent_x_1.json'
+        assert exec_logger.read_log_file(entity_type, 'agent_x_1')['output'] == 'old'
+        data = exec_logger.read_log_file(EntityType.AGENT, 'agent_x_2')
+        assert (data['output'], data['llm_config']) == ('new', {'model': 'm1'})
+        listed = {log['execution_id'] for log in exec_logger.list_logs(EntityType.AGENT)}
+        assert listed == {'agent_x_1', 'agent_x_2'}
+
+
+class TestLLMCallLogWriter:
+    """Test the batched llm_calls writer."""
+    
+    def test_batches_written_on_flush(self, tmp_path):
+        """Test that queued llm_calls rows are written on flush."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.llm_call_logger import LLMCallLogWriter
+        handler = SQLiteHandler(str(tmp_path / 'calls.db'))
+        handler.init_schema()
+        writer = LLMCallLogWriter(handler, batch_size=10, flush_interval_ms=1000)
+        for i in range(25):
+            writer.submit((f'call-{i}', None, None, 'user', 'ollama', 'llama3', 'chat',
+                           None, 'hi', [{'role': 'user', 'content': 'hi'}], 'ok', None,
+                           1, 1, 2, 0.0, None, None, 5, 'success', None, '{}'))
+        assert writer.flush(timeout=5.0)
+        writer.shutdown()
+        rows = handler.fetch_all("SELECT messages FROM llm_calls")
+        assert len(rows) == 25
+        assert writer.get_stats()['written'] == 25
+
+    def test_block_policy_waits_then_drops(self):
+        """Test that 'block' waits block_timeout_ms for queue space before dropping."""
+        import threading
+        import time
+        from abhikarta.llm_provider.llm_call_logger import LLMCallLogWriter
+
+        class StalledDatabase:
+            def __init__(self):
+                self.release = threading.Event()
+                self.rows = []
+
+            def execute_many(self, sql, rows):
+                self.release.wait(5)
+                self.rows.extend(rows)
+
+        db = StalledDatabase()
+        writer = LLMCallLogWriter(db, batch_size=1, flush_interval_ms=10, max_queue_size=1,
+                                  drop_policy='block', block_timeout_ms=200)
+        row = ('call', None, None, 'user', 'ollama', 'llama3', 'chat', None, 'hi', None,
+               'ok', None, 1, 1, 2, 0.0, None, None, 5, 'success', None, '{}')
+        assert writer.submit(row)  # taken by the stalled writer
+        time.sleep(0.05)
+        assert writer.submit(row)  # fills the queue
+        start = time.monotonic()
+        assert not writer.submit(row)
+        assert time.monotonic() - start >= 0.15
+        threading.Timer(0.05, db.release.set).start()
+        assert writer.submit(row)  # space frees up within the timeout
+        writer.shutdown()
+        assert len(db.rows) == 3
+        assert writer.get_stats()['dropped'] == 1
+
+
+class TestWorkflowExecutor:
+    """Test native workflow execution."""
+    
+    WORKFLOW = {
+        'workflow_id': 'fan_out',
+        'name': 'Fan Out',
+        'entry_point': 'start',
+        'nodes': [
+            {'id': 'start', 'type': 'input'},
+            {'id': 'a', 'type': 'python', 'code': 'output = {"a": 1}'},
+            {'id': 'b', 'type': 'python', 'code': 'output = {"b": 2}'},
+            {'id': 'join', 'type': 'join', 'config': {'join_type': 'merge'}},
+        ],
+        'edges': [
+            {'source': 'start', 'target': 'a'},
+            {'source': 'start', 'target': 'b'},
+            {'source': 'a', 'target': 'join'},
+            {'source': 'b', 'target': 'join'},
+        ]
+    }
+    
+    def test_parallel_branches_join(self):
+        """Test that join nodes receive the outputs of all parents."""
+        from abhikarta.workflow.executor import WorkflowExecutor
+        executor = WorkflowExecutor(use_langgraph=False, max_parallelism=2)
+        execution = executor.execute_from_dict(self.WORKFLOW, {'q': 1})
+        assert execution.status == 'completed'
+        assert execution.output_data['join'] == {'a': 1, 'b': 2}
+        assert len(execution.steps) == 4
+    
+    def test_continue_on_error_skips_descendants(self):
+        """Test that a failed branch only skips its own descendants."""
+        import copy
+        from abhikarta.workflow.executor import WorkflowExecutor
+        workflow = copy.deepcopy(self.WORKFLOW)
+        workflow['nodes'][1]['code'] = 'raise ValueError("boom")'
+        executor = WorkflowExecutor(use_langgraph=False, fail_fast=False)
+        execution = executor.execute_from_dict(workflow)
+        statuses = {s.node_id: s.status for s in execution.steps}
+        assert execution.status == 'failed'
+        assert statuses == {'start': 'completed', 'a': 'failed',
+                            'b': 'completed', 'join': 'skipped'}
+
+    def test_native_settings_from_application_properties(self, tmp_path):
+        """Test that executors built without prop_conf use the loaded configuration."""
+        from abhikarta.core import SingletonMeta
+        from abhikarta.core.config import PropertiesConfigurator
+        from abhikarta.workflow.executor import WorkflowExecutor
+
+        properties = tmp_path / 'application.properties'
+        properties.write_text("workflow.native.max.parallelism=7\n"
+                              "workflow.native.fail.fast=false\n")
+        previous = SingletonMeta._instances.get(PropertiesConfigurator)
+        SingletonMeta.reset_instance(PropertiesConfigurator)
+        try:
+            executor = WorkflowExecutor(use_langgraph=False)
+            assert (executor.max_workers, executor.fail_fast) == (4, True)
+            prop_conf = PropertiesConfigurator(properties_files=[str(properties)])
+            prop_conf.stop_reload()
+            executor = WorkflowExecutor(use_langgraph=False)
+            assert (executor.max_workers, executor.fail_fast) == (7, False)
+            assert WorkflowExecutor(use_langgraph=False, max_parallelism=2).max_workers == 2
+        finally:
+            SingletonMeta.reset_instance(PropertiesConfigurator)
+            if previous is not None:
+                SingletonMeta._instances[PropertiesConfigurator] = previous
+
+    def test_compiled_code_cache(self):
+        """Test that fragments compile once and are invalidated by origin."""
+        import traceback
+        from abhikarta.utils.code_cache import CompiledCodeCache
+        cache = CompiledCodeCache(max_size=2)
+        code = cache.compile("result = 1\nraise ValueError('x')", origin='fragment:f1')
+        assert cache.compile("result = 1\nraise ValueError('x')", origin='fragment:f1') is code
+        with pytest.raises(ValueError) as excinfo:
+            exec(code, {})
+        frame = traceback.extract_tb(excinfo.tb)[-1]
+        assert frame.filename == '<fragment:f1>'
+        assert frame.line == "raise ValueError('x')"
+        cache.compile("result = 2", origin='node:n1')
+        cache.compile("result = 3", origin='node:n2')
+        assert cache.invalidate('fragment:f1') == 0  # already evicted (LRU)
+        assert cache.invalidate('node:n2') == 1
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 3, 1)
+        assert stats['size'] == 1
+
+    def test_compiled_graph_cache(self, monkeypatch):
+        """Test graph cache hits, definition changes and factory identity."""
+        from abhikarta.langchain import workflow_graph
+        compiled = []
+
+        def fake_compile(config, db_facade, llm_factory=None, tool_factory=None):
+            compiled.append(config['v'])
+            return object()
+
+        monkeypatch.setattr(workflow_graph, 'create_workflow_graph', fake_compile)
+        cache = workflow_graph.CompiledGraphCache(max_size=8)
+        db_a, db_b = object(), object()
+        graph = cache.get_or_create('wf', {'v': 1}, db_a)
+        assert cache.get_or_create('wf', {'v': 1}, db_a) is graph
+        other = cache.get_or_create('wf', {'v': 1}, db_b)
+        assert other is not graph
+        # Two facades no longer evict each other
+        assert cache.get_or_create('wf', {'v': 1}, db_a) is graph
+        assert cache.get_or_create('wf', {'v': 1}, db_b) is other
+        assert compiled == [1, 1]
+        # An edited definition replaces every graph of the old one
+        edited = cache.get_or_create('wf', {'v': 2}, db_a)
+        assert edited is not graph and cache.get_stats()['size'] == 1
+        assert cache.get_or_create('wf', {'v': 2}, db_a) is edited
+        assert compiled == [1, 1, 2]
+        assert cache.invalidate('wf') == 1
+
+
+class TestSwarmEventBus:
+    """Test swarm event bus delivery."""
+    
+    def test_slow_subscriber_does_not_block_others(self):
+        """Test that wildcard subscribers receive events in parallel."""
+        import asyncio
+        from abhikarta.swarm.event_bus import SwarmEventBus, SwarmEvent
+        
+        async def run():
+            bus = SwarmEventBus('swarm-test')
+            await bus.start()
+            received = []
+            
+            async def slow(event):
+                await asyncio.sleep(10)
+            
+            async def fast(event):
+                received.append(event.event_type)
+            
+            await bus.subscribe('task.*', slow)
+            await bus.subscribe('task.#', fast)
+            await bus.subscribe('result.*', fast)
+            for i in range(3):
+                await bus.publish(SwarmEvent(event_type=f'task.t{i}'))
+            await bus.publish(SwarmEvent(event_type='task.deep.nested'))
+            await asyncio.wait_for(self._wait_for(received, 4), timeout=2.0)
+            metrics = bus.get_metrics()
+            await bus.stop()
+            return received, metrics
+        
+        received, metrics = asyncio.run(run())
+        assert received == ['task.t0', 'task.t1', 'task.t2', 'task.deep.nested']
+        assert metrics['subscriber_count'] == 3
+        assert metrics['subscriber_queue_depth_max'] >= 1
+
+    def test_full_subscriber_blocks_publisher_not_dispatcher(self):
+        """Test that 'block' backpressure waits in publish and spares other subscribers."""
+        import asyncio
+        from abhikarta.swarm.event_bus import SwarmEventBus, SwarmEvent
+
+        async def run():
+            bus = SwarmEventBus('swarm-backpressure', subscriber_queue_size=1)
+            await bus.start()
+            gate = asyncio.Event()
+            slow_received, fast_received = [], []
+
+            async def slow(event):
+                await gate.wait()
+                slow_received.append(event.event_type)
+
+            async def fast(event):
+                fast_received.append(event.event_type)
+
+            await bus.subscribe('task.*', slow)
+            await bus.subscribe('result.*', fast)
+            # One event in the callback, one queued; the third must wait
+            await bus.publish(SwarmEvent(event_type='task.a'))
+            await bus.publish(SwarmEvent(event_type='task.b'))
+            blocked = asyncio.create_task(bus.publish(SwarmEvent(event_type='task.c')))
+            await asyncio.sleep(0.05)
+            assert not blocked.done()
+
+            await bus.publish(SwarmEvent(event_type='result.ready'))
+            await asyncio.wait_for(self._wait_for(fast_received, 1), timeout=2.0)
+
+            gate.set()
+            assert await asyncio.wait_for(blocked, timeout=2.0) is True
+            await asyncio.wait_for(self._wait_for(slow_received, 3), timeout=2.0)
+            history = [e.event_type for e in bus.get_history('task.*')]
+            await bus.stop()
+            return slow_received, history
+
+        slow_received, history = asyncio.run(run())
+        assert slow_received == ['task.a', 'task.b', 'task.c']
+        assert history == ['task.a', 'task.b', 'task.c']
+
+    def test_subscribers_publishing_to_each_other_do_not_deadlock(self):
+        """Test that callbacks publishing into each other's full queues keep flowing."""
+        import asyncio
+        from abhikarta.swarm.event_bus import SwarmEventBus, SwarmEvent
+
+        async def run():
+            bus = SwarmEventBus('swarm-mutual', subscriber_queue_size=1)
+            await bus.start()
+            received = []
+
+            def relay(target):
+                async def handle(event):
+                    received.append(event.event_type)
+                    if event.payload < 4:
+                        # Two events per hop keep both queues over their bound
+                        for _ in range(2):
+                            await bus.publish(SwarmEvent(event_type=f'{target}.hop',
+                                                         payload=event.payload + 1))
+                return handle
+
+            await bus.subscribe('master.*', relay('agent'))
+            await bus.subscribe('agent.*', relay('master'))
+            await bus.publish(SwarmEvent(event_type='master.start', payload=0))
+            await bus.publish(SwarmEvent(event_type='agent.start', payload=0))
+            await asyncio.wait_for(self._wait_for(received, 62), timeout=5.0)
+            await bus.stop()
+            return received
+
+        received = asyncio.run(run())
+        assert received.count('master.hop') == received.count('agent.hop') == 30
+
+    @staticmethod
+    async def _wait_for(items, count):
+        import asyncio
+        while len(items) < count:
+            await asyncio.sleep(0.01)
+
+    def test_master_quorum_cancels_stragglers(self):
+        """Test that the master completes on quorum and cancels slow agents."""
+        import asyncio
+        import json
+        from abhikarta.swarm.event_bus import SwarmEventBus
+        from abhikarta.swarm.master_actor import MasterActor, MasterActorConfig
+        from abhikarta.swarm.swarm_agent import SwarmAgent, SwarmAgentConfig
+        from abhikarta.swarm.swarm_definition import AgentMembership, EventSubscription
+
+        async def run():
+            bus = SwarmEventBus('swarm-quorum')
+            await bus.start()
+            agents = []
+            for agent_id, delay in (('fast1', 0), ('fast2', 0), ('slow', 10)):
+                async def executor(event, config, delay=delay):
+                    await asyncio.sleep(delay)
+                    return {'agent': config.agent_id}
+                membership = AgentMembership(agent_id=agent_id, subscriptions=[
+                    EventSubscription(agent_id=agent_id, event_pattern='task.*')])
+                agent = SwarmAgent(SwarmAgentConfig(agent_id=agent_id), bus,
+                                   membership, agent_executor=executor)
+                await agent.start()
+                agents.append(agent)
+
+            master = MasterActor('swarm-quorum', bus,
+                                 MasterActorConfig(result_quorum=2, aggregation_timeout=5),
+                                 agent_registry={a.config.agent_id: {} for a in agents})
+
+            async def decide(system_prompt, user_prompt):
+                if '"trigger.http"' not in user_prompt:
+                    return json.dumps({'decision_type': 'no_action'})
+                return json.dumps({'decision_type': 'broadcast', 'event_type': 'task.search'})
+            master._call_llm = decide
+            await master.start()
+            result = await master.handle_external_trigger('http', {'q': 'x'})
+            await asyncio.sleep(0.1)
+            slow_metrics = agents[2]._metrics
+            await bus.stop()
+            return result, master.get_metrics(), slow_metrics
+
+        result, metrics, slow_metrics = asyncio.run(run())
+        assert result['status'] == 'success'
+        assert result['responders'] == ['fast1', 'fast2']
+        assert result['duration'] < 2
+        assert metrics['quorum_completions'] == 1
+        assert metrics['stragglers_cancelled'] == 1
+        assert metrics['pending_tasks'] == 0
+        assert slow_metrics['tasks_cancelled'] == 1
+
+
+class TestMCPWebSocketClient:
+    """Test JSON-RPC multiplexing over one MCP WebSocket."""
+
+    @staticmethod
+    def _client(handle, reconnect_backoff_seconds=0.01):
+        """Client whose connections are fake sockets served by ``handle(sock, msg)``."""
+        import json
+        import queue
+        pytest.importorskip('requests')
+        from abhikarta.mcp.client import WebSocketMCPClient
+        from abhikarta.mcp.server import MCPServerConfig
+
+        class FakeSocket:
+            def __init__(self):
+                self.connected = True
+                self.inbox = queue.Queue()
+                self.sent = []
+
+            def send(self, payload):
+                message = json.loads(payload)
+                self.sent.append(message)
+                if message['method'] == 'initialize':
+                    self.reply(message['id'], {'serverInfo': {'name': 'fake'}})
+                elif 'id' in message:
+                    handle(self, message)
+
+            def reply(self, msg_id, result):
+                self.inbox.put(json.dumps({'jsonrpc': '2.0', 'id': msg_id, 'result': result}))
+
+            def recv(self):
+                frame = self.inbox.get()
+                if frame is None:
+                    self.connected = False
+                    raise ConnectionError('dropped')
+                return frame
+
+            def abort(self):
+                self.inbox.put(None)
+
+            def close(self):
+                self.inbox.put(None)
+
+        client = WebSocketMCPClient(MCPServerConfig(server_id='s1', name='fake', timeout_seconds=2),
+                                    reconnect_backoff_seconds=reconnect_backoff_seconds)
+        client.sockets = []
+
+        def create_connection():
+            sock = FakeSocket()
+            client.sockets.append(sock)
+            return sock
+
+        client._create_connection = create_connection
+        return client
+
+    def test_responses_routed_by_id(self):
+        """Test that out-of-order responses reach the caller that sent each request."""
+        import threading
+        waiting = []
+        all_sent = threading.Event()
+
+        def hold(sock, message):
+            waiting.append((sock, message))
+            if len(waiting) == 3:
+                all_sent.set()
+
+        client = self._client(hold)
+        results = {}
+        threads = [threading.Thread(target=lambda n=n: results.__setitem__(
+            n, client.call_tool('echo', {'n': n}))) for n in range(3)]
+        for t in threads:
+            t.start()
+        assert all_sent.wait(2)
+        for sock, message in reversed(waiting):
+            sock.reply(message['id'], {'n': message['params']['arguments']['n']})
+        for t in threads:
+            t.join(2)
+        assert {n: r['result']['n'] for n, r in results.items()} == {0: 0, 1: 1, 2: 2}
+        assert client.server_info == {'serverInfo': {'name': 'fake'}}
+        assert client.get_stats()['in_flight'] == 0
+        client.disconnect()
+
+    def test_timeout_removes_pending_request(self):
+        """Test that a timed-out request is dropped and its late reply ignored."""
+        held = []
+        client = self._client(lambda sock, message: held.append((sock, message)))
+        result = client.call_tool('slow', {}, timeout=0.05)
+        assert not result['success'] and 'timed out' in result['error']
+        stats = client.get_stats()
+        assert (stats['timeouts'], stats['in_flight']) == (1, 0)
+        sock, message = held[0]
+        sock.reply(message['id'], {})
+        assert client.call_tool('slow', {}, timeout=0.05)['success'] is False
+        assert client.get_stats()['notifications'] >= 1
+        client.disconnect()
+
+    def test_reconnect_reinitializes_and_replays(self):
+        """Test that a dropped connection re-runs initialize before replaying requests."""
+        import threading
+
+        def serve(sock, message):
+            if len(client.sockets) > 1:
+                sock.reply(message['id'], {'tools': [{'name': 'echo', 'description': ''}]})
+            else:
+                sock.abort()  # drop the first connection mid-request
+
+        client = self._client(serve)
+        tools = []
+        worker = threading.Thread(target=lambda: tools.extend(client.list_tools()))
+        worker.start()
+        worker.join(2)
+        first, second = client.sockets
+        assert [m['method'] for m in first.sent] == [
+            'initialize', 'notifications/initialized', 'tools/list']
+        assert [m['method'] for m in second.sent] == [
+            'initialize', 'notifications/initialized', 'tools/list']
+        assert [t.name for t in tools] == ['echo']
+        assert client.get_stats()['reconnects'] == 1
+        client.disconnect()
+
+
+class TestMCPHTTPPool:
+    """Test pooled HTTP sessions for MCP tool calls."""
+
+    @staticmethod
+    def _server(delay=0.0):
+        """Local keep-alive server recording client ports and peak concurrency."""
+        import json
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        state = {'ports': set(), 'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                with lock:
+                    state['ports'].add(self.client_address[1])
+                    state['active'] += 1
+                    state['peak'] = max(state['peak'], state['active'])
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                time.sleep(delay)
+                data = json.dumps({'echo': json.loads(body),
+                                   'auth': self.headers.get('Authorization')}).encode('utf-8')
+                with lock:
+                    state['active'] -= 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_tool_calls_reuse_connection(self):
+        """Test that calls share one connection and the manager shares one pool per server."""
+        pytest.importorskip('requests')
+        from abhikarta.mcp.manager import MCPServerManager
+
+        server, state, base_url = self._server()
+        manager = MCPServerManager.get_instance()
+        try:
+            pool = manager.get_http_pool(base_url + '/', {'Authorization': 'Bearer t'})
+            assert manager.get_http_pool(base_url, {'Authorization': 'Bearer t'}) is pool
+            assert manager.get_http_pool(base_url, {'Authorization': 'Bearer u'}) is not pool
+            for i in range(3):
+                response = pool.post_json('/api/tools/call', {'n': i})
+                assert response.json() == {'echo': {'n': i}, 'auth': 'Bearer t'}
+            assert len(state['ports']) == 1
+            assert pool.get_stats()['requests'] == 3
+        finally:
+            manager.close_http_pools(base_url)
+            server.shutdown()
+
+    def test_connections_capped_per_server(self):
+        """Test that concurrent calls wait for one of max_connections connections."""
+        pytest.importorskip('requests')
+        from concurrent.futures import ThreadPoolExecutor
+        from abhikarta.mcp.http_pool import MCPHTTPPool
+
+        server, state, base_url = self._server(delay=0.1)
+        pool = MCPHTTPPool(base_url, max_connections=2)
+        try:
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                responses = list(executor.map(
+                    lambda i: pool.post_json('/call', {'n': i}), range(6)))
+            assert [r.json()['echo']['n'] for r in responses] == list(range(6))
+            assert state['peak'] == 2
+            assert len(state['ports']) == 2
+        finally:
+            pool.close()
+            server.shutdown()
+
+    def test_close_drops_pooled_connections(self):
+        """Test that closing a server's pools forces fresh connections."""
+        pytest.importorskip('requests')
+        from abhikarta.mcp.manager import MCPServerManager
+
+        server, state, base_url = self._server()
+        manager = MCPServerManager.get_instance()
+        try:
+            pool = manager.get_http_pool(base_url)
+            pool.post_json('/call', {})
+            assert manager.close_http_pools(base_url) == 1
+            assert manager.close_http_pools(base_url) == 0
+            fresh = manager.get_http_pool(base_url)
+            assert fresh is not pool
+            fresh.post_json('/call', {})
+            pool.post_json('/call', {})  # a closed pool reconnects rather than reusing
+            assert len(state['ports']) == 3
+        finally:
+            manager.close_http_pools(base_url)
+            server.shutdown()
+
+
+class TestHTTPTransport:
+    """Test the keep-alive transport used by LLM providers."""
+
+    def test_connection_reuse(self):
+        """Test that sequential requests to one host share a connection."""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from abhikarta.llm_provider.http_transport import HTTPTransport
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                data = json.dumps({'echo': json.loads(body)}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transport = HTTPTransport(max_connections_per_host=2)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/chat"
+            for i in range(3):
+                assert transport.post_json(url, {'n': i}) == {'echo': {'n': i}}
+            host = transport.get_stats()['hosts'][0]
+            assert host['created'] == 1
+            assert host['reused'] == 2
+        finally:
+            transport.close()
+            server.shutdown()
+
+    def test_written_post_not_retried(self):
+        """Test that a POST the server may have seen is not resent on a stale connection."""
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from abhikarta.llm_provider.http_transport import HTTPTransport
+
+        seen = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def handle_request(self):
+                seen.append((self.command, self.path))
+                if self.path == '/drop':
+                    self.close_connection = True  # read it, then hang up without replying
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+                if self.path == '/hangup':
+                    self.close_connection = True  # close while the client keeps it idle
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                self.handle_request()
+
+            do_GET = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transport = HTTPTransport(max_connections_per_host=1)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            transport.request('POST', f"{base}/ok", b'{}')
+            with pytest.raises(Exception):
+                transport.request('POST', f"{base}/drop", b'{}')
+            assert seen.count(('POST', '/drop')) == 1
+
+            transport.request('GET', f"{base}/ok")
+            with pytest.raises(Exception):
+                transport.request('GET', f"{base}/drop")
+            assert seen.count(('GET', '/drop')) == 2  # idempotent: retried once
+
+            # A connection the server closed while idle is dropped before sending
+            transport.request('POST', f"{base}/hangup", b'{}')
+            time.sleep(0.05)
+            assert transport.request('POST', f"{base}/ok", b'{}') == b'ok'
+        finally:
+            transport.close()
+            server.shutdown()
+
+
+class TestRateLimiter:
+    """Test provider rate limiting."""
+
+    def test_priority_lanes_and_token_settlement(self):
+        """Test that interactive calls preempt background ones and settle frees tokens."""
+        import threading
+        import time
+        from abhikarta.llm_provider.rate_limiter import ProviderRateLimiter
+
+        limiter = ProviderRateLimiter('test', rpm=300, tpm=200, burst_seconds=0)
+        lease = limiter.acquire(tokens=150)
+        lease.settle(10)
+        assert limiter.get_stats()['window_tokens'] == 10
+
+        order = []
+
+        def call(priority, delay):
+            time.sleep(delay)
+            limiter.acquire(tokens=50, priority=priority)
+            order.append(priority)
+
+        threads = [threading.Thread(target=call, args=('background', 0)),
+                   threading.Thread(target=call, args=('interactive', 0.05))]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 300 rpm spaces requests 0.2s apart; the later interactive call goes first
+        assert order == ['interactive', 'background']
+        assert time.monotonic() - start >= 0.35
+        assert limiter.get_stats()['throttled'] == 2
+
+        # A failed call gives its reserved tokens back
+        tokens = limiter.get_stats()['window_tokens']
+        limiter.acquire(tokens=40).refund()
+        assert limiter.get_stats()['window_tokens'] == tokens
+
+    def test_registry_reload_applies_provider_edits(self, tmp_path):
+        """Test that reloading picks up edited, new and removed provider limits."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.rate_limiter import RateLimiterRegistry
+
+        handler = SQLiteHandler(str(tmp_path / 'limits.db'))
+        handler.execute("""CREATE TABLE llm_providers (provider_id TEXT, provider_type TEXT,
+            rate_limit_rpm INTEGER, rate_limit_tpm INTEGER, is_active INTEGER)""")
+        handler.execute("INSERT INTO llm_providers VALUES ('p1', 'openai', 60, 1000, 1)")
+        registry = RateLimiterRegistry()
+        limiter = registry.get_limiter('openai', handler)
+        assert (limiter.rpm, limiter.tpm) == (60, 1000)
+
+        handler.execute("UPDATE llm_providers SET rate_limit_rpm = 30 WHERE provider_id = 'p1'")
+        handler.execute("INSERT INTO llm_providers VALUES ('p2', 'anthropic', 10, 0, 1)")
+        registry.load_from_db(handler)
+        assert registry.get_limiter('openai', handler) is limiter and limiter.rpm == 30
+        assert registry.get_limiter('anthropic', handler).rpm == 10
+
+        handler.execute("DELETE FROM llm_providers WHERE provider_id = 'p1'")
+        registry.load_from_db(handler)
+        assert registry.get_limiter('openai', handler) is None
+
+    def test_config_llm_nodes_limited_when_limits_arrive_later(self, monkeypatch):
+        """Test that direct-config clients are limited, with limits looked up per call."""
+        pytest.importorskip('langchain_core')
+        from abhikarta.langchain import llm_factory
+        from abhikarta.langchain.workflow_graph import LangGraphNodeFactory
+        from abhikarta.llm_provider import rate_limiter
+
+        class FakeChatModel:
+            callbacks = None
+            max_tokens = 10
+
+        monkeypatch.setattr(rate_limiter, '_registry', None)
+        monkeypatch.setattr(llm_factory, '_client_pool', None)
+        monkeypatch.setattr(LangGraphNodeFactory, '_build_llm', lambda self, *args: FakeChatModel())
+        llm = LangGraphNodeFactory(None)._create_llm_from_config('RateTest', 'm1')
+        handler = next(h for h in llm.callbacks
+                       if isinstance(h, llm_factory.RateLimitCallbackHandler))
+
+        handler.on_llm_start({}, ['x' * 40], run_id='before')  # no limits configured yet
+        limiter = rate_limiter.get_rate_limiter_registry().configure('ratetest', rpm=600, tpm=10000)
+        assert LangGraphNodeFactory(None)._create_llm_from_config('RateTest', 'm1') is llm
+        handler.on_llm_start({}, ['x' * 40], run_id='after')
+        assert limiter.get_stats()['admitted'] == 1
+        assert limiter.get_stats()['window_tokens'] == 40 // 4 + 10
+
+    def test_priority_lane_survives_async_dispatch(self):
+        """Test that run_async carries the caller's priority lane to the worker."""
+        import asyncio
+        from abhikarta.llm_provider.http_transport import HTTPTransport
+        from abhikarta.llm_provider.rate_limiter import get_llm_priority, llm_priority
+
+        transport = HTTPTransport(async_workers=1)
+
+        async def lanes():
+            with llm_priority('background'):
+                background = await transport.run_async(get_llm_priority)
+            return background, await transport.run_async(get_llm_priority)
+
+        try:
+            assert asyncio.run(lanes()) == ('background', 'normal')
+        finally:
+            transport.close()
+
+
+class TestLLMResponseCache:
+    """Test the LLM completion cache."""
+
+    def test_repeated_prompt_served_from_cache(self, tmp_path):
+        """Test that hits skip the provider and are logged at zero cost."""
+        import json
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.llm_call_logger import flush_llm_call_log_writers
+        from abhikarta.llm_provider.llm_facade import BaseLLMProvider, LLMFacade, LLMResponse
+        from abhikarta.llm_provider.response_cache import (
+            LLMResponseCache, init_llm_response_cache
+        )
+
+        class CountingProvider(BaseLLMProvider):
+            calls = 0
+
+            def get_provider_name(self):
+                return 'ollama'
+
+            def complete(self, messages, **kwargs):
+                CountingProvider.calls += 1
+                return LLMResponse(content='4', model='llama3', provider='ollama',
+                                   input_tokens=10, output_tokens=1, total_tokens=11)
+
+        handler = SQLiteHandler(str(tmp_path / 'calls.db'))
+        handler.init_schema()
+        disk_path = str(tmp_path / 'llm_cache.db')
+        init_llm_response_cache(enabled=True, disk_path=disk_path)
+        try:
+            facade = LLMFacade(handler)
+            facade.providers['ollama'] = CountingProvider()
+            question = [{'role': 'system', 'content': 'Be brief.'},
+                        {'role': 'user', 'content': 'What is 2+2? '}]
+            same_question = [{'role': 'system', 'content': 'Be brief.'},
+                             ('human', 'What is 2+2?')]
+            for messages in (question, question, same_question):
+                response = facade.complete(messages, model='llama3', temperature=0)
+                assert response.content == '4'
+            facade.complete(question, model='llama3', temperature=0.7)
+            assert CountingProvider.calls == 2
+
+            # The SQLite tier answers for a fresh process-level cache
+            assert LLMResponseCache(enabled=True, disk_path=disk_path).get(
+                LLMResponseCache.make_key('ollama', 'llama3', question, 0, max_tokens=None)
+            )['total_tokens'] == 11
+
+            flush_llm_call_log_writers()
+            rows = handler.fetch_all("SELECT total_tokens, cost_estimate, metadata FROM llm_calls")
+            hits = [r for r in rows if json.loads(r['metadata']).get('cache_hit')]
+            assert len(rows) == 4 and len(hits) == 2
+            assert all(r['total_tokens'] == 0 and r['cost_estimate'] == 0 for r in hits)
+        finally:
+            init_llm_response_cache()
+
+    def test_key_covers_generation_settings(self):
+        """Test that generation kwargs and bound tools split keys and hits cost nothing."""
+        from abhikarta.langchain.workflow_graph import LangGraphNodeFactory
+        from abhikarta.llm_provider.llm_facade import BaseLLMProvider, LLMFacade, LLMResponse
+        from abhikarta.llm_provider.response_cache import init_llm_response_cache
+
+        class EchoProvider(BaseLLMProvider):
+            calls = []
+
+            def get_provider_name(self):
+                return 'echo'
+
+            def complete(self, messages, **kwargs):
+                EchoProvider.calls.append(kwargs)
+                return LLMResponse(content='ok', model='llama3', provider='echo',
+                                   input_tokens=5, output_tokens=1, total_tokens=6)
+
+        init_llm_response_cache(enabled=True)
+        try:
+            facade = LLMFacade()
+            facade.providers['echo'] = EchoProvider()
+            question = [{'role': 'user', 'content': 'hi'}]
+            for settings in ({}, {'stop': ['\n']}, {'top_p': 0.5}, {'seed': 7},
+                             {'response_format': {'type': 'json_object'}}, {'stop': ['\n']}):
+                facade.complete(question, 'echo', 'llama3', temperature=0, **settings)
+            assert len(EchoProvider.calls) == 5
+            hit = facade.complete(question, 'echo', 'llama3', temperature=0, seed=7)
+            assert hit.cached and (hit.input_tokens, hit.total_tokens) == (0, 0)
+        finally:
+            init_llm_response_cache()
+
+        class Binding:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                self.bound = None
+
+        with_tools = LangGraphNodeFactory._bound_llm_params(Binding(tools=[{'name': 'search'}]))
+        assert with_tools == {'tools': [{'name': 'search'}]}
+        assert LangGraphNodeFactory._bound_llm_params(object()) == {}
+
+    def test_disk_tier_trimmed_periodically(self, tmp_path):
+        """Test that the SQLite tier is indexed and trimmed every few writes."""
+        from abhikarta.llm_provider.response_cache import LLMResponseCache
+        cache = LLMResponseCache(enabled=True, disk_path=str(tmp_path / 'c.db'),
+                                 disk_max_entries=5)
+        cache.DISK_TRIM_INTERVAL = 10
+        indexes = cache._disk.execute("PRAGMA index_list(llm_response_cache)").fetchall()
+        assert 'idx_llm_response_cache_expires' in [row[1] for row in indexes]
+
+        def rows():
+            return cache._disk.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+
+        for i in range(9):
+            cache.put(f'k{i}', {'i': i}, ttl_seconds=100 + i)
+        assert rows() == 9  # under the interval: no trim yet
+        cache.put('k9', {'i': 9}, ttl_seconds=109)
+        assert rows() == 5
+        # The entries expiring last survive
+        assert cache._disk_get('k9', 0) == {'i': 9} and cache._disk_get('k0', 0) is None
+        cache.close()
+
+
+class TestAgentJobs:
+    """Test background agent execution jobs."""
+
+    def test_jobs_run_bounded_and_stream_events(self, tmp_path):
+        """Test the worker bound, queue limit and event stream of agent jobs."""
+        import threading
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.services.agent_jobs import AgentJobManager, AgentJobQueueFull
+
+        handler = SQLiteHandler(str(tmp_path / 'jobs.db'))
+        handler.init_schema()
+        release = threading.Event()
+        running = []
+
+        def runner(job):
+            running.append(job.execution_id)
+            job.publish('step', {'tool': 'search'})
+            release.wait(5)
+            return {'status': 'completed', 'output': f"done {job.input_data}"}
+
+        manager = AgentJobManager(handler, max_concurrent=2, max_queued=1, runner=runner)
+        jobs = []
+        for i in range(3):
+            handler.execute("INSERT INTO executions (execution_id, agent_id, user_id, status) VALUES (?, ?, ?, ?)",
+                            (f'exec_{i}', 'agent', 'tester', 'queued'))
+            jobs.append(manager.submit('agent', i, f'exec_{i}'))
+        with pytest.raises(AgentJobQueueFull):
+            manager.submit('agent', 3, 'exec_3')
+
+        events = jobs[0].wait_events(after=0, timeout=2)
+        while not any(e['event'] == 'step' for e in events):
+            events += jobs[0].wait_events(after=events[-1]['id'], timeout=2)
+        assert manager.get_stats()['running'] == 2
+        assert manager.get_stats()['queued'] == 1
+
+        release.set()
+        seen = [e['event'] for e in events]
+        while not jobs[0].done or len(seen) < 4:
+            more = jobs[0].wait_events(after=len(seen), timeout=2)
+            seen += [e['event'] for e in more]
+        assert seen == ['status', 'status', 'step', 'completed']
+        for job in jobs:
+            while not job.done:
+                job.wait_events(after=10 ** 6, timeout=0.05)
+        assert sorted(running) == ['exec_0', 'exec_1', 'exec_2']
+        row = handler.fetch_one("SELECT status, output_data FROM executions WHERE execution_id = 'exec_2'")
+        assert row['status'] == 'completed' and row['output_data'] == 'done 2'
+        manager.shutdown(wait=True)
+
+
+class TestLLMClientPool:
+    """Test invalidation of pooled LangChain clients."""
+
+    def test_provider_edit_and_delete_invalidate_clients(self, tmp_path):
+        """Test that edited and deleted providers drop the clients tagged with their type."""
+        admin_routes = pytest.importorskip('abhikarta_web.routes.admin_routes')
+        from abhikarta.database.delegates.llm_delegate import LLMDelegate
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.langchain.llm_factory import init_llm_client_pool
+
+        handler = SQLiteHandler(str(tmp_path / 'providers.db'))
+        handler.execute("CREATE TABLE llm_providers (provider_id TEXT, provider_type TEXT)")
+        handler.execute("INSERT INTO llm_providers VALUES ('p1', 'openai')")
+        handler.llm = LLMDelegate(handler)
+        routes = admin_routes.AdminRoutes.__new__(admin_routes.AdminRoutes)
+        routes.db_facade = handler
+        pool = init_llm_client_pool()
+
+        def pooled():
+            # Clients built from direct node config carry only the provider type
+            return pool.get_or_create('openai', 'gpt-4o', factory=object)
+
+        client = pooled()
+        assert pooled() is client
+        routes._invalidate_llm_clients('p1', handler.llm.get_provider('p1'))  # edit
+        assert pooled() is not client
+
+        # Delete: the row is read before it is removed
+        client = pooled()
+        provider = handler.llm.get_provider('p1')
+        handler.llm.delete_provider('p1')
+        routes._invalidate_llm_clients('p1')
+        assert pooled() is client  # nothing left to look the type up by
+        routes._invalidate_llm_clients('p1', provider)
+        assert pooled() is not client
+        init_llm_client_pool()
+
+
+class TestAgentExecutorCache:
+    """Test reuse of built LangChain agents."""
+
+    def test_built_agent_reused_until_invalidated(self, tmp_path, monkeypatch):
+        """Test that agents are built once per config version."""
+        monkeypatch.chdir(tmp_path)
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.langchain.agents import (
+            AgentExecutor, init_agent_executor_cache, invalidate_agent_executor
+        )
+
+        handler = SQLiteHandler(str(tmp_path / 'agents.db'))
+        handler.init_schema()
+        handler.execute("PRAGMA foreign_keys = OFF")
+        handler.execute(
+            "INSERT INTO agents (agent_id, name, agent_type, config, created_by) VALUES (?, ?, ?, ?, ?)",
+            ('agent_1', 'Echo', 'conversational', '{"system_prompt": "be brief"}', 'tester'))
+        cache = init_agent_executor_cache(max_size=8)
+        builds = []
+
+        class EchoRunnable:
+            def invoke(self, inputs, config=None):
+                history = len(inputs.get('chat_history') or [])
+                return {'output': f"{inputs['input']} ({history})", 'intermediate_steps': []}
+
+        class CountingExecutor(AgentExecutor):
+            def _build_agent(self, agent_id, agent_config):
+                builds.append(agent_config['system_prompt'])
+                return EchoRunnable()
+
+        executor = CountingExecutor(handler)
+        first = executor.execute_agent('agent_1', 'hi')
+        second = executor.execute_agent('agent_1', 'again', chat_history=['hi', 'hi (0)'])
+        assert first.output == 'hi (0)' and second.output == 'again (2)'
+        assert builds == ['be brief']
+        assert cache.get_stats()['hits'] == 1
+
+        handler.execute("UPDATE agents SET config = ? WHERE agent_id = ?",
+                        ('{"system_prompt": "be verbose"}', 'agent_1'))
+        invalidate_agent_executor('agent_1')
+        executor.execute_agent('agent_1', 'hi')
+        assert builds == ['be brief', 'be verbose']
+        init_agent_executor_cache()
+
+
+class TestConversationMemory:
+    """Test per-message conversation storage."""
+
+    def test_append_window_and_legacy_migration(self, tmp_path):
+        """Test windowed loading and migration of legacy message blobs."""
+        import json
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        handler = SQLiteHandler(str(tmp_path / 'conv.db'))
+        handler.execute("""CREATE TABLE conversations (
+            conversation_id TEXT PRIMARY KEY, entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL, user_id TEXT NOT NULL, title TEXT,
+            messages_json TEXT DEFAULT '[]', metadata_json TEXT DEFAULT '{}',
+            created_at TIMESTAMP, updated_at TIMESTAMP)""")
+        legacy = [{'role': 'human', 'content': f'old {i}'} for i in range(3)]
+        handler.execute(
+            "INSERT INTO conversations (conversation_id, entity_type, entity_id, user_id, messages_json) "
+            "VALUES (?, ?, ?, ?, ?)", ('conv_legacy', 'agent', 'a1', 'u1', json.dumps(legacy)))
+
+        manager = ConversationMemoryManager(handler, max_cached=1, window_size=5)
+        assert manager.get_chat_history('conv_legacy') == [('human', f'old {i}') for i in range(3)]
+        row = handler.fetch_one("SELECT messages_json, message_count FROM conversations "
+                                "WHERE conversation_id = 'conv_legacy'")
+        assert row['messages_json'] == '[]' and row['message_count'] == 3
+
+        conversation = manager.create_conversation('agent', 'a1', 'u1')
+        conv_id = conversation.conversation_id
+        for i in range(30):
+            manager.add_message(conv_id, 'human' if i % 2 == 0 else 'assistant', f'msg {i}')
+        assert len(conversation.messages) <= 10 and conversation.message_count == 30
+
+        # Evict, then reload windowed from the message table
+        manager.get_conversation('conv_legacy')
+        cold = manager.get_or_create_conversation('agent', 'a1', 'u1', conv_id)
+        assert cold is not conversation
+        assert len(cold.messages) == 5 and cold.message_count == 30
+        assert manager.get_chat_history(conv_id, max_messages=8)[0] == ('human', 'msg 22')
+        # 'msg N' is 2 tokens plus 4 per-message overhead
+        window = manager.get_context_window(conv_id, max_tokens=60)
+        assert [m.content for m in window] == [f'msg {i}' for i in range(20, 30)]
+        assert len(manager.get_conversation(conv_id, max_messages=1).messages) >= 10
+        listed = manager.get_conversations_for_entity('agent', 'a1')
+        assert sorted(c.message_count for c in listed) == [3, 30]
+
+
+    def test_append_allocates_seq_in_database(self, tmp_path):
+        """Test that concurrent writers and failed writes do not lose messages."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        handler = SQLiteHandler(str(tmp_path / 'conv.db'))
+        first = ConversationMemoryManager(handler, window_size=5)
+        second = ConversationMemoryManager(handler, window_size=5)  # Another worker
+        conv_id = first.create_conversation('agent', 'a1', 'u1').conversation_id
+        assert first.add_message(conv_id, 'human', 'one')
+        assert second.add_message(conv_id, 'assistant', 'two')
+        assert first.add_message(conv_id, 'human', 'three')
+        rows = handler.fetch_all("SELECT seq, content FROM conversation_messages "
+                                 "WHERE conversation_id = ? ORDER BY seq", (conv_id,))
+        assert [(r['seq'], r['content']) for r in rows] == [(0, 'one'), (1, 'two'), (2, 'three')]
+        assert [m.content for m in first.get_conversation(conv_id).messages] == ['one', 'two', 'three']
+
+        handler.execute("DROP TABLE conversation_messages")
+        assert first.add_message(conv_id, 'human', 'lost') is False
+        assert first.get_conversation(conv_id).message_count == 3
+
+
+class TestTokenizer:
+    """Test token counting, model limits and rolling summaries."""
+
+    def test_token_budget_and_rolling_summary(self, tmp_path):
+        """Test heuristic counts, llm_models limits and background summarization."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.tokenizer import (
+            HeuristicTokenizer, ModelContextLimits, register_tokenizer, get_tokenizer
+        )
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        tokenizer = HeuristicTokenizer()
+        assert tokenizer.count('') == 0
+        assert tokenizer.count('Hello, world! How are you doing today?') == 10
+        assert tokenizer.count('internationalization') > tokenizer.count('cat')
+        assert tokenizer.count_messages([('human', 'hi'), ('ai', 'hello')]) == 13
+        register_tokenizer('test-model', tokenizer)
+        assert get_tokenizer('TEST-MODEL-large') is tokenizer
+
+        handler = SQLiteHandler(str(tmp_path / 'tok.db'))
+        handler.execute("""CREATE TABLE llm_models (model_id TEXT, name TEXT,
+            context_window INTEGER, max_output_tokens INTEGER, is_active INTEGER)""")
+        handler.execute("INSERT INTO llm_models VALUES ('m1', 'tiny-model', 1000, 200, 1)")
+        limits = ModelContextLimits(handler, default_context=4096, default_output=1024)
+        assert limits.get('Tiny-Model') == (1000, 200)
+        assert limits.prompt_budget('m1', reserve_tokens=100) == 700
+        assert limits.get('unknown') == (4096, 1024)
+
+        calls = []
+
+        def summarizer(previous, messages):
+            calls.append([m.content for m in messages])
+            return f"{previous or ''}|{len(messages)} turns".lstrip('|')
+
+        manager = ConversationMemoryManager(handler, window_size=20, tokenizer=tokenizer,
+                                            summarizer=summarizer,
+                                            summary_threshold_tokens=40,
+                                            summary_keep_recent=4)
+        conv_id = manager.create_conversation('agent', 'a1', 'u1').conversation_id
+        for i in range(12):
+            manager.add_message(conv_id, 'human', f'message number {i}')
+        manager._summary_executor.shutdown(wait=True)
+
+        summary = manager.get_conversation(conv_id).metadata['summary']
+        assert calls and summary['through_seq'] == sum(len(c) for c in calls) - 1
+        window = manager.get_context_window(conv_id, max_tokens=1000)
+        assert window[0].role == 'system' and window[0].metadata['summary']
+        assert window[1].content == f"message number {summary['through_seq'] + 1}"
+        assert window[-1].content == 'message number 11'
+        stored = handler.fetch_one("SELECT token_count FROM conversation_messages "
+                                   "WHERE conversation_id = ? AND seq = 0", (conv_id,))
+        assert stored['token_count'] == tokenizer.count('message number 0')
+
+    def test_unsummarized_tokens_kept_out_of_metadata(self, tmp_path):
+        """Test that the summary trigger counter is stored apart from conversation metadata."""
+        import json
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.tokenizer import HeuristicTokenizer
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        tokenizer = HeuristicTokenizer()
+        handler = SQLiteHandler(str(tmp_path / 'counter.db'))
+        manager = ConversationMemoryManager(handler, tokenizer=tokenizer)
+        conv_id = manager.create_conversation('agent', 'a1', 'u1').conversation_id
+        for i in range(3):
+            manager.add_message(conv_id, 'human', f'message number {i}')
+        expected = sum(tokenizer.count(f'message number {i}') for i in range(3))
+
+        conversation = manager.get_conversation(conv_id)
+        assert conversation.unsummarized_tokens == expected
+        assert 'unsummarized_tokens' not in conversation.to_dict()['metadata']
+        row = handler.fetch_one("SELECT metadata_json FROM conversations "
+                                "WHERE conversation_id = ?", (conv_id,))
+        assert 'unsummarized_tokens' not in json.loads(row['metadata_json'])
+
+        reloaded = ConversationMemoryManager(handler, tokenizer=tokenizer)
+        assert reloaded.get_conversation(conv_id).unsummarized_tokens == expected
+        reloaded.clear_conversation(conv_id)
+        assert ConversationMemoryManager(handler).get_conversation(conv_id).unsummarized_tokens == 0
+
+    def test_context_budget_uses_model_tokenizer(self, tmp_path):
+        """Test that a model's tokenizer prices the window without touching cached counts."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider.tokenizer import (
+            HeuristicTokenizer, TOKENS_PER_MESSAGE, register_tokenizer
+        )
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        class WideTokenizer(HeuristicTokenizer):
+            def count(self, text):
+                return 10 * super().count(text)
+
+        register_tokenizer('wide-model', WideTokenizer())
+        manager = ConversationMemoryManager(SQLiteHandler(str(tmp_path / 'wide.db')))
+        conv_id = manager.create_conversation('agent', 'a1', 'u1').conversation_id
+        for i in range(6):
+            manager.add_message(conv_id, 'human', f'message number {i}')
+        default_cost = manager.count_tokens('message number 0') + TOKENS_PER_MESSAGE
+        wide_cost = manager.count_tokens('message number 0', 'wide-model') + TOKENS_PER_MESSAGE
+        assert wide_cost > default_cost
+
+        assert len(manager.get_context_window(conv_id, max_tokens=3 * wide_cost)) == 6
+        wide = manager.get_context_window(conv_id, max_tokens=3 * wide_cost, model='wide-model')
+        assert [m.content for m in wide] == [f'message number {i}' for i in (3, 4, 5)]
+        assert wide[0].token_count == manager.count_tokens('message number 3')
+
+        reserved = manager.get_context_window(conv_id, max_tokens=None, model='wide-model',
+                                              reserve_tokens=10 ** 6)
+        assert reserved == []
+
+    def test_unknown_model_uses_configured_budget(self, tmp_path, monkeypatch):
+        """Test that models missing from llm_models get the configured default budget."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.llm_provider import tokenizer as tokenizer_module
+        from abhikarta.llm_provider.tokenizer import TOKENS_PER_MESSAGE
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        handler = SQLiteHandler(str(tmp_path / 'budget.db'))
+        handler.execute("""CREATE TABLE llm_models (model_id TEXT, name TEXT,
+            context_window INTEGER, max_output_tokens INTEGER, is_active INTEGER)""")
+        handler.execute("INSERT INTO llm_models VALUES ('m1', 'known-model', 1000, 200, 1)")
+        monkeypatch.setattr(tokenizer_module, '_model_limits', None)
+        manager = ConversationMemoryManager(handler)
+        manager.default_context_tokens = 3 * (manager.count_tokens('message number 0')
+                                              + TOKENS_PER_MESSAGE)
+        conv_id = manager.create_conversation('agent', 'a1', 'u1').conversation_id
+        for i in range(6):
+            manager.add_message(conv_id, 'human', f'message number {i}')
+
+        assert len(manager.get_context_window(conv_id)) == 3
+        assert len(manager.get_context_window(conv_id, model='unlisted-model')) == 3
+        assert len(manager.get_context_window(conv_id, model='known-model')) == 6
+
+    def test_workflow_chat_reports_malformed_definition(self, tmp_path):
+        """Test that a broken workflow definition returns the JSON error response."""
+        routes_module = pytest.importorskip('abhikarta_web.routes.conversation_routes')
+        from flask import Flask
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.services.conversation_memory import ConversationMemoryManager
+
+        handler = SQLiteHandler(str(tmp_path / 'chat.db'))
+        handler.execute("""CREATE TABLE workflows (workflow_id TEXT, name TEXT,
+            dag_definition TEXT, python_modules TEXT)""")
+        handler.execute("INSERT INTO workflows VALUES ('wf1', 'Broken', '{not json', '{}')")
+        app = Flask(__name__)
+        app.secret_key = 'test'
+        routes = routes_module.ConversationRoutes(app, handler)
+        routes._memory_manager = ConversationMemoryManager(handler)
+
+        response = app.test_client().post('/api/workflows/wf1/chat', json={'message': 'hi'})
+        body = response.get_json()
+        assert response.status_code == 500 and body['success'] is False
+        history = routes._memory_manager.get_chat_history(body['conversation_id'])
+        assert [role for role, _ in history] == ['human', 'assistant']
+
+
+class TestAIOrgTaskTree:
+    """Test batched AI Org task tree loading."""
+
+    def test_task_tree_loads_in_constant_queries(self, tmp_path):
+        """Test that task tree queries do not grow with the tree size."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.aiorg.db_ops import AIORGDBOps
+        from abhikarta.aiorg.models import AIOrg, AINode, AITask, AIResponse, NodeType, ResponseType
+        from abhikarta.aiorg.task_engine import TaskEngine
+
+        handler = SQLiteHandler(str(tmp_path / 'aiorg.db'))
+        db_ops = AIORGDBOps(handler)
+        org = AIOrg.create('Org', 'test', 'tester')
+        db_ops.save_org(org)
+        ceo = AINode.create(org.org_id, 'CEO', NodeType.EXECUTIVE, 'root')
+        db_ops.save_node(ceo)
+        managers = [AINode.create(org.org_id, f'Manager {i}', NodeType.MANAGER, 'mid',
+                                  parent_node_id=ceo.node_id) for i in range(3)]
+        for node in managers:
+            db_ops.save_node(node)
+
+        root = AITask.create(org.org_id, ceo.node_id, 'Root', 'root task', {})
+        db_ops.save_task(root)
+        for i, node in enumerate(managers):
+            sub = AITask.create(org.org_id, node.node_id, f'Sub {i}', 'sub', {},
+                                parent_task_id=root.task_id)
+            db_ops.save_task(sub)
+            db_ops.save_task(AITask.create(org.org_id, node.node_id, f'Leaf {i}', 'leaf', {},
+                                           parent_task_id=sub.task_id))
+            db_ops.save_response(AIResponse.create(sub.task_id, node.node_id,
+                                                   ResponseType.ANALYSIS, {'i': i}))
+
+        queries = []
+        original_fetch_all, original_fetch_one = handler.fetch_all, handler.fetch_one
+        handler.fetch_all = lambda *a, **k: queries.append(a[0]) or original_fetch_all(*a, **k)
+        handler.fetch_one = lambda *a, **k: queries.append(a[0]) or original_fetch_one(*a, **k)
+
+        tree = TaskEngine(db_ops).get_task_tree(root.task_id)
+        assert tree['assigned_to']['role_name'] == 'CEO'
+        assert sorted(st['title'] for st in tree['subtasks']) == ['Sub 0', 'Sub 1', 'Sub 2']
+        sub = tree['subtasks'][0]
+        assert sub['assigned_to']['role_name'].startswith('Manager')
+        assert len(sub['responses']) == 1 and len(sub['subtasks']) == 1
+        assert len(queries) == 3
+
+        # The node map is cached and invalidated by node writes
+        queries.clear()
+        TaskEngine(db_ops).get_task_tree(root.task_id)
+        assert len(queries) == 2
+        managers[0].role_name = 'Director'
+        db_ops.save_node(managers[0])
+        assert db_ops.get_org_node_map(org.org_id)[managers[0].node_id].role_name == 'Director'
+
+        active = TaskEngine(db_ops).get_org_active_tasks(org.org_id)
+        assert len(active) == 7
+
+    def test_tasks_by_status_limited_per_status(self, tmp_path):
+        """Test that a busy status does not crowd the others out of the limit."""
+        from abhikarta.database.sqlite_handler import SQLiteHandler
+        from abhikarta.aiorg.db_ops import AIORGDBOps
+        from abhikarta.aiorg.models import AIOrg, AINode, AITask, NodeType, TaskStatus
+
+        handler = SQLiteHandler(str(tmp_path / 'aiorg.db'))
+        db_ops = AIORGDBOps(handler)
+        org = AIOrg.create('Org', 'test', 'tester')
+        db_ops.save_org(org)
+        node = AINode.create(org.org_id, 'CEO', NodeType.EXECUTIVE, 'root')
+        db_ops.save_node(node)
+        oldest = AITask.create(org.org_id, node.node_id, 'Oldest', 'in progress', {})
+        oldest.status = TaskStatus.IN_PROGRESS
+        db_ops.save_task(oldest)
+        for i in range(5):
+            db_ops.save_task(AITask.create(org.org_id, node.node_id, f'Pending {i}', 'new', {}))
+
+        tasks = db_ops.get_org_tasks_by_status(
+            org.org_id, [TaskStatus.PENDING, TaskStatus.IN_PROGRESS], limit_per_status=2)
+        assert sorted(t.title for t in tasks) == ['Oldest', 'Pending 3', 'Pending 4']
+
+
+class TestActorScheduling:
+    """Test wake-on-enqueue actor scheduling."""
+
+    def test_tell_wakes_idle_actor_with_dispatcher_throughput(self):
+        """Test that tells are delivered in order in batches of the dispatcher throughput."""
+        import threading
+        from abhikarta.actor import Actor, ActorSystem, Props
+        from abhikarta.actor.dispatcher import DispatcherConfig
+        from abhikarta.actor.system import ActorSystemConfig
+
+        received = []
+        done = threading.Event()
+
+        class Collector(Actor):
+            def receive(self, message):
+                received.append(message)
+                if len(received) == 60:
+                    done.set()
+
+        system = ActorSystem(ActorSystemConfig(
+            name='test-wake-on-enqueue',
+            default_dispatcher=DispatcherConfig(thread_pool_size=2, throughput=3)))
+        try:
+            dispatcher = system._default_dispatcher
+            assert dispatcher.throughput == 3
+            batches = []
+            execute = dispatcher.execute
+            dispatcher.execute = lambda task: batches.append(task) or execute(task)
+
+            ref = system.actor_of(Props(Collector), 'collector')
+            for i in range(60):
+                ref.tell(i)
+            assert done.wait(5)
+            assert received == list(range(60))
+            assert len(batches) >= 20
+        finally:
+            system.terminate()
+
+    def test_ask_completes_without_temporary_actors(self):
+        """Test that ask replies and timeouts resolve through reply refs."""
+        from abhikarta.actor import Actor, ActorSystem, Props
+        from abhikarta.actor.system import ActorSystemConfig
+
+        class Echo(Actor):
+            def receive(self, message):
+                if message != 'ignore':
+                    self.sender.tell(f"echo:{message}")
+
+        system = ActorSystem(ActorSystemConfig(name='test-lightweight-ask'))
+        try:
+            echo = system.actor_of(Props(Echo), 'echo')
+            futures = [echo.ask(i, timeout=5) for i in range(100)]
+            assert [f.result(timeout=5) for f in futures] == [f"echo:{i}" for i in range(100)]
+            assert system.get_actor_count() == 1
+            assert system.pending_ask_count == 0
+
+            with pytest.raises(TimeoutError):
+                echo.ask('ignore', timeout=0.05).result(timeout=2)
+            assert system.pending_ask_count == 0
+
+            pending = echo.ask('ignore', timeout=30)
+        finally:
+            system.terminate()
+        with pytest.raises(RuntimeError):
+            pending.result(timeout=1)
+
+    def test_timing_wheel_scheduler(self):
+        """Test timing wheel expiry, cancellation, cascading and ask timeouts."""
+        from abhikarta.actor import Actor, ActorSystem, Props, TimingWheelScheduler
+        from abhikarta.actor.system import ActorSystemConfig
+
+        class Inbox:
+            def __init__(self):
+                self.messages = []
+
+            def tell(self, message, sender=None):
+                self.messages.append(message)
+
+        # Driven by hand with a fake clock; the tiny wheel makes the timer
+        # due at tick 20 cascade down from a higher level
+        now = [0]
+        scheduler = TimingWheelScheduler(tick_duration=1, wheel_size=4, levels=3,
+                                         clock=lambda: now[0])
+        inbox = Inbox()
+        scheduler.schedule_once(20, inbox, 'late')
+        scheduler.schedule_once(2, inbox, 'early')
+        cancelled = scheduler.schedule_once(5, inbox, 'cancelled')
+        ticker = scheduler.schedule_repeatedly(1, 2, inbox, 'tick')
+        assert cancelled.cancel()
+        assert scheduler.pending_count == 3
+        delivered_at = {}
+        for now[0] in range(1, 36):
+            scheduler._expire_due()
+            for message in inbox.messages:
+                delivered_at.setdefault(message, now[0])
+        ticker.cancel()
+        assert 'cancelled' not in inbox.messages
+        assert (delivered_at['early'], delivered_at['late']) == (2, 20)
+        assert inbox.messages.count('tick') == 18  # ticks 1, 3, ..., 35
+        assert scheduler.pending_count == 0
+
+        class Silent(Actor):
+            def receive(self, message):
+                pass
+
+        system = ActorSystem(ActorSystemConfig(name='test-wheel', scheduler_type='timing-wheel'))
+        try:
+            assert isinstance(system.scheduler, TimingWheelScheduler)
+            silent = system.actor_of(Props(Silent), 'silent')
+            with pytest.raises(TimeoutError):
+                silent.ask('hello', timeout=0.05).result(timeout=2)
+            assert system.pending_ask_count == 0
+        finally:
+            system.terminate()
+
+    def test_fork_join_dispatcher_steals_and_parks(self):
+        """Test that fork-join workers share work and park when idle."""
+        import threading
+        import time
+        from abhikarta.actor import Actor, ActorSystem, Props
+        from abhikarta.actor.dispatcher import DispatcherConfig
+        from abhikarta.actor.system import ActorSystemConfig
+
+        received = []
+        lock = threading.Lock()
+        done = threading.Event()
+
+        class Worker(Actor):
+            def receive(self, message):
+                with lock:
+                    received.append(message)
+                    if len(received) == 400:
+                        done.set()
+
+        system = ActorSystem(ActorSystemConfig(name='test-fork-join'))
+        try:
+            config = DispatcherConfig(dispatcher_type='fork-join', thread_pool_size=4)
+            workers = [system.actor_of(Props(Worker, dispatcher_config=config), f"w{i}")
+                       for i in range(8)]
+            for i in range(400):
+                workers[i % 8].tell(i)
+            assert done.wait(timeout=5)
+            assert sorted(received) == list(range(400))
+
+            time.sleep(0.1)
+            stats = system.get_stats()['dispatchers']
+            assert len(stats) == 2  # Actors with the same config share one pool
+            fork_join = next(s for s in stats.values() if s['type'] == 'ForkJoinDispatcher')
+            assert fork_join['queued'] == 0
+            assert fork_join['executed'] >= 8
+            assert fork_join['parks'] > 0
+            assert fork_join['parked_workers'] == 4
+        finally:
+            system.terminate()
+
+
+class TestActorRouting:
+    """Test consistent-hash and load-aware routing logics."""
+
+    def test_hash_ring_and_load_aware_logics(self):
+        """Test ring lookup, rebuilds on membership change and least-loaded picks."""
+        from abhikarta.actor import ConsistentHashingLogic as PatternsHashingLogic
+        from abhikarta.actor import PowerOfTwoChoicesLogic
+        from abhikarta.actor.router import (
+            ConsistentHashingLogic, SmallestMailboxLogic, hash_key
+        )
+
+        class Mailbox:
+            def __init__(self, depth):
+                self.depth = depth
+
+            def size(self):
+                return self.depth
+
+        class Routee:
+            def __init__(self, path, depth=0):
+                self.path = path
+                self._mailbox = Mailbox(depth)
+
+            def _mailbox_ref(self):
+                return self._mailbox
+
+        routees = tuple(Routee(f"/user/r/routee-{i}") for i in range(10))
+        logic = ConsistentHashingLogic(virtual_nodes=50)
+        keys = [f"user-{i}" for i in range(2000)]
+        before = {key: logic.select((key, 'payload'), routees)[0] for key in keys}
+
+        # Lookup matches a brute-force walk of the ring
+        points = sorted((hash_key(f"{r.path}-{i}"), r) for r in routees
+                        for i in range(50))
+        for key in keys[:200]:
+            h = hash_key(key)
+            expected = next((r for p, r in points if p >= h), points[0][1])
+            assert before[key] is expected
+
+        # Swapping one routee (same count) rebuilds; keys move only off the
+        # removed routee or onto its replacement
+        replacement = Routee("/user/r/replacement")
+        swapped = routees[:3] + (replacement,) + routees[4:]
+        after = {key: logic.select((key, 'payload'), swapped)[0] for key in keys}
+        moved = [key for key in keys if after[key] is not before[key]]
+        assert moved and all(before[key] is routees[3] or after[key] is replacement
+                             for key in moved)
+        assert all(after[key] is not routees[3] for key in keys)
+
+        shared = PatternsHashingLogic(virtual_nodes=50)
+        assert all(shared.select(key, routees)[0] is before[key] for key in keys[:100])
+
+        loaded = (Routee("/user/busy", 40), Routee("/user/idle", 1), Routee("/user/mid", 7))
+        assert SmallestMailboxLogic().select('job', loaded)[0] is loaded[1]
+        two_choices = PowerOfTwoChoicesLogic()
+        picks = [two_choices.select('job', loaded)[0] for _ in range(300)]
+        assert loaded[0] not in picks
+        assert picks.count(loaded[1]) > picks.count(loaded[2])
 
 
 if __name__ == '__main__':